@@ -2,6 +2,7 @@
 
 """Functions related to building the tweet content."""
 
+import re
 from typing import Union, List, Tuple
 
 from logtweet._content import exceptions
@@ -30,6 +31,31 @@ def make_preamble(day_number: int) -> str:
     return f"{day_number}/#100DaysOfCode"
 
 
+def get_day_number_from_tweet_content(tweet_content: str) -> int:
+    """
+    Extract the day number from the preamble of the tweet content.
+
+    Arguments:
+        tweet_content (str): Tweet content starting with a preamble as built
+            by ``make_preamble``.
+
+    Returns:
+        int: Number of the day of the tweet.
+
+    Raises:
+        ValueError: if the content does not start with a preamble.
+
+    """
+    match = re.match(r"(\d+)/#100DaysOfCode", tweet_content)
+    if match is None:
+        raise ValueError(
+            "Tweet content does not start with a preamble: '{0}'".format(
+                tweet_content[:30],
+            ),
+        )
+    return int(match.group(1))
+
+
 def make_tweet_content(preamble: str, message: str, link: str) -> str:
     """
     Make formatted tweet message from preamble, message and link.
@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+
+"""Incremental extraction of a single day's section from a streamed log."""
+
+import datetime
+import html
+import re
+from typing import Optional
+
+from logtweet._content import extract
+
+
+HEADING_PATTERN = re.compile(
+    r"<h2(?=[\s>])[^>]*>(?P<text>.*?)</h2\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+HEADING_START_PATTERN = re.compile(r"<h2(?=[\s>])", re.IGNORECASE)
+# Matches ``<h2>`` headings in raw bytes, like ``HEADING_PATTERN``.
+BYTES_HEADING_PATTERN = re.compile(
+    rb"<h2(?=[\s>])[^>]*>(?P<text>.*?)</h2\s*>",
+    re.IGNORECASE | re.DOTALL,
+)
+TAG_PATTERN = re.compile(r"<[^>]+>")
+HEADING_START = "<h2"
+
+
+class DaySectionScanner(object):
+    """
+    Find the section of a given day in a log that is fed in chunks.
+
+    The section of a day starts with the day's ``<h2>`` heading and ends
+    before the next ``<h2>`` heading (or at the end of the log).
+
+    Once the section is complete, no more input is needed. The scanner also
+    stops early if the log is confirmed not to contain the day. This is the
+    case when the dates of the headings seen so far show the order of the log
+    (ascending or descending) and a heading past the given day was found.
+
+    Only the unprocessed tail of the input and the day's section are kept in
+    memory.
+
+    """
+
+    def __init__(self, day_date: datetime.date) -> None:
+        """
+        Initialize ``DaySectionScanner``.
+
+        Parameters
+        ----------
+        day_date : datetime.date
+            Date of the day to find the section for.
+
+        """
+        self.day_date = day_date
+        self.done = False
+        self.found = False
+        self._buffer = ""
+        self._section_heading_end = 0
+        self._section = ""
+        self._previous_date: Optional[datetime.date] = None
+
+    @property
+    def section(self) -> str:
+        """
+        Section of the given day.
+
+        Returns
+        -------
+        str
+            Section of the day starting with its heading. Empty if the day
+            has not been found (yet).
+
+        """
+        return self._section
+
+    def feed(self, text: str) -> bool:
+        """
+        Feed the next chunk of the log.
+
+        Parameters
+        ----------
+        text : str
+            Next chunk of the log.
+
+        Returns
+        -------
+        bool
+            Expresses if the scan is done and no more input is needed.
+
+        """
+        if self.done:
+            return True
+        self._buffer += text
+        if self.found:
+            self._find_section_end()
+        else:
+            self._find_section_start()
+        return self.done
+
+    def close(self) -> None:
+        """Mark the end of the log."""
+        if not self.done and self.found:
+            self._section = self._buffer
+        self._buffer = ""
+        self.done = True
+
+    def _find_section_start(self) -> None:
+        position = 0
+        while True:
+            match = HEADING_PATTERN.search(self._buffer, position)
+            if match is None:
+                break
+            position = match.end()
+            heading_date = get_heading_date(match.group("text"))
+            if heading_date is None:
+                continue
+            if heading_date == self.day_date:
+                self.found = True
+                self._buffer = self._buffer[match.start():]
+                self._section_heading_end = match.end() - match.start()
+                self._find_section_end()
+                return
+            if self._is_past_day(heading_date):
+                self._buffer = ""
+                self.done = True
+                return
+            self._previous_date = heading_date
+
+        # Keep only the tail that might contain the start of a heading.
+        keep_from = self._buffer.lower().rfind(HEADING_START, position)
+        if keep_from < 0:
+            keep_from = max(position, len(self._buffer) - len(HEADING_START))
+        self._buffer = self._buffer[keep_from:]
+
+    def _find_section_end(self) -> None:
+        match = HEADING_START_PATTERN.search(
+            self._buffer,
+            self._section_heading_end,
+        )
+        if match is not None:
+            self._section = self._buffer[:match.start()]
+            self._buffer = ""
+            self.done = True
+
+    def _is_past_day(self, heading_date: datetime.date) -> bool:
+        if self._previous_date is None:
+            return False
+        if self._previous_date > heading_date:
+            # Descending log
+            return heading_date < self.day_date
+        # Ascending log
+        return heading_date > self.day_date
+
+
+def get_bytes_heading_date(
+    match: "re.Match[bytes]",
+    encoding: str = "utf-8",
+) -> Optional[datetime.date]:
+    """
+    Return the date of a day heading matched by ``BYTES_HEADING_PATTERN``.
+
+    Parameters
+    ----------
+    match : re.Match[bytes]
+        Match of ``BYTES_HEADING_PATTERN``.
+    encoding : str
+        Encoding of the matched bytes. Default is ``"utf-8"``.
+
+    Returns
+    -------
+    Optional[datetime.date]
+        Date of the day heading. ``None`` if the heading is not a day heading.
+
+    """
+    return get_heading_date(match.group("text").decode(encoding, "replace"))
+
+
+def get_heading_date(heading_html: str) -> Optional[datetime.date]:
+    """
+    Return the date of a day heading.
+
+    Parameters
+    ----------
+    heading_html : str
+        Inner HTML of the ``<h2>`` element.
+
+    Returns
+    -------
+    Optional[datetime.date]
+        Date of the day heading. ``None`` if the heading is not a day heading.
+
+    """
+    heading_text = html.unescape(TAG_PATTERN.sub("", heading_html)).strip()
+    try:
+        return extract.get_date_from_heading_string(heading_text)
+    except ValueError:
+        return None
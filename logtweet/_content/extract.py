@@ -60,18 +60,35 @@ def heading_matches_date(
             date.
 
     """
-    # Extract the date string
-    # TODO: Create separate function for the date_string extraction.
-    # A separate function makes this easier to test.
+    return get_date_from_heading_string(day_heading_text) == given_date
+
+
+def get_date_from_heading_string(heading_string: str) -> datetime.date:
+    """
+    Extract date from heading string.
+
+    >>> get_date_from_heading_string("Day 1: October 16, 2019, Wednesday")
+    datetime.date(2019, 10, 16)
+
+    Arguments:
+        heading_string (str): Day's log header string from which the date is
+            extracted. Expected format is something like
+            `Day 1: October 16, 2019, Wednesday`.
+
+    Returns:
+        date: Date represented by the heading string.
+
+    Raises:
+        ValueError: is raised if no date could be extracted due to formatting
+            issues.
+
+    """
     date_string = re.sub(
         r"(.*: )(.*)(, .*day.*)",  # pattern to create groups
         r"\2",  # Return only second group
-        day_heading_text,
+        heading_string,
     )
-    # Convert to date object
-    date_obj = datetime.datetime.strptime(date_string, DATE_FORMAT).date()
-
-    return date_obj == given_date
+    return datetime.datetime.strptime(date_string, DATE_FORMAT).date()
 
 
 def get_day_number_from_heading_string(heading_string: str) -> int:
@@ -4,25 +4,38 @@
 
 import typing
 
-import requests
+from logtweet import transport as httptransport
+
+DEFAULT_SHORTENER_URL = "https://s.lpld.io/create"
+BITLY_SHORTEN_URL = "https://api-ssl.bitly.com/v4/shorten"
 
 
 def get_short_link(
     long_link: str,
     bitly_api_key: typing.Optional[str] = None,
+    shortener_url: str = DEFAULT_SHORTENER_URL,
+    transport: typing.Optional[httptransport.Transport] = None,
 ) -> str:
     """
     Create short link.
 
     If a Bitly API key is passed, then the Bitly service is used to generate
-    the short link. Otherwise it defaults to the URL shortener at
-    `https://s.lpld.io`.
+    the short link. Otherwise the shortener at ``shortener_url`` is used,
+    which defaults to `https://s.lpld.io`. Any service speaking the same
+    ``/create`` protocol can be used, e.g. the one started with
+    ``logtweet shortener serve``.
 
     Arguments:
         long_link (str): Long link to shorten.
         bitly_api_key (Optional[str]): API key for the Bit.ly service.
             See the `Bitly API documentation`_ on how to retrieve an API key.
             Default is `None`.
+        shortener_url (str): Create endpoint of the default shortener. Not
+            used if a Bitly API key is passed.
+            Default is `https://s.lpld.io/create`.
+        transport (Optional[Transport]): Transport to send the request
+            through. Default is `None`, in which case the process wide default
+            transport is used.
 
     Returns:
         str: Shortened link pointing to the same resource as the long link.
@@ -35,15 +48,15 @@ def get_short_link(
     # TODO: Only return shortened link, if it actually shorter. At least when
     #       using the default link shortener. When using Bit.ly the user might
     #       want to have the analytical data, even if the link is not shorter.
-    shortener_url = "https://s.lpld.io/create"
     headers = {}
     shortlink_key = "short"
     if bitly_api_key:
-        shortener_url = "https://api-ssl.bitly.com/v4/shorten"
+        shortener_url = BITLY_SHORTEN_URL
         headers["Authorization"] = f"Bearer {bitly_api_key}"
         shortlink_key = "link"
     payload = {"long_url": long_link}
-    response = requests.post(shortener_url, json=payload, headers=headers)
+    transport = transport or httptransport.get_default_transport()
+    response = transport.post(shortener_url, json=payload, headers=headers)
     response.raise_for_status()
     response_data: typing.Dict[str, str] = response.json()
     return response_data[shortlink_key]
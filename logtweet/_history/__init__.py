@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+
+"""Package with the storage backends of the tweet history."""
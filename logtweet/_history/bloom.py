@@ -0,0 +1,400 @@
+# -*- coding: utf-8 -*-
+
+"""
+Persistent Bloom filter in front of a history store.
+
+Almost every lookup in the history is for a new tweet. The Bloom filter
+answers those lookups without touching the history store: if the filter does
+not contain a message, the message is definitely not in the history. Only
+possible hits are checked in the store.
+
+The filter is kept in a sidecar file next to the history store. The file is
+a header followed by the bit array and is memory-mapped, so that additions
+are written in place.
+
+"""
+
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from typing import Iterator
+
+from logtweet._history import locking  # noqa: WPS436
+from logtweet._history import store as histstore  # noqa: WPS436
+
+BLOOM_SUFFIX = ".bloom"
+DEFAULT_CAPACITY = 100000
+DEFAULT_ERROR_RATE = 0.001
+
+_MAGIC = b"LTBF"
+_VERSION = 1
+# Magic, version, bit count, hash count, capacity, entry count.
+_HEADER = struct.Struct("<4sIQQQQ")
+_COUNT_OFFSET = _HEADER.size - 8
+_HASH_PAIR = struct.Struct("<QQ")
+
+
+class BloomFilterError(Exception):
+    """Raised when a Bloom filter file can not be used."""
+
+    def __init__(self, path: str, reason: str) -> None:
+        """
+        Initialize ``BloomFilterError``.
+
+        Parameters
+        ----------
+        path : str
+            Path of the filter file.
+        reason : str
+            Why the file can not be used.
+
+        """
+        self.path = path
+        self.message = "The Bloom filter '{0}' can not be used! {1}".format(
+            path,
+            reason,
+        )
+        super().__init__(self.message)
+
+
+class BloomFilter(object):
+    """
+    Memory-mapped Bloom filter of history messages.
+
+    The bit positions of a message are derived from its digest (see
+    ``make_digest``) with double hashing. The filter counts its entries, so
+    that it is known when more entries were added than it was sized for.
+
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open an existing filter file.
+
+        Parameters
+        ----------
+        path : str
+            Path of the filter file.
+
+        Raises
+        ------
+        BloomFilterError
+            If the file is not a valid filter file.
+
+        """
+        self.path = path
+        self.bit_count: int
+        self.hash_count: int
+        self.capacity: int
+        self._count: int
+        self._lock = threading.Lock()
+        try:
+            self._file = open(path, "r+b")  # noqa: WPS515
+        except OSError as err:
+            raise BloomFilterError(path, str(err))
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0)
+        except (OSError, ValueError) as err:
+            self._file.close()
+            raise BloomFilterError(path, str(err))
+        try:
+            self._read_header()
+        except BloomFilterError:
+            self.close()
+            raise
+
+    @classmethod
+    def create(
+        cls,
+        path: str,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> "BloomFilter":
+        """
+        Create an empty filter file, replacing an existing one atomically.
+
+        Parameters
+        ----------
+        path : str
+            Path of the filter file.
+        capacity : int
+            Number of entries the filter is sized for. Default is 100000.
+        error_rate : float
+            False positive rate once the filter holds ``capacity`` entries,
+            between 0 and 1. Default is 0.001.
+
+        Returns
+        -------
+        BloomFilter
+            Opened empty filter.
+
+        Raises
+        ------
+        ValueError
+            If the capacity is not positive or the error rate is not between
+            0 and 1.
+
+        """
+        if capacity < 1:
+            raise ValueError("The capacity needs to be positive.")
+        if not 0 < error_rate < 1:
+            raise ValueError("The error rate needs to be between 0 and 1.")
+        bit_count = math.ceil(
+            -capacity * math.log(error_rate) / (math.log(2) ** 2),
+        )
+        hash_count = max(1, round(bit_count / capacity * math.log(2)))
+        header = _HEADER.pack(
+            _MAGIC,
+            _VERSION,
+            bit_count,
+            hash_count,
+            capacity,
+            0,
+        )
+        directory = os.path.dirname(path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(tmp_fd, "wb") as tmp_file:
+                tmp_file.write(header)
+                tmp_file.truncate(len(header) + math.ceil(bit_count / 8))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return cls(path)
+
+    def __len__(self) -> int:
+        """
+        Return the number of added entries.
+
+        Returns
+        -------
+        int
+            Number of added entries.
+
+        """
+        return self._count
+
+    @property
+    def is_full(self) -> bool:
+        """
+        Check if more entries were added than the filter was sized for.
+
+        Returns
+        -------
+        bool
+            Expresses if the false positive rate exceeds the configured one.
+
+        """
+        return self._count > self.capacity
+
+    def add(self, message: str) -> None:
+        """
+        Add a message to the filter.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        """
+        # Concurrent processes must not overwrite each other's bits.
+        with self._lock, locking.locked_file(self._file):
+            for position in self._iter_positions(message):
+                index = _HEADER.size + position // 8
+                self._map[index] |= 1 << (position % 8)
+            stored_count: int
+            (stored_count,) = struct.unpack_from("<Q", self._map, _COUNT_OFFSET)
+            self._count = stored_count + 1
+            struct.pack_into("<Q", self._map, _COUNT_OFFSET, self._count)
+
+    def might_contain(self, message: str) -> bool:
+        """
+        Check if a message might have been added.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Returns
+        -------
+        bool
+            ``False`` if the message was definitely not added. ``True`` if it
+            was added or, with the false positive rate, if it was not.
+
+        """
+        with self._lock:
+            return all(
+                self._map[_HEADER.size + position // 8] & (1 << (position % 8))
+                for position in self._iter_positions(message)
+            )
+
+    def close(self) -> None:
+        """Flush and close the filter file."""
+        with self._lock:
+            if self._file.closed:
+                return
+            self._map.flush()
+            self._map.close()
+            self._file.close()
+
+    def _iter_positions(self, message: str) -> Iterator[int]:
+        first_hash, second_hash = _HASH_PAIR.unpack(
+            histstore.make_digest(message),
+        )
+        # A zero step would map all hashes to the same position.
+        second_hash |= 1
+        for hash_index in range(self.hash_count):
+            yield (first_hash + hash_index * second_hash) % self.bit_count
+
+    def _read_header(self) -> None:
+        if len(self._map) < _HEADER.size:
+            raise BloomFilterError(self.path, "The file is too short.")
+        magic, version, bit_count, hash_count, capacity, count = (
+            _HEADER.unpack_from(self._map)
+        )
+        if magic != _MAGIC or version != _VERSION:
+            raise BloomFilterError(self.path, "Unknown file format.")
+        if bit_count < 1 or len(self._map) < _HEADER.size + bit_count / 8:
+            raise BloomFilterError(self.path, "The bit array is truncated.")
+        self.bit_count = bit_count
+        self.hash_count = hash_count
+        self.capacity = capacity
+        self._count = count
+
+
+class BloomFilteredHistoryStore(histstore.WrappedHistoryStore):
+    """
+    History store with a Bloom filter sidecar answering definite misses.
+
+    Lookups of messages that are not in the filter return without touching
+    the wrapped store. Possible hits are checked in the wrapped store.
+
+    The filter only knows exact messages. The text log also finds a message
+    that is part of a longer line; behind the filter, such a message is only
+    found if it was added itself.
+
+    The filter only knows the messages added through this class, or read
+    from the wrapped store by ``rebuild``. It is rebuilt automatically if the
+    sidecar is missing, invalid or full. If the wrapped store was changed
+    without the filter, it needs to be rebuilt with ``rebuild``
+    (``logtweet history rebuild-filter``).
+
+    """
+
+    def __init__(
+        self,
+        store: histstore.AbstractHistoryStore,
+        path: str,
+        capacity: int = DEFAULT_CAPACITY,
+        error_rate: float = DEFAULT_ERROR_RATE,
+    ) -> None:
+        """
+        Initialize ``BloomFilteredHistoryStore``.
+
+        Parameters
+        ----------
+        store : histstore.AbstractHistoryStore
+            History store to put the filter in front of.
+        path : str
+            Path of the filter sidecar file.
+        capacity : int
+            Minimum number of entries a rebuilt filter is sized for. Default
+            is 100000.
+        error_rate : float
+            False positive rate of a rebuilt filter at its capacity. Default
+            is 0.001.
+
+        """
+        super().__init__(store)
+        self.path = path
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.bloom: BloomFilter
+        try:
+            self.bloom = BloomFilter(path)
+        except BloomFilterError:
+            self.rebuild()
+            return
+        if self.bloom.is_full:
+            self.rebuild()
+
+    def contains(self, message: str) -> bool:
+        """
+        Check if a message is in the history.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Returns
+        -------
+        bool
+            Expresses if the message is in the wrapped store. Only checked in
+            the store if the filter might contain the message.
+
+        """
+        if not self.bloom.might_contain(message):
+            return False
+        return self.store.contains(message)
+
+    def track(self, message: str) -> None:
+        """
+        Add a message that was added to the wrapped store to the filter.
+
+        A full filter is rebuilt with twice the number of entries as its
+        capacity, so that its false positive rate stays as configured.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        """
+        self.bloom.add(message)
+        if self.bloom.is_full:
+            self.rebuild()
+
+    def rebuild(self) -> int:
+        """
+        Replace the filter with one built from the entries of the store.
+
+        The new filter is sized for twice the number of entries, but at
+        least for the configured capacity, so that it does not fill up soon.
+
+        Returns
+        -------
+        int
+            Number of entries added to the new filter.
+
+        """
+        entry_count = sum(1 for _ in self.store.iter_entries())
+        capacity = max(self.capacity, 2 * entry_count)
+        # Fill the new filter aside, so that the sidecar is never incomplete.
+        rebuild_path = self.path + ".rebuild"
+        new_bloom = BloomFilter.create(rebuild_path, capacity, self.error_rate)
+        try:
+            for entry in self.store.iter_entries():
+                new_bloom.add(entry.message)
+        except BaseException:
+            new_bloom.close()
+            os.unlink(rebuild_path)
+            raise
+        new_bloom.close()
+        old_bloom = getattr(self, "bloom", None)
+        if old_bloom is not None:
+            old_bloom.close()
+        os.replace(rebuild_path, self.path)
+        self.bloom = BloomFilter(self.path)
+        return len(self.bloom)
+
+    def close(self) -> None:
+        """Close the filter and the wrapped store."""
+        self.bloom.close()
+        super().close()
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+
+"""
+Record of the log days tweets were sent for.
+
+Every sent tweet is for one day of one log source. The day key of the tweet
+(source, date and number of the day) is recorded in a small text file next
+to the history, one key per line. Before the log is retrieved, the day of the
+source is looked up there, so that a day that was already tweeted is
+rejected without retrieving and parsing the log or shortening its link.
+
+"""
+
+import datetime
+import mmap
+import os
+from typing import Iterator, NamedTuple, Optional
+
+from logtweet._history import text as histtext  # noqa: WPS436
+
+DAY_KEYS_SUFFIX = ".days"
+# Separates the fields of a line of the day key file.
+FIELD_SEPARATOR = "\t"
+
+
+class DayKey(NamedTuple):
+    """Log day a tweet was sent for."""
+
+    source: str
+    day_date: datetime.date
+    day_number: int
+
+
+class DayKeyStore(object):
+    """
+    Day keys kept in a text file with one line per sent tweet.
+
+    Lines have the source, the date and the number of the day, separated by
+    tabs. Lines are appended like the lines of the text log (see
+    ``append_lines``), so concurrent workers can share the file.
+
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize ``DayKeyStore``.
+
+        Parameters
+        ----------
+        path : str
+            Path of the day key file. The file is created on the first
+            addition.
+
+        """
+        self.path = path
+
+    def contains_day(self, source: str, day_date: datetime.date) -> bool:
+        """
+        Check if a tweet was sent for a day of a source.
+
+        The number of the day is not needed, so the check can be done before
+        the log is read.
+
+        Parameters
+        ----------
+        source : str
+            Source string of the log.
+        day_date : datetime.date
+            Date of the day.
+
+        Returns
+        -------
+        bool
+            Expresses if a key of the day of the source was recorded.
+            ``False`` if the file does not exist yet.
+
+        """
+        line_start = "{0}{1}{2}{1}".format(
+            _clean_source(source),
+            FIELD_SEPARATOR,
+            day_date.isoformat(),
+        ).encode("utf-8")
+        try:
+            day_file = open(self.path, "rb")  # noqa: WPS515
+        except FileNotFoundError:
+            return False
+        with day_file:
+            if os.fstat(day_file.fileno()).st_size == 0:
+                # Empty files can not be mapped.
+                return False
+            with mmap.mmap(
+                day_file.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            ) as mapped:
+                # Only match at the start of a line.
+                if mapped[:len(line_start)] == line_start:
+                    return True
+                return mapped.find(b"\n" + line_start) != -1
+
+    def add(self, day_key: DayKey) -> None:
+        """
+        Append a day key to the file.
+
+        Parameters
+        ----------
+        day_key : DayKey
+            Day a tweet was sent for.
+
+        """
+        histtext.append_lines(self.path, [format_day_key_line(day_key)])
+
+    def iter_keys(self) -> Iterator[DayKey]:
+        """
+        Iterate over the recorded day keys.
+
+        Lines that do not have the form of a day key are skipped.
+
+        Yields
+        ------
+        DayKey
+            Day keys in the order they were added.
+
+        """
+        try:
+            day_file = open(self.path, "r", encoding="utf-8")  # noqa: WPS515
+        except FileNotFoundError:
+            return
+        with day_file:
+            for line in day_file:
+                day_key = parse_day_key_line(line)
+                if day_key is not None:
+                    yield day_key
+
+
+def format_day_key_line(day_key: DayKey) -> str:
+    """
+    Format a day key as a line of the day key file.
+
+    Parameters
+    ----------
+    day_key : DayKey
+        Day key to format. Line breaks and tabs in the source are replaced
+        with spaces.
+
+    Returns
+    -------
+    str
+        Tab-separated source, date and number of the day with a trailing line
+        break.
+
+    """
+    return "{1}{0}{2}{0}{3}\n".format(
+        FIELD_SEPARATOR,
+        _clean_source(day_key.source),
+        day_key.day_date.isoformat(),
+        day_key.day_number,
+    )
+
+
+def parse_day_key_line(line: str) -> Optional[DayKey]:
+    """
+    Parse a line of the day key file.
+
+    Parameters
+    ----------
+    line : str
+        Line of the file, with or without the trailing line break.
+
+    Returns
+    -------
+    Optional[DayKey]
+        Day key of the line. ``None`` if the line does not have the form
+        written by ``format_day_key_line``.
+
+    """
+    fields = line.rstrip("\r\n").split(FIELD_SEPARATOR)
+    if len(fields) != 3:
+        return None
+    source, date_string, number_string = fields
+    try:
+        day_date = datetime.datetime.strptime(date_string, "%Y-%m-%d").date()
+        day_number = int(number_string)
+    except ValueError:
+        return None
+    return DayKey(source, day_date, day_number)
+
+
+def _clean_source(source: str) -> str:
+    return source.replace("\n", " ").replace(FIELD_SEPARATOR, " ")
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+
+"""Defines the batching of concurrent writes into group commits."""
+
+import threading
+from typing import Callable, Generic, List, Optional, TypeVar
+
+ItemType = TypeVar("ItemType")
+
+MAX_BATCH_SIZE = 1024
+
+
+class _PendingItem(Generic[ItemType]):
+    """Item waiting to be committed."""
+
+    def __init__(self, item: ItemType) -> None:
+        self.item = item
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+class GroupCommitter(Generic[ItemType]):
+    """
+    Commits items submitted by concurrent threads in batches.
+
+    The first waiting thread commits all items that are pending at that
+    moment in one batch (e.g. one write and one ``fsync``). Items submitted
+    while a batch is committed wait and are committed together in the next
+    batch. Every thread returns once its own item is committed, so the
+    durability of a single write is kept, but the cost of the commit is
+    shared by everyone in the batch.
+
+    """
+
+    def __init__(
+        self,
+        commit: Callable[[List[ItemType]], None],
+        max_batch_size: int = MAX_BATCH_SIZE,
+    ) -> None:
+        """
+        Initialize ``GroupCommitter``.
+
+        Parameters
+        ----------
+        commit : Callable[[List[ItemType]], None]
+            Function durably committing a batch of items in order.
+        max_batch_size : int
+            Maximum number of items per batch. Default is 1024.
+
+        """
+        self.commit = commit
+        self.max_batch_size = max_batch_size
+        self.batch_count = 0
+        self._condition = threading.Condition()
+        self._pending: List[_PendingItem[ItemType]] = []
+        self._committing = False
+
+    def submit(self, item: ItemType) -> None:
+        """
+        Commit an item, possibly together with items of other threads.
+
+        Parameters
+        ----------
+        item : ItemType
+            Item to commit.
+
+        Raises
+        ------
+        BaseException
+            The error of the commit of the batch containing the item.
+
+        """
+        pending = _PendingItem(item)
+        with self._condition:
+            self._pending.append(pending)
+            while not pending.done:
+                if self._committing:
+                    self._condition.wait()
+                else:
+                    self._commit_batch()
+        if pending.error is not None:
+            raise pending.error
+
+    def _commit_batch(self) -> None:
+        # Called with the condition held. It is released during the commit.
+        batch = self._pending[:self.max_batch_size]
+        del self._pending[:self.max_batch_size]
+        self._committing = True
+        error: Optional[BaseException] = None
+        self._condition.release()
+        try:
+            self.commit([pending.item for pending in batch])
+        except BaseException as err:  # noqa: B902
+            error = err
+        finally:
+            self._condition.acquire()
+        for pending in batch:
+            pending.done = True
+            pending.error = error
+        self.batch_count += 1
+        self._committing = False
+        self._condition.notify_all()
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""
+Advisory file locks shared by the processes using one history.
+
+The locks are POSIX advisory locks (``fcntl``). On platforms without
+``fcntl``, only the threads of one process are synchronized.
+
+"""
+
+import contextlib
+import importlib
+import os
+import threading
+from types import ModuleType
+from typing import IO, Dict, Iterator, List, Optional
+
+# Not available on Windows, imported by name so that type checks pass either way.
+fcntl: Optional[ModuleType]
+try:
+    fcntl = importlib.import_module("fcntl")
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+LOCK_SUFFIX = ".lock"
+LOCK_STRIPES = 1024
+
+
+@contextlib.contextmanager
+def locked_file(file_obj: IO[bytes], shared: bool = False) -> Iterator[None]:
+    """
+    Hold a lock on a whole open file.
+
+    Parameters
+    ----------
+    file_obj : IO[bytes]
+        Open file to lock. The lock belongs to the open file, so other open
+        files of the same path are excluded, also in the same process.
+    shared : bool
+        Hold a shared lock, which only excludes exclusive locks. Default is
+        ``False``, in which case the lock is exclusive.
+
+    Yields
+    ------
+    None
+        While the lock is held.
+
+    """
+    if fcntl is None:  # pragma: no cover
+        yield
+        return
+    fcntl.flock(file_obj.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+    try:
+        yield
+    finally:
+        fcntl.flock(file_obj.fileno(), fcntl.LOCK_UN)
+
+
+class StripedFileLock(object):
+    """
+    Exclusive locks of keys, shared by all processes using a lock file.
+
+    Keys are mapped to one of ``stripes`` bytes of the lock file and the byte
+    is locked with a POSIX record lock, so that processes working on
+    different keys rarely wait for each other. Record locks do not exclude
+    the threads of one process, so every stripe also has a thread lock.
+
+    Use ``get_striped_lock`` to get the instance of a lock file. Closing any
+    descriptor of a file releases all record locks of the process on it, so
+    there must only be one instance per lock file and process.
+
+    """
+
+    def __init__(self, path: str, stripes: int = LOCK_STRIPES) -> None:
+        """
+        Initialize ``StripedFileLock``.
+
+        Parameters
+        ----------
+        path : str
+            Path of the lock file. It is created on first use.
+        stripes : int
+            Number of independently locked stripes. Default is 1024.
+
+        """
+        self.path = path
+        self.stripes = stripes
+        self._thread_locks: List[threading.Lock] = [
+            threading.Lock() for _ in range(stripes)
+        ]
+        self._file_lock = threading.Lock()
+        self._file: Optional[IO[bytes]] = None
+
+    @contextlib.contextmanager
+    def lock(self, key: bytes) -> Iterator[None]:
+        """
+        Hold the lock of a key.
+
+        Parameters
+        ----------
+        key : bytes
+            Key to lock, e.g. a digest. Its first 8 bytes choose the stripe.
+
+        Yields
+        ------
+        None
+            While the lock is held.
+
+        """
+        stripe = int.from_bytes(key[:8], "little") % self.stripes
+        with self._thread_locks[stripe]:
+            if fcntl is None:  # pragma: no cover
+                yield
+                return
+            lock_file = self._get_file()
+            fcntl.lockf(lock_file.fileno(), fcntl.LOCK_EX, 1, stripe)
+            try:
+                yield
+            finally:
+                fcntl.lockf(lock_file.fileno(), fcntl.LOCK_UN, 1, stripe)
+
+    def _get_file(self) -> IO[bytes]:
+        with self._file_lock:
+            if self._file is None:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self._file = open(self.path, "a+b")  # noqa: WPS515
+            return self._file
+
+
+_striped_locks: Dict[str, StripedFileLock] = {}
+_striped_locks_lock = threading.Lock()
+
+
+def get_striped_lock(path: str) -> StripedFileLock:
+    """
+    Return the striped lock of a lock file shared in this process.
+
+    Parameters
+    ----------
+    path : str
+        Path of the lock file.
+
+    Returns
+    -------
+    StripedFileLock
+        Lock of the file.
+
+    """
+    key = os.path.realpath(path)
+    with _striped_locks_lock:
+        striped_lock = _striped_locks.get(key)
+        if striped_lock is None:
+            striped_lock = StripedFileLock(key)
+            _striped_locks[key] = striped_lock
+        return striped_lock
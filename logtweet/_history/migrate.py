@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streaming migration of a text log into another history store.
+
+The text log is read line by line and its entries are added to the target
+store in large batches (see ``AbstractHistoryStore.add_entries``), e.g. one
+transaction per batch for the SQLite history. The log is never held in
+memory, so logs of several gigabytes can be migrated.
+
+After every batch, the offset of the next line in the log is written to a
+checkpoint file. An interrupted migration continues from there.
+
+"""
+
+import json
+import os
+import tempfile
+import time
+from typing import BinaryIO, Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+from logtweet._history import store as histstore  # noqa: WPS436
+
+CHECKPOINT_SUFFIX = ".migrate"
+BATCH_SIZE = 50000
+REPORT_INTERVAL = 1.0  # Seconds
+
+
+class MigrationError(Exception):
+    """Raised when a text log can not be migrated."""
+
+    def __init__(self, path: str, reason: str) -> None:
+        """
+        Initialize ``MigrationError``.
+
+        Parameters
+        ----------
+        path : str
+            Path of the text log.
+        reason : str
+            Why the log can not be migrated.
+
+        """
+        self.path = path
+        self.message = "The history '{0}' can not be migrated! {1}".format(
+            path,
+            reason,
+        )
+        super().__init__(self.message)
+
+
+class MigrationCheckpoint(NamedTuple):
+    """State of a migration after a committed batch."""
+
+    source: str
+    offset: int
+    entries: int
+    skipped_lines: int
+
+
+class MigrationProgress(NamedTuple):
+    """Progress of a migration."""
+
+    checkpoint: MigrationCheckpoint
+    source_size: int
+    resumed_at: MigrationCheckpoint
+    seconds: float
+
+    @property
+    def done_ratio(self) -> float:
+        """
+        Return the ratio of the text log that was migrated.
+
+        Returns
+        -------
+        float
+            Migrated bytes divided by the size of the log. 1 for empty logs.
+
+        """
+        if not self.source_size:
+            return 1.0
+        return self.checkpoint.offset / self.source_size
+
+    @property
+    def entries_per_second(self) -> float:
+        """
+        Return the number of entries migrated per second by this run.
+
+        Returns
+        -------
+        float
+            Entries per second since the migration was started or resumed.
+
+        """
+        entries = self.checkpoint.entries - self.resumed_at.entries
+        return entries / self.seconds if self.seconds else 0.0
+
+    @property
+    def bytes_per_second(self) -> float:
+        """
+        Return the number of bytes of the log migrated per second by this run.
+
+        Returns
+        -------
+        float
+            Bytes per second since the migration was started or resumed.
+
+        """
+        read_bytes = self.checkpoint.offset - self.resumed_at.offset
+        return read_bytes / self.seconds if self.seconds else 0.0
+
+
+def migrate_text_log(
+    source: str,
+    store: histstore.AbstractHistoryStore,
+    checkpoint_path: str,
+    batch_size: int = BATCH_SIZE,
+    report: Optional[Callable[[MigrationProgress], None]] = None,
+    report_interval: float = REPORT_INTERVAL,
+    clock: Callable[[], float] = time.monotonic,
+) -> MigrationProgress:
+    """
+    Add the entries of a text log to a history store.
+
+    If the checkpoint file exists, the migration continues after the last
+    committed batch. The batch after the checkpoint may have been added
+    before the migration was interrupted, so its entries that are already
+    in the store are skipped. The checkpoint file is removed once the whole
+    log was migrated.
+
+    Parameters
+    ----------
+    source : str
+        Path of the text log.
+    store : histstore.AbstractHistoryStore
+        Store to add the entries to.
+    checkpoint_path : str
+        Path of the checkpoint file.
+    batch_size : int
+        Number of entries added at once. Default is 50000.
+    report : Optional[Callable[[MigrationProgress], None]]
+        Function called with the progress after a batch, at most once per
+        ``report_interval``. Default is ``None``, in which case the progress
+        is not reported.
+    report_interval : float
+        Minimum number of seconds between reports. Default is 1.
+    clock : Callable[[], float]
+        Function returning the current time in seconds. Default is
+        ``time.monotonic``.
+
+    Returns
+    -------
+    MigrationProgress
+        Progress at the end of the migration.
+
+    Raises
+    ------
+    MigrationError
+        If the checkpoint belongs to another log or the log is shorter than
+        the migrated part.
+
+    """
+    source = os.path.abspath(source)
+    started = clock()
+    last_report = started
+    resumed_at = read_checkpoint(checkpoint_path)
+    if resumed_at is None:
+        resumed_at = MigrationCheckpoint(source, 0, 0, 0)
+    elif resumed_at.source != source:
+        raise MigrationError(
+            source,
+            "A migration of '{0}' is in progress ({1}).".format(
+                resumed_at.source,
+                checkpoint_path,
+            ),
+        )
+    checkpoint = resumed_at
+    with open(source, "rb") as source_file:
+        source_size = os.fstat(source_file.fileno()).st_size
+        if checkpoint.offset > source_size:
+            raise MigrationError(
+                source,
+                "The log is shorter than at the checkpoint ({0}).".format(
+                    checkpoint_path,
+                ),
+            )
+        source_file.seek(checkpoint.offset)
+        is_resumed = checkpoint.offset > 0
+        for entries, read_bytes, skipped_lines in iter_entry_batches(
+            source_file,
+            batch_size,
+        ):
+            if is_resumed:
+                new_entries = [
+                    entry for entry in entries
+                    if not store.contains(entry.message)
+                ]
+                skipped_lines += len(entries) - len(new_entries)
+                entries = new_entries
+                is_resumed = False
+            if entries:
+                store.add_entries(entries)
+            checkpoint = MigrationCheckpoint(
+                source,
+                checkpoint.offset + read_bytes,
+                checkpoint.entries + len(entries),
+                checkpoint.skipped_lines + skipped_lines,
+            )
+            write_checkpoint(checkpoint_path, checkpoint)
+            now = clock()
+            if report is not None and now - last_report >= report_interval:
+                last_report = now
+                report(
+                    MigrationProgress(
+                        checkpoint,
+                        source_size,
+                        resumed_at,
+                        now - started,
+                    ),
+                )
+    if os.path.exists(checkpoint_path):
+        os.unlink(checkpoint_path)
+    return MigrationProgress(
+        checkpoint,
+        source_size,
+        resumed_at,
+        clock() - started,
+    )
+
+
+def iter_entry_batches(
+    source_file: BinaryIO,
+    batch_size: int,
+) -> Iterator[Tuple[List[histstore.HistoryEntry], int, int]]:
+    """
+    Read the entries of a text log in batches.
+
+    Parameters
+    ----------
+    source_file : BinaryIO
+        Text log opened in binary mode. Reading starts at its position.
+    batch_size : int
+        Maximum number of entries per batch.
+
+    Yields
+    ------
+    Tuple[List[histstore.HistoryEntry], int, int]
+        Entries of the batch, number of bytes read for the batch and number
+        of lines of the batch that are not entries.
+
+    """
+    entries: List[histstore.HistoryEntry] = []
+    read_bytes = 0
+    skipped_lines = 0
+    for raw_line in source_file:
+        read_bytes += len(raw_line)
+        entry = histstore.parse_entry_line(raw_line.decode("utf-8", "replace"))
+        if entry is None:
+            skipped_lines += 1
+            continue
+        entries.append(entry)
+        if len(entries) >= batch_size:
+            yield entries, read_bytes, skipped_lines
+            entries, read_bytes, skipped_lines = [], 0, 0
+    if read_bytes:
+        yield entries, read_bytes, skipped_lines
+
+
+def read_checkpoint(path: str) -> Optional[MigrationCheckpoint]:
+    """
+    Read a checkpoint file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint file.
+
+    Returns
+    -------
+    Optional[MigrationCheckpoint]
+        Checkpoint of the file. ``None`` if the file does not exist.
+
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as checkpoint_file:
+            return MigrationCheckpoint(**json.load(checkpoint_file))
+    except FileNotFoundError:
+        return None
+
+
+def write_checkpoint(path: str, checkpoint: MigrationCheckpoint) -> None:
+    """
+    Durably replace a checkpoint file.
+
+    Parameters
+    ----------
+    path : str
+        Path of the checkpoint file.
+    checkpoint : MigrationCheckpoint
+        Checkpoint to write.
+
+    """
+    directory = os.path.dirname(path) or "."
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(tmp_fd, "w", encoding="utf-8") as tmp_file:
+            json.dump(checkpoint._asdict(), tmp_file)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
@@ -0,0 +1,616 @@
+# -*- coding: utf-8 -*-
+
+"""
+Near-duplicate detection of history messages with SimHash.
+
+Every message is reduced to a 64 bit SimHash fingerprint of its character
+shingles, after the day preamble and links are removed and white space and
+case are normalized. Similar messages have fingerprints that differ in few
+bits, so the similarity of two messages is the share of equal bits.
+
+The day number of the preamble is mixed into the fingerprint with a random
+looking mask per day. Messages of the same day keep the distance of their
+texts, while messages of different days differ in about half of the bits.
+Only tweets of the same day are near-duplicates, so a similar text for a new
+day is not rejected.
+
+The fingerprints are kept in a locality-sensitive index file. The 64 bits
+are split into bands, one more than the number of bits that may differ. Two
+fingerprints within that distance are equal in at least one band. For every
+band, the file holds all fingerprints rotated so that the band comes first,
+in sorted order. A lookup binary-searches each band for the fingerprints
+sharing the band of the query and only compares those. New fingerprints are
+appended to an unsorted tail, which is merged into the sorted tables once it
+gets long.
+
+The tables are stored in native byte order, so that they can be searched
+without conversion. The header records the byte order, and index files of
+another byte order are rebuilt.
+
+"""
+
+import array
+import bisect
+import contextlib
+import hashlib
+import mmap
+import os
+import re
+import struct
+import tempfile
+from typing import (
+    IO,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from logtweet._history import locking  # noqa: WPS436
+from logtweet._history import store as histstore  # noqa: WPS436
+
+INDEX_SUFFIX = ".simhash"
+DEFAULT_THRESHOLD = 0.9
+SHINGLE_LENGTH = 4
+# Appended fingerprints are merged into the sorted tables beyond this count.
+MAX_TAIL_LENGTH = 1024
+
+FINGERPRINT_BITS = 64
+_MASK = (1 << FINGERPRINT_BITS) - 1
+URL_PATTERN = re.compile(r"https?://\S+", re.IGNORECASE)
+# Preamble of the tweets, e.g. ``77/#100DaysOfCode`` (see
+# ``logtweet._content.build.make_preamble``).
+PREAMBLE_PATTERN = re.compile(
+    r"^\s*(?P<number>\d+)/#100DaysOfCode\b",
+    re.IGNORECASE,
+)
+
+_MAGIC = b"LTSH"
+# Version 3 mixes the day number into the fingerprint.
+_VERSION = 3
+# Magic, version, band count, padding, byte order marker, sorted count.
+_HEADER = struct.Struct("=4sIIIQQ")
+_BYTE_ORDER_MARKER = 1
+_FINGERPRINT_SIZE = 8
+
+
+def normalize_message(message: str) -> str:
+    """
+    Normalize a message for the fingerprint.
+
+    Parameters
+    ----------
+    message : str
+        History message of a tweet.
+
+    Returns
+    -------
+    str
+        Lower case message without the day preamble and links, and with
+        single spaces. The day is kept in the fingerprint separately (see
+        ``get_day_mask``).
+
+    """
+    text = URL_PATTERN.sub(" ", PREAMBLE_PATTERN.sub("", message))
+    return " ".join(text.lower().split())
+
+
+def get_day_mask(message: str) -> int:
+    """
+    Return the mask of the day of a message.
+
+    Parameters
+    ----------
+    message : str
+        History message of a tweet.
+
+    Returns
+    -------
+    int
+        64 bit hash of the day number in the preamble of the message. 0 if
+        the message has no preamble.
+
+    """
+    match = PREAMBLE_PATTERN.match(message)
+    if match is None:
+        return 0
+    day = "day:{0}".format(int(match.group("number")))
+    return int.from_bytes(
+        hashlib.blake2b(day.encode("utf-8"), digest_size=8).digest(),
+        "big",
+    )
+
+
+def simhash(message: str, shingle_length: int = SHINGLE_LENGTH) -> int:
+    """
+    Create the SimHash fingerprint of a message.
+
+    Parameters
+    ----------
+    message : str
+        History message of a tweet. It is normalized first (see
+        ``normalize_message``).
+    shingle_length : int
+        Number of characters per shingle. Default is 4.
+
+    Returns
+    -------
+    int
+        64 bit fingerprint. Every bit is set if it is set in the hashes of
+        more than half of the shingles of the message, and flipped if it is
+        set in the mask of the day (see ``get_day_mask``).
+
+    """
+    text = normalize_message(message)
+    shingles = {
+        text[start:start + shingle_length]
+        for start in range(max(1, len(text) - shingle_length + 1))
+    }
+    bit_strings = [
+        "{0:064b}".format(
+            int.from_bytes(
+                hashlib.blake2b(
+                    shingle.encode("utf-8"),
+                    digest_size=8,
+                ).digest(),
+                "big",
+            ),
+        )
+        for shingle in shingles
+    ]
+    half = len(bit_strings) / 2
+    fingerprint = 0
+    # Count the set bits column by column, most significant first.
+    for column in zip(*bit_strings):
+        fingerprint = (fingerprint << 1) | (column.count("1") > half)
+    return fingerprint ^ get_day_mask(message)
+
+
+def _count_bits_of_str(number: int) -> int:
+    return bin(number).count("1")
+
+
+# Counts the set bits of a non-negative integer (``int.bit_count`` is only
+# available from Python 3.10).
+count_bits: Callable[[int], int] = getattr(int, "bit_count", _count_bits_of_str)
+
+
+def get_similarity(first: int, second: int) -> float:
+    """
+    Return the similarity of two fingerprints.
+
+    Parameters
+    ----------
+    first : int
+        Fingerprint.
+    second : int
+        Other fingerprint.
+
+    Returns
+    -------
+    float
+        Share of equal bits, between 0 and 1.
+
+    """
+    distance = count_bits(first ^ second)
+    return 1 - distance / FINGERPRINT_BITS
+
+
+def get_max_distance(threshold: float) -> int:
+    """
+    Return the number of bits that may differ at a similarity threshold.
+
+    Parameters
+    ----------
+    threshold : float
+        Minimum similarity, between 0 and 1.
+
+    Returns
+    -------
+    int
+        Maximum number of differing bits.
+
+    Raises
+    ------
+    ValueError
+        If the threshold is not between 0 and 1.
+
+    """
+    if not 0 <= threshold <= 1:
+        raise ValueError("The similarity threshold needs to be between 0 and 1.")
+    # Tolerate rounding, e.g. of (1 - 0.9) * 64.
+    return int((1 - threshold) * FINGERPRINT_BITS + 1e-9)
+
+
+def get_bands(band_count: int) -> List[Tuple[int, int]]:
+    """
+    Split the fingerprint bits into bands.
+
+    Parameters
+    ----------
+    band_count : int
+        Number of bands, between 1 and 64.
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        Offset from the most significant bit and width of every band.
+
+    """
+    width, remainder = divmod(FINGERPRINT_BITS, band_count)
+    bands = []
+    offset = 0
+    for band_index in range(band_count):
+        band_width = width + (band_index < remainder)
+        bands.append((offset, band_width))
+        offset += band_width
+    return bands
+
+
+def rotate_left(fingerprint: int, shift: int) -> int:
+    """
+    Rotate the bits of a fingerprint to the left.
+
+    Parameters
+    ----------
+    fingerprint : int
+        64 bit fingerprint.
+    shift : int
+        Number of bits to rotate by, between 0 and 63.
+
+    Returns
+    -------
+    int
+        Rotated fingerprint.
+
+    """
+    if not shift:
+        return fingerprint
+    return (
+        (fingerprint << shift) | (fingerprint >> (FINGERPRINT_BITS - shift))
+    ) & _MASK
+
+
+class NearDuplicateIndex(object):
+    """
+    Locality-sensitive index file of message fingerprints.
+
+    Changes hold an exclusive lock of a lock file next to the index (with the
+    suffix ``.lock``). Merging the tail replaces the file atomically, so
+    lookups never see a partial index.
+
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> None:
+        """
+        Initialize ``NearDuplicateIndex``.
+
+        Parameters
+        ----------
+        path : str
+            Path of the index file. It is created by the first addition.
+        threshold : float
+            Minimum similarity of matches, between 0 and 1. Default is 0.9.
+            Index files created for another threshold are not used.
+
+        """
+        self.path = path
+        self.threshold = threshold
+        self.max_distance = get_max_distance(threshold)
+        self.band_count = min(self.max_distance + 1, FINGERPRINT_BITS)
+        self.bands = get_bands(self.band_count)
+        self._lock_path = path + locking.LOCK_SUFFIX
+
+    def is_usable(self) -> bool:
+        """
+        Check if the index file exists and fits the threshold.
+
+        Returns
+        -------
+        bool
+            Expresses if the index file can be searched.
+
+        """
+        try:
+            with open(self.path, "rb") as index_file:
+                header = _read_header(index_file)
+        except FileNotFoundError:
+            return False
+        return header is not None and header[0] == self.band_count
+
+    def find(self, message: str) -> List[histstore.NearDuplicateMatch]:
+        """
+        Find the fingerprints similar to the fingerprint of a message.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Returns
+        -------
+        List[histstore.NearDuplicateMatch]
+            Fingerprints with at least the threshold similarity, most similar
+            first. Empty if the index does not exist or is for another
+            threshold or byte order.
+
+        """
+        query = simhash(message)
+        max_distance = self.max_distance
+        matches: Set[int] = set()
+        with self._mapped_tables() as tables:
+            if tables is None:
+                return []
+            sorted_tables, tail = tables
+            for band_table, (offset, width) in zip(sorted_tables, self.bands):
+                # Rotation keeps the distance, so candidates are compared
+                # rotated and only matches are rotated back.
+                rotated_query = rotate_left(query, offset)
+                suffix_bits = FINGERPRINT_BITS - width
+                low = (rotated_query >> suffix_bits) << suffix_bits
+                start = bisect.bisect_left(band_table, low)
+                end = bisect.bisect_left(band_table, low + (1 << suffix_bits))
+                matches.update(
+                    rotate_left(candidate, -offset % FINGERPRINT_BITS)
+                    for candidate in band_table[start:end].tolist()
+                    if count_bits(candidate ^ rotated_query) <= max_distance
+                )
+            matches.update(
+                candidate
+                for candidate in tail
+                if count_bits(candidate ^ query) <= max_distance
+            )
+        return sorted(
+            (
+                histstore.NearDuplicateMatch(
+                    fingerprint,
+                    get_similarity(query, fingerprint),
+                )
+                for fingerprint in matches
+            ),
+            key=lambda match: match.similarity,
+            reverse=True,
+        )
+
+    def add(self, message: str) -> None:
+        """
+        Add the fingerprint of a message to the index.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        """
+        fingerprint = simhash(message)
+        with self._locked():
+            if not self.is_usable():
+                self._write(self._read_fingerprints() + [fingerprint])
+                return
+            with open(self.path, "ab") as index_file:
+                index_file.write(array.array("Q", [fingerprint]).tobytes())
+            if self._get_tail_length() > MAX_TAIL_LENGTH:
+                self._write(self._read_fingerprints())
+
+    def rebuild(self, messages: Iterable[str]) -> int:
+        """
+        Replace the index with the fingerprints of the messages.
+
+        Parameters
+        ----------
+        messages : Iterable[str]
+            History messages of all sent tweets.
+
+        Returns
+        -------
+        int
+            Number of indexed fingerprints.
+
+        """
+        fingerprints = [simhash(message) for message in messages]
+        with self._locked():
+            self._write(fingerprints)
+        return len(fingerprints)
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        with open(self._lock_path, "a+b") as lock_file:
+            with locking.locked_file(lock_file):
+                yield
+
+    @contextlib.contextmanager
+    def _mapped_tables(
+        self,
+    ) -> Iterator[Optional[Tuple[List[memoryview], List[int]]]]:
+        try:
+            index_file = open(self.path, "rb")  # noqa: WPS515
+        except FileNotFoundError:
+            yield None
+            return
+        with index_file:
+            header = _read_header(index_file)
+            if header is None or header[0] != self.band_count:
+                yield None
+                return
+            band_count, sorted_count = header
+            with mmap.mmap(
+                index_file.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            ) as mapped:
+                table_size = sorted_count * _FINGERPRINT_SIZE
+                tail_start = _HEADER.size + band_count * table_size
+                tail_end = len(mapped) - (len(mapped) - tail_start) % 8
+                tail = array.array("Q", mapped[tail_start:tail_end]).tolist()
+                view = memoryview(mapped)
+                sorted_tables = []
+                if table_size:
+                    sorted_tables = [
+                        view[start:start + table_size].cast("Q")
+                        for start in range(_HEADER.size, tail_start, table_size)
+                    ]
+                try:
+                    yield (sorted_tables, tail)
+                finally:
+                    for table in sorted_tables:
+                        table.release()
+                    view.release()
+
+    def _get_tail_length(self) -> int:
+        with open(self.path, "rb") as index_file:
+            header = _read_header(index_file)
+            size = os.fstat(index_file.fileno()).st_size
+        if header is None:
+            return 0
+        band_count, sorted_count = header
+        table_bytes = band_count * sorted_count * _FINGERPRINT_SIZE
+        return (size - _HEADER.size - table_bytes) // _FINGERPRINT_SIZE
+
+    def _read_fingerprints(self) -> List[int]:
+        try:
+            index_file = open(self.path, "rb")  # noqa: WPS515
+        except FileNotFoundError:
+            return []
+        with index_file:
+            header = _read_header(index_file)
+            if header is None:
+                return []
+            band_count, sorted_count = header
+            content = index_file.read()
+        # The first table is not rotated.
+        first_table = content[:sorted_count * _FINGERPRINT_SIZE]
+        tail = content[band_count * sorted_count * _FINGERPRINT_SIZE:]
+        tail = tail[:len(tail) - len(tail) % _FINGERPRINT_SIZE]
+        return array.array("Q", first_table + tail).tolist()
+
+    def _write(self, fingerprints: List[int]) -> None:
+        unique = sorted(set(fingerprints))
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(tmp_fd, "wb") as tmp_file:
+                tmp_file.write(
+                    _HEADER.pack(
+                        _MAGIC,
+                        _VERSION,
+                        self.band_count,
+                        0,
+                        _BYTE_ORDER_MARKER,
+                        len(unique),
+                    ),
+                )
+                for offset, _ in self.bands:
+                    band_table = array.array(
+                        "Q",
+                        sorted(
+                            rotate_left(fingerprint, offset)
+                            for fingerprint in unique
+                        ),
+                    )
+                    tmp_file.write(band_table.tobytes())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+def _read_header(index_file: IO[bytes]) -> Optional[Tuple[int, int]]:
+    raw_header = index_file.read(_HEADER.size)
+    if len(raw_header) < _HEADER.size:
+        return None
+    magic, version, band_count, _, marker, sorted_count = _HEADER.unpack(
+        raw_header,
+    )
+    is_valid = (
+        magic == _MAGIC
+        and version == _VERSION
+        and marker == _BYTE_ORDER_MARKER
+    )
+    if not is_valid:
+        return None
+    return band_count, sorted_count
+
+
+class NearDuplicateHistoryStore(histstore.WrappedHistoryStore):
+    """
+    History store keeping a near-duplicate index of its messages.
+
+    The index is built from the wrapped store if it does not exist or was
+    created for another threshold.
+
+    """
+
+    def __init__(
+        self,
+        store: histstore.AbstractHistoryStore,
+        path: str,
+        threshold: float = DEFAULT_THRESHOLD,
+    ) -> None:
+        """
+        Initialize ``NearDuplicateHistoryStore``.
+
+        Parameters
+        ----------
+        store : histstore.AbstractHistoryStore
+            History store to index.
+        path : str
+            Path of the index file.
+        threshold : float
+            Minimum similarity of near-duplicates. Default is 0.9.
+
+        """
+        super().__init__(store)
+        self.index = NearDuplicateIndex(path, threshold)
+        if not self.index.is_usable():
+            self.rebuild()
+
+    def find_similar(self, message: str) -> List[histstore.NearDuplicateMatch]:
+        """
+        Find messages in the history similar to a message.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Returns
+        -------
+        List[histstore.NearDuplicateMatch]
+            Matches above the similarity threshold, most similar first.
+
+        """
+        return self.index.find(message)
+
+    def track(self, message: str) -> None:
+        """
+        Add a message that was added to the wrapped store to the index.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        """
+        self.index.add(message)
+
+    def rebuild(self) -> int:
+        """
+        Rebuild the index from the entries of the wrapped store.
+
+        Returns
+        -------
+        int
+            Number of indexed messages.
+
+        """
+        return self.index.rebuild(
+            entry.message for entry in self.store.iter_entries()
+        )
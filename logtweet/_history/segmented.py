@@ -0,0 +1,589 @@
+# -*- coding: utf-8 -*-
+
+"""
+History kept in rotated segments with sorted digest indexes.
+
+The history directory contains numbered segments:
+
+``segment-<number>.log``
+    Lines in the format of the text log (see ``format_entry_line``). The
+    segment with the highest number is the active segment, which new entries
+    are appended to.
+
+``segment-<number>.idx``
+    Index of a sealed segment. A header is followed by records of the digest
+    of a message and the offset of its line, sorted by digest, so that a
+    lookup is a binary search. The header records the size of the indexed
+    segment; an index that does not match its segment is not used.
+
+The active segment is sealed and a new one started once it is larger than
+the maximum size or older than the maximum age. Compaction merges all sealed
+segments into one and can drop entries older than a retention window.
+
+"""
+
+import contextlib
+import datetime
+import mmap
+import os
+import re
+import struct
+import tempfile
+from typing import IO, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from logtweet._history import groupcommit  # noqa: WPS436
+from logtweet._history import locking  # noqa: WPS436
+from logtweet._history import store as histstore  # noqa: WPS436
+from logtweet._history import text as histtext  # noqa: WPS436
+
+SEGMENT_BYTES = 16 * 1024 * 1024
+SEGMENT_PATTERN = re.compile(r"^segment-(?P<number>\d+)\.log$")
+DIRECTORY_LOCK_FILENAME = "segments.lock"
+
+_INDEX_MAGIC = b"LTHX"
+_INDEX_VERSION = 1
+# Magic, version, entry count, size of the indexed segment.
+_INDEX_HEADER = struct.Struct("<4sIQQ")
+# Digest of the message and offset of its line in the segment.
+_INDEX_RECORD = struct.Struct("<16sQ")
+
+
+class CompactionResult(NamedTuple):
+    """Outcome of the compaction of a segmented history."""
+
+    merged_segments: int
+    kept_entries: int
+    dropped_entries: int
+
+
+class SegmentIndex(object):
+    """Memory-mapped sorted digest index of a sealed segment."""
+
+    def __init__(self, index_file: IO[bytes]) -> None:
+        """
+        Initialize ``SegmentIndex``.
+
+        Parameters
+        ----------
+        index_file : IO[bytes]
+            Open index file. It needs to stay open while the index is used.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a valid index.
+
+        """
+        self._map = mmap.mmap(index_file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, entry_count, segment_size = _INDEX_HEADER.unpack_from(
+            self._map,
+        )
+        expected_size = _INDEX_HEADER.size + entry_count * _INDEX_RECORD.size
+        if magic != _INDEX_MAGIC or version != _INDEX_VERSION:
+            self._map.close()
+            raise ValueError("Unknown index format.")
+        if len(self._map) != expected_size:
+            self._map.close()
+            raise ValueError("The index is truncated.")
+        self.entry_count: int = entry_count
+        self.segment_size: int = segment_size
+
+    def find(self, digest: bytes) -> List[int]:
+        """
+        Find the lines of a digest with a binary search.
+
+        Parameters
+        ----------
+        digest : bytes
+            Digest of a message.
+
+        Returns
+        -------
+        List[int]
+            Offsets of the lines of the messages with the digest.
+
+        """
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._digest_at(middle) < digest:
+                low = middle + 1
+            else:
+                high = middle
+        offsets = []
+        while low < self.entry_count and self._digest_at(low) == digest:
+            offsets.append(self._record_at(low)[1])
+            low += 1
+        return offsets
+
+    def close(self) -> None:
+        """Unmap the index."""
+        self._map.close()
+
+    def _digest_at(self, position: int) -> bytes:
+        return self._record_at(position)[0]
+
+    def _record_at(self, position: int) -> Tuple[bytes, int]:
+        digest, offset = _INDEX_RECORD.unpack_from(
+            self._map,
+            _INDEX_HEADER.size + position * _INDEX_RECORD.size,
+        )
+        return digest, offset
+
+
+class SegmentedHistoryStore(histstore.AbstractHistoryStore):
+    """
+    History kept in rotated segments of a directory.
+
+    Lookups search the active segment (memory-mapped) and then the indexes
+    of the sealed segments, newest first. Like the SQLite history, only
+    exact messages are found.
+
+    Appends are group commits to the active segment. Sealing, compaction
+    and lookups are synchronized between processes with a lock file in the
+    directory.
+
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_segment_bytes: int = SEGMENT_BYTES,
+        max_segment_age: Optional[datetime.timedelta] = None,
+    ) -> None:
+        """
+        Initialize ``SegmentedHistoryStore``.
+
+        Parameters
+        ----------
+        directory : str
+            Directory of the segments. It is created if it does not exist.
+        max_segment_bytes : int
+            Size in bytes after which the active segment is sealed. Default
+            is 16 MiB.
+        max_segment_age : Optional[datetime.timedelta]
+            Age of the first entry of the active segment after which the
+            segment is sealed. Default is ``None``, in which case segments
+            are only sealed by size.
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.path = directory
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age = max_segment_age
+        self._lock_path = os.path.join(directory, DIRECTORY_LOCK_FILENAME)
+        # Sealed segments known to have an index. Indexes are only removed
+        # with their segments, so they are not checked again.
+        self._indexed_segments: Set[int] = set()
+        self._committer: groupcommit.GroupCommitter[histstore.HistoryEntry] = (
+            groupcommit.GroupCommitter(self._append_entries)
+        )
+
+    def contains(self, message: str) -> bool:
+        """
+        Check if the exact message is in the history.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Returns
+        -------
+        bool
+            Expresses if the message is in the history.
+
+        """
+        line_end = "{0}{1}\n".format(histstore.SENT_SEPARATOR, message)
+        digest = histstore.make_digest(message)
+        with self._locked_directory(shared=True):
+            numbers = self.list_segments()
+            if not numbers:
+                return False
+            if _find_in_file(self._log_path(numbers[-1]), line_end):
+                return True
+            return any(
+                self._sealed_segment_contains(number, digest, line_end)
+                for number in reversed(numbers[:-1])
+            )
+
+    def add(
+        self,
+        message: str,
+        sent_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """
+        Append the message to the active segment.
+
+        The active segment is sealed first if it is too large or too old.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+        sent_at : Optional[datetime.datetime]
+            Time the tweet was sent. Default is ``None``, in which case the
+            current time is used.
+
+        """
+        self._committer.submit(
+            histstore.HistoryEntry(sent_at or datetime.datetime.now(), message),
+        )
+
+    def add_entries(self, entries: List[histstore.HistoryEntry]) -> None:
+        """
+        Append entries to the active segment with one write.
+
+        Parameters
+        ----------
+        entries : List[histstore.HistoryEntry]
+            Entries to add, in order.
+
+        """
+        self._append_entries(entries)
+
+    def iter_entries(self) -> Iterator[histstore.HistoryEntry]:
+        """
+        Iterate over the entries of all segments.
+
+        Yields
+        ------
+        histstore.HistoryEntry
+            Entries in the order they were added.
+
+        """
+        for number in self.list_segments():
+            yield from histtext.TextHistoryStore(
+                self._log_path(number),
+            ).iter_entries()
+
+    def iter_entries_between(
+        self,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+    ) -> Iterator[histstore.HistoryEntry]:
+        """
+        Iterate over the entries sent in a time range.
+
+        Segments follow each other in time. Segments whose successor starts
+        before the range are skipped, and the iteration stops with the first
+        segment starting after the range. In the other segments, the range
+        is looked up like in the text log.
+
+        Parameters
+        ----------
+        since : Optional[datetime.datetime]
+            Start of the range, inclusive. Default is ``None``, in which case
+            the range starts with the first entry.
+        until : Optional[datetime.datetime]
+            End of the range, exclusive. Default is ``None``, in which case
+            the range ends with the last entry.
+
+        Yields
+        ------
+        histstore.HistoryEntry
+            Entries in the range, in the order they were added.
+
+        """
+        segments = [
+            histtext.TextHistoryStore(self._log_path(number))
+            for number in self.list_segments()
+        ]
+        first_entries = [
+            next(segment.iter_entries(), None) for segment in segments
+        ]
+        # A segment ends before the first entry of the following segment.
+        following_entries = first_entries[1:] + [None]
+        for segment, first_entry, following_entry in zip(
+            segments,
+            first_entries,
+            following_entries,
+        ):
+            if first_entry is not None and not histstore.is_in_time_range(
+                first_entry,
+                until=until,
+            ):
+                return
+            if following_entry is not None and not histstore.is_in_time_range(
+                following_entry,
+                since=since,
+            ):
+                continue
+            yield from segment.iter_entries_between(since, until)
+
+    @contextlib.contextmanager
+    def locked(self, message: str) -> Iterator[None]:
+        """
+        Hold a lock of a message against other workers using the history.
+
+        The lock is a record lock in the lock file next to the directory
+        (with the suffix ``.lock``).
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Yields
+        ------
+        None
+            While the lock is held.
+
+        """
+        striped_lock = locking.get_striped_lock(self.path + locking.LOCK_SUFFIX)
+        with striped_lock.lock(histstore.make_digest(message)):
+            yield
+
+    def list_segments(self) -> List[int]:
+        """
+        Return the numbers of the segments.
+
+        Returns
+        -------
+        List[int]
+            Ascending numbers of the segments. The last one is the active
+            segment.
+
+        """
+        numbers = []
+        for filename in os.listdir(self.path):
+            match = SEGMENT_PATTERN.match(filename)
+            if match is not None:
+                numbers.append(int(match.group("number")))
+        return sorted(numbers)
+
+    def compact(
+        self,
+        retention: Optional[datetime.timedelta] = None,
+        now: Optional[datetime.datetime] = None,
+    ) -> CompactionResult:
+        """
+        Merge the sealed segments into one.
+
+        The merged segment replaces the newest sealed segment, the others are
+        removed. The active segment is not changed.
+
+        Parameters
+        ----------
+        retention : Optional[datetime.timedelta]
+            Entries of the sealed segments sent longer ago than this are
+            dropped. Default is ``None``, in which case all entries are kept.
+        now : Optional[datetime.datetime]
+            Time the retention window ends. Default is ``None``, in which
+            case the current time is used.
+
+        Returns
+        -------
+        CompactionResult
+            Number of merged segments and of kept and dropped entries.
+
+        """
+        cutoff = None
+        if retention is not None:
+            cutoff = (now or datetime.datetime.now()) - retention
+        with self._locked_directory():
+            sealed = self.list_segments()[:-1]
+            if not sealed:
+                return CompactionResult(0, 0, 0)
+            target = sealed[-1]
+            tmp_fd, tmp_log_path = tempfile.mkstemp(dir=self.path)
+            kept, dropped = 0, 0
+            try:
+                with os.fdopen(tmp_fd, "wb") as merged_file:
+                    for number in sealed:
+                        segment = histtext.TextHistoryStore(
+                            self._log_path(number),
+                        )
+                        for entry in segment.iter_entries():
+                            if cutoff is not None and entry.sent_at < cutoff:
+                                dropped += 1
+                                continue
+                            merged_file.write(
+                                histstore.format_entry_line(entry).encode(
+                                    "utf-8",
+                                ),
+                            )
+                            kept += 1
+                    merged_file.flush()
+                    os.fsync(merged_file.fileno())
+                tmp_index_path = tmp_log_path + ".idx"
+                write_segment_index(tmp_log_path, tmp_index_path)
+            except BaseException:
+                os.unlink(tmp_log_path)
+                raise
+            os.replace(tmp_log_path, self._log_path(target))
+            os.replace(tmp_index_path, self._index_path(target))
+            for number in sealed[:-1]:
+                _remove_if_exists(self._log_path(number))
+                _remove_if_exists(self._index_path(number))
+        return CompactionResult(len(sealed), kept, dropped)
+
+    def _append_entries(self, entries: List[histstore.HistoryEntry]) -> None:
+        with self._locked_directory():
+            numbers = self.list_segments() or [1]
+            active = numbers[-1]
+            for number in numbers[:-1]:
+                if number in self._indexed_segments:
+                    continue
+                # Seal segments left without index by an interrupted process.
+                if not os.path.exists(self._index_path(number)):
+                    write_segment_index(
+                        self._log_path(number),
+                        self._index_path(number),
+                    )
+                self._indexed_segments.add(number)
+            if self._is_full(active):
+                write_segment_index(
+                    self._log_path(active),
+                    self._index_path(active),
+                )
+                self._indexed_segments.add(active)
+                active += 1
+            histtext.append_lines(
+                self._log_path(active),
+                [histstore.format_entry_line(entry) for entry in entries],
+            )
+
+    def _is_full(self, number: int) -> bool:
+        log_path = self._log_path(number)
+        try:
+            size = os.path.getsize(log_path)
+        except FileNotFoundError:
+            return False
+        if size == 0:
+            return False
+        if size >= self.max_segment_bytes:
+            return True
+        if self.max_segment_age is None:
+            return False
+        first_entry = next(
+            histtext.TextHistoryStore(log_path).iter_entries(),
+            None,
+        )
+        if first_entry is None:
+            return False
+        age = datetime.datetime.now() - first_entry.sent_at
+        return age >= self.max_segment_age
+
+    def _sealed_segment_contains(
+        self,
+        number: int,
+        digest: bytes,
+        line_end: str,
+    ) -> bool:
+        log_path = self._log_path(number)
+        try:
+            index_file = open(self._index_path(number), "rb")  # noqa: WPS515
+        except FileNotFoundError:
+            return _find_in_file(log_path, line_end)
+        with index_file:
+            try:
+                index = SegmentIndex(index_file)
+            except (ValueError, struct.error):
+                return _find_in_file(log_path, line_end)
+            try:
+                if index.segment_size != os.path.getsize(log_path):
+                    # The segment changed since it was indexed.
+                    return _find_in_file(log_path, line_end)
+                offsets = index.find(digest)
+            finally:
+                index.close()
+        if not offsets:
+            return False
+        # Rule out digest collisions.
+        with open(log_path, "rb") as log_file:
+            for offset in offsets:
+                log_file.seek(offset)
+                line = log_file.readline().decode("utf-8", "replace")
+                if line.endswith(line_end):
+                    return True
+        return False
+
+    @contextlib.contextmanager
+    def _locked_directory(self, shared: bool = False) -> Iterator[None]:
+        with open(self._lock_path, "a+b") as lock_file:
+            with locking.locked_file(lock_file, shared=shared):
+                yield
+
+    def _log_path(self, number: int) -> str:
+        return os.path.join(self.path, "segment-{0:08d}.log".format(number))
+
+    def _index_path(self, number: int) -> str:
+        return os.path.join(self.path, "segment-{0:08d}.idx".format(number))
+
+
+def write_segment_index(log_path: str, index_path: str) -> int:
+    """
+    Write the sorted digest index of a segment.
+
+    The index is written to a temporary file and then moved into place.
+
+    Parameters
+    ----------
+    log_path : str
+        Path of the segment.
+    index_path : str
+        Path of the index.
+
+    Returns
+    -------
+    int
+        Number of indexed entries.
+
+    """
+    records = []
+    offset = 0
+    with open(log_path, "rb") as log_file:
+        for raw_line in log_file:
+            entry = histstore.parse_entry_line(
+                raw_line.decode("utf-8", "replace"),
+            )
+            if entry is not None:
+                records.append(
+                    _INDEX_RECORD.pack(
+                        histstore.make_digest(entry.message),
+                        offset,
+                    ),
+                )
+            offset += len(raw_line)
+    records.sort()
+    directory = os.path.dirname(index_path) or "."
+    tmp_fd, tmp_path = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(tmp_fd, "wb") as index_file:
+            index_file.write(
+                _INDEX_HEADER.pack(
+                    _INDEX_MAGIC,
+                    _INDEX_VERSION,
+                    len(records),
+                    offset,
+                ),
+            )
+            index_file.write(b"".join(records))
+            index_file.flush()
+            os.fsync(index_file.fileno())
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    return len(records)
+
+
+def _find_in_file(path: str, line_end: str) -> bool:
+    try:
+        with open(path, "rb") as search_file:
+            if os.fstat(search_file.fileno()).st_size == 0:
+                return False
+            with mmap.mmap(
+                search_file.fileno(),
+                0,
+                access=mmap.ACCESS_READ,
+            ) as mapped:
+                return mapped.find(line_end.encode("utf-8")) != -1
+    except FileNotFoundError:
+        return False
+
+
+def _remove_if_exists(path: str) -> None:
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(path)
@@ -0,0 +1,269 @@
+# -*- coding: utf-8 -*-
+
+"""Defines the history store kept in an SQLite database."""
+
+import contextlib
+import datetime
+import os
+import sqlite3
+import threading
+from typing import Iterator, List, Optional, Tuple
+
+from logtweet._history import groupcommit  # noqa: WPS436
+from logtweet._history import locking  # noqa: WPS436
+from logtweet._history import store as histstore  # noqa: WPS436
+from logtweet._history import text as histtext  # noqa: WPS436
+
+ITER_BATCH_SIZE = 1000
+# Seconds to wait for the database lock held by another process.
+BUSY_TIMEOUT = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tweets (
+    id INTEGER PRIMARY KEY,
+    sent_at TEXT NOT NULL,
+    digest BLOB NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tweets_digest ON tweets (digest);
+CREATE INDEX IF NOT EXISTS tweets_sent_at ON tweets (sent_at);
+"""
+
+
+class SQLiteHistoryStore(histstore.AbstractHistoryStore):
+    """
+    History kept in an SQLite database.
+
+    Every message is stored with its digest (see ``make_digest``). The
+    digest column is indexed, so that a lookup is a B-tree search instead of
+    a scan of the whole history. Unlike the text log, a message is only in
+    the history if the exact same message was added. The send times are
+    indexed too, for queries of time ranges.
+
+    Optionally, every added entry is also appended to a text log in the
+    format of ``TextHistoryStore``.
+
+    Entries added by concurrent threads are inserted in group commits, with
+    one transaction per batch. Concurrent processes are serialized by the
+    database lock.
+
+    """
+
+    def __init__(self, path: str, text_export: Optional[str] = None) -> None:
+        """
+        Initialize ``SQLiteHistoryStore``.
+
+        Parameters
+        ----------
+        path : str
+            Path of the database file. The file and its directory are created
+            if they do not exist.
+        text_export : Optional[str]
+            Path of a text log every added entry is also appended to. Default
+            is ``None``, in which case no text log is written.
+
+        """
+        self.path = path
+        self.text_export = text_export
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path,
+            timeout=BUSY_TIMEOUT,
+            check_same_thread=False,
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+        self._committer: groupcommit.GroupCommitter[histstore.HistoryEntry] = (
+            groupcommit.GroupCommitter(self._insert_entries)
+        )
+
+    def contains(self, message: str) -> bool:
+        """
+        Check if the exact message is in the history.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Returns
+        -------
+        bool
+            Expresses if the message is in the history.
+
+        """
+        digest = histstore.make_digest(message)
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT message FROM tweets WHERE digest = ?",
+                (digest,),
+            ).fetchall()
+        # Compare the messages too, in case of a digest collision.
+        return any(row[0] == message for row in rows)
+
+    def add(
+        self,
+        message: str,
+        sent_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """
+        Insert the message into the history.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+        sent_at : Optional[datetime.datetime]
+            Time the tweet was sent. Default is ``None``, in which case the
+            current time is used.
+
+        """
+        entry = histstore.HistoryEntry(
+            sent_at or datetime.datetime.now(),
+            message,
+        )
+        self._committer.submit(entry)
+
+    def add_entries(self, entries: List[histstore.HistoryEntry]) -> None:
+        """
+        Insert entries into the history in one transaction.
+
+        Parameters
+        ----------
+        entries : List[histstore.HistoryEntry]
+            Entries to add, in order.
+
+        """
+        self._insert_entries(entries)
+
+    @contextlib.contextmanager
+    def locked(self, message: str) -> Iterator[None]:
+        """
+        Hold a lock of a message against other workers using the history.
+
+        The lock is a record lock in the lock file next to the database (with
+        the suffix ``.lock``). Messages share one of the stripes of the file,
+        so workers with different messages rarely wait for each other.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Yields
+        ------
+        None
+            While the lock is held.
+
+        """
+        striped_lock = locking.get_striped_lock(self.path + locking.LOCK_SUFFIX)
+        with striped_lock.lock(histstore.make_digest(message)):
+            yield
+
+    def iter_entries(self) -> Iterator[histstore.HistoryEntry]:
+        """
+        Iterate over the entries of the history.
+
+        Yields
+        ------
+        histstore.HistoryEntry
+            Entries in the order they were added.
+
+        """
+        last_id = 0
+        while True:
+            # Read in batches, so that the history is not held in memory.
+            with self._lock:
+                rows = self._connection.execute(
+                    "SELECT id, sent_at, message FROM tweets"
+                    + " WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, ITER_BATCH_SIZE),
+                ).fetchall()
+            if not rows:
+                return
+            for last_id, sent_at, message in rows:
+                timestamp = histstore.parse_timestamp(sent_at)
+                if timestamp is not None:
+                    yield histstore.HistoryEntry(timestamp, message)
+
+    def iter_entries_between(
+        self,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+    ) -> Iterator[histstore.HistoryEntry]:
+        """
+        Iterate over the entries sent in a time range.
+
+        The range is looked up in the index of the send times. Timestamps
+        are stored in a format that sorts like the times.
+
+        Parameters
+        ----------
+        since : Optional[datetime.datetime]
+            Start of the range, inclusive. Default is ``None``, in which case
+            the range starts with the first entry.
+        until : Optional[datetime.datetime]
+            End of the range, exclusive. Default is ``None``, in which case
+            the range ends with the last entry.
+
+        Yields
+        ------
+        histstore.HistoryEntry
+            Entries in the range, in order of time.
+
+        """
+        query = (
+            "SELECT id, sent_at, message FROM tweets"
+            + " WHERE (sent_at > ? OR (sent_at = ? AND id > ?))"
+        )
+        end_parameters: Tuple[str, ...] = ()
+        if until is not None:
+            query += " AND sent_at < ?"
+            end_parameters = (str(until),)
+        query += " ORDER BY sent_at, id LIMIT ?"
+        last_sent_at = "" if since is None else str(since)
+        last_id = 0
+        while True:
+            # Continue after the last row, so that no offset is scanned.
+            with self._lock:
+                rows = self._connection.execute(
+                    query,
+                    (last_sent_at, last_sent_at, last_id)
+                    + end_parameters
+                    + (ITER_BATCH_SIZE,),
+                ).fetchall()
+            if not rows:
+                return
+            for last_id, last_sent_at, message in rows:
+                timestamp = histstore.parse_timestamp(last_sent_at)
+                if timestamp is not None:
+                    yield histstore.HistoryEntry(timestamp, message)
+
+    def _insert_entries(self, entries: List[histstore.HistoryEntry]) -> None:
+        with self._lock:
+            with self._connection:
+                self._connection.executemany(
+                    "INSERT INTO tweets (sent_at, digest, message)"
+                    + " VALUES (?, ?, ?)",
+                    [
+                        (
+                            str(entry.sent_at),
+                            histstore.make_digest(entry.message),
+                            entry.message,
+                        )
+                        for entry in entries
+                    ],
+                )
+        if self.text_export:
+            histtext.append_lines(
+                self.text_export,
+                [histstore.format_entry_line(entry) for entry in entries],
+            )
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,518 @@
+# -*- coding: utf-8 -*-
+
+"""Defines the abstraction of a history store and its entry format."""
+
+import abc
+import contextlib
+import datetime
+import hashlib
+import types
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional, Type
+
+# Separates the timestamp from the message in a line of the text log.
+SENT_SEPARATOR = " - Sent : "
+
+# Not available before Python 3.7.
+_from_isoformat = getattr(datetime.datetime, "fromisoformat", None)
+
+
+class HistoryEntry(NamedTuple):
+    """Sent tweet as recorded in the history."""
+
+    sent_at: datetime.datetime
+    message: str
+
+
+class NearDuplicateMatch(NamedTuple):
+    """Fingerprint of a message in the history similar to another message."""
+
+    fingerprint: int
+    similarity: float
+
+
+class AbstractHistoryStore(abc.ABC):
+    """
+    Abstract storage of the messages of sent tweets.
+
+    Messages are single line representations of tweets (see
+    ``logtweet.history.create_tweet_history_msg``). Stores are context
+    managers that close themselves on exit.
+
+    """
+
+    @abc.abstractmethod
+    def contains(self, message: str) -> bool:
+        """
+        Check if a message is in the history.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        """
+
+    @abc.abstractmethod
+    def add(
+        self,
+        message: str,
+        sent_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """
+        Add a message to the history.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+        sent_at : Optional[datetime.datetime]
+            Time the tweet was sent. Default is ``None``, in which case the
+            current time is used.
+
+        """
+
+    def add_entries(self, entries: List[HistoryEntry]) -> None:
+        """
+        Add entries to the history in bulk.
+
+        By default, the entries are added one by one. Backends override this
+        to add them in one commit.
+
+        Parameters
+        ----------
+        entries : List[HistoryEntry]
+            Entries to add, in order.
+
+        """
+        for entry in entries:
+            self.add(entry.message, sent_at=entry.sent_at)
+
+    @abc.abstractmethod
+    def iter_entries(self) -> Iterator[HistoryEntry]:
+        """Iterate over the entries in the order they were added."""
+
+    def iter_entries_between(
+        self,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+    ) -> Iterator[HistoryEntry]:
+        """
+        Iterate over the entries sent in a time range.
+
+        By default, all entries are scanned. Backends override this with a
+        lookup of the start of the range.
+
+        Parameters
+        ----------
+        since : Optional[datetime.datetime]
+            Start of the range, inclusive. Default is ``None``, in which case
+            the range starts with the first entry.
+        until : Optional[datetime.datetime]
+            End of the range, exclusive. Default is ``None``, in which case
+            the range ends with the last entry.
+
+        Returns
+        -------
+        Iterator[HistoryEntry]
+            Entries in the range, in the order they were added.
+
+        """
+        return (
+            entry
+            for entry in self.iter_entries()
+            if is_in_time_range(entry, since, until)
+        )
+
+    @contextlib.contextmanager
+    def locked(self, message: str) -> Iterator[None]:
+        """
+        Hold a lock of a message against other workers using the history.
+
+        Checking for a message, sending the tweet and adding the message
+        need to hold the lock, so that concurrent workers do not send the
+        same tweet. By default, nothing is locked.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Yields
+        ------
+        None
+            While the lock is held.
+
+        """
+        yield
+
+    def find_similar(self, message: str) -> List[NearDuplicateMatch]:
+        """
+        Find messages in the history similar to a message.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Returns
+        -------
+        List[NearDuplicateMatch]
+            Similar messages, most similar first. By default, near-duplicates
+            are not detected and the list is empty.
+
+        """
+        return []
+
+    def close(self) -> None:
+        """Release the resources held by the store."""
+
+    def __enter__(self) -> "AbstractHistoryStore":
+        """
+        Enter the context of the store.
+
+        Returns
+        -------
+        AbstractHistoryStore
+            The store itself.
+
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[types.TracebackType],
+    ) -> None:
+        """
+        Close the store when leaving its context.
+
+        Parameters
+        ----------
+        exc_type : Optional[Type[BaseException]]
+            Type of the exception raised in the context, if any.
+        exc_value : Optional[BaseException]
+            Exception raised in the context, if any.
+        traceback : Optional[types.TracebackType]
+            Traceback of the exception raised in the context, if any.
+
+        """
+        self.close()
+
+
+class WrappedHistoryStore(AbstractHistoryStore):
+    """
+    History store adding a sidecar to another history store.
+
+    All methods are delegated to the wrapped store. Messages added through
+    the wrapper are passed to ``track``, which subclasses override to keep
+    their sidecar (e.g. a filter or an index) up to date.
+
+    """
+
+    def __init__(self, store: AbstractHistoryStore) -> None:
+        """
+        Initialize ``WrappedHistoryStore``.
+
+        Parameters
+        ----------
+        store : AbstractHistoryStore
+            History store to wrap.
+
+        """
+        self.store = store
+
+    def contains(self, message: str) -> bool:
+        """
+        Check if a message is in the wrapped store.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Returns
+        -------
+        bool
+            Expresses if the message is in the history.
+
+        """
+        return self.store.contains(message)
+
+    def add(
+        self,
+        message: str,
+        sent_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """
+        Add a message to the wrapped store and track it.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+        sent_at : Optional[datetime.datetime]
+            Time the tweet was sent. Default is ``None``, in which case the
+            current time is used.
+
+        """
+        self.store.add(message, sent_at=sent_at)
+        self.track(message)
+
+    def add_entries(self, entries: List[HistoryEntry]) -> None:
+        """
+        Add entries to the wrapped store in bulk and track their messages.
+
+        Parameters
+        ----------
+        entries : List[HistoryEntry]
+            Entries to add, in order.
+
+        """
+        self.store.add_entries(entries)
+        for entry in entries:
+            self.track(entry.message)
+
+    def track(self, message: str) -> None:
+        """
+        Record a message that was added to the wrapped store.
+
+        By default, nothing is recorded.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        """
+
+    @contextlib.contextmanager
+    def locked(self, message: str) -> Iterator[None]:
+        """
+        Hold the lock of a message of the wrapped store.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Yields
+        ------
+        None
+            While the lock is held.
+
+        """
+        with self.store.locked(message):
+            yield
+
+    def find_similar(self, message: str) -> List[NearDuplicateMatch]:
+        """
+        Find messages in the wrapped store similar to a message.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Returns
+        -------
+        List[NearDuplicateMatch]
+            Similar messages, most similar first.
+
+        """
+        return self.store.find_similar(message)
+
+    def iter_entries(self) -> Iterator[HistoryEntry]:
+        """
+        Iterate over the entries of the wrapped store.
+
+        Returns
+        -------
+        Iterator[HistoryEntry]
+            Entries in the order they were added.
+
+        """
+        return self.store.iter_entries()
+
+    def iter_entries_between(
+        self,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+    ) -> Iterator[HistoryEntry]:
+        """
+        Iterate over the entries of the wrapped store sent in a time range.
+
+        Parameters
+        ----------
+        since : Optional[datetime.datetime]
+            Start of the range, inclusive. Default is ``None``.
+        until : Optional[datetime.datetime]
+            End of the range, exclusive. Default is ``None``.
+
+        Returns
+        -------
+        Iterator[HistoryEntry]
+            Entries in the range.
+
+        """
+        return self.store.iter_entries_between(since, until)
+
+    def close(self) -> None:
+        """Close the wrapped store."""
+        self.store.close()
+
+
+def make_digest(message: str) -> bytes:
+    """
+    Create the digest identifying a history message.
+
+    Parameters
+    ----------
+    message : str
+        History message of a tweet.
+
+    Returns
+    -------
+    bytes
+        16 byte BLAKE2b digest of the UTF-8 encoded message.
+
+    """
+    return hashlib.blake2b(message.encode("utf-8"), digest_size=16).digest()
+
+
+def is_in_time_range(
+    entry: HistoryEntry,
+    since: Optional[datetime.datetime] = None,
+    until: Optional[datetime.datetime] = None,
+) -> bool:
+    """
+    Check if an entry was sent in a time range.
+
+    Parameters
+    ----------
+    entry : HistoryEntry
+        Entry to check.
+    since : Optional[datetime.datetime]
+        Start of the range, inclusive. Default is ``None``, in which case the
+        range is open at the start.
+    until : Optional[datetime.datetime]
+        End of the range, exclusive. Default is ``None``, in which case the
+        range is open at the end.
+
+    Returns
+    -------
+    bool
+        Expresses if the entry was sent in the range.
+
+    """
+    if since is not None and entry.sent_at < since:
+        return False
+    return until is None or entry.sent_at < until
+
+
+def format_entry_line(entry: HistoryEntry) -> str:
+    """
+    Format an entry as a line of the text log.
+
+    Parameters
+    ----------
+    entry : HistoryEntry
+        Entry to format.
+
+    Returns
+    -------
+    str
+        Line of the form ``<timestamp> - Sent : <message>`` with a trailing
+        line break.
+
+    """
+    return "{0}{1}{2}\n".format(entry.sent_at, SENT_SEPARATOR, entry.message)
+
+
+def parse_entry_line(line: str) -> Optional[HistoryEntry]:
+    """
+    Parse a line of the text log.
+
+    Parameters
+    ----------
+    line : str
+        Line of the text log, with or without the trailing line break.
+
+    Returns
+    -------
+    Optional[HistoryEntry]
+        Entry of the line. ``None`` if the line does not have the form
+        written by ``format_entry_line``.
+
+    """
+    timestamp, separator, message = line.rstrip("\r\n").partition(
+        SENT_SEPARATOR,
+    )
+    if not separator:
+        return None
+    sent_at = parse_timestamp(timestamp)
+    if sent_at is None:
+        return None
+    return HistoryEntry(sent_at, message)
+
+
+def parse_timestamp(timestamp: str) -> Optional[datetime.datetime]:
+    """
+    Parse a timestamp as written by ``str(datetime.datetime)``.
+
+    Parameters
+    ----------
+    timestamp : str
+        Timestamp like ``2020-01-31 12:30:00.123456``. The microseconds are
+        optional.
+
+    Returns
+    -------
+    Optional[datetime.datetime]
+        Parsed timestamp. ``None`` if the string is not a timestamp.
+
+    """
+    if _is_canonical_timestamp(timestamp):
+        # Much faster than strptime, which matters for long histories.
+        try:
+            return _from_isoformat(timestamp)  # type: ignore
+        except ValueError:
+            pass  # noqa: WPS420
+    for timestamp_format in ("%Y-%m-%d %H:%M:%S.%f", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.datetime.strptime(timestamp, timestamp_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _is_canonical_timestamp(timestamp: str) -> bool:
+    if _from_isoformat is None or timestamp[10:11] != " ":
+        return False
+    if len(timestamp) == 19:
+        return True
+    return len(timestamp) == 26 and timestamp[19] == "."
+
+
+def write_text_log(entries: Iterable[HistoryEntry], text_file: IO[str]) -> int:
+    """
+    Write entries in the format of the text log.
+
+    Parameters
+    ----------
+    entries : Iterable[HistoryEntry]
+        Entries to write.
+    text_file : IO[str]
+        Text file to write the lines to.
+
+    Returns
+    -------
+    int
+        Number of written entries.
+
+    """
+    count = 0
+    for entry in entries:
+        text_file.write(format_entry_line(entry))
+        count += 1
+    return count
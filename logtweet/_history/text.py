@@ -0,0 +1,338 @@
+# -*- coding: utf-8 -*-
+
+"""Defines the history store kept in a plain text log."""
+
+import contextlib
+import datetime
+import mmap
+import os
+from typing import BinaryIO, Iterator, List, Optional
+
+from logtweet._history import groupcommit  # noqa: WPS436
+from logtweet._history import locking  # noqa: WPS436
+from logtweet._history import store as histstore  # noqa: WPS436
+
+
+class TextHistoryStore(histstore.AbstractHistoryStore):
+    """
+    History kept as a plain text log with one line per sent tweet.
+
+    Lines have the form ``<timestamp> - Sent : <message>``. A message is in
+    the history if it is part of any line. The lookup searches the whole log,
+    memory-mapped (see ``is_string_in_file``).
+
+    Lines added by concurrent threads are appended in group commits, with
+    one ``fsync`` per batch. Appends hold an exclusive lock of the file, so
+    lines of concurrent processes do not interleave.
+
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize ``TextHistoryStore``.
+
+        Parameters
+        ----------
+        path : str
+            Path of the text log. The file is created on the first addition.
+
+        """
+        self.path = path
+        self._committer: groupcommit.GroupCommitter[str] = (
+            groupcommit.GroupCommitter(self._append_lines)
+        )
+
+    def contains(self, message: str) -> bool:
+        """
+        Check if a message is part of any line of the log.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Returns
+        -------
+        bool
+            Expresses if the message is in the history. ``False`` if the log
+            does not exist yet.
+
+        """
+        try:
+            return is_string_in_file(message, self.path)
+        except FileNotFoundError:
+            return False
+
+    def add(
+        self,
+        message: str,
+        sent_at: Optional[datetime.datetime] = None,
+    ) -> None:
+        """
+        Append a line for the message to the log.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+        sent_at : Optional[datetime.datetime]
+            Time the tweet was sent. Default is ``None``, in which case the
+            current time is used.
+
+        """
+        entry = histstore.HistoryEntry(
+            sent_at or datetime.datetime.now(),
+            message,
+        )
+        self._committer.submit(histstore.format_entry_line(entry))
+
+    def add_entries(self, entries: List[histstore.HistoryEntry]) -> None:
+        """
+        Append the lines of entries to the log with one write.
+
+        Parameters
+        ----------
+        entries : List[histstore.HistoryEntry]
+            Entries to add, in order.
+
+        """
+        append_lines(
+            self.path,
+            [histstore.format_entry_line(entry) for entry in entries],
+        )
+
+    @contextlib.contextmanager
+    def locked(self, message: str) -> Iterator[None]:
+        """
+        Hold a lock of a message against other workers using the history.
+
+        The lock is a record lock in the lock file next to the log (with the
+        suffix ``.lock``). Messages share one of the stripes of the file, so
+        workers with different messages rarely wait for each other.
+
+        Parameters
+        ----------
+        message : str
+            History message of a tweet.
+
+        Yields
+        ------
+        None
+            While the lock is held.
+
+        """
+        striped_lock = locking.get_striped_lock(self.path + locking.LOCK_SUFFIX)
+        with striped_lock.lock(histstore.make_digest(message)):
+            yield
+
+    def iter_entries(self) -> Iterator[histstore.HistoryEntry]:
+        """
+        Iterate over the entries of the log.
+
+        Lines that do not have the form of an entry are skipped.
+
+        Yields
+        ------
+        histstore.HistoryEntry
+            Entries in the order of the lines.
+
+        """
+        try:
+            history_file = open(self.path, "r")  # noqa: WPS515
+        except FileNotFoundError:
+            return
+        with history_file:
+            for line in history_file:
+                entry = histstore.parse_entry_line(line)
+                if entry is not None:
+                    yield entry
+
+    def iter_entries_between(
+        self,
+        since: Optional[datetime.datetime] = None,
+        until: Optional[datetime.datetime] = None,
+    ) -> Iterator[histstore.HistoryEntry]:
+        """
+        Iterate over the entries sent in a time range.
+
+        Lines are appended when tweets are sent, so the log is in order of
+        time. The start of the range is found with a binary search (see
+        ``find_time_offset``) and reading stops at its end, so only the
+        lines in the range are read.
+
+        Parameters
+        ----------
+        since : Optional[datetime.datetime]
+            Start of the range, inclusive. Default is ``None``, in which case
+            the range starts with the first entry.
+        until : Optional[datetime.datetime]
+            End of the range, exclusive. Default is ``None``, in which case
+            the range ends with the last entry.
+
+        Yields
+        ------
+        histstore.HistoryEntry
+            Entries in the range, in the order of the lines.
+
+        """
+        try:
+            history_file = open(self.path, "rb")  # noqa: WPS515
+        except FileNotFoundError:
+            return
+        with history_file:
+            if since is not None:
+                history_file.seek(find_time_offset(history_file, since))
+            for raw_line in history_file:
+                entry = histstore.parse_entry_line(
+                    raw_line.decode("utf-8", "replace"),
+                )
+                if entry is None:
+                    continue
+                if until is not None and entry.sent_at >= until:
+                    return
+                if histstore.is_in_time_range(entry, since):
+                    yield entry
+
+    def _append_lines(self, lines: List[str]) -> None:
+        append_lines(self.path, lines)
+
+
+def append_lines(path: str, lines: List[str]) -> None:
+    """
+    Durably append lines to a text file, excluding concurrent appends.
+
+    The lines are written with one write under an exclusive lock of the file
+    and forced to disk with one ``fsync``.
+
+    Parameters
+    ----------
+    path : str
+        Path of the file. It is created if it does not exist.
+    lines : List[str]
+        Lines with their trailing line breaks.
+
+    """
+    with open(path, "ab") as append_file:
+        with locking.locked_file(append_file):
+            append_file.write("".join(lines).encode("utf-8"))
+            append_file.flush()
+            os.fsync(append_file.fileno())
+
+
+def is_string_in_file(
+    search_string: str,
+    path: str,
+    encoding: str = "utf-8",
+) -> bool:
+    """
+    Check if a string is part of any line of a file.
+
+    The file is memory-mapped and searched with a single bytes-level
+    ``find``, so no lines are created and the file is not read into the
+    Python heap. This keeps the lookup fast and the memory use flat, even
+    for history files of several gigabytes.
+
+    Parameters
+    ----------
+    search_string : str
+        String to look for. Strings spanning multiple lines are never found,
+        like in a line by line search.
+    path : str
+        Path of the file to search.
+    encoding : str
+        Encoding of the file. Default is ``"utf-8"``.
+
+    Returns
+    -------
+    bool
+        Expresses if the string was found in a line of the file.
+
+    # noqa: DAR401
+
+    Raises
+    ------
+    OSError
+        If the file can not be opened, e.g. ``FileNotFoundError``.
+
+    """
+    # A line can only contain a line break at its end.
+    if search_string.find("\n") not in {-1, len(search_string) - 1}:
+        return False
+    with open(path, "rb") as search_file:
+        if os.fstat(search_file.fileno()).st_size == 0:
+            # Empty files can not be mapped and have no lines.
+            return False
+        with mmap.mmap(
+            search_file.fileno(),
+            0,
+            access=mmap.ACCESS_READ,
+        ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            return mapped.find(search_string.encode(encoding)) != -1
+
+
+def find_time_offset(log_file: BinaryIO, since: datetime.datetime) -> int:
+    """
+    Find the first line of a log sent at or after a time.
+
+    The log is memory-mapped and bisected by byte offset. At every step, the
+    timestamp of the first entry line after the offset is compared, so a
+    lookup reads a few lines, however large the log is. Lines that are not
+    entries are skipped.
+
+    Parameters
+    ----------
+    log_file : BinaryIO
+        Log opened in binary mode, with its entries in order of time.
+    since : datetime.datetime
+        Time to look up.
+
+    Returns
+    -------
+    int
+        Offset of the first line sent at or after the time. The size of the
+        log if all lines were sent before.
+
+    """
+    size = os.fstat(log_file.fileno()).st_size
+    if size == 0:
+        # Empty files can not be mapped.
+        return 0
+    with mmap.mmap(log_file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        low, high = 0, size
+        while low < high:
+            middle = (low + high) // 2
+            sent_at = _get_next_entry_time(mapped, middle)
+            if sent_at is not None and sent_at < since:
+                low = middle + 1
+            else:
+                high = middle
+        return _get_next_line_start(mapped, low)
+
+
+def _get_next_line_start(mapped: mmap.mmap, position: int) -> int:
+    if position == 0:
+        return 0
+    line_break = mapped.find(b"\n", position - 1)
+    if line_break == -1:
+        return len(mapped)
+    return line_break + 1
+
+
+def _get_next_entry_time(
+    mapped: mmap.mmap,
+    position: int,
+) -> Optional[datetime.datetime]:
+    line_start = _get_next_line_start(mapped, position)
+    while line_start < len(mapped):
+        line_end = mapped.find(b"\n", line_start)
+        if line_end == -1:
+            line_end = len(mapped)
+        entry = histstore.parse_entry_line(
+            mapped[line_start:line_end].decode("utf-8", "replace"),
+        )
+        if entry is not None:
+            return entry.sent_at
+        line_start = line_end + 1
+    return None
@@ -3,11 +3,25 @@
 """Module for main app functionality of logtweet."""
 
 import argparse
-from datetime import date, timedelta
+from configparser import ConfigParser
+from datetime import date, datetime, timedelta
+import sys
+from typing import List, Optional
 
 from logtweet import conf, history, send, content
+from logtweet import transport as httptransport
+from logtweet.shortener import server as shortserver
+from logtweet.shortener import store as shortstore
+from logtweet.source.adapters import limits as adaptlimits
 from logtweet.source.controllers import retrieve as ctrlretrieve
 
+TIME_ARGUMENT_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S.%f",
+)
+
 
 def main() -> None:
     """
@@ -23,36 +37,149 @@ def main() -> None:
     parser = create_arg_parser()
     args = parser.parse_args()
 
+    if args.command == "shortener":
+        run_shortener_command(args)
+        return
+    if args.command == "history":
+        run_history_command(args)
+        return
+
     day_date = date.today() + timedelta(days=args.offset)
 
     config = conf.get_config()
-    source_string = config["LogTweet"]["source"]
+    source_strings = ctrlretrieve.parse_source_strings(
+        config["LogTweet"]["source"],
+    )
+    day_source = get_day_source(source_strings)
+    history_settings = get_history_settings(config)
+    # Reject days that were tweeted before any connection is opened.
+    if not args.testmode and history.is_day_in_history(
+        day_source,
+        day_date,
+        history_settings,
+    ):
+        raise RuntimeError(
+            "A tweet for {0} of this log was already sent!".format(day_date),
+        )
     bitly_api_key = config.get(
         section="Bitly",
         option="api_key",
         fallback=None,
     )
+    shortener_url = config.get(
+        section="Shortener",
+        option="url",
+        fallback=None,
+    )
+
+    transport = httptransport.Transport(
+        httptransport.TransportSettings.from_config(
+            config["Transport"] if config.has_section("Transport") else None,
+        ),
+    )
+    # Connect to the hosts used after the log was retrieved in parallel while
+    # the log is retrieved. Later requests reuse the open connections.
+    prewarm_urls = [content.get_shortener_url(bitly_api_key, shortener_url)]
+    if not args.testmode:
+        prewarm_urls.append(send.TWITTER_API_URL)
+    transport.prewarm(prewarm_urls)
+
+    cache_dir = config.get(
+        section="LogTweet",
+        option="cache_dir",
+        fallback=None,
+    )
+
+    streaming = config.getboolean(
+        section="LogTweet",
+        option="streaming",
+        fallback=False,
+    )
+    incremental = config.getboolean(
+        section="LogTweet",
+        option="incremental",
+        fallback=False,
+    )
 
-    log_content = ctrlretrieve.get_log_content_from_source(source_string)
+    limits = adaptlimits.RetrievalLimits.from_config(config["LogTweet"])
+
+    mirror_concurrency = config.getint(
+        section="LogTweet",
+        option="mirror_concurrency",
+        fallback=ctrlretrieve.MIRROR_CONCURRENCY,
+    )
+
+    if len(source_strings) > 1:
+        log_content = ctrlretrieve.get_log_content_from_mirrors(
+            source_strings,
+            cache_dir,
+            transport,
+            day_date if streaming else None,
+            incremental,
+            limits=limits,
+            max_concurrency=mirror_concurrency,
+        )
+    else:
+        log_content = ctrlretrieve.get_log_content_from_source(
+            source_strings[0],
+            cache_dir,
+            transport,
+            day_date if streaming else None,
+            incremental,
+            limits=limits,
+        )
 
     tweet_content = content.get_tweet_content(
         log_content,
         day_date,
         bitly_api_key,
+        shortener_url,
+        transport,
     )
 
     if args.testmode:
         print(tweet_content)
     else:
-        # Check history before sending tweet to prevent duplication.
-        tweeted_before = history.is_tweet_in_history(tweet_content)
-        if tweeted_before:
-            raise RuntimeError("Tweet with this content already exists!")
-        # Send the tweet
-        send.send_tweet(tweet_content, dict(config["Twitter"]))
-        # Create history record of sent tweet for future lookup.
-        history.add_tweet_to_history(tweet_content)
-        # TODO: Add success message to user.
+        with history.create_history_store(history_settings) as history_store:
+            # Keep concurrent workers from sending the same tweet between the
+            # check and the history record.
+            with history_store.locked(
+                history.create_tweet_history_msg(tweet_content),
+            ):
+                # Check history before sending tweet to prevent duplication.
+                tweeted_before = history.is_tweet_in_history(
+                    tweet_content,
+                    store=history_store,
+                )
+                if tweeted_before:
+                    raise RuntimeError(
+                        "Tweet with this content already exists!",
+                    )
+                similar_tweets = history.find_similar_tweets(
+                    tweet_content,
+                    store=history_store,
+                )
+                if similar_tweets:
+                    raise RuntimeError(
+                        "A tweet {0:.0%} similar to this one exists!".format(
+                            similar_tweets[0].similarity,
+                        ),
+                    )
+                # Send the tweet
+                send.send_tweet(
+                    tweet_content,
+                    dict(config["Twitter"]),
+                    transport,
+                )
+                # Create history record of sent tweet for future lookup.
+                history.add_tweet_to_history(tweet_content, store=history_store)
+                history.add_day_to_history(
+                    day_source,
+                    day_date,
+                    content.get_day_number(tweet_content),
+                    history_settings,
+                )
+            # TODO: Add success message to user.
 
 
 def create_arg_parser() -> argparse.ArgumentParser:
@@ -84,4 +211,357 @@ def create_arg_parser() -> argparse.ArgumentParser:
             + " created."
         ),
     )
+
+    subparsers = parser.add_subparsers(dest="command")
+    shortener_parser = subparsers.add_parser(
+        "shortener",
+        help="Self-hosted link shortener service.",
+    )
+    shortener_subparsers = shortener_parser.add_subparsers(
+        dest="shortener_command",
+    )
+    shortener_subparsers.required = True
+    serve_parser = shortener_subparsers.add_parser(
+        "serve",
+        help="Run the link shortener service.",
+    )
+    serve_parser.add_argument(
+        "--host",
+        default=shortserver.DEFAULT_HOST,
+        help="Host to listen on. Default is %(default)s.",
+    )
+    serve_parser.add_argument(
+        "--port",
+        type=int,
+        default=shortserver.DEFAULT_PORT,
+        help="Port to listen on. Default is %(default)s.",
+    )
+    serve_parser.add_argument(
+        "--store",
+        default=shortstore.STORE_DIR,
+        help="Directory of the short link store. Default is %(default)s.",
+    )
+    serve_parser.add_argument(
+        "--base-url",
+        default=None,
+        help=(
+            "Base URL of the created short links, e.g. https://s.lpld.io."
+            + " Derived from the request's Host header if not given."
+        ),
+    )
+    serve_parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Log every request.",
+    )
+
+    history_parser = subparsers.add_parser(
+        "history",
+        help="Maintain the history of sent tweets.",
+    )
+    history_subparsers = history_parser.add_subparsers(
+        dest="history_command",
+    )
+    history_subparsers.required = True
+    history_subparsers.add_parser(
+        "rebuild-filter",
+        help=(
+            "Rebuild the Bloom filter of the history, e.g. when it is full or"
+            + " the history was changed without it."
+        ),
+    )
+    compact_parser = history_subparsers.add_parser(
+        "compact",
+        help="Merge the sealed segments of a segmented history.",
+    )
+    compact_parser.add_argument(
+        "--retention-days",
+        type=float,
+        default=None,
+        help=(
+            "Drop entries older than this many days. Default is the"
+            + " retention_days option of the History section, if set."
+        ),
+    )
+    migrate_parser = history_subparsers.add_parser(
+        "migrate",
+        help=(
+            "Copy the tweets of a text log into the configured history, e.g."
+            + " after switching to the sqlite backend."
+        ),
+    )
+    migrate_parser.add_argument(
+        "--source",
+        default=history.LOG_FILE,
+        help="Text log to migrate. Default is %(default)s.",
+    )
+    migrate_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=history.MIGRATION_BATCH_SIZE,
+        help="Tweets added per transaction. Default is %(default)s.",
+    )
+    list_parser = history_subparsers.add_parser(
+        "list",
+        help="List the sent tweets, optionally of a time range.",
+    )
+    add_time_range_arguments(list_parser)
+    count_parser = history_subparsers.add_parser(
+        "count",
+        help="Count the sent tweets, optionally of a time range.",
+    )
+    add_time_range_arguments(count_parser)
+    export_parser = history_subparsers.add_parser(
+        "export",
+        help="Export the sent tweets, optionally of a time range.",
+    )
+    add_time_range_arguments(export_parser)
+    export_parser.add_argument(
+        "--format",
+        choices=history.EXPORT_FORMATS,
+        default=history.TEXT_FORMAT,
+        help=(
+            "Lines of the text log or JSON lines. Default is %(default)s."
+        ),
+    )
+    export_parser.add_argument(
+        "--output",
+        default="-",
+        help="File to write to. Default is stdout.",
+    )
     return parser
+
+
+def add_time_range_arguments(parser: argparse.ArgumentParser) -> None:
+    """
+    Add the arguments selecting a time range of the history.
+
+    Parameters
+    ----------
+    parser : argparse.ArgumentParser
+        Parser of a ``history`` subcommand.
+
+    """
+    start_group = parser.add_mutually_exclusive_group()
+    start_group.add_argument(
+        "--since",
+        type=parse_time_argument,
+        default=None,
+        help="Only tweets sent at or after this time (YYYY-MM-DD [HH:MM]).",
+    )
+    start_group.add_argument(
+        "--days",
+        type=float,
+        default=None,
+        help="Only tweets sent in the last DAYS days.",
+    )
+    parser.add_argument(
+        "--until",
+        type=parse_time_argument,
+        default=None,
+        help="Only tweets sent before this time (YYYY-MM-DD [HH:MM]).",
+    )
+
+
+def parse_time_argument(time_string: str) -> datetime:
+    """
+    Parse a time given on the command line.
+
+    Parameters
+    ----------
+    time_string : str
+        Date (``YYYY-MM-DD``) or date and time (``YYYY-MM-DD HH:MM``, with
+        optional seconds and microseconds). The date and the time can also be
+        separated by ``T``.
+
+    Returns
+    -------
+    datetime
+        Parsed time. A date is parsed as its start.
+
+    Raises
+    ------
+    ArgumentTypeError
+        If the string is not a date or a time.
+
+    """
+    normalized = time_string.strip().replace("T", " ")
+    for time_format in TIME_ARGUMENT_FORMATS:
+        try:
+            return datetime.strptime(normalized, time_format)
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(
+        "'{0}' is not a date or time.".format(time_string),
+    )
+
+
+def run_shortener_command(args: argparse.Namespace) -> None:
+    """
+    Run the ``shortener`` subcommand.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed command line arguments.
+
+    """
+    shortserver.serve(
+        host=args.host,
+        port=args.port,
+        store_dir=args.store,
+        base_url=args.base_url,
+        verbose=args.verbose,
+    )
+
+
+def run_history_command(args: argparse.Namespace) -> None:
+    """
+    Run the ``history`` subcommand.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed command line arguments.
+
+    """
+    history_settings = get_history_settings(conf.get_config())
+    if args.history_command == "rebuild-filter":
+        entry_count = history.rebuild_bloom_filter(history_settings)
+        print("Rebuilt the Bloom filter with {0} entries.".format(entry_count))
+    elif args.history_command == "migrate":
+        migration = history.migrate_history(
+            history_settings,
+            args.source,
+            args.batch_size,
+            report=print_migration_progress,
+        )
+        print(
+            "Migrated {0} tweets, skipped {1} lines.".format(
+                migration.checkpoint.entries,
+                migration.checkpoint.skipped_lines,
+            ),
+        )
+    elif args.history_command in {"list", "count", "export"}:
+        run_history_query(args, history_settings)
+    elif args.history_command == "compact":
+        compaction = history.compact_history(
+            history_settings,
+            args.retention_days,
+        )
+        print(
+            "Merged {0} segments, kept {1} and dropped {2} entries.".format(
+                compaction.merged_segments,
+                compaction.kept_entries,
+                compaction.dropped_entries,
+            ),
+        )
+
+
+def print_migration_progress(
+    progress: history.MigrationProgress,
+) -> None:
+    """
+    Print the progress of a history migration.
+
+    Parameters
+    ----------
+    progress : history.MigrationProgress
+        Progress of the migration.
+
+    """
+    print(
+        "{0:.0%} migrated, {1} tweets ({2:.0f} tweets/s, {3:.1f} MiB/s)".format(
+            progress.done_ratio,
+            progress.checkpoint.entries,
+            progress.entries_per_second,
+            progress.bytes_per_second / (1024 * 1024),
+        ),
+    )
+
+
+def run_history_query(
+    args: argparse.Namespace,
+    history_settings: history.HistorySettings,
+) -> None:
+    """
+    Run the ``history list``, ``count`` or ``export`` subcommand.
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+        Parsed command line arguments.
+    history_settings : history.HistorySettings
+        Settings of the history to query.
+
+    """
+    since: Optional[datetime] = args.since
+    if args.days is not None:
+        since = datetime.now() - timedelta(days=args.days)
+    if args.history_command == "count":
+        print(history.count_history_entries(history_settings, since, args.until))
+    elif args.history_command == "list":
+        for entry in history.iter_history_entries(
+            history_settings,
+            since,
+            args.until,
+        ):
+            print("{0:%Y-%m-%d %H:%M}  {1}".format(entry.sent_at, entry.message))
+    elif args.output == "-":
+        history.export_history(
+            history_settings,
+            sys.stdout,
+            since,
+            args.until,
+            args.format,
+        )
+    else:
+        with open(args.output, "w", encoding="utf-8") as export_file:
+            history.export_history(
+                history_settings,
+                export_file,
+                since,
+                args.until,
+                args.format,
+            )
+
+
+def get_day_source(source_strings: List[str]) -> str:
+    """
+    Return the source of the log days in the history.
+
+    Mirrors of the log share the key of their days, whatever their order.
+
+    Parameters
+    ----------
+    source_strings : List[str]
+        Source strings of the log and its mirrors.
+
+    Returns
+    -------
+    str
+        Sorted source strings, separated by commas.
+
+    """
+    return ",".join(sorted(source_strings))
+
+
+def get_history_settings(config: ConfigParser) -> history.HistorySettings:
+    """
+    Read the history settings from the config.
+
+    Parameters
+    ----------
+    config : ConfigParser
+        App config. The optional ``History`` section defines the settings.
+
+    Returns
+    -------
+    history.HistorySettings
+        Settings of the history.
+
+    """
+    return history.HistorySettings.from_config(
+        config["History"] if config.has_section("History") else None,
+    )
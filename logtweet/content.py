@@ -7,6 +7,7 @@ from typing import Optional
 
 import bs4  # type: ignore
 
+from logtweet import transport as httptransport
 from logtweet._content import extract, build, shortlink  # noqa: WPS436
 
 
@@ -14,6 +15,8 @@ def get_tweet_content(
     log_string: str,
     day_date: datetime.date,
     bitly_api_key: Optional[str] = None,
+    shortener_url: Optional[str] = None,
+    transport: Optional[httptransport.Transport] = None,
 ) -> str:
     """
     Get tweet content from a log string for a given date.
@@ -36,6 +39,14 @@ def get_tweet_content(
         The user if an API key for the Bit.ly service is provided, that
         service is used. This argument defaults to ``None``, in which case
         `Shorten That URL_ is used.
+    shortener_url : Optional[str]
+        Create endpoint of a shortener speaking the `Shorten That URL`_
+        protocol, e.g. a self-hosted ``logtweet shortener serve``. Only used
+        if no ``bitly_api_key`` is given. Defaults to ``None``, in which case
+        `Shorten That URL`_ itself is used.
+    transport : Optional[httptransport.Transport]
+        Transport to send the shortener request through. Defaults to
+        ``None``, in which case the process wide default transport is used.
 
     Returns
     -------
@@ -54,7 +65,12 @@ def get_tweet_content(
     except LookupError:
         link = ""
     else:
-        link = shortlink.get_short_link(link, bitly_api_key)
+        link = shortlink.get_short_link(
+            link,
+            bitly_api_key,
+            shortener_url or shortlink.DEFAULT_SHORTENER_URL,
+            transport,
+        )
 
     # Generate tweet preamble (E.g. 77/#100DaysOfCode)
     preamble = build.make_preamble(day_number)
@@ -77,6 +93,50 @@ def get_tweet_content(
     )
 
 
+def get_day_number(tweet_content: str) -> int:
+    """
+    Get the number of the day a tweet was generated for.
+
+    Parameters
+    ----------
+    tweet_content : str
+        Tweet content as returned by ``get_tweet_content``.
+
+    Returns
+    -------
+    int
+        Number of the day in the preamble of the tweet.
+
+    """
+    return build.get_day_number_from_tweet_content(tweet_content)
+
+
+def get_shortener_url(
+    bitly_api_key: Optional[str] = None,
+    shortener_url: Optional[str] = None,
+) -> str:
+    """
+    Return the URL that link shortening requests are sent to.
+
+    Parameters
+    ----------
+    bitly_api_key : Optional[str]
+        API key for the Bit.ly service. See ``get_tweet_content``.
+    shortener_url : Optional[str]
+        Create endpoint of a shortener. See ``get_tweet_content``.
+
+    Returns
+    -------
+    str
+        Bit.ly endpoint if an API key is given, otherwise the given or the
+        default shortener endpoint.
+
+    """
+    if bitly_api_key:
+        return shortlink.BITLY_SHORTEN_URL
+    return shortener_url or shortlink.DEFAULT_SHORTENER_URL
+
+
 def calc_max_tweet_msg_len(
     preamble: str,
     link: str,
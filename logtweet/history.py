@@ -2,15 +2,543 @@
 
 """Functions related to keeping a history of sent tweets."""
 
+from configparser import SectionProxy
 import datetime
+import json
 import os
+from typing import IO, Callable, Iterator, List, NamedTuple, Optional
+
+from logtweet._history import bloom as histbloom  # noqa: WPS436
+from logtweet._history import daykeys as histdaykeys  # noqa: WPS436
+from logtweet._history import migrate as histmigrate  # noqa: WPS436
+from logtweet._history import nearduplicate as histnear  # noqa: WPS436
+from logtweet._history import segmented as histsegmented  # noqa: WPS436
+from logtweet._history import store as histstore  # noqa: WPS436
+from logtweet._history import sqlite as histsqlite  # noqa: WPS436
+from logtweet._history import text as histtext  # noqa: WPS436
 
 LOG_FILE = os.path.expanduser("~/.config/logtweet/tweet.log")
+SQLITE_FILE = os.path.expanduser("~/.config/logtweet/history.sqlite3")
+SEGMENTS_DIR = os.path.expanduser("~/.config/logtweet/history")
+
+TEXT_BACKEND = "text"
+SQLITE_BACKEND = "sqlite"
+SEGMENTED_BACKEND = "segmented"
+BACKENDS = (TEXT_BACKEND, SQLITE_BACKEND, SEGMENTED_BACKEND)
+
+TEXT_FORMAT = "text"
+JSON_FORMAT = "json"
+EXPORT_FORMATS = (TEXT_FORMAT, JSON_FORMAT)
+
+MIGRATION_BATCH_SIZE = histmigrate.BATCH_SIZE
+MigrationProgress = histmigrate.MigrationProgress
+
+
+class HistorySettings(NamedTuple):
+    """Settings of the history store."""
+
+    backend: str = TEXT_BACKEND
+    path: Optional[str] = None
+    text_export: Optional[str] = None
+    bloom_filter: bool = False
+    bloom_capacity: int = histbloom.DEFAULT_CAPACITY
+    bloom_error_rate: float = histbloom.DEFAULT_ERROR_RATE
+    segment_max_bytes: int = histsegmented.SEGMENT_BYTES
+    segment_max_days: Optional[float] = None
+    retention_days: Optional[float] = None
+    near_duplicates: bool = False
+    similarity_threshold: float = histnear.DEFAULT_THRESHOLD
+    day_keys: bool = True
+
+    @classmethod
+    def from_config(
+        cls,
+        section: Optional[SectionProxy],
+    ) -> "HistorySettings":
+        """
+        Create settings from the ``History`` section of the config.
+
+        Arguments:
+            section (Optional[SectionProxy]): Config section with the
+                ``backend``, ``path``, ``text_export``, ``bloom_filter``,
+                ``bloom_capacity``, ``bloom_error_rate``,
+                ``segment_max_bytes``, ``segment_max_days``,
+                ``retention_days``, ``near_duplicates``,
+                ``similarity_threshold`` and ``day_keys`` options. Options
+                that are not set fall back to the defaults. If ``None``, the
+                defaults are used.
+
+        Returns:
+            HistorySettings: Settings defined by the config section.
+
+        """
+        defaults = cls()
+        if section is None:
+            return defaults
+        return cls(
+            backend=section.get("backend", defaults.backend),
+            path=section.get("path", defaults.path),
+            text_export=section.get("text_export", defaults.text_export),
+            bloom_filter=section.getboolean(
+                "bloom_filter",
+                defaults.bloom_filter,
+            ),
+            bloom_capacity=section.getint(
+                "bloom_capacity",
+                defaults.bloom_capacity,
+            ),
+            bloom_error_rate=section.getfloat(
+                "bloom_error_rate",
+                defaults.bloom_error_rate,
+            ),
+            segment_max_bytes=section.getint(
+                "segment_max_bytes",
+                defaults.segment_max_bytes,
+            ),
+            segment_max_days=section.getfloat(
+                "segment_max_days",
+                defaults.segment_max_days,
+            ),
+            retention_days=section.getfloat(
+                "retention_days",
+                defaults.retention_days,
+            ),
+            near_duplicates=section.getboolean(
+                "near_duplicates",
+                defaults.near_duplicates,
+            ),
+            similarity_threshold=section.getfloat(
+                "similarity_threshold",
+                defaults.similarity_threshold,
+            ),
+            day_keys=section.getboolean("day_keys", defaults.day_keys),
+        )
+
+
+def create_history_store(
+    settings: Optional[HistorySettings] = None,
+) -> histstore.AbstractHistoryStore:
+    """
+    Create the history store chosen in the settings.
+
+    Arguments:
+        settings (Optional[HistorySettings]): Settings of the history. Default
+            is ``None``, in which case the text log at ``LOG_FILE`` is used.
+
+    Returns:
+        AbstractHistoryStore: Store of the configured backend. The ``text``
+            backend keeps the history in a text log (default ``LOG_FILE``),
+            the ``sqlite`` backend in an indexed database (default
+            ``SQLITE_FILE``) and the ``segmented`` backend in rotated segments
+            of a directory (default ``SEGMENTS_DIR``). If enabled, the store
+            keeps a Bloom filter (suffix ``.bloom``) and a near-duplicate index
+            (suffix ``.simhash``) next to it.
+
+    Raises:
+        ValueError: If the backend is unknown.
+
+    """
+    settings = settings or HistorySettings()
+    store = _create_backend_store(settings)
+    if settings.bloom_filter:
+        store = histbloom.BloomFilteredHistoryStore(
+            store,
+            get_history_path(settings) + histbloom.BLOOM_SUFFIX,
+            capacity=settings.bloom_capacity,
+            error_rate=settings.bloom_error_rate,
+        )
+    if settings.near_duplicates:
+        store = histnear.NearDuplicateHistoryStore(
+            store,
+            get_history_path(settings) + histnear.INDEX_SUFFIX,
+            threshold=settings.similarity_threshold,
+        )
+    return store
+
+
+def rebuild_bloom_filter(settings: HistorySettings) -> int:
+    """
+    Rebuild the Bloom filter of the history from the history store.
+
+    Needed when the filter is full or the store was changed without it.
+
+    Arguments:
+        settings (HistorySettings): Settings of the history. The Bloom filter
+            is built with the configured capacity and error rate, even if it
+            is not enabled.
+
+    Returns:
+        int: Number of history entries in the rebuilt filter.
+
+    """
+    store = histbloom.BloomFilteredHistoryStore(
+        _create_backend_store(settings),
+        get_history_path(settings) + histbloom.BLOOM_SUFFIX,
+        capacity=settings.bloom_capacity,
+        error_rate=settings.bloom_error_rate,
+    )
+    with store:
+        return store.rebuild()
+
+
+def rebuild_near_duplicate_index(settings: HistorySettings) -> int:
+    """
+    Rebuild the near-duplicate index of the history from the history store.
+
+    Arguments:
+        settings (HistorySettings): Settings of the history. The index is
+            built for the configured similarity threshold, even if it is not
+            enabled.
+
+    Returns:
+        int: Number of history entries in the rebuilt index.
+
+    """
+    index = histnear.NearDuplicateIndex(
+        get_history_path(settings) + histnear.INDEX_SUFFIX,
+        threshold=settings.similarity_threshold,
+    )
+    with _create_backend_store(settings) as store:
+        return index.rebuild(entry.message for entry in store.iter_entries())
+
+
+def migrate_history(
+    settings: HistorySettings,
+    source: str = LOG_FILE,
+    batch_size: int = MIGRATION_BATCH_SIZE,
+    report: Optional[Callable[[MigrationProgress], None]] = None,
+) -> MigrationProgress:
+    """
+    Migrate a text log into the configured history store.
+
+    The log is streamed into the store in batches. An interrupted migration
+    continues from the checkpoint next to the store (with the suffix
+    ``.migrate``). Afterwards, the enabled Bloom filter and near-duplicate
+    index are rebuilt once, instead of being updated for every entry.
+
+    Arguments:
+        settings (HistorySettings): Settings of the history to migrate into.
+        source (str): Path of the text log. Default is ``LOG_FILE``.
+        batch_size (int): Number of entries added at once, e.g. in one
+            transaction. Default is 50000.
+        report (Optional[Callable[[MigrationProgress], None]]): Function
+            called with the progress about once per second. Default is
+            ``None``.
+
+    Returns:
+        MigrationProgress: Progress at the end of the migration.
+
+    Raises:
+        ValueError: If the text log is the configured history itself.
+
+    """
+    history_path = get_history_path(settings)
+    source = os.path.expanduser(source)
+    if settings.backend == TEXT_BACKEND and os.path.abspath(
+        history_path,
+    ) == os.path.abspath(source):
+        raise ValueError("The text log is the configured history already!")
+    with _create_backend_store(settings) as store:
+        progress = histmigrate.migrate_text_log(
+            source,
+            store,
+            history_path + histmigrate.CHECKPOINT_SUFFIX,
+            batch_size=batch_size,
+            report=report,
+        )
+    if settings.bloom_filter:
+        rebuild_bloom_filter(settings)
+    if settings.near_duplicates:
+        rebuild_near_duplicate_index(settings)
+    return progress
+
+
+def find_similar_tweets(
+    tweet_content: str,
+    store: histstore.AbstractHistoryStore,
+) -> List[histstore.NearDuplicateMatch]:
+    """
+    Find tweets in the history that are near-duplicates of the tweet content.
+
+    Arguments:
+        tweet_content (str): Tweet content string.
+        store (AbstractHistoryStore): History store to search. Near-duplicates
+            are only found if the ``near_duplicates`` setting is enabled.
+
+    Returns:
+        List[NearDuplicateMatch]: Matches above the similarity threshold, most
+            similar first. Links are ignored in the comparison.
+
+    """
+    return store.find_similar(create_tweet_history_msg(tweet_content))
+
+
+def compact_history(
+    settings: HistorySettings,
+    retention_days: Optional[float] = None,
+) -> histsegmented.CompactionResult:
+    """
+    Merge the sealed segments of a segmented history.
+
+    Arguments:
+        settings (HistorySettings): Settings of the history. The backend needs
+            to be ``segmented``.
+        retention_days (Optional[float]): Entries older than this many days
+            are dropped. Default is ``None``, in which case the configured
+            ``retention_days`` is used. Without either, all entries are kept.
+
+    Returns:
+        CompactionResult: Number of merged segments and of kept and dropped
+            entries.
+
+    Raises:
+        ValueError: If the history is not segmented.
+
+    """
+    if settings.backend != SEGMENTED_BACKEND:
+        raise ValueError(
+            "Only a '{0}' history can be compacted!".format(SEGMENTED_BACKEND),
+        )
+    if retention_days is None:
+        retention_days = settings.retention_days
+    retention = None
+    if retention_days is not None:
+        retention = datetime.timedelta(days=retention_days)
+    store = _create_segmented_store(settings)
+    with store:
+        return store.compact(retention)
+
+
+def is_day_in_history(
+    source: str,
+    day_date: datetime.date,
+    settings: HistorySettings,
+) -> bool:
+    """
+    Check if a tweet was sent for a day of a log source.
+
+    Only the small day key file next to the history is read, so the check
+    can be done before the log is retrieved.
+
+    Arguments:
+        source (str): Source string of the log.
+        day_date (datetime.date): Date of the day.
+        settings (HistorySettings): Settings of the history.
+
+    Returns:
+        bool: Expresses if a tweet was sent for the day. Always ``False`` if
+            the ``day_keys`` setting is disabled.
+
+    """
+    if not settings.day_keys:
+        return False
+    return histdaykeys.DayKeyStore(get_day_keys_path(settings)).contains_day(
+        source,
+        day_date,
+    )
+
+
+def add_day_to_history(
+    source: str,
+    day_date: datetime.date,
+    day_number: int,
+    settings: HistorySettings,
+) -> None:
+    """
+    Record that a tweet was sent for a day of a log source.
+
+    Arguments:
+        source (str): Source string of the log.
+        day_date (datetime.date): Date of the day.
+        day_number (int): Number of the day in the log.
+        settings (HistorySettings): Settings of the history. Nothing is
+            recorded if the ``day_keys`` setting is disabled.
+
+    """
+    if not settings.day_keys:
+        return
+    histdaykeys.DayKeyStore(get_day_keys_path(settings)).add(
+        histdaykeys.DayKey(source, day_date, day_number),
+    )
+
+
+def get_day_keys_path(settings: HistorySettings) -> str:
+    """
+    Return the path of the day key file of the history.
+
+    Arguments:
+        settings (HistorySettings): Settings of the history.
+
+    Returns:
+        str: Path of the history store with the suffix ``.days``.
+
+    """
+    return get_history_path(settings) + histdaykeys.DAY_KEYS_SUFFIX
+
+
+def iter_history_entries(
+    settings: HistorySettings,
+    since: Optional[datetime.datetime] = None,
+    until: Optional[datetime.datetime] = None,
+) -> Iterator[histstore.HistoryEntry]:
+    """
+    Iterate over the history entries sent in a time range.
+
+    Only the entries in the range are read: the text log and the segments
+    are searched by time and the SQLite history has an index of the times.
+
+    Arguments:
+        settings (HistorySettings): Settings of the history.
+        since (Optional[datetime.datetime]): Start of the range, inclusive.
+            Default is ``None``, in which case the range starts with the
+            first entry.
+        until (Optional[datetime.datetime]): End of the range, exclusive.
+            Default is ``None``, in which case the range ends with the last
+            entry.
+
+    Yields:
+        HistoryEntry: Entries in the range, in order of time.
+
+    """
+    with _create_backend_store(settings) as store:
+        yield from store.iter_entries_between(since, until)
+
+
+def count_history_entries(
+    settings: HistorySettings,
+    since: Optional[datetime.datetime] = None,
+    until: Optional[datetime.datetime] = None,
+) -> int:
+    """
+    Count the history entries sent in a time range.
+
+    Arguments:
+        settings (HistorySettings): Settings of the history.
+        since (Optional[datetime.datetime]): Start of the range, inclusive.
+            Default is ``None``.
+        until (Optional[datetime.datetime]): End of the range, exclusive.
+            Default is ``None``.
+
+    Returns:
+        int: Number of entries in the range.
+
+    """
+    return sum(1 for _ in iter_history_entries(settings, since, until))
+
+
+def export_history(
+    settings: HistorySettings,
+    export_file: IO[str],
+    since: Optional[datetime.datetime] = None,
+    until: Optional[datetime.datetime] = None,
+    export_format: str = TEXT_FORMAT,
+) -> int:
+    """
+    Write the history entries sent in a time range to a file.
+
+    Arguments:
+        settings (HistorySettings): Settings of the history.
+        export_file (IO[str]): Text file to write the entries to.
+        since (Optional[datetime.datetime]): Start of the range, inclusive.
+            Default is ``None``.
+        until (Optional[datetime.datetime]): End of the range, exclusive.
+            Default is ``None``.
+        export_format (str): ``text`` for lines in the format of the text log,
+            ``json`` for one JSON object with the ``sent_at`` and ``message``
+            of an entry per line. Default is ``text``.
+
+    Returns:
+        int: Number of written entries.
+
+    Raises:
+        ValueError: If the format is unknown.
+
+    """
+    entries = iter_history_entries(settings, since, until)
+    if export_format == TEXT_FORMAT:
+        return histstore.write_text_log(entries, export_file)
+    if export_format == JSON_FORMAT:
+        count = 0
+        for entry in entries:
+            export_file.write(
+                json.dumps(
+                    {
+                        "sent_at": entry.sent_at.isoformat(),
+                        "message": entry.message,
+                    },
+                    ensure_ascii=False,
+                ),
+            )
+            export_file.write("\n")
+            count += 1
+        return count
+    raise ValueError(
+        "Unknown export format '{0}'! Use one of: {1}.".format(
+            export_format,
+            ", ".join(EXPORT_FORMATS),
+        ),
+    )
+
+
+def get_history_path(settings: HistorySettings) -> str:
+    """
+    Return the path of the history store.
+
+    Arguments:
+        settings (HistorySettings): Settings of the history.
+
+    Returns:
+        str: Configured path with ``~`` expanded, or the default path of the
+            backend.
+
+    """
+    if settings.path:
+        return os.path.expanduser(settings.path)
+    if settings.backend == SQLITE_BACKEND:
+        return SQLITE_FILE
+    if settings.backend == SEGMENTED_BACKEND:
+        return SEGMENTS_DIR
+    return LOG_FILE
+
+
+def _create_backend_store(
+    settings: HistorySettings,
+) -> histstore.AbstractHistoryStore:
+    path = get_history_path(settings)
+    if settings.backend == TEXT_BACKEND:
+        return histtext.TextHistoryStore(path)
+    if settings.backend == SQLITE_BACKEND:
+        text_export = None
+        if settings.text_export:
+            text_export = os.path.expanduser(settings.text_export)
+        return histsqlite.SQLiteHistoryStore(path, text_export=text_export)
+    if settings.backend == SEGMENTED_BACKEND:
+        return _create_segmented_store(settings)
+    raise ValueError(
+        "Unknown history backend '{0}'! Use one of: {1}.".format(
+            settings.backend,
+            ", ".join(BACKENDS),
+        ),
+    )
+
+
+def _create_segmented_store(
+    settings: HistorySettings,
+) -> histsegmented.SegmentedHistoryStore:
+    max_segment_age = None
+    if settings.segment_max_days is not None:
+        max_segment_age = datetime.timedelta(days=settings.segment_max_days)
+    return histsegmented.SegmentedHistoryStore(
+        get_history_path(settings),
+        max_segment_bytes=settings.segment_max_bytes,
+        max_segment_age=max_segment_age,
+    )
 
 
 def add_tweet_to_history(
     tweet_content: str,
     history_filepath: str = LOG_FILE,
+    store: Optional[histstore.AbstractHistoryStore] = None,
 ) -> None:
     """
     Add tweet to history file.
@@ -21,20 +549,21 @@ def add_tweet_to_history(
             line by calling the ``create_tweet_history_msg()`` on it.
         history_filepath (str): Optional path string to the history file to
             append the tweet to. Default is ``logtweet.LOG_FILE``.
+        store (Optional[AbstractHistoryStore]): History store to add the tweet
+            to. If given, ``history_filepath`` is ignored.
 
     """
     tweet_history_msg = create_tweet_history_msg(tweet_content)
-    full_line = "{0} - Sent : {1}\n".format(
-        datetime.datetime.now(),
-        tweet_history_msg,
-    )
-    with open(history_filepath, "a") as history_file:
-        history_file.writelines(full_line)
+    if store is None:
+        # Appends to the file are locked and synced to disk.
+        store = histtext.TextHistoryStore(history_filepath)
+    store.add(tweet_history_msg)
 
 
 def is_tweet_in_history(
     tweet_content: str,
     history_filepath: str = LOG_FILE,
+    store: Optional[histstore.AbstractHistoryStore] = None,
 ) -> bool:
     """
     Check if the history contains a message representing the tweet_content.
@@ -43,6 +572,8 @@ def is_tweet_in_history(
         tweet_content (str): Tweet content string.
         history_filepath (str): Path string to the history file that is to be
             checked for the tweet content representation.
+        store (Optional[AbstractHistoryStore]): History store to check. If
+            given, ``history_filepath`` is ignored.
 
     Returns:
         bool: Expresses if the tweet was sent before (and therefore is in the
@@ -50,6 +581,8 @@ def is_tweet_in_history(
 
     """
     tweet_history_msg = create_tweet_history_msg(tweet_content)
+    if store is not None:
+        return store.contains(tweet_history_msg)
     return is_string_in_filelines(tweet_history_msg, filepath=history_filepath)
 
 
@@ -73,8 +606,9 @@ def is_string_in_filelines(search_string: str, filepath: str) -> bool:
     """
     Check if string can be found in file.
 
-    File is checked line by line. Thus, strings spanning multiple lines are not
-    supported.
+    File is checked as if line by line. Thus, strings spanning multiple lines
+    are not supported. The file is memory-mapped and searched without creating
+    the lines (see ``logtweet._history.text.is_string_in_file``).
 
     Arguments:
         search_string (str): String to lookup in the lines of the file.
@@ -84,7 +618,4 @@ def is_string_in_filelines(search_string: str, filepath: str) -> bool:
         bool: Expresses if the ``search_string`` was found in the file.
 
     """
-    with open(filepath, "r") as file_obj:
-        return any(
-            search_string in line for line in file_obj.readlines()
-        )
+    return histtext.is_string_in_file(search_string, filepath)
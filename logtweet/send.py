@@ -2,12 +2,141 @@
 
 """Functions related to sending a tweet."""
 
+import threading
+import time
 import typing
 
 import tweepy  # type: ignore
 
+from logtweet import transport as httptransport
 
-def send_tweet(tweet_content: str, twitter_config: typing.Dict[str, str]) -> None:
+TWITTER_API_URL = "https://api.twitter.com"
+# Seconds for which verified credentials are not verified again.
+VERIFY_TTL = 3600.0
+
+
+class TwitterCredentials(typing.NamedTuple):
+    """Credentials of Twitter API access."""
+
+    api_key: str
+    api_secret: str
+    access_token: str
+    access_secret: str
+
+
+class _CachedApi(object):
+    """Authenticated API with the time its credentials were verified."""
+
+    def __init__(
+        self,
+        api: tweepy.API,
+        transport: httptransport.Transport,
+    ) -> None:
+        self.api = api
+        self.transport = transport
+        self.verified_at: typing.Optional[float] = None
+        # Held while the credentials are verified.
+        self.lock = threading.Lock()
+
+
+class TwitterClientCache(object):
+    """
+    Cache of authenticated Tweepy APIs keyed by credentials.
+
+    An API is created once per credentials and reused with its HTTP session.
+    If it is requested with another transport, it is moved to the session of
+    that transport, so one API is kept per credentials. Its credentials are
+    verified when it is created and again once the verification is older
+    than the TTL. Verifications of different credentials do not wait for
+    each other. After an authentication error, the API is dropped (see
+    ``invalidate``), so that the next request creates and verifies a new one.
+
+    """
+
+    def __init__(
+        self,
+        clock: typing.Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize ``TwitterClientCache``.
+
+        Arguments:
+            clock (Callable[[], float]): Function returning the current time in
+                seconds. Default is `time.monotonic`.
+
+        """
+        self.clock = clock
+        self._apis: typing.Dict[TwitterCredentials, _CachedApi] = {}
+        self._lock = threading.Lock()
+
+    def get_api(
+        self,
+        credentials: TwitterCredentials,
+        transport: httptransport.Transport,
+        verify_ttl: float = VERIFY_TTL,
+    ) -> tweepy.API:
+        """
+        Return the authenticated API of the credentials.
+
+        Arguments:
+            credentials (TwitterCredentials): Credentials of the API.
+            transport (Transport): Transport to send the API requests through.
+            verify_ttl (float): Seconds after which the credentials are
+                verified again. Default is `VERIFY_TTL`.
+
+        Returns:
+            tweepy.API: Cached API, with credentials verified within the TTL.
+
+        """
+        with self._lock:
+            cached = self._apis.get(credentials)
+            if cached is None:
+                cached = _CachedApi(
+                    create_tweepy_api(credentials, transport),
+                    transport,
+                )
+                self._apis[credentials] = cached
+            elif cached.transport is not transport:
+                cached.api.session = transport.get_session(TWITTER_API_URL)
+                cached.transport = transport
+        # The verification is a request, so only this API's lock is held.
+        with cached.lock:
+            now = self.clock()
+            verified_at = cached.verified_at
+            if verified_at is None or now - verified_at >= verify_ttl:
+                try:
+                    cached.api.verify_credentials()  # Raises if not valid
+                except BaseException:
+                    self._drop(credentials, cached)
+                    raise
+                cached.verified_at = now
+            return cached.api
+
+    def invalidate(self, credentials: TwitterCredentials) -> None:
+        """
+        Drop the API of the credentials, e.g. after an authentication error.
+
+        Arguments:
+            credentials (TwitterCredentials): Credentials of the API.
+
+        """
+        with self._lock:
+            self._apis.pop(credentials, None)
+
+    def _drop(self, credentials: TwitterCredentials, cached: _CachedApi) -> None:
+        with self._lock:
+            if self._apis.get(credentials) is cached:
+                del self._apis[credentials]
+
+
+_client_cache = TwitterClientCache()
+
+
+def send_tweet(
+    tweet_content: str,
+    twitter_config: typing.Dict[str, str],
+    transport: typing.Optional[httptransport.Transport] = None,
+) -> None:
     """
     Send tweet with given content.
 
@@ -19,19 +148,36 @@ def send_tweet(tweet_content: str, twitter_config: typing.Dict[str, str]) -> Non
     * "access_token",
     * "access_secret".
 
+    The optional key "verify_ttl" sets the seconds after which the
+    credentials are verified again (default `VERIFY_TTL`).
+
     Arguments:
         tweet_content (str): Content of the tweet.
         twitter_config (dict): Dict-like object with above keys.
+        transport (Optional[Transport]): Transport to send the API requests
+            through. Default is `None`, in which case the process wide default
+            transport is used.
 
     """
-    tweepy_api = get_tweepy_api(
+    credentials = TwitterCredentials(
         twitter_config["api_key"],
         twitter_config["api_secret"],
         twitter_config["access_token"],
         twitter_config["access_secret"],
     )
+    transport = transport or httptransport.get_default_transport()
+    tweepy_api = get_tweepy_api(
+        *credentials,
+        transport=transport,
+        verify_ttl=float(twitter_config.get("verify_ttl", VERIFY_TTL)),
+    )
     # Send tweet
-    tweepy_api.update_status(tweet_content)
+    try:
+        tweepy_api.update_status(tweet_content)
+    except tweepy.Unauthorized:
+        # Verify the credentials again with the next request.
+        _client_cache.invalidate(credentials)
+        raise
 
 
 def get_tweepy_api(
@@ -39,24 +185,58 @@ def get_tweepy_api(
     api_secret: str,
     access_token: str,
     access_secret: str,
+    transport: typing.Optional[httptransport.Transport] = None,
+    verify_ttl: float = VERIFY_TTL,
 ) -> tweepy.API:
     """
-    Create authenticated Tweepy API.
+    Return authenticated Tweepy API.
 
-    Requires twitter API access information.
+    Requires twitter API access information. The API is cached per
+    credentials, and the credentials are only verified again
+    after ``VERIFY_TTL`` or an authentication error (see
+    ``TwitterClientCache``).
 
     Arguments:
         api_key (str): Twitter API key
         api_secret (str): Twitter API secret
         access_token (str): Twitter API access token
         access_secret (str): Twitter API access secret
+        transport (Optional[Transport]): Transport to send the API requests
+            through. Default is `None`, in which case the process wide default
+            transport is used.
+        verify_ttl (float): Seconds after which the credentials are verified
+            again. Default is `VERIFY_TTL`.
 
     Returns:
         tweepy.API: Authenticated tweepy API object.
 
     """
-    auth = tweepy.OAuthHandler(api_key, api_secret)
-    auth.set_access_token(access_token, access_secret)
-    api = tweepy.API(auth)
-    api.verify_credentials()  # Raises exception if not valid
+    return _client_cache.get_api(
+        TwitterCredentials(api_key, api_secret, access_token, access_secret),
+        transport or httptransport.get_default_transport(),
+        verify_ttl,
+    )
+
+
+def create_tweepy_api(
+    credentials: TwitterCredentials,
+    transport: httptransport.Transport,
+) -> tweepy.API:
+    """
+    Create Tweepy API without verifying the credentials.
+
+    Arguments:
+        credentials (TwitterCredentials): Credentials of the API.
+        transport (Transport): Transport to send the API requests through.
+
+    Returns:
+        tweepy.API: Tweepy API object using the pooled session of the
+            transport.
+
+    """
+    auth = tweepy.OAuthHandler(credentials.api_key, credentials.api_secret)
+    auth.set_access_token(credentials.access_token, credentials.access_secret)
+    api = tweepy.API(auth, timeout=transport.settings.read_timeout)
+    # Use the pooled session of the transport for all API requests.
+    api.session = transport.get_session(TWITTER_API_URL)
     return api
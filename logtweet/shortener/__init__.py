@@ -0,0 +1,3 @@
+# -*- coding: utf-8 -*-
+
+"""Package with a self-hostable link shortener service."""
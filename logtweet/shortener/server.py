@@ -0,0 +1,222 @@
+# -*- coding: utf-8 -*-
+
+"""
+HTTP service for the self-hosted link shortener.
+
+The service speaks the same protocol as the default shortener used by
+``logtweet._content.shortlink.get_short_link``:
+
+``POST /create``
+    Expects a JSON body like ``{"long_url": "https://example.com"}`` and
+    responds with ``{"short": "<base url>/<code>", "long_url": "..."}``.
+
+``GET /<code>``
+    Redirects to the long URL stored for the code.
+
+"""
+
+from http import server as httpserver
+import json
+import socketserver
+import typing
+
+import validators  # type: ignore
+
+from logtweet.shortener import store as shortstore
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+MAX_REQUEST_BODY = 64 * 1024
+
+
+class ShortenerRequestHandler(httpserver.BaseHTTPRequestHandler):
+    """Handle create and redirect requests of the shortener service."""
+
+    # Keep-alive allows clients to reuse connections for many requests.
+    protocol_version = "HTTP/1.1"
+    server: "ShortenerServer"
+
+    def do_POST(self) -> None:  # noqa: N802
+        """Create a short link for the long URL in the request body."""
+        try:
+            content_length = int(self.headers.get("Content-Length", "0"))
+        except ValueError:
+            content_length = -1
+        is_valid_length = 0 < content_length <= MAX_REQUEST_BODY
+        has_body = content_length != 0 or "Transfer-Encoding" in self.headers
+        # Unread body bytes would be parsed as the next request of the
+        # connection, so it is closed if the body is not read.
+        if has_body and not is_valid_length:
+            self.close_connection = True
+
+        if self.path.rstrip("/") != "/create":
+            if is_valid_length:
+                self.rfile.read(content_length)
+            self.send_json(404, {"error": "Not found."})
+            return
+
+        if not is_valid_length:
+            self.send_json(400, {"error": "Invalid request body length."})
+            return
+
+        try:
+            payload = json.loads(self.rfile.read(content_length))
+            long_url = payload["long_url"]
+        except (ValueError, KeyError, TypeError):
+            self.send_json(400, {"error": "Expected JSON with 'long_url'."})
+            return
+        if not isinstance(long_url, str) or validators.url(long_url) is not True:
+            self.send_json(400, {"error": "'long_url' is not a URL."})
+            return
+
+        try:
+            code = self.server.store.create(long_url)
+        except shortstore.InvalidLongUrlError as err:
+            self.send_json(400, {"error": err.message})
+            return
+        self.send_json(200, {
+            "short": "{0}/{1}".format(self.get_base_url(), code),
+            "long_url": long_url,
+        })
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Redirect to the long URL of the requested code."""
+        code = self.path.lstrip("/").split("?", 1)[0]
+        long_url = self.server.store.get(code) if code else None
+        if long_url is None:
+            self.send_json(404, {"error": "Not found."})
+            return
+        self.send_response(301)
+        self.send_header("Location", long_url)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def send_json(
+        self,
+        status_code: int,
+        body: typing.Dict[str, str],
+    ) -> None:
+        """
+        Send JSON response.
+
+        Parameters
+        ----------
+        status_code : int
+            Status code of the response.
+        body : Dict[str, str]
+            Data to send as JSON body.
+
+        """
+        encoded_body = json.dumps(body).encode("utf-8")
+        self.send_response(status_code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(encoded_body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(encoded_body)
+
+    def get_base_url(self) -> str:
+        """
+        Return the base URL for created short links.
+
+        Returns
+        -------
+        str
+            The configured base URL of the server. If none is configured, the
+            base URL is derived from the ``Host`` header of the request.
+
+        """
+        if self.server.base_url:
+            return self.server.base_url.rstrip("/")
+        host = self.headers.get("Host") or "{0}:{1}".format(
+            *self.server.server_address[:2],
+        )
+        return "http://{0}".format(host)
+
+    def log_message(self, format: str, *args: typing.Any) -> None:  # noqa: WPS125
+        """
+        Log requests only if the server is verbose.
+
+        Parameters
+        ----------
+        format : str
+            Format string of the log message.
+        args : Any
+            Values for the format string.
+
+        """
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class ShortenerServer(socketserver.ThreadingMixIn, httpserver.HTTPServer):
+    """Threaded HTTP server that serves short links from a store."""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        server_address: typing.Tuple[str, int],
+        store: shortstore.ShortLinkStore,
+        base_url: typing.Optional[str] = None,
+        verbose: bool = False,
+    ) -> None:
+        """
+        Initialize ``ShortenerServer``.
+
+        Parameters
+        ----------
+        server_address : Tuple[str, int]
+            Host and port to listen on.
+        store : ShortLinkStore
+            Store used to create and look up the short links.
+        base_url : Optional[str]
+            Base URL of the created short links, e.g. ``https://s.lpld.io``.
+            Default is ``None``, in which case the base URL is derived from
+            the ``Host`` header of the create request.
+        verbose : bool
+            Log every request to stderr. Default is ``False``.
+
+        """
+        self.store = store
+        self.base_url = base_url
+        self.verbose = verbose
+        super().__init__(server_address, ShortenerRequestHandler)
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    store_dir: str = shortstore.STORE_DIR,
+    base_url: typing.Optional[str] = None,
+    verbose: bool = False,
+) -> None:
+    """
+    Run the shortener service until interrupted.
+
+    Parameters
+    ----------
+    host : str
+        Host to listen on. Default is ``127.0.0.1``.
+    port : int
+        Port to listen on. Default is ``8080``.
+    store_dir : str
+        Directory of the short link store.
+        Default is ``~/.config/logtweet/shortener``.
+    base_url : Optional[str]
+        Base URL of the created short links. See ``ShortenerServer``.
+    verbose : bool
+        Log every request to stderr. Default is ``False``.
+
+    """
+    with shortstore.ShortLinkStore(store_dir) as store:
+        server = ShortenerServer((host, port), store, base_url, verbose)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
@@ -0,0 +1,476 @@
+# -*- coding: utf-8 -*-
+
+"""
+Append-only, memory-mapped store for the short link codes.
+
+The store consists of two files in the store directory:
+
+``links.dat``
+    Append-only data file. Every short link is one line of the form
+    ``<code>\\t<long url>\\n``. Lines are never changed or removed.
+
+``links.idx``
+    Memory-mapped open addressing hash table that maps the hash of a code to
+    the offset of its line in the data file. The index can always be rebuilt
+    from the data file. If the process ended before the index caught up with
+    the data file, the missing lines are indexed when the store is opened.
+
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import types
+import typing
+
+
+STORE_DIR = os.path.expanduser("~/.config/logtweet/shortener")
+
+DATA_FILENAME = "links.dat"
+INDEX_FILENAME = "links.idx"
+
+CODE_LENGTH = 7
+CODE_ALPHABET = (
+    "0123456789"
+    + "abcdefghijklmnopqrstuvwxyz"
+    + "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+)
+MAX_URL_LENGTH = 4096
+
+_INDEX_MAGIC = b"LTSI"
+_INDEX_VERSION = 1
+# Magic, version, slot count, entry count, indexed length of the data file.
+_HEADER = struct.Struct("<4sIQQQ")
+# Hash of the code and offset of the line in the data file plus one. A slot
+# with hash zero is empty.
+_SLOT = struct.Struct("<QQ")
+_MIN_SLOTS = 1024
+_READ_SIZE = 512
+
+
+class ShortLinkStoreError(Exception):
+    """Raised when the short link store can not fulfill a request."""
+
+
+class InvalidLongUrlError(ShortLinkStoreError):
+    """Raised when a long URL can not be stored."""
+
+    def __init__(self, long_url: str) -> None:
+        """
+        Initialize ``InvalidLongUrlError``.
+
+        Parameters
+        ----------
+        long_url : str
+            Long URL that was rejected by the store.
+
+        """
+        self.long_url = long_url
+        self.message = "The long URL '{0}' can not be stored!".format(
+            long_url,
+        )
+        super().__init__(self.message)
+
+
+def make_code(long_url: str, salt: int = 0) -> str:
+    """
+    Derive the short link code for a long URL.
+
+    The code is derived from a hash of the URL. The same URL therefore always
+    leads to the same code, unless a collision forces the use of a salt.
+
+    Parameters
+    ----------
+    long_url : str
+        Long URL to derive the code for.
+    salt : int
+        Salt to add to the hash input. Used to resolve collisions.
+
+    Returns
+    -------
+    str
+        Short link code of ``CODE_LENGTH`` characters from ``CODE_ALPHABET``.
+
+    """
+    digest = hashlib.blake2b(
+        "{0}:{1}".format(salt, long_url).encode("utf-8"),
+        digest_size=8,
+    ).digest()
+    number = int.from_bytes(digest, "little")
+    base = len(CODE_ALPHABET)
+    characters = []
+    for _ in range(CODE_LENGTH):
+        number, remainder = divmod(number, base)
+        characters.append(CODE_ALPHABET[remainder])
+    return "".join(characters)
+
+
+def _hash_code(code: str) -> int:
+    """
+    Hash a code for the index.
+
+    Parameters
+    ----------
+    code : str
+        Short link code.
+
+    Returns
+    -------
+    int
+        Non-zero 64 bit hash of the code.
+
+    """
+    digest = hashlib.blake2b(code.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") or 1
+
+
+class ShortLinkStore(object):
+    """
+    Persistent mapping of short link codes to long URLs.
+
+    The store is safe to use from multiple threads of one process. It is not
+    meant to be opened by multiple processes at the same time.
+
+    """
+
+    def __init__(
+        self,
+        directory: str = STORE_DIR,
+        initial_slots: int = _MIN_SLOTS,
+    ) -> None:
+        """
+        Open the store in the given directory.
+
+        The directory and the store files are created if they do not exist.
+
+        Parameters
+        ----------
+        directory : str
+            Directory containing the store files.
+            Default is ``~/.config/logtweet/shortener``.
+        initial_slots : int
+            Number of slots of a newly created index. Rounded up to the next
+            power of two. The index grows automatically.
+
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._data_path = os.path.join(directory, DATA_FILENAME)
+        self._index_path = os.path.join(directory, INDEX_FILENAME)
+
+        self._data_file = open(self._data_path, "a+b")  # noqa: WPS515
+        self._truncate_partial_line()
+        self._index_file: typing.BinaryIO
+        self._index: mmap.mmap
+        self._slot_count = 0
+        self._entry_count = 0
+        self._open_index(max(initial_slots, _MIN_SLOTS))
+
+    def __enter__(self) -> "ShortLinkStore":
+        """
+        Enter context of the store.
+
+        Returns
+        -------
+        ShortLinkStore
+            The store itself.
+
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: typing.Optional[typing.Type[BaseException]],
+        exc_value: typing.Optional[BaseException],
+        traceback: typing.Optional[types.TracebackType],
+    ) -> None:
+        """
+        Close the store when leaving the context.
+
+        Parameters
+        ----------
+        exc_type : Optional[Type[BaseException]]
+            Type of the exception raised in the context, if any.
+        exc_value : Optional[BaseException]
+            Exception raised in the context, if any.
+        traceback : Optional[TracebackType]
+            Traceback of the exception raised in the context, if any.
+
+        """
+        self.close()
+
+    def __len__(self) -> int:
+        """
+        Return number of stored short links.
+
+        Returns
+        -------
+        int
+            Number of stored short links.
+
+        """
+        return self._entry_count
+
+    def close(self) -> None:
+        """Flush and close the store files."""
+        with self._lock:
+            if self._data_file.closed:
+                return
+            self._index.flush()
+            self._index.close()
+            self._index_file.close()
+            self._data_file.close()
+
+    def sync(self) -> None:
+        """Force the store files to disk."""
+        with self._lock:
+            self._data_file.flush()
+            os.fsync(self._data_file.fileno())
+            self._index.flush()
+
+    def get(self, code: str) -> typing.Optional[str]:
+        """
+        Return the long URL for a code.
+
+        Parameters
+        ----------
+        code : str
+            Short link code.
+
+        Returns
+        -------
+        Optional[str]
+            Long URL stored for the code. ``None`` if the code is unknown.
+
+        """
+        with self._lock:
+            return self._lookup(code)
+
+    def create(self, long_url: str) -> str:
+        """
+        Return the code for a long URL and store it if it is new.
+
+        Creating a code for a URL that is already stored returns the existing
+        code.
+
+        Parameters
+        ----------
+        long_url : str
+            Long URL to create the short link code for.
+
+        Returns
+        -------
+        str
+            Short link code for the long URL.
+
+        Raises
+        ------
+        InvalidLongUrlError
+            If the long URL is empty, too long or contains white space.
+
+        """
+        is_invalid = (
+            not long_url
+            or len(long_url) > MAX_URL_LENGTH
+            or any(character.isspace() for character in long_url)
+        )
+        if is_invalid:
+            raise InvalidLongUrlError(long_url)
+        with self._lock:
+            salt = 0
+            while True:
+                code = make_code(long_url, salt)
+                stored_url = self._lookup(code)
+                if stored_url is None:
+                    self._append(code, long_url)
+                    return code
+                if stored_url == long_url:
+                    return code
+                salt += 1
+
+    def _lookup(self, code: str) -> typing.Optional[str]:
+        code_hash = _hash_code(code)
+        mask = self._slot_count - 1
+        slot = code_hash & mask
+        while True:
+            slot_hash, offset = _SLOT.unpack_from(
+                self._index,
+                _HEADER.size + slot * _SLOT.size,
+            )
+            if slot_hash == 0:
+                return None
+            if slot_hash == code_hash:
+                stored_code, long_url = self._read_line(offset - 1)
+                if stored_code == code:
+                    return long_url
+            slot = (slot + 1) & mask
+
+    def _append(self, code: str, long_url: str) -> None:
+        self._data_file.seek(0, os.SEEK_END)
+        offset = self._data_file.tell()
+        line = "{0}\t{1}\n".format(code, long_url).encode("utf-8")
+        self._data_file.write(line)
+        self._data_file.flush()
+        self._insert(_hash_code(code), offset)
+        self._write_header(offset + len(line))
+
+    def _insert(self, code_hash: int, offset: int) -> None:
+        if (self._entry_count + 1) * 2 > self._slot_count:
+            self._grow()
+        self._place(self._index, self._slot_count, code_hash, offset + 1)
+        self._entry_count += 1
+
+    @staticmethod
+    def _place(
+        index: mmap.mmap,
+        slot_count: int,
+        code_hash: int,
+        stored_offset: int,
+    ) -> None:
+        mask = slot_count - 1
+        slot = code_hash & mask
+        while _SLOT.unpack_from(index, _HEADER.size + slot * _SLOT.size)[0]:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(
+            index,
+            _HEADER.size + slot * _SLOT.size,
+            code_hash,
+            stored_offset,
+        )
+
+    def _grow(self) -> None:
+        new_slot_count = self._slot_count * 2
+        tmp_path = "{0}.tmp".format(self._index_path)
+        with open(tmp_path, "w+b") as tmp_file:
+            tmp_file.truncate(_HEADER.size + new_slot_count * _SLOT.size)
+            new_index = mmap.mmap(tmp_file.fileno(), 0)
+            for slot in range(self._slot_count):
+                slot_hash, stored_offset = _SLOT.unpack_from(
+                    self._index,
+                    _HEADER.size + slot * _SLOT.size,
+                )
+                if slot_hash:
+                    self._place(
+                        new_index,
+                        new_slot_count,
+                        slot_hash,
+                        stored_offset,
+                    )
+            _HEADER.pack_into(
+                new_index,
+                0,
+                _INDEX_MAGIC,
+                _INDEX_VERSION,
+                new_slot_count,
+                self._entry_count,
+                _HEADER.unpack_from(self._index)[4],
+            )
+            new_index.flush()
+            new_index.close()
+        self._index.close()
+        self._index_file.close()
+        os.replace(tmp_path, self._index_path)
+        self._map_index()
+
+    def _write_header(self, indexed_length: int) -> None:
+        _HEADER.pack_into(
+            self._index,
+            0,
+            _INDEX_MAGIC,
+            _INDEX_VERSION,
+            self._slot_count,
+            self._entry_count,
+            indexed_length,
+        )
+
+    def _read_line(self, offset: int) -> typing.Tuple[str, str]:
+        self._data_file.seek(offset)
+        chunks = []
+        while True:
+            chunk = self._data_file.read(_READ_SIZE)
+            newline_position = chunk.find(b"\n")
+            if newline_position >= 0 or not chunk:
+                chunks.append(chunk[:newline_position])
+                break
+            chunks.append(chunk)
+        code, _, long_url = b"".join(chunks).decode("utf-8").partition("\t")
+        return code, long_url
+
+    def _truncate_partial_line(self) -> None:
+        """Drop an incomplete last line left behind by an interrupted write."""
+        self._data_file.seek(0, os.SEEK_END)
+        size = self._data_file.tell()
+        if not size:
+            return
+        position = size
+        while position > 0:
+            block_start = max(0, position - _READ_SIZE)
+            self._data_file.seek(block_start)
+            block = self._data_file.read(position - block_start)
+            newline_position = block.rfind(b"\n")
+            if newline_position >= 0:
+                complete_size = block_start + newline_position + 1
+                break
+            position = block_start
+        else:
+            complete_size = 0
+        if complete_size != size:
+            self._data_file.truncate(complete_size)
+
+    def _open_index(self, initial_slots: int) -> None:
+        slot_count = 1 << (initial_slots - 1).bit_length()
+        self._data_file.seek(0, os.SEEK_END)
+        data_size = self._data_file.tell()
+
+        indexed_length = -1
+        if os.path.exists(self._index_path):
+            self._map_index()
+            magic, version, _, _, indexed_length = _HEADER.unpack_from(
+                self._index,
+            )
+            is_usable = (
+                magic == _INDEX_MAGIC
+                and version == _INDEX_VERSION
+                and indexed_length <= data_size
+            )
+            if not is_usable:
+                self._index.close()
+                self._index_file.close()
+                indexed_length = -1
+
+        if indexed_length < 0:
+            with open(self._index_path, "wb") as index_file:
+                index_file.truncate(_HEADER.size + slot_count * _SLOT.size)
+                index_file.write(_HEADER.pack(
+                    _INDEX_MAGIC,
+                    _INDEX_VERSION,
+                    slot_count,
+                    0,
+                    0,
+                ))
+            self._map_index()
+            indexed_length = 0
+
+        self._index_tail(indexed_length, data_size)
+
+    def _map_index(self) -> None:
+        self._index_file = open(self._index_path, "r+b")  # noqa: WPS515
+        self._index = mmap.mmap(self._index_file.fileno(), 0)
+        _, _, self._slot_count, self._entry_count, _ = _HEADER.unpack_from(
+            self._index,
+        )
+
+    def _index_tail(self, indexed_length: int, data_size: int) -> None:
+        """Index the lines of the data file not covered by the index yet."""
+        if indexed_length >= data_size:
+            return
+        self._data_file.seek(indexed_length)
+        offset = indexed_length
+        for line in self._data_file:
+            code = line.decode("utf-8").partition("\t")[0]
+            self._insert(_hash_code(code), offset)
+            offset += len(line)
+        self._write_header(offset)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+"""Defines an asynchronous retriever for online sources."""
+
+import asyncio
+from concurrent import futures
+from typing import Optional
+
+from logtweet import transport as httptransport
+from logtweet.source.adapters import httpcache
+from logtweet.source.adapters import onlineretriever as adaptonline
+from logtweet.source.usecases import retrieve as ucretrieve
+
+
+class AsyncOnlineSourceContentRetriever(
+    ucretrieve.AbstractAsyncSourceContentRetriever,
+):
+    """
+    Asynchronous online log source.
+
+    The request is sent through the shared pooled transport. The blocking
+    request runs in an executor, so that the event loop can drive many
+    retrievals at the same time.
+
+    """
+
+    valid_source_type = adaptonline.AbstractValidOnlineSource
+
+    def __init__(
+        self,
+        valid_source: adaptonline.AbstractValidOnlineSource,
+        cache: Optional[httpcache.HTTPCache] = None,
+        transport: Optional[httptransport.Transport] = None,
+        executor: Optional[futures.Executor] = None,
+    ) -> None:
+        """
+        Initialize ``AsyncOnlineSourceContentRetriever``.
+
+        Parameters
+        ----------
+        valid_source : adaptonline.AbstractValidOnlineSource
+            Valid online source object. The object needs to be an instance
+            of a subclass of `AbstractValidOnlineSource`.
+        cache : Optional[httpcache.HTTPCache]
+            On-disk HTTP cache. See ``OnlineSourceContentRetriever``.
+        transport : Optional[httptransport.Transport]
+            Transport to send the requests through. Default is ``None``, in
+            which case the process wide default transport is used.
+        executor : Optional[futures.Executor]
+            Executor to run the requests in. Default is ``None``, in which
+            case the default executor of the event loop is used.
+
+        """
+        self.valid_source: adaptonline.AbstractValidOnlineSource
+        super().__init__(valid_source)
+        self.executor = executor
+        self._retriever = adaptonline.OnlineSourceContentRetriever(
+            valid_source,
+            cache,
+            transport,
+        )
+
+    async def get_content(self) -> str:
+        """
+        Get content from online source.
+
+        Returns
+        -------
+        str
+            Content string retrieved from the online source.
+
+        # noqa: DAR402
+
+        Raises
+        ------
+        RequestError
+            When the network connection to the URL target fails.
+        HTTPStatusError
+            When the source host responds with an error status code (e.g. 404).
+
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            self._retriever.get_content,
+        )
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+
+"""Defines a retriever for compressed local log files."""
+
+import bz2
+import codecs
+import datetime
+import gzip
+import importlib
+from types import ModuleType
+from typing import (
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Type,
+)
+
+from logtweet._content import daysection  # noqa: WPS436
+from logtweet.source.adapters import fileretriever as adaptfile
+from logtweet.source.adapters import limits as adaptlimits
+from logtweet.source.usecases import retrieve as ucretrieve
+
+# Optional dependency, imported by name so that type checks pass either way.
+zstandard: Optional[ModuleType]
+try:
+    zstandard = importlib.import_module("zstandard")
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+
+CHUNK_SIZE = 64 * 1024  # Bytes
+ZSTANDARD_SUFFIX = ".zst"
+DECOMPRESSION_ERRORS: Tuple[Type[Exception], ...] = (OSError, EOFError, ValueError)
+if zstandard is not None:
+    DECOMPRESSION_ERRORS += (zstandard.ZstdError,)
+
+
+class MissingDecompressorError(adaptfile.FileReadError):
+    """Raised when the package to decompress a file is not installed."""
+
+    def __init__(self, path: str, package: str):
+        """
+        Initialize ``MissingDecompressorError``.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file that could not be decompressed.
+        package : str
+            Name of the package that is needed to decompress the file.
+
+        """
+        self.package = package
+        super().__init__(
+            path,
+            ImportError(
+                "The package '{0}' is needed to decompress the file.".format(
+                    package,
+                )
+                + " Install it with `pip install logtweet[compression]`.",
+            ),
+        )
+
+
+def _open_zstandard(path: str) -> BinaryIO:
+    if zstandard is None:
+        raise MissingDecompressorError(path, "zstandard")
+    raw_file = open(path, "rb")  # noqa: WPS515
+    return zstandard.ZstdDecompressor().stream_reader(  # type: ignore
+        raw_file,
+        closefd=True,
+    )
+
+
+OPENERS: Dict[str, Callable[[str], BinaryIO]] = {
+    ".gz": gzip.open,  # type: ignore
+    ".bz2": bz2.open,  # type: ignore
+    ZSTANDARD_SUFFIX: _open_zstandard,
+}
+
+
+class CompressedLocalFileSourceContentRetriever(
+    ucretrieve.AbstractSourceContentRetriever,
+):
+    """
+    Compressed local file log source.
+
+    Files compressed with gzip (``.gz``), bzip2 (``.bz2``) or Zstandard
+    (``.zst``) are decompressed as a stream. Zstandard needs the optional
+    ``zstandard`` package.
+
+    If a day is given, the decompressed stream is passed through a
+    ``DaySectionScanner`` and decompression stops once the section of the day
+    is complete. Otherwise, the whole decompressed content is returned.
+
+    """
+
+    valid_source_type = adaptfile.AbstractValidFileSource
+
+    def __init__(
+        self,
+        valid_source: adaptfile.AbstractValidFileSource,
+        day_date: Optional[datetime.date] = None,
+        encoding: str = "utf-8",
+        chunk_size: int = CHUNK_SIZE,
+        limits: Optional[adaptlimits.RetrievalLimits] = None,
+    ) -> None:
+        """
+        Initialize ``CompressedLocalFileSourceContentRetriever``.
+
+        Parameters
+        ----------
+        valid_source : adaptfile.AbstractValidFileSource
+            Valid file source object. The path needs to have one of the
+            supported compression suffixes.
+        day_date : Optional[datetime.date]
+            Date of the day to return the section for. Default is ``None``,
+            in which case the whole content is returned.
+        encoding : str
+            Encoding of the decompressed content. Default is ``"utf-8"``.
+        chunk_size : int
+            Number of decompressed bytes processed at once. Default is
+            64 KiB.
+        limits : Optional[adaptlimits.RetrievalLimits]
+            Size limits of the decompressed content. Decompression stops with
+            an error once the maximum is exceeded. Default is ``None``, in
+            which case the size is not limited.
+
+        """
+        self.valid_source: adaptfile.AbstractValidFileSource
+        super().__init__(valid_source)
+        self.day_date = day_date
+        self.encoding = encoding
+        self.chunk_size = chunk_size
+        self.limits = limits
+
+    def get_content(self) -> str:
+        """
+        Get decompressed content from the local file source.
+
+        Returns
+        -------
+        str
+            Decompressed content of the file, or only the section of the day
+            if a day is given. Bytes that can not be decoded are replaced.
+
+        Raises
+        ------
+        FileReadError
+            When the file can not be read or decompressed.
+        MissingDecompressorError
+            When the package to decompress the file is not installed.
+
+        # noqa: DAR402
+
+        BodyTooLargeError
+            When limits are set and the decompressed content exceeds the
+            maximum size.
+
+        """
+        path = self.valid_source.path
+        opener = OPENERS[get_compression_suffix(path)]
+        try:
+            with opener(path) as compressed_file:
+                return self._read(compressed_file)
+        except DECOMPRESSION_ERRORS as err:
+            raise adaptfile.FileReadError(path, err)
+
+    def _read(self, compressed_file: BinaryIO) -> str:
+        decoder = codecs.getincrementaldecoder(self.encoding)(errors="replace")
+        chunks = self._iter_limited_chunks(compressed_file)
+        if self.day_date is None:
+            texts: List[str] = [decoder.decode(chunk) for chunk in chunks]
+            texts.append(decoder.decode(b"", final=True))
+            return "".join(texts)
+
+        scanner = daysection.DaySectionScanner(self.day_date)
+        for chunk in chunks:
+            if scanner.feed(decoder.decode(chunk)):
+                break
+        else:
+            scanner.feed(decoder.decode(b"", final=True))
+        scanner.close()
+        return scanner.section
+
+    def _iter_limited_chunks(self, compressed_file: BinaryIO) -> Iterator[bytes]:
+        received = 0
+        for chunk in iter_chunks(compressed_file, self.chunk_size):
+            received += len(chunk)
+            if self.limits and not self.limits.check(received):
+                raise ucretrieve.BodyTooLargeError(
+                    self.valid_source.source_string,
+                    self.limits.max_body_bytes or 0,
+                )
+            yield chunk
+
+
+def iter_chunks(stream: BinaryIO, chunk_size: int) -> Iterator[bytes]:
+    """
+    Iterate over a binary stream in chunks.
+
+    Parameters
+    ----------
+    stream : BinaryIO
+        Stream to read from.
+    chunk_size : int
+        Maximum number of bytes per chunk.
+
+    Returns
+    -------
+    Iterator[bytes]
+        Chunks of the stream until its end.
+
+    """
+    return iter(lambda: stream.read(chunk_size), b"")
+
+
+def get_compression_suffix(path: str) -> str:
+    """
+    Return the supported compression suffix of the path.
+
+    Parameters
+    ----------
+    path : str
+        Path of a file.
+
+    Returns
+    -------
+    str
+        Compression suffix of the path (e.g. ``".gz"``). Empty string if the
+        path does not have a supported compression suffix.
+
+    """
+    lower_path = path.lower()
+    for suffix in OPENERS:
+        if lower_path.endswith(suffix):
+            return suffix
+    return ""
+
+
+def is_compressed(path: str) -> bool:
+    """
+    Check if the path has a supported compression suffix.
+
+    Parameters
+    ----------
+    path : str
+        Path of a file.
+
+    Returns
+    -------
+    bool
+        Expresses if the file is expected to be compressed.
+
+    """
+    return bool(get_compression_suffix(path))
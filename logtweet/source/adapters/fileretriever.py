@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+
+"""Defines class representing a valid local file source for the log."""
+
+import contextlib
+import datetime
+import mmap
+import os
+from typing import Iterator, Optional, Tuple
+
+from logtweet._content import daysection  # noqa: WPS436
+from logtweet.source.adapters import limits as adaptlimits
+from logtweet.source.usecases import retrieve as ucretrieve
+
+
+FILE_URL_PREFIX = "file://"
+TAIL_BLOCK_SIZE = 64 * 1024  # Bytes
+# Headings longer than this are not found if they span two blocks.
+MAX_HEADING_LENGTH = 1024  # Bytes
+
+
+class FileReadError(ucretrieve.SourceContentRetrievalError):
+    """Raised when the local source file can not be read."""
+
+    def __init__(self, path: str, err: Optional[Exception] = None):
+        """
+        Initialize ``FileReadError``.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file that could not be read.
+        err : Exception
+            Original exception raised
+
+        """
+        self.path = path
+
+        self.message = "Reading the file '{0}' failed!".format(self.path)
+        if err:
+            self.message += " The following error occurred:\n{0}".format(err)
+        super().__init__(self.message)
+
+
+class AbstractValidFileSource(ucretrieve.AbstractValidSource):
+    """
+    Abstract class representing a valid local file source.
+
+    The validation method `is_valid` still needs to be implemented.
+
+    This abstraction adds the `path` property.
+
+    """
+
+    @property
+    def path(self) -> str:
+        """
+        Path of the validated file source.
+
+        A ``file://`` prefix of the source string is removed and ``~`` is
+        expanded.
+
+        Returns
+        -------
+        str
+            Path of the validated file source.
+
+        """
+        return get_path_from_source_string(self.source_string)
+
+
+class LocalFileSourceContentRetriever(ucretrieve.AbstractSourceContentRetriever):
+    """
+    Valid local file log source.
+
+    The file is memory-mapped instead of read into a buffer. The content is
+    only decoded when it is requested as a string. Consumers that can work
+    with bytes can access the mapping directly through `open_buffer`.
+
+    """
+
+    valid_source_type = AbstractValidFileSource
+
+    def __init__(
+        self,
+        valid_source: AbstractValidFileSource,
+        encoding: str = "utf-8",
+        limits: Optional[adaptlimits.RetrievalLimits] = None,
+    ) -> None:
+        """
+        Initialize ``LocalFileSourceContentRetriever``.
+
+        Parameters
+        ----------
+        valid_source : AbstractValidFileSource
+            Valid file source object. The object needs to be an instance
+            of a subclass of `AbstractValidFileSource`.
+        encoding : str
+            Encoding of the file. Default is ``"utf-8"``.
+        limits : Optional[adaptlimits.RetrievalLimits]
+            Size limits of the content. Files larger than the maximum are
+            rejected by `get_content`. Default is ``None``, in which case the
+            size is not limited.
+
+        """
+        self.valid_source: AbstractValidFileSource
+        super().__init__(valid_source)
+        self.encoding = encoding
+        self.limits = limits
+
+    @contextlib.contextmanager
+    def open_buffer(self) -> Iterator[memoryview]:
+        """
+        Provide the file content as a zero-copy buffer.
+
+        The buffer is only valid inside the context. Slices of it must not be
+        kept beyond the context.
+
+        Yields
+        ------
+        memoryview
+            Read-only view of the memory-mapped file.
+
+        Raises
+        ------
+        FileReadError
+            When the file can not be opened or mapped.
+
+        """
+        path = self.valid_source.path
+        try:
+            source_file = open(path, "rb")  # noqa: WPS515
+        except OSError as err:
+            raise FileReadError(path, err)
+        with source_file:
+            try:
+                is_empty = os.fstat(source_file.fileno()).st_size == 0
+                # Empty files can not be mapped.
+                mapped = None if is_empty else mmap.mmap(
+                    source_file.fileno(),
+                    0,
+                    access=mmap.ACCESS_READ,
+                )
+            except (OSError, ValueError) as err:
+                raise FileReadError(path, err)
+            if mapped is None:
+                yield memoryview(b"")
+                return
+            with mapped:
+                buffer = memoryview(mapped)
+                try:
+                    yield buffer
+                finally:
+                    buffer.release()
+
+    def get_content(self) -> str:
+        """
+        Get content from local file source.
+
+        Returns
+        -------
+        str
+            Content string of the file. Bytes that can not be decoded are
+            replaced.
+
+        # noqa: DAR402
+
+        Raises
+        ------
+        FileReadError
+            When the file can not be read.
+        BodyTooLargeError
+            When limits are set and the file exceeds the maximum size.
+
+        """
+        with self.open_buffer() as buffer:
+            if self.limits and not self.limits.check(len(buffer)):
+                raise ucretrieve.BodyTooLargeError(
+                    self.valid_source.source_string,
+                    self.limits.max_body_bytes or 0,
+                )
+            return str(buffer, self.encoding, "replace")
+
+
+class TailSeekingLocalFileSourceContentRetriever(
+    LocalFileSourceContentRetriever,
+):
+    """
+    Local file log source returning only the section of a given day.
+
+    Logs are usually appended to, so the requested day is usually close to the
+    end of the file. The file is therefore read backwards in fixed-size blocks
+    until the ``<h2>`` heading of the day has been passed. Only the section of
+    the day, from its heading up to the next heading, is returned.
+
+    Reading stops early if the headings show the order of the log and a
+    heading past the day was found. Only one block is copied out of the
+    memory-mapped file at a time.
+
+    """
+
+    def __init__(
+        self,
+        valid_source: AbstractValidFileSource,
+        day_date: datetime.date,
+        block_size: int = TAIL_BLOCK_SIZE,
+        encoding: str = "utf-8",
+    ) -> None:
+        """
+        Initialize ``TailSeekingLocalFileSourceContentRetriever``.
+
+        Parameters
+        ----------
+        valid_source : AbstractValidFileSource
+            Valid file source object. The object needs to be an instance
+            of a subclass of `AbstractValidFileSource`.
+        day_date : datetime.date
+            Date of the day to return the section for.
+        block_size : int
+            Number of bytes read from the file at once. Default is 64 KiB.
+        encoding : str
+            Encoding of the file. Default is ``"utf-8"``.
+
+        """
+        super().__init__(valid_source, encoding)
+        self.day_date = day_date
+        self.block_size = block_size
+
+    def get_content(self) -> str:
+        """
+        Get the section of the day from the local file source.
+
+        Returns
+        -------
+        str
+            Section of the day starting with its heading. Empty string if the
+            file does not contain the day.
+
+        # noqa: DAR402
+
+        Raises
+        ------
+        FileReadError
+            When the file can not be read.
+
+        """
+        with self.open_buffer() as buffer:
+            start, end = self._find_section(buffer)
+            return str(buffer[start:end], self.encoding, "replace")
+
+    def _find_section(self, buffer: memoryview) -> Tuple[int, int]:
+        # Start of the heading following the latest heading found.
+        section_end = len(buffer)
+        later_date: Optional[datetime.date] = None
+        position = len(buffer)
+        while position > 0:
+            block_start = max(0, position - self.block_size)
+            # Headings starting in the block may reach into the following
+            # bytes, but never past the start of an already found heading.
+            search_end = min(position + MAX_HEADING_LENGTH, section_end)
+            window = bytes(buffer[block_start:search_end])
+            matches = [
+                match
+                for match in daysection.BYTES_HEADING_PATTERN.finditer(window)
+                if match.start() < position - block_start
+            ]
+            for match in reversed(matches):
+                heading_date = daysection.get_bytes_heading_date(
+                    match,
+                    self.encoding,
+                )
+                if heading_date is None:
+                    continue
+                heading_start = block_start + match.start()
+                if heading_date == self.day_date:
+                    return heading_start, section_end
+                if self._is_past_day(heading_date, later_date):
+                    return 0, 0
+                later_date = heading_date
+                section_end = heading_start
+            position = block_start
+        return 0, 0
+
+    def _is_past_day(
+        self,
+        heading_date: datetime.date,
+        later_date: Optional[datetime.date],
+    ) -> bool:
+        # Headings are visited from the end of the file to the start.
+        if later_date is None:
+            return False
+        if heading_date < later_date:
+            # Ascending log
+            return heading_date < self.day_date
+        # Descending log
+        return heading_date > self.day_date
+
+
+def get_path_from_source_string(source_string: str) -> str:
+    """
+    Return file path defined by a source string.
+
+    Parameters
+    ----------
+    source_string : str
+        Path of a file, optionally with ``file://`` prefix.
+
+    Returns
+    -------
+    str
+        Path with the ``file://`` prefix removed and ``~`` expanded.
+
+    """
+    if source_string.startswith(FILE_URL_PREFIX):
+        source_string = source_string[len(FILE_URL_PREFIX):]
+    return os.path.expanduser(source_string)
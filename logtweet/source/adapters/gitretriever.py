@@ -0,0 +1,380 @@
+# -*- coding: utf-8 -*-
+
+"""Defines a retriever reading the log from the object store of a git repo."""
+
+import atexit
+import os
+import re
+import subprocess  # noqa: S404
+import threading
+from typing import IO, Dict, NamedTuple, Optional
+
+from logtweet.source.usecases import retrieve as ucretrieve
+
+
+GIT_SOURCE_PATTERN = re.compile(r"^(?P<repo>.+)@(?P<ref>[^@:]+):(?P<path>.+)$")
+
+
+class GitObjectSpec(NamedTuple):
+    """Parts of a git source string ``repo_path@ref:path/to/log.md``."""
+
+    repo_path: str
+    ref: str
+    path: str
+
+    @property
+    def object_name(self) -> str:
+        """
+        Name of the blob as understood by ``git cat-file``.
+
+        Returns
+        -------
+        str
+            Object name in the form ``ref:path``.
+
+        """
+        return "{0}:{1}".format(self.ref, self.path)
+
+
+class GitError(ucretrieve.SourceContentRetrievalError):
+    """Raised when reading from the git object store fails."""
+
+    def __init__(self, repo_path: str, message: str):
+        """
+        Initialize ``GitError``.
+
+        Parameters
+        ----------
+        repo_path : str
+            Path of the repository.
+        message : str
+            Description of the failure.
+
+        """
+        self.repo_path = repo_path
+        self.message = "Reading from the git repository '{0}' failed! {1}".format(
+            repo_path,
+            message,
+        )
+        super().__init__(self.message)
+
+
+class GitObjectNotFoundError(ucretrieve.SourceContentRetrievalError):
+    """Raised when the ref or path does not exist in the repository."""
+
+    def __init__(self, spec: GitObjectSpec):
+        """
+        Initialize ``GitObjectNotFoundError``.
+
+        Parameters
+        ----------
+        spec : GitObjectSpec
+            Git source that was not found.
+
+        """
+        self.spec = spec
+        self.message = "The object '{0}' is not a file in '{1}'!".format(
+            spec.object_name,
+            spec.repo_path,
+        )
+        super().__init__(self.message)
+
+
+class AbstractValidGitSource(ucretrieve.AbstractValidSource):
+    """
+    Abstract class representing a valid git source.
+
+    The validation method `is_valid` still needs to be implemented.
+
+    This abstraction adds the `spec` property.
+
+    """
+
+    @property
+    def spec(self) -> GitObjectSpec:
+        """
+        Parts of the validated git source string.
+
+        Returns
+        -------
+        GitObjectSpec
+            Repository path, ref and path of the validated git source.
+
+        """
+        spec = parse_git_source_string(self.source_string)
+        if spec is None:  # pragma: no cover
+            raise ucretrieve.SourceValidationError
+        return spec
+
+
+class GitCatFileBatch(object):
+    """
+    Persistent ``git cat-file --batch`` process of one repository.
+
+    The process is started on first use and reads any number of blobs, so
+    that the process startup is only paid once. Reads are serialized with a
+    lock, so the process can be shared between threads. If the process died,
+    it is restarted once.
+
+    """
+
+    def __init__(self, repo_path: str) -> None:
+        """
+        Initialize ``GitCatFileBatch``.
+
+        Parameters
+        ----------
+        repo_path : str
+            Path of the repository.
+
+        """
+        self.repo_path = repo_path
+        self._lock = threading.Lock()
+        self._process: Optional["subprocess.Popen[bytes]"] = None
+
+    def read_blob(self, object_name: str) -> Optional[bytes]:
+        """
+        Read the content of a blob.
+
+        Parameters
+        ----------
+        object_name : str
+            Name of the blob, e.g. ``main:log.md``.
+
+        Returns
+        -------
+        Optional[bytes]
+            Content of the blob. ``None`` if the object does not exist or is
+            not a blob.
+
+        Raises
+        ------
+        GitError
+            If the object name contains a line break or the process fails.
+
+        """
+        if "\n" in object_name:
+            raise GitError(self.repo_path, "Invalid object name.")
+        with self._lock:
+            try:
+                return self._read_blob(object_name)
+            except (OSError, ValueError):
+                self._terminate()
+            try:
+                return self._read_blob(object_name)
+            except (OSError, ValueError) as err:
+                self._terminate()
+                raise GitError(self.repo_path, str(err))
+
+    def close(self) -> None:
+        """Stop the process."""
+        with self._lock:
+            self._terminate()
+
+    def _read_blob(self, object_name: str) -> Optional[bytes]:
+        process = self._get_process()
+        stdin: IO[bytes] = process.stdin  # type: ignore
+        stdout: IO[bytes] = process.stdout  # type: ignore
+        stdin.write(object_name.encode("utf-8") + b"\n")
+        stdin.flush()
+        header = stdout.readline()
+        if not header:
+            raise OSError("The git process ended unexpectedly.")
+        header = header.rstrip(b"\n")
+        # The name is echoed as given, so it can contain spaces.
+        if header.endswith((b" missing", b" ambiguous")):
+            return None
+        # "<sha> <type> <size>"
+        _, object_type, size = header.rsplit(b" ", 2)
+        content = read_exactly(stdout, int(size))
+        # Each object is followed by a line feed.
+        read_exactly(stdout, 1)
+        if object_type != b"blob":
+            return None
+        return content
+
+    def _get_process(self) -> "subprocess.Popen[bytes]":
+        if self._process is None or self._process.poll() is not None:
+            try:
+                self._process = subprocess.Popen(  # noqa: S603, S607
+                    ["git", "-C", self.repo_path, "cat-file", "--batch"],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+            except OSError as err:
+                raise GitError(self.repo_path, str(err))
+        return self._process
+
+    def _terminate(self) -> None:
+        if self._process is None:
+            return
+        process, self._process = self._process, None
+        for pipe in (process.stdin, process.stdout):
+            if pipe is not None:
+                pipe.close()
+        try:
+            process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+_batch_processes: Dict[str, GitCatFileBatch] = {}
+_batch_processes_lock = threading.Lock()
+
+
+def get_batch_process(repo_path: str) -> GitCatFileBatch:
+    """
+    Return the batch process shared by all sources of a repository.
+
+    Parameters
+    ----------
+    repo_path : str
+        Path of the repository.
+
+    Returns
+    -------
+    GitCatFileBatch
+        Batch process of the repository. Processes are stopped when the
+        interpreter exits.
+
+    """
+    key = os.path.realpath(repo_path)
+    with _batch_processes_lock:
+        batch = _batch_processes.get(key)
+        if batch is None:
+            batch = GitCatFileBatch(key)
+            _batch_processes[key] = batch
+        return batch
+
+
+@atexit.register
+def close_batch_processes() -> None:
+    """Stop all shared batch processes."""
+    with _batch_processes_lock:
+        for batch in _batch_processes.values():
+            batch.close()
+        _batch_processes.clear()
+
+
+class GitSourceContentRetriever(ucretrieve.AbstractSourceContentRetriever):
+    """
+    Git repository log source.
+
+    The log is read as a blob from the object store of a local repository,
+    without a checkout or network access. All sources of the same repository
+    share one ``git cat-file --batch`` process.
+
+    """
+
+    valid_source_type = AbstractValidGitSource
+
+    def __init__(
+        self,
+        valid_source: AbstractValidGitSource,
+        encoding: str = "utf-8",
+    ) -> None:
+        """
+        Initialize ``GitSourceContentRetriever``.
+
+        Parameters
+        ----------
+        valid_source : AbstractValidGitSource
+            Valid git source object. The object needs to be an instance
+            of a subclass of `AbstractValidGitSource`.
+        encoding : str
+            Encoding of the log. Default is ``"utf-8"``.
+
+        """
+        self.valid_source: AbstractValidGitSource
+        super().__init__(valid_source)
+        self.encoding = encoding
+
+    def get_content(self) -> str:
+        """
+        Get content of the blob from the repository.
+
+        Returns
+        -------
+        str
+            Content of the blob. Bytes that can not be decoded are replaced.
+
+        Raises
+        ------
+        GitObjectNotFoundError
+            When the ref or the path does not exist in the repository.
+
+        # noqa: DAR402
+
+        GitError
+            When the git process fails.
+
+        """
+        spec = self.valid_source.spec
+        content = get_batch_process(spec.repo_path).read_blob(
+            spec.object_name,
+        )
+        if content is None:
+            raise GitObjectNotFoundError(spec)
+        return content.decode(self.encoding, "replace")
+
+
+def read_exactly(stream: IO[bytes], size: int) -> bytes:
+    """
+    Read an exact number of bytes from a stream.
+
+    Parameters
+    ----------
+    stream : IO[bytes]
+        Stream to read from.
+    size : int
+        Number of bytes to read.
+
+    Returns
+    -------
+    bytes
+        Bytes read.
+
+    Raises
+    ------
+    OSError
+        If the stream ends before the bytes were read.
+
+    """
+    chunks = []
+    remaining = size
+    while remaining > 0:
+        chunk = stream.read(remaining)
+        if not chunk:
+            raise OSError("The git process ended unexpectedly.")
+        chunks.append(chunk)
+        remaining -= len(chunk)
+    return b"".join(chunks)
+
+
+def parse_git_source_string(source_string: str) -> Optional[GitObjectSpec]:
+    """
+    Split a git source string into its parts.
+
+    Parameters
+    ----------
+    source_string : str
+        Source string in the form ``repo_path@ref:path/to/log.md``. A ``~``
+        in the repository path is expanded.
+
+    Returns
+    -------
+    Optional[GitObjectSpec]
+        Parts of the source string. ``None`` if the source string does not
+        have the form of a git source.
+
+    """
+    match = GIT_SOURCE_PATTERN.match(source_string)
+    if match is None:
+        return None
+    return GitObjectSpec(
+        os.path.expanduser(match.group("repo")),
+        match.group("ref"),
+        match.group("path"),
+    )
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+
+"""Defines an on-disk cache for conditional HTTP requests."""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import typing
+
+import requests
+
+
+CACHE_DIR = os.path.expanduser("~/.cache/logtweet/http")
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+class CachedResponse(typing.NamedTuple):
+    """Cached body of a response with its validators."""
+
+    url: str
+    body: bytes
+    encoding: typing.Optional[str] = None
+    etag: typing.Optional[str] = None
+    last_modified: typing.Optional[str] = None
+
+    @property
+    def text(self) -> str:
+        """
+        Body of the cached response decoded with the stored encoding.
+
+        Returns
+        -------
+        str
+            Decoded body of the cached response.
+
+        """
+        return self.body.decode(self.encoding or "utf-8", errors="replace")
+
+    def conditional_headers(self) -> typing.Dict[str, str]:
+        """
+        Return headers to revalidate the cached response.
+
+        Returns
+        -------
+        Dict[str, str]
+            ``If-None-Match`` and ``If-Modified-Since`` headers, as far as the
+            respective validators are known.
+
+        """
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    @classmethod
+    def from_response(
+        cls,
+        url: str,
+        response: requests.Response,
+    ) -> "CachedResponse":
+        """
+        Create cached response from a ``requests.Response``.
+
+        Parameters
+        ----------
+        url : str
+            URL that was requested. This is the cache key, which might differ
+            from the final URL of the response after redirects.
+        response : requests.Response
+            Response to cache.
+
+        Returns
+        -------
+        CachedResponse
+            Cacheable representation of the response.
+
+        """
+        return cls(
+            url=url,
+            body=response.content,
+            encoding=response.encoding or response.apparent_encoding,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+
+class HTTPCache(object):
+    """
+    On-disk cache of responses, keyed by URL.
+
+    Every entry is a single file. The first line of the file holds the
+    metadata of the response as JSON, the rest of the file is the body.
+    Entries are replaced atomically, so concurrent readers never see partial
+    entries.
+
+    """
+
+    def __init__(self, directory: typing.Optional[str] = None) -> None:
+        """
+        Initialize ``HTTPCache``.
+
+        Parameters
+        ----------
+        directory : Optional[str]
+            Directory to store the cache entries in. ``~`` is expanded. The
+            directory is created when the first entry is stored.
+            Default is ``None``, in which case ``~/.cache/logtweet/http`` is
+            used.
+
+        """
+        self.directory = os.path.expanduser(directory or CACHE_DIR)
+
+    def load(self, url: str) -> typing.Optional[CachedResponse]:
+        """
+        Load cached response for a URL.
+
+        Parameters
+        ----------
+        url : str
+            URL of the cached response.
+
+        Returns
+        -------
+        Optional[CachedResponse]
+            Cached response. ``None`` if there is no usable entry for the URL.
+
+        """
+        try:
+            with open(self.get_entry_path(url), "rb") as entry_file:
+                metadata = json.loads(entry_file.readline())
+                body = entry_file.read()
+        except (OSError, ValueError):
+            return None
+        is_intact = (
+            metadata.get("url") == url
+            and metadata.get("length") == len(body)
+            and metadata.get("sha256") == hashlib.sha256(body).hexdigest()
+        )
+        if not is_intact:
+            return None
+        return CachedResponse(
+            url=url,
+            body=body,
+            encoding=metadata.get("encoding"),
+            etag=metadata.get("etag"),
+            last_modified=metadata.get("last_modified"),
+        )
+
+    def store(
+        self,
+        cached_response: CachedResponse,
+        revalidatable_only: bool = True,
+    ) -> None:
+        """
+        Store a response in the cache.
+
+        Parameters
+        ----------
+        cached_response : CachedResponse
+            Response to store.
+        revalidatable_only : bool
+            Only store responses that can be revalidated, i.e. responses with
+            ``ETag`` or ``Last-Modified``. Default is ``True``.
+
+        """
+        self.store_file(
+            cached_response.url,
+            io.BytesIO(cached_response.body),
+            encoding=cached_response.encoding,
+            etag=cached_response.etag,
+            last_modified=cached_response.last_modified,
+            revalidatable_only=revalidatable_only,
+        )
+
+    def store_file(
+        self,
+        url: str,
+        body_file: typing.IO[bytes],
+        encoding: typing.Optional[str] = None,
+        etag: typing.Optional[str] = None,
+        last_modified: typing.Optional[str] = None,
+        revalidatable_only: bool = True,
+    ) -> None:
+        """
+        Store a response whose body is in a file in the cache.
+
+        The body is copied in chunks, so it is never held in memory whole.
+
+        Parameters
+        ----------
+        url : str
+            URL of the response.
+        body_file : IO[bytes]
+            Seekable file with the body, read from its start. It is left at
+            its end.
+        encoding : Optional[str]
+            Encoding of the body. Default is ``None``.
+        etag : Optional[str]
+            ``ETag`` header of the response. Default is ``None``.
+        last_modified : Optional[str]
+            ``Last-Modified`` header of the response. Default is ``None``.
+        revalidatable_only : bool
+            Only store responses that can be revalidated, i.e. responses with
+            ``ETag`` or ``Last-Modified``. Default is ``True``.
+
+        """
+        if revalidatable_only and not (etag or last_modified):
+            return
+        # The metadata line comes first, so the digest is taken beforehand.
+        body_file.seek(0)
+        digest = hashlib.sha256()
+        length = 0
+        for chunk in iter(lambda: body_file.read(COPY_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            length += len(chunk)
+        metadata = {
+            "url": url,
+            "length": length,
+            "sha256": digest.hexdigest(),
+            "encoding": encoding,
+            "etag": etag,
+            "last_modified": last_modified,
+        }
+        body_file.seek(0)
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(tmp_fd, "wb") as tmp_file:
+                tmp_file.write(json.dumps(metadata).encode("utf-8") + b"\n")
+                shutil.copyfileobj(body_file, tmp_file, COPY_CHUNK_SIZE)
+            os.replace(tmp_path, self.get_entry_path(url))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def get_entry_path(self, url: str) -> str:
+        """
+        Return path of the cache entry file for a URL.
+
+        Parameters
+        ----------
+        url : str
+            URL of the cached response.
+
+        Returns
+        -------
+        str
+            Path of the entry file.
+
+        """
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, "{0}.cache".format(key))
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+
+"""Defines the limits that keep the memory use of retrievals bounded."""
+
+from configparser import SectionProxy
+import typing
+
+
+class RetrievalLimits(typing.NamedTuple):
+    """
+    Limits of the content size of a retrieval.
+
+    Content larger than ``max_body_bytes`` is rejected. Downloads are
+    buffered in a temporary file once they are larger than
+    ``spool_threshold``, instead of being held in memory while they are
+    received.
+
+    """
+
+    max_body_bytes: typing.Optional[int] = 32 * 1024 * 1024
+    spool_threshold: int = 1024 * 1024
+    chunk_size: int = 64 * 1024
+
+    def check(self, size: int) -> bool:
+        """
+        Check if a content size is within the maximum.
+
+        Parameters
+        ----------
+        size : int
+            Size of the content in bytes.
+
+        Returns
+        -------
+        bool
+            Expresses if the size is allowed.
+
+        """
+        return self.max_body_bytes is None or size <= self.max_body_bytes
+
+    @classmethod
+    def from_config(
+        cls,
+        section: typing.Optional[SectionProxy],
+    ) -> "RetrievalLimits":
+        """
+        Create limits from the ``LogTweet`` section of the config.
+
+        The options are ``max_body_size`` and ``spool_threshold``, both in
+        bytes. A ``max_body_size`` of ``0`` disables the maximum.
+
+        Parameters
+        ----------
+        section : Optional[SectionProxy]
+            Config section with the limit options. Options that are not set
+            fall back to the defaults. If ``None``, the defaults are used.
+
+        Returns
+        -------
+        RetrievalLimits
+            Limits defined by the config section.
+
+        """
+        defaults = cls()
+        if section is None:
+            return defaults
+        max_body_bytes = section.getint(
+            "max_body_size",
+            defaults.max_body_bytes,
+        )
+        return cls(
+            max_body_bytes=max_body_bytes or None,
+            spool_threshold=section.getint(
+                "spool_threshold",
+                defaults.spool_threshold,
+            ),
+        )
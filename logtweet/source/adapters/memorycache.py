@@ -0,0 +1,291 @@
+# -*- coding: utf-8 -*-
+
+"""Defines an in-memory stale-while-revalidate cache for retrieved content."""
+
+import collections
+import contextlib
+import sys
+import threading
+import time
+from typing import Callable, Hashable, NamedTuple, Optional, Set
+
+from logtweet.source.usecases import retrieve as ucretrieve
+
+
+class MemoryCacheEntry(NamedTuple):
+    """Content of a source cached in memory."""
+
+    content: str
+    retrieved_at: float
+    size: int
+
+
+class MemoryCache(object):
+    """
+    Bounded in-memory cache of retrieved content.
+
+    Content younger than ``fresh_for`` is fresh and served without
+    retrieval. Content that is older, but younger than ``fresh_for`` plus
+    ``stale_for``, is stale but usable: it is served and revalidated in the
+    background. Older content is not served.
+
+    The number of entries and their total size are limited. The least
+    recently used entries are evicted first. The cache can be shared between
+    threads and between retrievers.
+
+    """
+
+    def __init__(
+        self,
+        fresh_for: float = 60,
+        stale_for: float = 600,
+        max_entries: int = 128,
+        max_bytes: int = 64 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize ``MemoryCache``.
+
+        Parameters
+        ----------
+        fresh_for : float
+            Seconds after retrieval during which content is fresh. Default is
+            60.
+        stale_for : float
+            Seconds after the freshness window during which stale content is
+            still served while it is revalidated. Default is 600.
+        max_entries : int
+            Maximum number of cached entries. Default is 128.
+        max_bytes : int
+            Maximum total size of the cached content in bytes. Content larger
+            than this is not cached. Default is 64 MiB.
+        clock : Callable[[], float]
+            Function returning the current time in seconds. Default is
+            ``time.monotonic``.
+
+        """
+        self.fresh_for = fresh_for
+        self.stale_for = stale_for
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self.total_bytes = 0
+        self._entries: "collections.OrderedDict[Hashable, MemoryCacheEntry]" = (
+            collections.OrderedDict()
+        )
+        self._revalidating: Set[Hashable] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """
+        Return the number of cached entries.
+
+        Returns
+        -------
+        int
+            Number of cached entries.
+
+        """
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[MemoryCacheEntry]:
+        """
+        Return the usable entry of a key.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the entry.
+
+        Returns
+        -------
+        Optional[MemoryCacheEntry]
+            Fresh or stale entry of the key. ``None`` if there is no entry or
+            it is too old to be served.
+
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self.age(entry) >= self.fresh_for + self.stale_for:
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: Hashable, content: str) -> None:
+        """
+        Store content for a key, evicting least recently used entries.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the entry.
+        content : str
+            Content to cache.
+
+        """
+        entry = MemoryCacheEntry(content, self.clock(), sys.getsizeof(content))
+        with self._lock:
+            self._remove(key)
+            if entry.size > self.max_bytes:
+                return
+            self._entries[key] = entry
+            self.total_bytes += entry.size
+            while (
+                len(self._entries) > self.max_entries
+                or self.total_bytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._entries)))
+
+    def is_fresh(self, entry: MemoryCacheEntry) -> bool:
+        """
+        Check if an entry is within the freshness window.
+
+        Parameters
+        ----------
+        entry : MemoryCacheEntry
+            Cached entry.
+
+        Returns
+        -------
+        bool
+            Expresses if the entry can be served without revalidation.
+
+        """
+        return self.age(entry) < self.fresh_for
+
+    def age(self, entry: MemoryCacheEntry) -> float:
+        """
+        Return the age of an entry.
+
+        Parameters
+        ----------
+        entry : MemoryCacheEntry
+            Cached entry.
+
+        Returns
+        -------
+        float
+            Seconds since the content of the entry was retrieved.
+
+        """
+        return self.clock() - entry.retrieved_at
+
+    def start_revalidation(self, key: Hashable) -> bool:
+        """
+        Mark a key as being revalidated.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the entry.
+
+        Returns
+        -------
+        bool
+            ``False`` if the key is already being revalidated.
+
+        """
+        with self._lock:
+            if key in self._revalidating:
+                return False
+            self._revalidating.add(key)
+            return True
+
+    def end_revalidation(self, key: Hashable) -> None:
+        """
+        Mark the revalidation of a key as done.
+
+        Parameters
+        ----------
+        key : Hashable
+            Key of the entry.
+
+        """
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry.size
+
+
+class CachingSourceContentRetriever(ucretrieve.AbstractSourceContentRetriever):
+    """
+    Retriever wrapping another retriever with an in-memory cache.
+
+    Fresh content is returned without calling the wrapped retriever. Stale
+    content is returned immediately while the wrapped retriever refreshes it
+    in a background thread. Otherwise, the wrapped retriever is called and
+    its content is cached. Errors of background revalidations are dropped;
+    the stale content is served until it is too old.
+
+    """
+
+    def __init__(
+        self,
+        retriever: ucretrieve.AbstractSourceContentRetriever,
+        cache: MemoryCache,
+        key: Optional[Hashable] = None,
+    ) -> None:
+        """
+        Initialize ``CachingSourceContentRetriever``.
+
+        Parameters
+        ----------
+        retriever : ucretrieve.AbstractSourceContentRetriever
+            Retriever to get the content from when it is not fresh.
+        cache : MemoryCache
+            Cache to store the content in.
+        key : Optional[Hashable]
+            Key of the content in the cache. Needs to differ between
+            retrievers returning different content for the same source.
+            Default is ``None``, in which case the source string is used.
+
+        """
+        super().__init__(retriever.valid_source)
+        self.retriever = retriever
+        self.cache = cache
+        self.key = key if key is not None else retriever.valid_source.source_string
+
+    def get_content(self) -> str:
+        """
+        Get content from the cache or the wrapped retriever.
+
+        Returns
+        -------
+        str
+            Content of the source.
+
+        # noqa: DAR402
+
+        Raises
+        ------
+        SourceContentRetrievalError
+            When the content is not cached and the wrapped retriever fails.
+
+        """
+        entry = self.cache.get(self.key)
+        if entry is None:
+            return self._retrieve()
+        if not self.cache.is_fresh(entry) and self.cache.start_revalidation(
+            self.key,
+        ):
+            threading.Thread(target=self._revalidate, daemon=True).start()
+        return entry.content
+
+    def _retrieve(self) -> str:
+        content = self.retriever.get_content()
+        self.cache.put(self.key, content)
+        return content
+
+    def _revalidate(self) -> None:
+        try:
+            # On failure, the stale content keeps being served.
+            with contextlib.suppress(ucretrieve.SourceContentRetrievalError):
+                self._retrieve()
+        finally:
+            self.cache.end_revalidation(self.key)
@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""Defines latency statistics of mirrors persisted in a JSON file."""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, Optional
+
+from logtweet.source.usecases import retrieve as ucretrieve
+
+
+STATS_PATH = os.path.expanduser("~/.cache/logtweet/mirrors.json")
+# Latency in seconds recorded for a failed retrieval.
+FAILURE_PENALTY = 60.0
+
+
+class JSONMirrorLatencyStats(ucretrieve.AbstractMirrorLatencyStats):
+    """
+    Latency statistics of mirrors persisted in a JSON file.
+
+    The expected latency of a mirror is the exponentially weighted moving
+    average of its measured latencies. Failed retrievals are recorded with a
+    latency of ``FAILURE_PENALTY``, so that failing mirrors are tried last.
+
+    The file maps source strings to their expected latency in seconds. A
+    missing or unreadable file starts empty statistics.
+
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        smoothing: float = 0.3,
+    ) -> None:
+        """
+        Initialize ``JSONMirrorLatencyStats``.
+
+        Parameters
+        ----------
+        path : Optional[str]
+            Path of the JSON file. Default is ``None``, in which case
+            ``STATS_PATH`` is used.
+        smoothing : float
+            Weight of a new measurement in the moving average, between 0 and
+            1. Default is 0.3.
+
+        Raises
+        ------
+        ValueError
+            If ``smoothing`` is not between 0 and 1.
+
+        """
+        if not 0 < smoothing <= 1:
+            raise ValueError("Smoothing needs to be between 0 and 1.")
+        self.path = os.path.expanduser(path or STATS_PATH)
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        self._latencies = self._load()
+
+    def get_latency(self, source_string: str) -> Optional[float]:
+        """
+        Return the expected latency of a mirror.
+
+        Parameters
+        ----------
+        source_string : str
+            Source string of the mirror.
+
+        Returns
+        -------
+        Optional[float]
+            Expected latency in seconds. ``None`` if the mirror is unknown.
+
+        """
+        with self._lock:
+            return self._latencies.get(source_string)
+
+    def record(self, source_string: str, latency: Optional[float]) -> None:
+        """
+        Record the outcome of a retrieval from a mirror.
+
+        Parameters
+        ----------
+        source_string : str
+            Source string of the mirror.
+        latency : Optional[float]
+            Duration of the successful retrieval in seconds. ``None`` if the
+            retrieval failed.
+
+        """
+        if latency is None:
+            latency = FAILURE_PENALTY
+        with self._lock:
+            previous = self._latencies.get(source_string)
+            if previous is not None:
+                latency = (
+                    self.smoothing * latency
+                    + (1 - self.smoothing) * previous
+                )
+            self._latencies[source_string] = latency
+
+    def save(self) -> None:
+        """Write the statistics to the JSON file, replacing it atomically."""
+        with self._lock:
+            serialized = json.dumps(self._latencies, indent=2, sort_keys=True)
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        tmp_fd, tmp_path = tempfile.mkstemp(dir=directory)
+        try:
+            with os.fdopen(tmp_fd, "w") as tmp_file:
+                tmp_file.write(serialized)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def _load(self) -> Dict[str, float]:
+        try:
+            with open(self.path) as stats_file:
+                loaded = json.load(stats_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(loaded, dict):
+            return {}
+        return {
+            str(source_string): float(latency)
+            for source_string, latency in loaded.items()
+            if isinstance(latency, (int, float))
+        }
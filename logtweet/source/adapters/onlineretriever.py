@@ -2,10 +2,18 @@
 
 """Defines class representing a valid online source for the log."""
 
-from typing import Optional
+import codecs
+import contextlib
+import datetime
+import tempfile
+from typing import IO, Optional
 
 import requests
 
+from logtweet import transport as httptransport
+from logtweet._content import daysection  # noqa: WPS436
+from logtweet.source.adapters import httpcache
+from logtweet.source.adapters import limits as adaptlimits
 from logtweet.source.usecases import retrieve as ucretrieve
 
 
@@ -86,24 +94,50 @@ class OnlineSourceContentRetriever(ucretrieve.AbstractSourceContentRetriever):
 
     valid_source_type = AbstractValidOnlineSource
 
-    def __init__(self, valid_source: AbstractValidOnlineSource) -> None:
+    def __init__(
+        self,
+        valid_source: AbstractValidOnlineSource,
+        cache: Optional[httpcache.HTTPCache] = None,
+        transport: Optional[httptransport.Transport] = None,
+        limits: Optional[adaptlimits.RetrievalLimits] = None,
+    ) -> None:
         """
-        Override for type annotation only.
+        Initialize ``OnlineSourceContentRetriever``.
 
         Parameters
         ----------
         valid_source : AbstractValidOnlineSource
             Valid online source object. The object needs to be an instance
             of a subclass of `AbstractValidOnlineSource`.
+        cache : Optional[httpcache.HTTPCache]
+            On-disk HTTP cache. If given, the retrieved content is cached and
+            revalidated with a conditional request on the next retrieval.
+            Default is ``None``, in which case the content is always
+            downloaded in full.
+        transport : Optional[httptransport.Transport]
+            Transport to send the requests through. Default is ``None``, in
+            which case the process wide default transport is used.
+        limits : Optional[adaptlimits.RetrievalLimits]
+            Size limits of the response body. If given, the body is streamed
+            into a temporary file that is spooled to disk above the
+            threshold, and responses above the maximum are rejected. Default
+            is ``None``, in which case the body is read into memory without
+            limit.
 
         """
         self.valid_source: AbstractValidOnlineSource
         super().__init__(valid_source)
+        self.cache = cache
+        self.transport = transport or httptransport.get_default_transport()
+        self.limits = limits
 
     def get_content(self) -> str:
         """
         Get content from online source.
 
+        If a cache is used and the source responds with ``304 Not Modified``,
+        the cached content is returned.
+
         Returns
         -------
         str
@@ -116,15 +150,244 @@ class OnlineSourceContentRetriever(ucretrieve.AbstractSourceContentRetriever):
         HTTPStatusError
             When the source host responds with an error status code (e.g. 404).
 
+        # noqa: DAR402
+
+        BodyTooLargeError
+            When limits are set and the body exceeds the maximum size.
+
         """
+        url = self.valid_source.url
+        cached_response = None
+        headers = {}
+        if self.cache is not None:
+            cached_response = self.cache.load(url)
+            if cached_response is not None:
+                headers.update(cached_response.conditional_headers())
+
         try:
-            response = requests.get(self.valid_source.url)
+            response = self.transport.get(
+                url,
+                headers=headers,
+                stream=self.limits is not None,
+            )
         except requests.exceptions.RequestException as err:
-            raise RequestError(self.valid_source.url, err)
+            raise RequestError(url, err)
+
+        if self.limits is None:
+            return self._read_response(response, cached_response)
+        # A streamed response holds its connection until it is closed.
+        with contextlib.closing(response):
+            return self._read_response(response, cached_response)
+
+    def _read_response(
+        self,
+        response: requests.Response,
+        cached_response: Optional[httpcache.CachedResponse],
+    ) -> str:
+        url = self.valid_source.url
+        if response.status_code == 304 and cached_response is not None:
+            return cached_response.text
 
         try:
             response.raise_for_status()
         except requests.exceptions.HTTPError:
-            raise HTTPStatusError(self.valid_source.url, response.status_code)
+            raise HTTPStatusError(url, response.status_code)
+
+        if self.limits is not None:
+            return self._read_limited_body(response, self.limits)
 
+        if self.cache is not None:
+            self.cache.store(
+                httpcache.CachedResponse.from_response(url, response),
+            )
         return response.text
+
+    def _read_limited_body(
+        self,
+        response: requests.Response,
+        limits: adaptlimits.RetrievalLimits,
+    ) -> str:
+        url = self.valid_source.url
+        encoding = response.encoding or "utf-8"
+        with spool_body(url, response, limits) as body:
+            if self.cache is not None:
+                # Copied in chunks, so a body spooled to disk stays there.
+                self.cache.store_file(
+                    url,
+                    body,
+                    encoding=encoding,
+                    etag=response.headers.get("ETag"),
+                    last_modified=response.headers.get("Last-Modified"),
+                )
+                body.seek(0)
+            # Decoded in chunks, so the bytes are never held in memory whole.
+            decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+            text_parts = [
+                decoder.decode(chunk)
+                for chunk in iter(lambda: body.read(limits.chunk_size), b"")
+            ]
+            text_parts.append(decoder.decode(b"", final=True))
+            return "".join(text_parts)
+
+
+class StreamingOnlineSourceContentRetriever(OnlineSourceContentRetriever):
+    """
+    Online log source that only downloads as much as needed for one day.
+
+    The response is read in chunks and fed to an incremental extractor. The
+    connection is closed as soon as the section of the requested day is
+    complete or the log is confirmed not to contain the day. For logs with the
+    newest day at the top, this saves nearly the entire download.
+
+    """
+
+    default_chunk_size = 16 * 1024
+
+    def __init__(
+        self,
+        valid_source: AbstractValidOnlineSource,
+        day_date: datetime.date,
+        chunk_size: int = default_chunk_size,
+        transport: Optional[httptransport.Transport] = None,
+        limits: Optional[adaptlimits.RetrievalLimits] = None,
+    ) -> None:
+        """
+        Initialize ``StreamingOnlineSourceContentRetriever``.
+
+        Parameters
+        ----------
+        valid_source : AbstractValidOnlineSource
+            Valid online source object. The object needs to be an instance
+            of a subclass of `AbstractValidOnlineSource`.
+        day_date : datetime.date
+            Date of the day whose section is retrieved.
+        chunk_size : int
+            Size of the chunks in which the response is read, in bytes.
+        transport : Optional[httptransport.Transport]
+            Transport to send the requests through. Default is ``None``, in
+            which case the process wide default transport is used.
+        limits : Optional[adaptlimits.RetrievalLimits]
+            Size limits of the response body. Only the maximum applies, since
+            the body is not kept. Default is ``None``, in which case the
+            body size is not limited.
+
+        """
+        super().__init__(valid_source, transport=transport, limits=limits)
+        self.day_date = day_date
+        self.chunk_size = chunk_size
+
+    def get_content(self) -> str:
+        """
+        Get the requested day's section from the online source.
+
+        Returns
+        -------
+        str
+            Section of the requested day, starting with its ``<h2>`` heading.
+            Empty string if the log does not contain the day.
+
+        Raises
+        ------
+        RequestError
+            When the network connection to the URL target fails.
+        HTTPStatusError
+            When the source host responds with an error status code (e.g. 404).
+
+        """
+        url = self.valid_source.url
+        try:
+            response = self.transport.get(url, stream=True)
+        except requests.exceptions.RequestException as err:
+            raise RequestError(url, err)
+
+        scanner = daysection.DaySectionScanner(self.day_date)
+        # Closing the response before the body is consumed drops the
+        # connection, which stops the download.
+        with contextlib.closing(response):
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError:
+                raise HTTPStatusError(url, response.status_code)
+
+            decoder = codecs.getincrementaldecoder(
+                response.encoding or "utf-8",
+            )(errors="replace")
+            received = 0
+            try:
+                for chunk in response.iter_content(self.chunk_size):
+                    received += len(chunk)
+                    if self.limits and not self.limits.check(received):
+                        raise ucretrieve.BodyTooLargeError(
+                            url,
+                            self.limits.max_body_bytes or 0,
+                        )
+                    if scanner.feed(decoder.decode(chunk)):
+                        break
+                else:
+                    scanner.feed(decoder.decode(b"", final=True))
+            except requests.exceptions.RequestException as err:
+                raise RequestError(url, err)
+        scanner.close()
+        return scanner.section
+
+
+def spool_body(
+    url: str,
+    response: requests.Response,
+    limits: adaptlimits.RetrievalLimits,
+) -> IO[bytes]:
+    """
+    Read the body of a streamed response into a spooled temporary file.
+
+    The file is held in memory up to the spool threshold of the limits and
+    moved to disk above it.
+
+    Parameters
+    ----------
+    url : str
+        URL of the response, used in error messages.
+    response : requests.Response
+        Response that was requested with ``stream=True``.
+    limits : adaptlimits.RetrievalLimits
+        Limits of the body size.
+
+    Returns
+    -------
+    IO[bytes]
+        Temporary file with the decoded body, positioned at its start. The
+        caller needs to close it.
+
+    Raises
+    ------
+    BodyTooLargeError
+        If the body exceeds the maximum size of the limits.
+    RequestError
+        If the connection fails while the body is received.
+
+    """
+    content_length = response.headers.get("Content-Length", "")
+    is_identity = not response.headers.get("Content-Encoding")
+    # The length of encoded bodies says little about their decoded size.
+    if is_identity and content_length.isdigit():
+        if not limits.check(int(content_length)):
+            raise ucretrieve.BodyTooLargeError(url, limits.max_body_bytes or 0)
+
+    body = tempfile.SpooledTemporaryFile(max_size=limits.spool_threshold)
+    received = 0
+    try:
+        for chunk in response.iter_content(limits.chunk_size):
+            received += len(chunk)
+            if not limits.check(received):
+                raise ucretrieve.BodyTooLargeError(
+                    url,
+                    limits.max_body_bytes or 0,
+                )
+            body.write(chunk)
+    except requests.exceptions.RequestException as err:
+        body.close()
+        raise RequestError(url, err)
+    except BaseException:
+        body.close()
+        raise
+    body.seek(0)
+    return body
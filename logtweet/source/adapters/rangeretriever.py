@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+
+"""Defines a retriever that only downloads what was appended to a log."""
+
+import re
+from typing import Dict, Optional
+
+import requests
+
+from logtweet import transport as httptransport
+from logtweet.source.adapters import httpcache
+from logtweet.source.adapters import onlineretriever as adaptonline
+
+
+CONTENT_RANGE_PATTERN = re.compile(r"bytes (?P<start>\d+)-\d+/(?:\d+|\*)")
+
+
+class IncrementalOnlineSourceContentRetriever(
+    adaptonline.OnlineSourceContentRetriever,
+):
+    """
+    Online log source that is fetched incrementally.
+
+    Logs only grow at the end. The retriever keeps a copy of the log it saw
+    last (with its length and checksum) in the cache. On the next retrieval it
+    only requests the bytes from shortly before the end of the copy with a
+    ``Range`` request. The re-requested overlap is compared to the end of the
+    copy to verify that the log was only appended to. The new tail is then
+    stitched onto the copy.
+
+    If the server ignores the range, the log shrank or the overlap does not
+    match, the log is fetched in full.
+
+    """
+
+    default_overlap = 1024
+
+    def __init__(
+        self,
+        valid_source: adaptonline.AbstractValidOnlineSource,
+        cache: httpcache.HTTPCache,
+        overlap: int = default_overlap,
+        transport: Optional[httptransport.Transport] = None,
+    ) -> None:
+        """
+        Initialize ``IncrementalOnlineSourceContentRetriever``.
+
+        Parameters
+        ----------
+        valid_source : adaptonline.AbstractValidOnlineSource
+            Valid online source object. The object needs to be an instance
+            of a subclass of `AbstractValidOnlineSource`.
+        cache : httpcache.HTTPCache
+            Cache to keep the copy of the log in.
+        overlap : int
+            Number of bytes before the end of the copy that are requested
+            again to verify the log was only appended to.
+        transport : Optional[httptransport.Transport]
+            Transport to send the requests through. Default is ``None``, in
+            which case the process wide default transport is used.
+
+        """
+        super().__init__(valid_source, cache, transport)
+        self.cache: httpcache.HTTPCache
+        self.overlap = overlap
+
+    def get_content(self) -> str:
+        """
+        Get content from online source, downloading only the new tail.
+
+        Returns
+        -------
+        str
+            Content string of the complete log.
+
+        Raises
+        ------
+        RequestError
+            When the network connection to the URL target fails.
+        HTTPStatusError
+            When the source host responds with an error status code (e.g. 404).
+
+        """
+        url = self.valid_source.url
+        cached_response = self.cache.load(url)
+        updated_response = None
+        if cached_response is not None:
+            updated_response = self._fetch_tail(cached_response)
+        if updated_response is None:
+            updated_response = self._fetch_full()
+        self.cache.store(updated_response, revalidatable_only=False)
+        return updated_response.text
+
+    def _fetch_tail(
+        self,
+        cached_response: httpcache.CachedResponse,
+    ) -> Optional[httpcache.CachedResponse]:
+        """
+        Fetch the new tail of the log and stitch it onto the cached copy.
+
+        Parameters
+        ----------
+        cached_response : httpcache.CachedResponse
+            Cached copy of the log.
+
+        Returns
+        -------
+        Optional[httpcache.CachedResponse]
+            Updated copy of the log. ``None`` if the log needs to be fetched in
+            full.
+
+        """
+        start = max(0, len(cached_response.body) - self.overlap)
+        response = self._get({
+            "Range": "bytes={0}-".format(start),
+            # Byte ranges refer to the encoded body. Only request the
+            # unencoded body so that the ranges match the cached copy.
+            "Accept-Encoding": "identity",
+        })
+        if response.status_code == 416:
+            # The log is shorter than the cached copy.
+            return None
+        self._raise_for_status(response)
+        if response.status_code != 206:
+            # The server ignored the range and sent the full log.
+            return httpcache.CachedResponse.from_response(
+                self.valid_source.url,
+                response,
+            )
+
+        match = CONTENT_RANGE_PATTERN.match(
+            response.headers.get("Content-Range", ""),
+        )
+        if match is None or int(match.group("start")) != start:
+            return None
+        overlap_bytes = cached_response.body[start:]
+        if not response.content.startswith(overlap_bytes):
+            # The log was changed, not only appended to.
+            return None
+        return cached_response._replace(
+            body=cached_response.body[:start] + response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    def _fetch_full(self) -> httpcache.CachedResponse:
+        response = self._get({})
+        self._raise_for_status(response)
+        return httpcache.CachedResponse.from_response(
+            self.valid_source.url,
+            response,
+        )
+
+    def _get(self, headers: Dict[str, str]) -> requests.Response:
+        try:
+            return self.transport.get(self.valid_source.url, headers=headers)
+        except requests.exceptions.RequestException as err:
+            raise adaptonline.RequestError(self.valid_source.url, err)
+
+    def _raise_for_status(self, response: requests.Response) -> None:
+        try:
+            response.raise_for_status()
+        except requests.exceptions.HTTPError:
+            raise adaptonline.HTTPStatusError(
+                self.valid_source.url,
+                response.status_code,
+            )
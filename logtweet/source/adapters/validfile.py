@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+"""Defines class representing a valid local file."""
+
+import os
+
+from logtweet.source.usecases import retrieve as ucretrieve
+from logtweet.source.adapters import fileretriever as adaptfile
+
+
+class NotAFileError(ucretrieve.SourceValidationError):
+    """Raised when a source string is expected to be a file but is not."""
+
+    def __init__(self, source_string: str = ""):
+        """
+        Initialize `NotAFileError`.
+
+        Parameters
+        ----------
+        source_string : str
+            Provide the source string that is not a file.
+            Optional argument. Defaults to empty string. If not provided,
+            the source string is not shown to the user.
+
+        """
+        self.source_string = source_string
+
+        # Add parenthesis around source string only if not empty.
+        source_string_in_msg = ""
+        if self.source_string:
+            source_string_in_msg = "'{0}'".format(source_string)
+
+        self.message = "The given source string {0} is not a file!".format(
+            source_string_in_msg,
+        )
+        super().__init__(self.message)
+
+
+class ValidSourceFile(adaptfile.AbstractValidFileSource):
+    """Valid local file class."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Initialize `ValidSourceFile`.
+
+        Parameters
+        ----------
+        path : str
+            Path of the file to validate. May have a ``file://`` prefix.
+
+        Raises
+        ------
+        NotAFileError
+            Raised if the passed path is not an existing file.
+
+        """
+        try:
+            super().__init__(path)
+        except ucretrieve.SourceValidationError:
+            raise NotAFileError(path)
+
+    @staticmethod
+    def is_valid(path: str) -> bool:  # noqa: WPS602
+        """
+        Check if the given path is an existing file.
+
+        Parameters
+        ----------
+        path : str
+            Path that is to be validated. May have a ``file://`` prefix.
+
+        Returns
+        -------
+        bool
+             Expresses if the given path is an existing file.
+
+        """
+        return os.path.isfile(adaptfile.get_path_from_source_string(path))
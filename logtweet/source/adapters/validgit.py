@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+
+"""Defines class representing a valid git source."""
+
+import os
+
+from logtweet.source.usecases import retrieve as ucretrieve
+from logtweet.source.adapters import gitretriever as adaptgit
+
+
+class NotAGitSourceError(ucretrieve.SourceValidationError):
+    """Raised when a source string is expected to be a git source but is not."""
+
+    def __init__(self, source_string: str = ""):
+        """
+        Initialize `NotAGitSourceError`.
+
+        Parameters
+        ----------
+        source_string : str
+            Provide the source string that is not a git source.
+            Optional argument. Defaults to empty string. If not provided,
+            the source string is not shown to the user.
+
+        """
+        self.source_string = source_string
+
+        # Add parenthesis around source string only if not empty.
+        source_string_in_msg = ""
+        if self.source_string:
+            source_string_in_msg = "'{0}'".format(source_string)
+
+        self.message = (
+            "The given source string {0}".format(source_string_in_msg)
+            + " is not a git source of the form 'repo_path@ref:path'!"
+        )
+        super().__init__(self.message)
+
+
+class ValidGitSource(adaptgit.AbstractValidGitSource):
+    """Valid git source class."""
+
+    def __init__(self, source_string: str) -> None:
+        """
+        Initialize `ValidGitSource`.
+
+        Parameters
+        ----------
+        source_string : str
+            Source string to validate, in the form ``repo_path@ref:path``.
+
+        Raises
+        ------
+        NotAGitSourceError
+            Raised if the source string does not name a file in a local
+            repository.
+
+        """
+        try:
+            super().__init__(source_string)
+        except ucretrieve.SourceValidationError:
+            raise NotAGitSourceError(source_string)
+
+    @staticmethod
+    def is_valid(source_string: str) -> bool:  # noqa: WPS602
+        """
+        Check if the source string names a file in a local repository.
+
+        Only the form of the source string and the existence of the
+        repository are checked. The ref and the path are resolved when the
+        content is retrieved.
+
+        Parameters
+        ----------
+        source_string : str
+            Source string that is to be validated.
+
+        Returns
+        -------
+        bool
+             Expresses if the source string is a valid git source.
+
+        """
+        spec = adaptgit.parse_git_source_string(source_string)
+        if spec is None:
+            return False
+        repo_path = spec.repo_path
+        is_work_tree = os.path.exists(os.path.join(repo_path, ".git"))
+        is_bare = (
+            os.path.isfile(os.path.join(repo_path, "HEAD"))
+            and os.path.isdir(os.path.join(repo_path, "objects"))
+        )
+        return is_work_tree or is_bare
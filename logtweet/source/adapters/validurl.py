@@ -2,12 +2,22 @@
 
 """Defines class representing a valid url."""
 
+import functools
+import re
+from typing import Iterable, List
+
 import validators  # type: ignore
 
 from logtweet.source.usecases import retrieve as ucretrieve
 from logtweet.source.adapters import onlineretriever as adaptonline
 
 
+# Cheap check that rejects most non-URLs (e.g. file paths) before the full
+# validation. Every URL accepted by ``validators.url`` also matches.
+URL_PREFILTER_PATTERN = re.compile(r"^[a-z0-9+.-]+://\S+$", re.IGNORECASE)
+VALIDATION_CACHE_SIZE = 16384
+
+
 class NotAUrlError(ucretrieve.SourceValidationError):
     """Raised when a source string is expected to be a URL but is not."""
 
@@ -75,7 +85,89 @@ class ValidSourceURL(adaptonline.AbstractValidOnlineSource):
              Expresses if the given URL is valid.
 
         """
-        is_url = validators.url(url)
-        if is_url is not True:
-            return False
-        return True
+        return is_url(url)
+
+
+class InvalidSourcesError(ucretrieve.SourceValidationError):
+    """Raised when some of the source strings of a batch are not URLs."""
+
+    def __init__(self, invalid_sources: List[str]):
+        """
+        Initialize `InvalidSourcesError`.
+
+        Parameters
+        ----------
+        invalid_sources : List[str]
+            All source strings of the batch that are not URLs.
+
+        """
+        self.invalid_sources = invalid_sources
+        self.message = "The following {0} source strings are not URLs:\n{1}".format(
+            len(invalid_sources),
+            "\n".join(invalid_sources),
+        )
+        super().__init__(self.message)
+
+
+@functools.lru_cache(maxsize=VALIDATION_CACHE_SIZE)
+def is_url(url: str) -> bool:
+    """
+    Check if the given string is a URL.
+
+    Results are memoized, so repeated validation of the same string (e.g.
+    by ``is_valid`` and again by the initialization of ``ValidSourceURL``)
+    is only done once.
+
+    Parameters
+    ----------
+    url : str
+        String that is to be validated.
+
+    Returns
+    -------
+    bool
+        Expresses if the given string is a URL.
+
+    """
+    if not URL_PREFILTER_PATTERN.match(url):
+        return False
+    return validators.url(url) is True
+
+
+def validate_source_urls(source_strings: Iterable[str]) -> List[ValidSourceURL]:
+    """
+    Validate many source strings as URLs in one pass.
+
+    Parameters
+    ----------
+    source_strings : Iterable[str]
+        Source strings to validate.
+
+    Returns
+    -------
+    List[ValidSourceURL]
+        One valid URL object per source string, in the given order.
+
+    Raises
+    ------
+    TypeError
+        If one of the source strings is not of type `str`.
+    InvalidSourcesError
+        If any of the source strings is not a URL. All invalid source
+        strings are listed on the error, in the given order.
+
+    """
+    source_strings = list(source_strings)
+    for source_string in source_strings:
+        if not isinstance(source_string, str):
+            raise TypeError(
+                "Expected str, got {0}".format(type(source_string)),
+            )
+    invalid_sources = [
+        source_string
+        for source_string in source_strings
+        if not is_url(source_string)
+    ]
+    if invalid_sources:
+        raise InvalidSourcesError(invalid_sources)
+    return [ValidSourceURL(source_string) for source_string in source_strings]
@@ -7,12 +7,64 @@ This is the entry point to the retrieve usecase.
 
 """
 
+import asyncio
+from concurrent import futures
+import datetime
+import re
+import typing
+
+from logtweet import transport as httptransport
 from logtweet.source.usecases import retrieve as ucretrieve
+from logtweet.source.adapters import asynconline as adaptasync
+from logtweet.source.adapters import compressedfile as adaptcompressed
+from logtweet.source.adapters import fileretriever as adaptfile
+from logtweet.source.adapters import gitretriever as adaptgit
+from logtweet.source.adapters import httpcache
+from logtweet.source.adapters import limits as adaptlimits
+from logtweet.source.adapters import memorycache
+from logtweet.source.adapters import mirrorstats
 from logtweet.source.adapters import onlineretriever as adaptonline
+from logtweet.source.adapters import rangeretriever as adaptrange
+from logtweet.source.adapters import validfile as adaptvalidfile
+from logtweet.source.adapters import validgit as adaptvalidgit
 from logtweet.source.adapters import validurl as adapturl
 
 
-def get_log_content_from_source(source_string: str) -> str:
+# Mirrors retrieved at the same time: the fastest known one and a backup.
+MIRROR_CONCURRENCY = 2
+
+
+class UnknownSourceTypeError(ucretrieve.SourceValidationError):
+    """Raised when a source string is not of any known source type."""
+
+    def __init__(self, source_string: str):
+        """
+        Initialize `UnknownSourceTypeError`.
+
+        Parameters
+        ----------
+        source_string : str
+            The source string whose type could not be detected.
+
+        """
+        self.source_string = source_string
+        self.message = (
+            "The given source string '{0}'".format(source_string)
+            + " is neither a URL nor an existing file"
+            + " nor a git source of the form 'repo_path@ref:path'!"
+        )
+        super().__init__(self.message)
+
+
+def get_log_content_from_source(
+    source_string: str,
+    cache_dir: typing.Optional[str] = None,
+    transport: typing.Optional[httptransport.Transport] = None,
+    day_date: typing.Optional[datetime.date] = None,
+    incremental: bool = False,
+    memory_cache: typing.Optional[memorycache.MemoryCache] = None,
+    limits: typing.Optional[adaptlimits.RetrievalLimits] = None,
+) -> str:
     """
     Return log content from the source identified by the source string.
 
@@ -20,8 +72,35 @@ def get_log_content_from_source(source_string: str) -> str:
     ----------
     source_string : str
         String defining the source from which to retrieve the content.
-        Currently, the source string has to be a valid url. But, this will
-        be extended to allow local file paths in the future.
+        The source string can be a URL, the path of a local file or a file in
+        a local git repository (``repo_path@ref:path``).
+    cache_dir : Optional[str]
+        Directory of the on-disk HTTP cache. If given, retrieved content is
+        cached there and only downloaded again if it changed on the source.
+        Default is ``None``, in which case no cache is used.
+    transport : Optional[httptransport.Transport]
+        Transport to send requests through. Default is ``None``, in which case
+        the process wide default transport is used.
+    day_date : Optional[datetime.date]
+        Date of the day the content is needed for. If given, only the section
+        of that day is returned. Online content is streamed and the download
+        stops as soon as the section is complete. Local files are read
+        backwards from the end until the section is found. Default is
+        ``None``, in which case the full content is returned.
+    incremental : bool
+        Only download what was appended to the log since the last retrieval,
+        using ``Range`` requests. Requires ``cache_dir`` to keep the copy of
+        the log. Not used if ``day_date`` is given. Default is ``False``.
+    memory_cache : Optional[memorycache.MemoryCache]
+        In-memory cache for long-running processes. Fresh content is
+        returned from it without retrieval and stale content is returned
+        while it is refreshed in the background. Default is ``None``, in
+        which case every call retrieves the content.
+    limits : Optional[adaptlimits.RetrievalLimits]
+        Size limits of the content. Downloads are spooled to a temporary file
+        above the threshold and content above the maximum is rejected with a
+        ``BodyTooLargeError``. Default is ``None``, in which case the size is
+        not limited.
 
     Returns
     -------
@@ -29,10 +108,270 @@ def get_log_content_from_source(source_string: str) -> str:
         Content string retrieved from the source.
 
     """
-    # TODO: Allow source to be local file. Handle the two possible types.
-    #       To allow the two source types, detect source type, then create the
-    #       appropriate retriever object and call the use case with the
-    #       created retriever.
-    validurl = adapturl.ValidSourceURL(source_string)
-    retriever = adaptonline.OnlineSourceContentRetriever(validurl)
+    retriever = create_source_content_retriever(
+        source_string,
+        cache_dir,
+        transport,
+        day_date,
+        incremental,
+        limits,
+    )
+    if memory_cache is not None:
+        retriever = memorycache.CachingSourceContentRetriever(
+            retriever,
+            memory_cache,
+            key=(source_string, day_date),
+        )
     return ucretrieve.get_log_content_from_source(retriever)
+
+
+def get_log_content_from_mirrors(
+    source_strings: typing.Iterable[str],
+    cache_dir: typing.Optional[str] = None,
+    transport: typing.Optional[httptransport.Transport] = None,
+    day_date: typing.Optional[datetime.date] = None,
+    incremental: bool = False,
+    stats_path: typing.Optional[str] = None,
+    limits: typing.Optional[adaptlimits.RetrievalLimits] = None,
+    max_concurrency: typing.Optional[int] = MIRROR_CONCURRENCY,
+) -> str:
+    """
+    Return log content from the fastest of several mirrors of the log.
+
+    The mirrors are retrieved concurrently, fastest known mirror first, and
+    the first non-empty content is returned. Further mirrors are only
+    requested when one of the running retrievals fails. The latency of each
+    mirror is recorded, so that the fastest mirrors are tried first on the
+    next run.
+
+    Parameters
+    ----------
+    source_strings : Iterable[str]
+        Source strings of the mirrors. Each can be a URL or the path of a
+        local file.
+    cache_dir : Optional[str]
+        Directory of the on-disk HTTP cache. See
+        ``get_log_content_from_source``.
+    transport : Optional[httptransport.Transport]
+        Transport to send requests through. See
+        ``get_log_content_from_source``.
+    day_date : Optional[datetime.date]
+        Date of the day the content is needed for. See
+        ``get_log_content_from_source``.
+    incremental : bool
+        Retrieve online sources with ``Range`` requests. See
+        ``get_log_content_from_source``.
+    stats_path : Optional[str]
+        Path of the JSON file with the latency statistics of the mirrors.
+        Default is ``None``, in which case ``mirrorstats.STATS_PATH`` is used.
+    limits : Optional[adaptlimits.RetrievalLimits]
+        Size limits of the content. See ``get_log_content_from_source``.
+    max_concurrency : Optional[int]
+        Maximum number of mirrors retrieved at the same time. Default is 2.
+        If ``None``, all mirrors are retrieved at once.
+
+    Returns
+    -------
+    str
+        Content string retrieved from the first successful mirror.
+
+    """
+    retrievers = [
+        create_source_content_retriever(
+            source_string,
+            cache_dir,
+            transport,
+            day_date,
+            incremental,
+            limits,
+        )
+        for source_string in source_strings
+    ]
+    return ucretrieve.get_log_content_from_mirrors(
+        retrievers,
+        mirrorstats.JSONMirrorLatencyStats(stats_path),
+        max_concurrency,
+    )
+
+
+def parse_source_strings(source_option: str) -> typing.List[str]:
+    """
+    Return the source strings defined by the ``source`` config option.
+
+    Parameters
+    ----------
+    source_option : str
+        Value of the ``source`` option. Mirrors of the log are separated by
+        commas or line breaks.
+
+    Returns
+    -------
+    List[str]
+        Non-empty source strings, in the configured order.
+
+    """
+    return [
+        source_string.strip()
+        for source_string in re.split(r"[,\n]", source_option)
+        if source_string.strip()
+    ]
+
+
+def create_source_content_retriever(
+    source_string: str,
+    cache_dir: typing.Optional[str] = None,
+    transport: typing.Optional[httptransport.Transport] = None,
+    day_date: typing.Optional[datetime.date] = None,
+    incremental: bool = False,
+    limits: typing.Optional[adaptlimits.RetrievalLimits] = None,
+) -> ucretrieve.AbstractSourceContentRetriever:
+    """
+    Create the retriever matching the type of the source string.
+
+    URLs are retrieved online. Paths of existing files (optionally with a
+    ``file://`` prefix) are read from the local file system. Files ending in
+    ``.gz``, ``.bz2`` or ``.zst`` are decompressed while reading. Source
+    strings of the form ``repo_path@ref:path`` are read from the object store
+    of the local git repository. The options are
+    described in ``get_log_content_from_source``.
+
+    Parameters
+    ----------
+    source_string : str
+        String defining the source from which to retrieve the content.
+    cache_dir : Optional[str]
+        Directory of the on-disk HTTP cache. Only used for online sources.
+    transport : Optional[httptransport.Transport]
+        Transport to send requests through. Only used for online sources.
+    day_date : Optional[datetime.date]
+        Date of the day the content is needed for.
+    incremental : bool
+        Retrieve online sources with ``Range`` requests.
+    limits : Optional[adaptlimits.RetrievalLimits]
+        Size limits of the content. Not used for incremental retrieval and
+        git sources.
+
+    Returns
+    -------
+    ucretrieve.AbstractSourceContentRetriever
+        Retriever for the source.
+
+    Raises
+    ------
+    UnknownSourceTypeError
+        If the source string is neither a URL nor the path of an existing
+        file nor a git source.
+
+    """
+    if adaptvalidfile.ValidSourceFile.is_valid(source_string):
+        validfile = adaptvalidfile.ValidSourceFile(source_string)
+        if adaptcompressed.is_compressed(validfile.path):
+            return adaptcompressed.CompressedLocalFileSourceContentRetriever(
+                validfile,
+                day_date,
+                limits=limits,
+            )
+        if day_date is not None:
+            return adaptfile.TailSeekingLocalFileSourceContentRetriever(
+                validfile,
+                day_date,
+            )
+        return adaptfile.LocalFileSourceContentRetriever(
+            validfile,
+            limits=limits,
+        )
+    if adaptvalidgit.ValidGitSource.is_valid(source_string):
+        return adaptgit.GitSourceContentRetriever(
+            adaptvalidgit.ValidGitSource(source_string),
+        )
+    if not adapturl.ValidSourceURL.is_valid(source_string):
+        raise UnknownSourceTypeError(source_string)
+
+    validurl = adapturl.ValidSourceURL(source_string)
+    if day_date is not None:
+        return adaptonline.StreamingOnlineSourceContentRetriever(
+            validurl,
+            day_date,
+            transport=transport,
+            limits=limits,
+        )
+    if incremental and cache_dir:
+        return adaptrange.IncrementalOnlineSourceContentRetriever(
+            validurl,
+            httpcache.HTTPCache(cache_dir),
+            transport=transport,
+        )
+    cache = httpcache.HTTPCache(cache_dir) if cache_dir else None
+    return adaptonline.OnlineSourceContentRetriever(
+        validurl,
+        cache,
+        transport,
+        limits,
+    )
+
+
+def get_log_contents_from_sources(
+    source_strings: typing.Iterable[str],
+    max_concurrency: int = 50,
+    cache_dir: typing.Optional[str] = None,
+    transport: typing.Optional[httptransport.Transport] = None,
+) -> typing.List[ucretrieve.SourceContentResult]:
+    """
+    Return log contents from many sources, retrieved concurrently.
+
+    Parameters
+    ----------
+    source_strings : Iterable[str]
+        Strings defining the sources from which to retrieve the content.
+        Currently, the source strings have to be valid urls.
+    max_concurrency : int
+        Maximum number of retrievals running at the same time. Default is 50.
+        The pool size of the transport should be at least as large if many
+        sources share a host.
+    cache_dir : Optional[str]
+        Directory of the on-disk HTTP cache. See
+        ``get_log_content_from_source``.
+    transport : Optional[httptransport.Transport]
+        Transport to send requests through. Default is ``None``, in which case
+        the process wide default transport is used.
+
+    Returns
+    -------
+    List[ucretrieve.SourceContentResult]
+        One result per source string, in the order of the source strings.
+        Sources that are not valid or could not be retrieved have the error
+        set instead of the content.
+
+    """
+    cache = httpcache.HTTPCache(cache_dir) if cache_dir else None
+    results: typing.List[typing.Optional[ucretrieve.SourceContentResult]] = []
+    retrievers = []
+    with futures.ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        for source_string in source_strings:
+            try:
+                validurl = adapturl.ValidSourceURL(source_string)
+            except (TypeError, ucretrieve.SourceValidationError) as err:
+                results.append(
+                    ucretrieve.SourceContentResult(source_string, error=err),
+                )
+                continue
+            results.append(None)
+            retrievers.append(adaptasync.AsyncOnlineSourceContentRetriever(
+                validurl,
+                cache,
+                transport,
+                executor,
+            ))
+
+        loop = asyncio.new_event_loop()
+        try:
+            retrieved = iter(loop.run_until_complete(
+                ucretrieve.get_log_contents_from_sources(
+                    retrievers,
+                    max_concurrency,
+                ),
+            ))
+        finally:
+            loop.close()
+
+    return [result or next(retrieved) for result in results]
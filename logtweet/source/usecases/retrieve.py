@@ -3,6 +3,11 @@
 """Retrieve log content from a source."""
 
 import abc
+import asyncio
+import contextlib
+from concurrent import futures
+import time
+import typing
 
 
 class SourceValidationError(Exception):
@@ -82,6 +87,30 @@ class SourceContentRetrievalError(Exception):
     """
 
 
+class BodyTooLargeError(SourceContentRetrievalError):
+    """Raised when the content of a source exceeds the maximum size."""
+
+    def __init__(self, source_string: str, max_bytes: int):
+        """
+        Initialize `BodyTooLargeError`.
+
+        Parameters
+        ----------
+        source_string : str
+            Source whose content is too large.
+        max_bytes : int
+            Maximum size of the content in bytes.
+
+        """
+        self.source_string = source_string
+        self.max_bytes = max_bytes
+        self.message = (
+            "The content of '{0}' is larger than".format(source_string)
+            + " the maximum of {0} bytes!".format(max_bytes)
+        )
+        super().__init__(self.message)
+
+
 class AbstractSourceContentRetriever(abc.ABC):
     """
     Abstract source content retriever class.
@@ -178,3 +207,345 @@ def get_log_content_from_source(
             + " got {0}".format(type(source_content_retriever)),
         )
     return source_content_retriever.get_content()
+
+
+class AbstractAsyncSourceContentRetriever(abc.ABC):
+    """
+    Abstract asynchronous source content retriever class.
+
+    This is the asynchronous counterpart of `AbstractSourceContentRetriever`.
+    Its `get_content` method is a coroutine, so that the content of many
+    sources can be retrieved concurrently.
+
+    """
+
+    valid_source_type = AbstractValidSource
+
+    def __init__(self, valid_source: AbstractValidSource) -> None:
+        """
+        Initialize AbstractAsyncSourceContentRetriever.
+
+        Parameters
+        ----------
+        valid_source: AbstractValidSource
+            `AbstractValidSource` instance. If this is missing, the
+            `AsyncSourceContentRetriever` can not be initialized.
+
+        Raises
+        ------
+        TypeError
+            If the `valid_source` is not an instance of a subclass of
+            `AbstractValidSource`.
+
+        """
+        if not isinstance(valid_source, self.valid_source_type):
+            raise TypeError(
+                "Expected {0}".format(self.valid_source_type)
+                + ", got {0}".format(type(valid_source)),
+            )
+        self.valid_source = valid_source
+
+    @abc.abstractmethod
+    async def get_content(self) -> str:
+        """
+        Return content string from the source.
+
+        # noqa: DAR402
+
+        Raises
+        ------
+        SourceContentRetrievalError
+            This exception or any of its child exceptions may be raised if
+            something went wrong during the content retrieval.
+
+        """
+
+
+class SourceContentResult(typing.NamedTuple):
+    """Outcome of the content retrieval of one source."""
+
+    source_string: str
+    content: typing.Optional[str] = None
+    error: typing.Optional[Exception] = None
+
+
+async def get_log_contents_from_sources(
+    source_content_retrievers: typing.Iterable[
+        AbstractAsyncSourceContentRetriever
+    ],
+    max_concurrency: int = 50,
+) -> typing.List[SourceContentResult]:
+    """
+    Get log contents from many sources concurrently.
+
+    Parameters
+    ----------
+    source_content_retrievers: Iterable[AbstractAsyncSourceContentRetriever]
+        Instances of implementations of `AbstractAsyncSourceContentRetriever`,
+        one per source.
+    max_concurrency: int
+        Maximum number of retrievals running at the same time. Default is 50.
+
+    Returns
+    -------
+    List[SourceContentResult]
+        One result per retriever, in the order of the retrievers. If the
+        retrieval of a source failed with a `SourceContentRetrievalError`, the
+        error is set on its result instead of the content. The retrieval of
+        the other sources is not affected.
+
+    Raises
+    ------
+    TypeError
+        If one of the passed retrievers is not of correct type
+        `AbstractAsyncSourceContentRetriever`.
+    ValueError
+        If `max_concurrency` is not positive.
+
+    """
+    retrievers = list(source_content_retrievers)
+    for retriever in retrievers:
+        if not isinstance(retriever, AbstractAsyncSourceContentRetriever):
+            raise TypeError(
+                "Expected {0}".format(AbstractAsyncSourceContentRetriever)
+                + " got {0}".format(type(retriever)),
+            )
+    if max_concurrency < 1:
+        raise ValueError("Maximum concurrency needs to be positive.")
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def retrieve(
+        retriever: AbstractAsyncSourceContentRetriever,
+    ) -> SourceContentResult:
+        source_string = retriever.valid_source.source_string
+        async with semaphore:
+            try:
+                content = await retriever.get_content()
+            except SourceContentRetrievalError as err:
+                return SourceContentResult(source_string, error=err)
+        return SourceContentResult(source_string, content=content)
+
+    return list(await asyncio.gather(
+        *(retrieve(retriever) for retriever in retrievers),
+    ))
+
+
+class AllMirrorsFailedError(SourceContentRetrievalError):
+    """Raised when the content could not be retrieved from any mirror."""
+
+    def __init__(self, errors: typing.Dict[str, Exception]):
+        """
+        Initialize `AllMirrorsFailedError`.
+
+        Parameters
+        ----------
+        errors : Dict[str, Exception]
+            Error of each mirror, by source string.
+
+        """
+        self.errors = errors
+        self.message = "The content could not be retrieved from any mirror!"
+        for source_string, err in errors.items():
+            self.message += "\n{0}: {1}".format(source_string, err)
+        super().__init__(self.message)
+
+
+class AbstractMirrorLatencyStats(abc.ABC):
+    """
+    Abstract latency statistics of mirrors.
+
+    The statistics are used to try the fastest mirrors first. Implementations
+    need to be safe to use from multiple threads.
+
+    """
+
+    @abc.abstractmethod
+    def get_latency(self, source_string: str) -> typing.Optional[float]:
+        """
+        Return the expected latency of a mirror.
+
+        # noqa: DAR202
+
+        Parameters
+        ----------
+        source_string : str
+            Source string of the mirror.
+
+        Returns
+        -------
+        Optional[float]
+            Expected latency in seconds. ``None`` if the mirror is unknown.
+
+        """
+
+    @abc.abstractmethod
+    def record(
+        self,
+        source_string: str,
+        latency: typing.Optional[float],
+    ) -> None:
+        """
+        Record the outcome of a retrieval from a mirror.
+
+        Parameters
+        ----------
+        source_string : str
+            Source string of the mirror.
+        latency : Optional[float]
+            Duration of the successful retrieval in seconds. ``None`` if the
+            retrieval failed.
+
+        """
+
+    def sort(
+        self,
+        source_strings: typing.Iterable[str],
+    ) -> typing.List[str]:
+        """
+        Sort mirrors by their expected latency, fastest first.
+
+        Unknown mirrors are expected to have the mean latency of the known
+        mirrors, so that they get measured without always being tried first.
+
+        Parameters
+        ----------
+        source_strings : Iterable[str]
+            Source strings of the mirrors.
+
+        Returns
+        -------
+        List[str]
+            Source strings sorted by expected latency. The order of mirrors
+            with the same latency is kept.
+
+        """
+        source_strings = list(source_strings)
+        latencies = {
+            source_string: self.get_latency(source_string)
+            for source_string in source_strings
+        }
+        known = [
+            latency for latency in latencies.values() if latency is not None
+        ]
+        mean_latency = sum(known) / len(known) if known else 0.0
+
+        def get_expected_latency(source_string: str) -> float:
+            latency = latencies[source_string]
+            return mean_latency if latency is None else latency
+
+        return sorted(source_strings, key=get_expected_latency)
+
+    def save(self) -> None:
+        """
+        Persist the recorded latencies.
+
+        Called after every recorded outcome. By default, nothing is
+        persisted.
+
+        """
+
+
+def get_log_content_from_mirrors(
+    source_content_retrievers: typing.Iterable[AbstractSourceContentRetriever],
+    latency_stats: typing.Optional[AbstractMirrorLatencyStats] = None,
+    max_concurrency: typing.Optional[int] = None,
+) -> str:
+    """
+    Get log content from the first mirror that returns it.
+
+    The retrievals are started concurrently, fastest known mirror first. The
+    first non-empty content wins. Any exception of a retrieval counts as the
+    failure of its mirror. Retrievals that have not started yet are
+    cancelled. Retrievals already running are not waited for; they end
+    within the timeouts of their transport. The outcome of every retrieval,
+    including the ones ending after the winner, is recorded and saved in the
+    latency statistics as soon as it is known.
+
+    Parameters
+    ----------
+    source_content_retrievers: Iterable[AbstractSourceContentRetriever]
+        One retriever per mirror of the same log.
+    latency_stats: Optional[AbstractMirrorLatencyStats]
+        Latency statistics to order the mirrors by and to record the
+        latencies in. Default is ``None``, in which case the given order is
+        kept and nothing is recorded.
+    max_concurrency: Optional[int]
+        Maximum number of retrievals running at the same time. Default is
+        ``None``, in which case all mirrors are tried at once.
+
+    Returns
+    -------
+    str
+        Content of the first successful mirror. Empty if all successful
+        mirrors returned empty content.
+
+    Raises
+    ------
+    TypeError
+        If one of the passed retrievers is not of correct type
+        `AbstractSourceContentRetriever`.
+    ValueError
+        If no retrievers are passed.
+    AllMirrorsFailedError
+        If the retrieval failed for all mirrors.
+
+    """
+    retrievers = {}
+    for retriever in source_content_retrievers:
+        if not isinstance(retriever, AbstractSourceContentRetriever):
+            raise TypeError(
+                "Expected {0}".format(AbstractSourceContentRetriever)
+                + " got {0}".format(type(retriever)),
+            )
+        retrievers[retriever.valid_source.source_string] = retriever
+    if not retrievers:
+        raise ValueError("At least one mirror is needed.")
+    source_strings = list(retrievers)
+    if latency_stats is not None:
+        source_strings = latency_stats.sort(source_strings)
+
+    def record(source_string: str, latency: typing.Optional[float]) -> None:
+        if latency_stats is None:
+            return
+        latency_stats.record(source_string, latency)
+        # The statistics only speed up the next run.
+        with contextlib.suppress(OSError):
+            latency_stats.save()
+
+    def retrieve(source_string: str) -> str:
+        start = time.monotonic()
+        try:
+            content = retrievers[source_string].get_content()
+        except Exception:  # noqa: B902
+            # Unexpected errors of one mirror are its failure, too.
+            record(source_string, None)
+            raise
+        record(source_string, time.monotonic() - start)
+        return content
+
+    executor = futures.ThreadPoolExecutor(
+        max_workers=max_concurrency or len(source_strings),
+    )
+    pending = {
+        executor.submit(retrieve, source_string): source_string
+        for source_string in source_strings
+    }
+    errors: typing.Dict[str, Exception] = {}
+    empty_content: typing.Optional[str] = None
+    try:
+        for future in futures.as_completed(pending):
+            try:
+                content = future.result()
+            except Exception as err:  # noqa: B902
+                errors[pending[future]] = err
+                continue
+            if content:
+                return content
+            empty_content = content
+    finally:
+        for remaining in pending:
+            remaining.cancel()
+        executor.shutdown(wait=False)
+    if empty_content is not None:
+        return empty_content
+    raise AllMirrorsFailedError(errors)
@@ -0,0 +1,346 @@
+# -*- coding: utf-8 -*-
+
+"""
+Shared HTTP transport for all network access of the app.
+
+The log retrieval, the link shortening and the sending of the tweet all talk
+to different hosts. The ``Transport`` keeps one pooled ``requests.Session``
+per host, so that connections are kept alive and reused across calls, and
+applies the same timeouts, proxies and retry policy to all of them.
+
+"""
+
+from concurrent import futures
+from configparser import SectionProxy
+import threading
+import typing
+from urllib import parse
+
+import requests
+from requests import adapters
+from urllib3.util import request as urlrequest
+from urllib3.util import retry as urlretry
+
+# Content codings urllib3 can decode in this environment. Brotli (``br``) and
+# Zstandard (``zstd``) are only offered if their optional packages are
+# installed (``pip install logtweet[compression]``).
+ACCEPT_ENCODING = ", ".join(urlrequest.ACCEPT_ENCODING.split(","))
+
+
+class TransportSettings(typing.NamedTuple):
+    """Settings shared by all connections of a ``Transport``."""
+
+    pool_connections: int = 10
+    pool_maxsize: int = 10
+    connect_timeout: float = 5.0
+    read_timeout: float = 30.0
+    retries: int = 2
+    backoff_factor: float = 0.3
+    http_proxy: typing.Optional[str] = None
+    https_proxy: typing.Optional[str] = None
+    prewarm: bool = True
+
+    @property
+    def timeout(self) -> typing.Tuple[float, float]:
+        """
+        Connect and read timeout as expected by ``requests``.
+
+        Returns
+        -------
+        Tuple[float, float]
+            Connect and read timeout in seconds.
+
+        """
+        return (self.connect_timeout, self.read_timeout)
+
+    @property
+    def proxies(self) -> typing.Dict[str, str]:
+        """
+        Proxies as expected by ``requests``.
+
+        Returns
+        -------
+        Dict[str, str]
+            Proxy URLs by scheme. Only contains the configured proxies.
+
+        """
+        proxies = {}
+        if self.http_proxy:
+            proxies["http"] = self.http_proxy
+        if self.https_proxy:
+            proxies["https"] = self.https_proxy
+        return proxies
+
+    @classmethod
+    def from_config(
+        cls,
+        section: typing.Optional[SectionProxy],
+    ) -> "TransportSettings":
+        """
+        Create settings from the ``Transport`` section of the config.
+
+        Parameters
+        ----------
+        section : Optional[SectionProxy]
+            Config section with the transport options. Options that are not
+            set fall back to the defaults. If ``None``, the defaults are used.
+
+        Returns
+        -------
+        TransportSettings
+            Settings defined by the config section.
+
+        """
+        defaults = cls()
+        if section is None:
+            return defaults
+        return cls(
+            pool_connections=section.getint(
+                "pool_connections",
+                defaults.pool_connections,
+            ),
+            pool_maxsize=section.getint("pool_maxsize", defaults.pool_maxsize),
+            connect_timeout=section.getfloat(
+                "connect_timeout",
+                defaults.connect_timeout,
+            ),
+            read_timeout=section.getfloat(
+                "read_timeout",
+                defaults.read_timeout,
+            ),
+            retries=section.getint("retries", defaults.retries),
+            backoff_factor=section.getfloat(
+                "backoff_factor",
+                defaults.backoff_factor,
+            ),
+            http_proxy=section.get("http_proxy", defaults.http_proxy),
+            https_proxy=section.get("https_proxy", defaults.https_proxy),
+            prewarm=section.getboolean("prewarm", defaults.prewarm),
+        )
+
+
+class Transport(object):
+    """Pooled HTTP sessions, one per host, with shared settings."""
+
+    def __init__(self, settings: typing.Optional[TransportSettings] = None):
+        """
+        Initialize ``Transport``.
+
+        Parameters
+        ----------
+        settings : Optional[TransportSettings]
+            Settings applied to all sessions. Default is ``None``, in which
+            case the default ``TransportSettings`` are used.
+
+        """
+        self.settings = settings or TransportSettings()
+        self._sessions: typing.Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, url: str) -> requests.Session:
+        """
+        Return the pooled session for the host of the URL.
+
+        Parameters
+        ----------
+        url : str
+            URL that a request is to be sent to.
+
+        Returns
+        -------
+        requests.Session
+            Session for the scheme and host of the URL. The same session is
+            returned for every URL of the same host.
+
+        """
+        split_url = parse.urlsplit(url)
+        host_key = "{0}://{1}".format(split_url.scheme, split_url.netloc)
+        with self._lock:
+            session = self._sessions.get(host_key)
+            if session is None:
+                session = self._create_session()
+                self._sessions[host_key] = session
+            return session
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        **kwargs: typing.Any,
+    ) -> requests.Response:
+        """
+        Send request through the pooled session of the URL's host.
+
+        Parameters
+        ----------
+        method : str
+            HTTP method, e.g. ``"GET"``.
+        url : str
+            URL to send the request to.
+        kwargs : Any
+            Keyword arguments passed on to ``requests.Session.request``. If no
+            ``timeout`` is given, the configured timeouts are used.
+
+        Returns
+        -------
+        requests.Response
+            Response to the request.
+
+        """
+        kwargs.setdefault("timeout", self.settings.timeout)
+        return self.get_session(url).request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs: typing.Any) -> requests.Response:
+        """
+        Send GET request. See ``request``.
+
+        Parameters
+        ----------
+        url : str
+            URL to send the request to.
+        kwargs : Any
+            Keyword arguments passed on to ``request``.
+
+        Returns
+        -------
+        requests.Response
+            Response to the request.
+
+        """
+        kwargs.setdefault("timeout", self.settings.timeout)
+        return self.get_session(url).get(url, **kwargs)
+
+    def post(self, url: str, **kwargs: typing.Any) -> requests.Response:
+        """
+        Send POST request. See ``request``.
+
+        Parameters
+        ----------
+        url : str
+            URL to send the request to.
+        kwargs : Any
+            Keyword arguments passed on to ``request``.
+
+        Returns
+        -------
+        requests.Response
+            Response to the request.
+
+        """
+        kwargs.setdefault("timeout", self.settings.timeout)
+        return self.get_session(url).post(url, **kwargs)
+
+    def prewarm(
+        self,
+        urls: typing.Iterable[str],
+    ) -> typing.List["futures.Future[bool]"]:
+        """
+        Open pooled connections to the hosts of the URLs in the background.
+
+        A ``HEAD`` request is sent to every host through its session, so DNS
+        resolution, the TCP connect and the TLS handshake of all hosts run in
+        parallel, while the caller continues. The connections are kept in the
+        pools of the sessions, so that later requests to the hosts reuse them.
+        Failures are ignored; the later request simply opens its own
+        connection. Nothing is pre-warmed if the ``prewarm`` setting is off.
+
+        The requests run in daemon threads, so a pre-warm that is still
+        waiting for a slow host does not hold up the exit of the app.
+
+        Parameters
+        ----------
+        urls : Iterable[str]
+            URLs of the hosts to connect to. Only one request per host is
+            sent. URLs that are not HTTP(S) are skipped.
+
+        Returns
+        -------
+        List[futures.Future[bool]]
+            One future per host, resolving to whether the host responded.
+            Callers do not need to wait for them.
+
+        """
+        host_urls: typing.Dict[str, str] = {}
+        if not self.settings.prewarm:
+            return []
+        for url in urls:
+            split_url = parse.urlsplit(url)
+            if split_url.scheme in {"http", "https"} and split_url.netloc:
+                host_key = "{0}://{1}".format(split_url.scheme, split_url.netloc)
+                host_urls.setdefault(host_key, url)
+        prewarm_futures: typing.List["futures.Future[bool]"] = []
+        for url in host_urls.values():
+            prewarm_future: "futures.Future[bool]" = futures.Future()
+            threading.Thread(
+                target=self._send_prewarm_request,
+                args=(url, prewarm_future),
+                daemon=True,
+            ).start()
+            prewarm_futures.append(prewarm_future)
+        return prewarm_futures
+
+    def close(self) -> None:
+        """Close all sessions and their pooled connections."""
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+
+    def _send_prewarm_request(
+        self,
+        url: str,
+        prewarm_future: "futures.Future[bool]",
+    ) -> None:
+        try:
+            response = self.request(
+                "HEAD",
+                url,
+                timeout=self.settings.timeout,
+                allow_redirects=False,
+            )
+        except Exception:  # noqa: B902
+            prewarm_future.set_result(False)
+            return
+        # Releases the connection to the pool of the session.
+        response.close()
+        prewarm_future.set_result(True)
+
+    def _create_session(self) -> requests.Session:
+        session = requests.Session()
+        retry = urlretry.Retry(
+            total=self.settings.retries,
+            backoff_factor=self.settings.backoff_factor,
+            status_forcelist=(502, 503, 504),
+            raise_on_status=False,
+        )
+        adapter = adapters.HTTPAdapter(
+            pool_connections=self.settings.pool_connections,
+            pool_maxsize=self.settings.pool_maxsize,
+            max_retries=retry,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.proxies.update(self.settings.proxies)
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        return session
+
+
+_default_transport: typing.Optional[Transport] = None
+_default_transport_lock = threading.Lock()
+
+
+def get_default_transport() -> Transport:
+    """
+    Return the transport shared by all callers that do not inject their own.
+
+    Returns
+    -------
+    Transport
+        Process wide transport with the default settings.
+
+    """
+    global _default_transport  # noqa: WPS420
+    with _default_transport_lock:
+        if _default_transport is None:
+            _default_transport = Transport()
+        return _default_transport
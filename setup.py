@@ -2,7 +2,7 @@
 
 """Setup script."""
 
-from setuptools import setup  # type: ignore
+from setuptools import find_packages, setup  # type: ignore
 
 with open("README.md", "r") as f:
     long_description = f.read()
@@ -10,10 +10,17 @@ with open("README.md", "r") as f:
 requires = [
     "bs4",
     "requests",
-    "tweepy",
+    # The API session and the Unauthorized error are only in tweepy 4.
+    "tweepy>=4",
     "validators",
 ]
 
+# Optional decoders for Brotli and Zstandard compressed logs.
+compression_requires = [
+    "brotli",
+    "zstandard",
+]
+
 develop_requires = [
     "wheel",
     # "twine" to upload to pypi in secure way.
@@ -34,12 +41,13 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/tbrlpld/logtweet",
-    python_requires=">=3.6",
+    python_requires=">=3.7",
     install_requires=requires,
     extras_require={
+        "compression": compression_requires,
         "develop": develop_requires,
     },
-    packages=["logtweet"],
+    packages=find_packages(exclude=["tests*"]),
     entry_points={
         "console_scripts": [
             "logtweet = logtweet.app:main",
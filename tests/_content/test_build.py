@@ -48,6 +48,28 @@ class TestMakePreamble(object):
             make_preamble(day_number)
 
 
+class TestGetDayNumberFromTweetContent(object):
+    """Tests for `get_day_number_from_tweet_content` function."""
+
+    def test_day_number_of_built_content(self) -> None:
+        """The day number of the preamble is returned."""
+        from logtweet._content import build
+        tweet_content = build.make_tweet_content(
+            build.make_preamble(77),
+            "Did 3 things.",
+            "https://bit.ly/x",
+        )
+
+        assert build.get_day_number_from_tweet_content(tweet_content) == 77
+
+    def test_exception_without_preamble(self) -> None:
+        """Content without a preamble has no day number."""
+        from logtweet._content import build
+
+        with pytest.raises(ValueError):
+            build.get_day_number_from_tweet_content("Did 3/#100DaysOfCode")
+
+
 class TestMakeTweetContent(object):
     """Tests for `make_tweet_content` function."""
 
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the incremental day section extraction."""
+
+from datetime import date
+
+import pytest  # type: ignore
+
+
+DAY_1 = """<h2>Day 1: October 16, 2019, Wednesday</h2>
+<h3>Today&#39;s Progress</h3>
+<p>First day.</p>
+"""
+DAY_2 = """<h2>Day 2: October 17, 2019, Thursday</h2>
+<h3>Today&#39;s Progress</h3>
+<p>Second day.</p>
+"""
+DAY_3 = """<h2>Day 3: October 18, 2019, Friday</h2>
+<h3>Today&#39;s Progress</h3>
+<p>Third day.</p>
+"""
+ASCENDING_LOG = "<h1>100 Days Of Code - Log</h1>\n" + DAY_1 + DAY_2 + DAY_3
+DESCENDING_LOG = "<h1>100 Days Of Code - Log</h1>\n" + DAY_3 + DAY_2 + DAY_1
+
+
+def feed_in_chunks(scanner, text, chunk_size):
+    """Feed text to the scanner in chunks until it is done."""
+    for start in range(0, len(text), chunk_size):
+        if scanner.feed(text[start:start + chunk_size]):
+            return start + chunk_size
+    scanner.close()
+    return len(text)
+
+
+class TestDaySectionScanner(object):
+    """Tests for the `DaySectionScanner` class."""
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+    @pytest.mark.parametrize(
+        "log, day_date, expected_section",
+        [
+            (ASCENDING_LOG, date(2019, 10, 16), DAY_1),
+            (ASCENDING_LOG, date(2019, 10, 17), DAY_2),
+            (ASCENDING_LOG, date(2019, 10, 18), DAY_3),
+            (DESCENDING_LOG, date(2019, 10, 18), DAY_3),
+            (DESCENDING_LOG, date(2019, 10, 16), DAY_1),
+        ],
+    )
+    def test_returns_day_section(
+        self,
+        log,
+        day_date,
+        expected_section,
+        chunk_size,
+    ):
+        """Section of the day is found independent of the chunk size."""
+        from logtweet._content.daysection import DaySectionScanner
+        scanner = DaySectionScanner(day_date)
+
+        feed_in_chunks(scanner, log, chunk_size)
+
+        assert scanner.found is True
+        assert scanner.section == expected_section
+
+    def test_stops_after_section_in_descending_log(self):
+        """Scan is done before the end of the log when the section ends."""
+        from logtweet._content.daysection import DaySectionScanner
+        scanner = DaySectionScanner(date(2019, 10, 18))
+
+        consumed = feed_in_chunks(scanner, DESCENDING_LOG, 10)
+
+        assert consumed < len(DESCENDING_LOG) - len(DAY_1)
+
+    @pytest.mark.parametrize(
+        "log, day_date",
+        [
+            (DESCENDING_LOG, date(2019, 10, 17)),
+            (ASCENDING_LOG, date(2019, 10, 17)),
+        ],
+    )
+    def test_stops_when_day_confirmed_missing(self, log, day_date):
+        """Scan is done once a heading past the missing day is seen."""
+        log = log.replace(DAY_2, "")
+        from logtweet._content.daysection import DaySectionScanner
+        scanner = DaySectionScanner(day_date)
+
+        consumed = feed_in_chunks(scanner, log + DAY_2 * 10, 10)
+
+        assert scanner.found is False
+        assert scanner.section == ""
+        assert consumed < len(log)
+
+    def test_missing_day_at_end_of_log(self):
+        """Section is empty if the day is not in the log."""
+        from logtweet._content.daysection import DaySectionScanner
+        scanner = DaySectionScanner(date(2019, 10, 19))
+
+        feed_in_chunks(scanner, ASCENDING_LOG, 10)
+
+        assert scanner.done is True
+        assert scanner.found is False
+        assert scanner.section == ""
+
+    def test_heading_with_attributes_and_markup(self):
+        """Headings with attributes and inner markup are recognized."""
+        log = (
+            '<h2 id="day-1"><em>Day 1: October 16, 2019, Wednesday</em></h2>'
+            + "<p>First day.</p>"
+        )
+        from logtweet._content.daysection import DaySectionScanner
+        scanner = DaySectionScanner(date(2019, 10, 16))
+
+        feed_in_chunks(scanner, log, 5)
+
+        assert scanner.section == log
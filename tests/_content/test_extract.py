@@ -73,6 +73,25 @@ class TestHeadingMatchesDate(object):
         assert actual_return == expected_return
 
 
+class TestGetDateFromHeadingString(object):
+    """Tests for `get_date_from_heading_string` function."""
+
+    def test_valid_heading(self):
+        """Return the date of the heading."""
+        from logtweet._content.extract import get_date_from_heading_string
+        actual_return = get_date_from_heading_string(
+            "Day 1: October 16, 2019, Wednesday",
+        )
+
+        assert actual_return == date(2019, 10, 16)
+
+    def test_exception_for_heading_without_date(self):
+        """Raise exception if the heading does not contain a date."""
+        from logtweet._content.extract import get_date_from_heading_string
+        with pytest.raises(ValueError):
+            get_date_from_heading_string("100 Days Of Code - Log")
+
+
 class TestGetDayHeading(object):
     """Tests for `get_day_heading`` function."""
 
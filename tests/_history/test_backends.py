@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the history store backends."""
+
+import datetime
+import typing
+
+import pytest  # type: ignore
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+    from logtweet._history import store as histstore
+
+
+@pytest.fixture(params=["text", "sqlite", "segmented"])  # type: ignore
+def history_store(
+    request: typing.Any,
+    tmp_path: "pathlib.Path",
+) -> typing.Iterator["histstore.AbstractHistoryStore"]:
+    """Return an empty store of each backend."""
+    from logtweet._history import segmented as histsegmented
+    from logtweet._history import sqlite as histsqlite
+    from logtweet._history import text as histtext
+
+    store: "histstore.AbstractHistoryStore"
+    if request.param == "text":
+        store = histtext.TextHistoryStore(str(tmp_path / "tweet.log"))
+    elif request.param == "sqlite":
+        store = histsqlite.SQLiteHistoryStore(str(tmp_path / "history.db"))
+    else:
+        store = histsegmented.SegmentedHistoryStore(
+            str(tmp_path / "history"),
+            max_segment_bytes=64,
+        )
+    with store:
+        yield store
+
+
+class TestHistoryStore(object):
+    """Tests shared by all history store backends."""
+
+    def test_empty_store_contains_nothing(
+        self,
+        history_store: "histstore.AbstractHistoryStore",
+    ) -> None:
+        """A new store does not contain any message."""
+        assert history_store.contains("A tweet.") is False
+        assert list(history_store.iter_entries()) == []
+
+    def test_contains_added_message(
+        self,
+        history_store: "histstore.AbstractHistoryStore",
+    ) -> None:
+        """Only added messages are in the history."""
+        history_store.add("A tweet.")
+        history_store.add("Another tweet.")
+
+        assert history_store.contains("A tweet.") is True
+        assert history_store.contains("Another tweet.") is True
+        assert history_store.contains("A new tweet.") is False
+
+    def test_entries_in_order_of_addition(
+        self,
+        history_store: "histstore.AbstractHistoryStore",
+    ) -> None:
+        """Entries keep their timestamp and order."""
+        sent_at = datetime.datetime(2020, 1, 31, 12, 30)
+        history_store.add("First tweet.", sent_at=sent_at)
+        history_store.add("Second tweet.")
+
+        entries = list(history_store.iter_entries())
+
+        assert [entry.message for entry in entries] == [
+            "First tweet.",
+            "Second tweet.",
+        ]
+        assert entries[0].sent_at == sent_at
+
+    def test_add_entries_in_bulk(
+        self,
+        history_store: "histstore.AbstractHistoryStore",
+    ) -> None:
+        """Entries added in bulk are kept with their timestamps and order."""
+        from logtweet._history import store as histstore
+        entries = [
+            histstore.HistoryEntry(
+                datetime.datetime(2020, 1, day),
+                "Tweet {0}.".format(day),
+            )
+            for day in range(1, 6)
+        ]
+
+        history_store.add_entries(entries)
+
+        assert list(history_store.iter_entries()) == entries
+        assert history_store.contains("Tweet 5.") is True
+
+    def test_entries_between_times(
+        self,
+        history_store: "histstore.AbstractHistoryStore",
+    ) -> None:
+        """Only entries sent in the half-open range are returned."""
+        start = datetime.datetime(2020, 1, 1)
+        for day in range(10):
+            history_store.add(
+                "Tweet of day {0}.".format(day),
+                sent_at=start + datetime.timedelta(days=day),
+            )
+
+        def get_days(
+            since: typing.Optional[datetime.datetime],
+            until: typing.Optional[datetime.datetime],
+        ) -> typing.List[int]:
+            return [
+                (entry.sent_at - start).days
+                for entry in history_store.iter_entries_between(since, until)
+            ]
+
+        assert get_days(
+            start + datetime.timedelta(days=3),
+            start + datetime.timedelta(days=6),
+        ) == [3, 4, 5]
+        assert get_days(start + datetime.timedelta(days=8, hours=1), None) == [9]
+        assert get_days(None, start + datetime.timedelta(days=2)) == [0, 1]
+        assert get_days(None, None) == list(range(10))
+        assert get_days(start + datetime.timedelta(days=20), None) == []
+
+
+class TestWrappedHistoryStore(object):
+    """Tests for the `WrappedHistoryStore` class."""
+
+    def test_delegates_and_tracks(
+        self,
+        history_store: "histstore.AbstractHistoryStore",
+    ) -> None:
+        """All methods use the wrapped store; added messages are tracked."""
+        from logtweet._history import store as histstore
+        tracked: typing.List[str] = []
+
+        class TrackingHistoryStore(histstore.WrappedHistoryStore):
+            def track(self, message: str) -> None:
+                tracked.append(message)
+
+        store = TrackingHistoryStore(history_store)
+        sent_at = datetime.datetime(2020, 1, 2, 3, 4, 5)
+        store.add("A tweet.", sent_at=sent_at)
+        store.add_entries([
+            histstore.HistoryEntry(sent_at, "Another tweet."),
+            histstore.HistoryEntry(sent_at, "A third tweet."),
+        ])
+
+        with store.locked("A tweet."):
+            found = store.contains("Another tweet.")
+
+        assert found is True
+        assert tracked == ["A tweet.", "Another tweet.", "A third tweet."]
+        assert [entry.message for entry in store.iter_entries()] == tracked
+        assert len(list(store.iter_entries_between(since=sent_at))) == 3
+        assert store.find_similar("A tweet.") == []
+
+
+class TestSQLiteHistoryStore(object):
+    """Tests specific to the `SQLiteHistoryStore`."""
+
+    def test_history_persists(self, tmp_path: "pathlib.Path") -> None:
+        """Messages are found after the database is opened again."""
+        from logtweet._history import sqlite as histsqlite
+        db_path = str(tmp_path / "nested" / "history.db")
+
+        with histsqlite.SQLiteHistoryStore(db_path) as first_store:
+            first_store.add("A tweet.")
+        with histsqlite.SQLiteHistoryStore(db_path) as second_store:
+            found = second_store.contains("A tweet.")
+
+        assert found is True
+
+    def test_lookup_uses_digest_index(self, tmp_path: "pathlib.Path") -> None:
+        """The lookup searches the index instead of scanning the table."""
+        from logtweet._history import sqlite as histsqlite
+        store = histsqlite.SQLiteHistoryStore(str(tmp_path / "history.db"))
+
+        plan = store._connection.execute(  # noqa: WPS437
+            "EXPLAIN QUERY PLAN SELECT message FROM tweets WHERE digest = ?",
+            (b"digest",),
+        ).fetchall()
+        store.close()
+
+        assert "tweets_digest" in str(plan)
+
+    def test_only_exact_message_found(self, tmp_path: "pathlib.Path") -> None:
+        """Unlike the text log, parts of a message are not found."""
+        from logtweet._history import sqlite as histsqlite
+
+        with histsqlite.SQLiteHistoryStore(str(tmp_path / "h.db")) as store:
+            store.add("A tweet with more text.")
+
+            assert store.contains("A tweet") is False
+
+    def test_text_export(self, tmp_path: "pathlib.Path") -> None:
+        """Added entries are also appended to the text export."""
+        from logtweet._history import sqlite as histsqlite
+        from logtweet._history import text as histtext
+        export_path = str(tmp_path / "tweet.log")
+
+        with histsqlite.SQLiteHistoryStore(
+            str(tmp_path / "history.db"),
+            text_export=export_path,
+        ) as store:
+            store.add("A tweet.")
+
+        assert histtext.TextHistoryStore(export_path).contains("A tweet.")
+
+
+class TestParseEntryLine(object):
+    """Tests for the `parse_entry_line` function."""
+
+    def test_formatted_line_parsed(self) -> None:
+        """Lines written by `format_entry_line` are parsed back."""
+        from logtweet._history import store as histstore
+        entry = histstore.HistoryEntry(
+            datetime.datetime(2020, 1, 31, 12, 30, 0, 1234),
+            "A tweet - Sent : with the separator.",
+        )
+
+        line = histstore.format_entry_line(entry)
+
+        assert histstore.parse_entry_line(line) == entry
+
+    def test_other_line_ignored(self) -> None:
+        """Lines without timestamp and separator are not entries."""
+        from logtweet._history import store as histstore
+
+        assert histstore.parse_entry_line("Just some text.\n") is None
+        assert histstore.parse_entry_line("yesterday - Sent : A tweet") is None
+
+
+class TestIsStringInFile(object):
+    """Tests for the memory-mapped `is_string_in_file` function."""
+
+    def test_found_like_line_by_line(self, tmp_path: "pathlib.Path") -> None:
+        """Results match a search in every line of the file."""
+        from logtweet._history import text as histtext
+        history_path = tmp_path / "tweet.log"
+        history_path.write_text("First line.\nSecond line ü.\n")
+        lines = history_path.read_text().splitlines(keepends=True)
+        search_strings = [
+            "Second line ü.",
+            "line.\n",
+            "First line.\nSecond",
+            "Third line.",
+            "",
+        ]
+
+        found = [
+            histtext.is_string_in_file(search_string, str(history_path))
+            for search_string in search_strings
+        ]
+
+        assert found == [
+            any(search_string in line for line in lines)
+            for search_string in search_strings
+        ]
+        assert found == [True, True, False, False, True]
+
+    def test_empty_file(self, tmp_path: "pathlib.Path") -> None:
+        """Nothing is found in an empty file."""
+        from logtweet._history import text as histtext
+        history_path = tmp_path / "tweet.log"
+        history_path.write_text("")
+
+        assert histtext.is_string_in_file("", str(history_path)) is False
+
+    def test_missing_file_raises(self, tmp_path: "pathlib.Path") -> None:
+        """A missing file is an error, but not for the store."""
+        from logtweet._history import text as histtext
+        history_path = str(tmp_path / "tweet.log")
+
+        with pytest.raises(FileNotFoundError):
+            histtext.is_string_in_file("A tweet.", history_path)
+        assert histtext.TextHistoryStore(history_path).contains("A") is False
+
+
+class TestFindTimeOffset(object):
+    """Tests for the binary search `find_time_offset`."""
+
+    def test_offset_of_first_line_at_or_after_time(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """The offset matches a linear search, other lines are skipped."""
+        from logtweet._history import store as histstore
+        from logtweet._history import text as histtext
+        start = datetime.datetime(2020, 1, 1)
+        lines = []
+        for minute in range(0, 200, 2):
+            lines.append(
+                histstore.format_entry_line(
+                    histstore.HistoryEntry(
+                        start + datetime.timedelta(minutes=minute),
+                        "Tweet ü {0}.".format(minute) * (minute % 7),
+                    ),
+                ),
+            )
+            if minute % 5 == 0:
+                lines.append("Not an entry.\n")
+        history_path = tmp_path / "tweet.log"
+        history_path.write_bytes("".join(lines).encode("utf-8"))
+
+        for minute in (-1, 0, 1, 2, 51, 198, 199, 500):
+            since = start + datetime.timedelta(minutes=minute)
+            # The line after the last entry sent before the time.
+            expected, offset = 0, 0
+            for line in lines:
+                offset += len(line.encode("utf-8"))
+                entry = histstore.parse_entry_line(line)
+                if entry is not None and entry.sent_at < since:
+                    expected = offset
+            with open(history_path, "rb") as history_file:
+                found = histtext.find_time_offset(history_file, since)
+
+            assert found == expected
@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the Bloom filter of the history."""
+
+import typing
+
+import pytest  # type: ignore
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+class TestBloomFilter(object):
+    """Tests for the `BloomFilter` class."""
+
+    def test_no_false_negatives(self, tmp_path: "pathlib.Path") -> None:
+        """All added messages might be contained."""
+        from logtweet._history import bloom as histbloom
+        bloom = histbloom.BloomFilter.create(str(tmp_path / "f.bloom"), 100)
+        messages = ["Tweet {0}".format(number) for number in range(100)]
+
+        for message in messages:
+            bloom.add(message)
+
+        assert all(bloom.might_contain(message) for message in messages)
+        assert len(bloom) == 100
+        bloom.close()
+
+    def test_false_positive_rate(self, tmp_path: "pathlib.Path") -> None:
+        """Few messages that were not added might be contained."""
+        from logtweet._history import bloom as histbloom
+        bloom = histbloom.BloomFilter.create(
+            str(tmp_path / "f.bloom"),
+            capacity=1000,
+            error_rate=0.01,
+        )
+        for number in range(1000):
+            bloom.add("Tweet {0}".format(number))
+
+        false_positives = sum(
+            bloom.might_contain("Other tweet {0}".format(number))
+            for number in range(10000)
+        )
+        bloom.close()
+
+        assert false_positives < 300
+
+    def test_persists_and_fills_up(self, tmp_path: "pathlib.Path") -> None:
+        """Reopened filters keep their content and entry count."""
+        from logtweet._history import bloom as histbloom
+        path = str(tmp_path / "f.bloom")
+        first_bloom = histbloom.BloomFilter.create(path, capacity=1)
+        first_bloom.add("A tweet.")
+        first_bloom.add("Another tweet.")
+        first_bloom.close()
+
+        second_bloom = histbloom.BloomFilter(path)
+
+        assert second_bloom.might_contain("A tweet.")
+        assert len(second_bloom) == 2
+        assert second_bloom.is_full
+        second_bloom.close()
+
+    def test_invalid_file_rejected(self, tmp_path: "pathlib.Path") -> None:
+        """Files that are not filters raise an error."""
+        from logtweet._history import bloom as histbloom
+        path = tmp_path / "f.bloom"
+        path.write_bytes(b"Not a Bloom filter, but long enough for a header.")
+
+        with pytest.raises(histbloom.BloomFilterError):
+            histbloom.BloomFilter(str(path))
+
+
+class CountingHistoryStore(object):
+    """Text history store counting the lookups in the store."""
+
+    def __init__(self, path: str) -> None:
+        from logtweet._history import text as histtext
+        self.store = histtext.TextHistoryStore(path)
+        self.lookups = 0
+
+    def contains(self, message: str) -> bool:
+        self.lookups += 1
+        return self.store.contains(message)
+
+    def __getattr__(self, name: str) -> typing.Any:
+        return getattr(self.store, name)
+
+
+class TestBloomFilteredHistoryStore(object):
+    """Tests for the `BloomFilteredHistoryStore` class."""
+
+    def test_misses_skip_store(self, tmp_path: "pathlib.Path") -> None:
+        """Only possible hits are looked up in the wrapped store."""
+        from logtweet._history import bloom as histbloom
+        counting_store = CountingHistoryStore(str(tmp_path / "tweet.log"))
+        store = histbloom.BloomFilteredHistoryStore(
+            counting_store,  # type: ignore
+            str(tmp_path / "tweet.log.bloom"),
+        )
+        store.add("A tweet.")
+
+        found_new = store.contains("A new tweet.")
+        found_old = store.contains("A tweet.")
+        store.close()
+
+        assert (found_new, found_old) == (False, True)
+        assert counting_store.lookups == 1
+
+    def test_missing_filter_built_from_store(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """Entries added before the filter existed are found."""
+        from logtweet._history import bloom as histbloom
+        from logtweet._history import text as histtext
+        history_path = str(tmp_path / "tweet.log")
+        histtext.TextHistoryStore(history_path).add("An old tweet.")
+
+        with histbloom.BloomFilteredHistoryStore(
+            histtext.TextHistoryStore(history_path),
+            history_path + histbloom.BLOOM_SUFFIX,
+        ) as store:
+            assert store.contains("An old tweet.")
+
+    def test_rebuild_after_external_change(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """Rebuilding picks up entries that were added without the filter."""
+        from logtweet._history import bloom as histbloom
+        from logtweet._history import text as histtext
+        history_path = str(tmp_path / "tweet.log")
+        bloom_path = history_path + histbloom.BLOOM_SUFFIX
+        with histbloom.BloomFilteredHistoryStore(
+            histtext.TextHistoryStore(history_path),
+            bloom_path,
+            capacity=10,
+        ) as store:
+            store.add("A tweet.")
+            histtext.TextHistoryStore(history_path).add("A stale tweet.")
+            stale_found = store.contains("A stale tweet.")
+
+            entry_count = store.rebuild()
+
+            assert stale_found is False
+            assert store.contains("A stale tweet.")
+            assert entry_count == 2
+            assert store.bloom.capacity == 10
+
+    def test_full_filter_rebuilt(self, tmp_path: "pathlib.Path") -> None:
+        """A filter that gets full is rebuilt with twice the entries."""
+        from logtweet._history import bloom as histbloom
+        from logtweet._history import text as histtext
+        history_path = str(tmp_path / "tweet.log")
+        with histbloom.BloomFilteredHistoryStore(
+            histtext.TextHistoryStore(history_path),
+            history_path + histbloom.BLOOM_SUFFIX,
+            capacity=4,
+        ) as store:
+            for tweet_index in range(5):
+                store.add("Tweet {0}.".format(tweet_index))
+
+            assert not store.bloom.is_full
+            assert store.bloom.capacity == 10
+            assert len(store.bloom) == 5
+            assert store.contains("Tweet 4.")
+
+    def test_full_filter_rebuilt_at_open(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """A full sidecar file is rebuilt when the store is opened."""
+        from logtweet._history import bloom as histbloom
+        from logtweet._history import text as histtext
+        history_path = str(tmp_path / "tweet.log")
+        bloom_path = history_path + histbloom.BLOOM_SUFFIX
+        text_store = histtext.TextHistoryStore(history_path)
+        bloom = histbloom.BloomFilter.create(bloom_path, capacity=1)
+        for tweet_index in range(2):
+            text_store.add("Tweet {0}.".format(tweet_index))
+            bloom.add("Tweet {0}.".format(tweet_index))
+        bloom.close()
+
+        with histbloom.BloomFilteredHistoryStore(
+            histtext.TextHistoryStore(history_path),
+            bloom_path,
+            capacity=1,
+        ) as store:
+            assert not store.bloom.is_full
+            assert store.bloom.capacity == 4
+
+    def test_only_exact_messages_found(self, tmp_path: "pathlib.Path") -> None:
+        """Parts of longer messages are only found without the filter."""
+        from logtweet._history import bloom as histbloom
+        from logtweet._history import text as histtext
+        history_path = str(tmp_path / "tweet.log")
+        text_store = histtext.TextHistoryStore(history_path)
+        text_store.add("A tweet with a link.")
+
+        with histbloom.BloomFilteredHistoryStore(
+            histtext.TextHistoryStore(history_path),
+            history_path + histbloom.BLOOM_SUFFIX,
+        ) as store:
+            found_filtered = store.contains("A tweet")
+
+        assert text_store.contains("A tweet")
+        assert not found_filtered
@@ -0,0 +1,123 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for concurrent writes to the history."""
+
+import typing
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+class TestGroupCommitter(object):
+    """Tests for the `GroupCommitter` class."""
+
+    def test_concurrent_items_batched(self) -> None:
+        """Items submitted during a commit are committed together."""
+        import threading
+        import time
+        from logtweet._history import groupcommit
+        batches: typing.List[typing.List[int]] = []
+
+        def slow_commit(items: typing.List[int]) -> None:
+            time.sleep(0.05)
+            batches.append(items)
+
+        committer = groupcommit.GroupCommitter(slow_commit)
+        threads = [
+            threading.Thread(target=committer.submit, args=(number,))
+            for number in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        committed = [item for batch in batches for item in batch]
+        assert sorted(committed) == list(range(20))
+        assert committer.batch_count == len(batches) < 20
+
+    def test_commit_error_raised_in_submitter(self) -> None:
+        """Every submitter of a failed batch gets the error."""
+        import pytest
+        from logtweet._history import groupcommit
+
+        def failing_commit(items: typing.List[str]) -> None:
+            raise OSError("Disk full.")
+
+        committer = groupcommit.GroupCommitter(failing_commit)
+
+        with pytest.raises(OSError):
+            committer.submit("A line.")
+
+
+class TestConcurrentTextHistory(object):
+    """Tests for appends of concurrent processes to a text history."""
+
+    def test_lines_of_processes_do_not_interleave(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """All lines of all processes are complete."""
+        import os
+        import subprocess
+        import sys
+        import logtweet
+        history_path = str(tmp_path / "tweet.log")
+        script = (
+            "import sys\n"
+            + "from logtweet._history import text\n"
+            + "store = text.TextHistoryStore(sys.argv[1])\n"
+            + "for number in range(50):\n"
+            + "    store.add(sys.argv[2] * 500 + str(number))\n"
+        )
+        env = dict(
+            os.environ,
+            PYTHONPATH=os.path.dirname(os.path.dirname(logtweet.__file__)),
+        )
+
+        processes = [
+            subprocess.Popen(
+                [sys.executable, "-c", script, history_path, letter],
+                env=env,
+            )
+            for letter in "abcd"
+        ]
+        return_codes = [process.wait() for process in processes]
+
+        from logtweet._history import text as histtext
+        messages = [
+            entry.message
+            for entry in histtext.TextHistoryStore(history_path).iter_entries()
+        ]
+        assert return_codes == [0, 0, 0, 0]
+        assert sorted(messages) == sorted(
+            letter * 500 + str(number)
+            for letter in "abcd"
+            for number in range(50)
+        )
+
+
+class TestLocked(object):
+    """Tests for the `locked` method of the history stores."""
+
+    def test_check_and_add_not_interleaved(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """Only one of concurrent workers adds the same message."""
+        from concurrent import futures
+        from logtweet._history import text as histtext
+        history_path = str(tmp_path / "tweet.log")
+
+        def check_and_add(_: int) -> bool:
+            store = histtext.TextHistoryStore(history_path)
+            with store.locked("A tweet."):
+                if store.contains("A tweet."):
+                    return False
+                store.add("A tweet.")
+                return True
+
+        with futures.ThreadPoolExecutor(max_workers=8) as executor:
+            added = list(executor.map(check_and_add, range(16)))
+
+        assert added.count(True) == 1
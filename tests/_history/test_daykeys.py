@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the record of the days tweets were sent for."""
+
+import datetime
+import typing
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+class TestDayKeyStore(object):
+    """Tests for the `DayKeyStore` class."""
+
+    def test_contains_day_of_added_key(self, tmp_path: "pathlib.Path") -> None:
+        """Days are found by source and date, without the day number."""
+        from logtweet._history import daykeys as histdaykeys
+        store = histdaykeys.DayKeyStore(str(tmp_path / "tweet.log.days"))
+        day_date = datetime.date(2020, 1, 31)
+
+        assert store.contains_day("https://a.com/log", day_date) is False
+        store.add(histdaykeys.DayKey("https://a.com/log", day_date, 77))
+        store.add(histdaykeys.DayKey("/logs/a\tb", day_date, 78))
+
+        assert store.contains_day("https://a.com/log", day_date) is True
+        assert store.contains_day("/logs/a\tb", day_date) is True
+        assert store.contains_day(
+            "https://a.com/log",
+            day_date + datetime.timedelta(days=1),
+        ) is False
+        assert store.contains_day("a.com/log", day_date) is False
+        assert list(store.iter_keys())[0] == histdaykeys.DayKey(
+            "https://a.com/log",
+            day_date,
+            77,
+        )
+
+    def test_other_lines_ignored(self, tmp_path: "pathlib.Path") -> None:
+        """Lines that are not day keys are skipped."""
+        from logtweet._history import daykeys as histdaykeys
+        day_path = tmp_path / "tweet.log.days"
+        day_path.write_text("Not a key.\nsource\t2020-01-31\t5\n")
+        store = histdaykeys.DayKeyStore(str(day_path))
+
+        assert list(store.iter_keys()) == [
+            histdaykeys.DayKey("source", datetime.date(2020, 1, 31), 5),
+        ]
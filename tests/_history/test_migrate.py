@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the streaming migration of the text log."""
+
+import datetime
+import typing
+
+import pytest  # type: ignore
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+    from logtweet._history import migrate as histmigrate
+
+
+def write_text_log(path: "pathlib.Path", entry_count: int) -> None:
+    """Write a text log with an entry per minute and a broken line."""
+    from logtweet._history import store as histstore
+    start = datetime.datetime(2020, 1, 1)
+    lines = [
+        histstore.format_entry_line(
+            histstore.HistoryEntry(
+                start + datetime.timedelta(minutes=minute),
+                "Tweet {0}.".format(minute),
+            ),
+        )
+        for minute in range(entry_count)
+    ]
+    lines.insert(3, "Not an entry.\n")
+    path.write_text("".join(lines))
+
+
+class TestMigrateTextLog(object):
+    """Tests for the `migrate_text_log` function."""
+
+    def test_entries_migrated_in_batches(self, tmp_path: "pathlib.Path") -> None:
+        """All entries are added in batches and the checkpoint is removed."""
+        from logtweet._history import migrate as histmigrate
+        from logtweet._history import sqlite as histsqlite
+        log_path = tmp_path / "tweet.log"
+        write_text_log(log_path, 25)
+        checkpoint_path = str(tmp_path / "history.db.migrate")
+        reports: typing.List["histmigrate.MigrationProgress"] = []
+
+        with histsqlite.SQLiteHistoryStore(str(tmp_path / "history.db")) as store:
+            progress = histmigrate.migrate_text_log(
+                str(log_path),
+                store,
+                checkpoint_path,
+                batch_size=10,
+                report=reports.append,
+                report_interval=0,
+            )
+            entries = list(store.iter_entries())
+
+        assert len(entries) == progress.checkpoint.entries == 25
+        assert progress.checkpoint.skipped_lines == 1
+        assert progress.done_ratio == 1
+        assert [report.checkpoint.entries for report in reports] == [10, 20, 25]
+        assert entries[-1].message == "Tweet 24."
+        assert histmigrate.read_checkpoint(checkpoint_path) is None
+
+    def test_resumed_after_interruption(self, tmp_path: "pathlib.Path") -> None:
+        """An interrupted migration continues without duplicates."""
+        from logtweet._history import migrate as histmigrate
+        from logtweet._history import text as histtext
+        log_path = tmp_path / "tweet.log"
+        write_text_log(log_path, 25)
+        checkpoint_path = str(tmp_path / "target.log.migrate")
+        store = histtext.TextHistoryStore(str(tmp_path / "target.log"))
+
+        source_entries = list(
+            histtext.TextHistoryStore(str(log_path)).iter_entries(),
+        )
+
+        def interrupt(progress: "histmigrate.MigrationProgress") -> None:
+            # The next batch is added, but its checkpoint is not written.
+            store.add_entries(source_entries[10:20])
+            raise KeyboardInterrupt
+
+        with pytest.raises(KeyboardInterrupt):
+            histmigrate.migrate_text_log(
+                str(log_path),
+                store,
+                checkpoint_path,
+                batch_size=10,
+                report=interrupt,
+                report_interval=0,
+            )
+        checkpoint = histmigrate.read_checkpoint(checkpoint_path)
+        progress = histmigrate.migrate_text_log(
+            str(log_path),
+            store,
+            checkpoint_path,
+            batch_size=10,
+        )
+
+        assert checkpoint is not None
+        assert checkpoint.entries == 10
+        assert progress.resumed_at == checkpoint
+        assert [entry.message for entry in store.iter_entries()] == [
+            "Tweet {0}.".format(minute) for minute in range(25)
+        ]
+
+    def test_checkpoint_of_other_log_rejected(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """A migration in progress is not mixed with another log."""
+        from logtweet._history import migrate as histmigrate
+        from logtweet._history import text as histtext
+        log_path = tmp_path / "tweet.log"
+        write_text_log(log_path, 5)
+        checkpoint_path = str(tmp_path / "target.log.migrate")
+        histmigrate.write_checkpoint(
+            checkpoint_path,
+            histmigrate.MigrationCheckpoint(str(tmp_path / "other.log"), 5, 1, 0),
+        )
+
+        with pytest.raises(histmigrate.MigrationError):
+            histmigrate.migrate_text_log(
+                str(log_path),
+                histtext.TextHistoryStore(str(tmp_path / "target.log")),
+                checkpoint_path,
+            )
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the near-duplicate detection of history messages."""
+
+import typing
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+TWEET = (
+    "77/#100DaysOfCode Gone through first bit of Flask introduction and set"
+    + " up the basic project structure in #100DayOfWebInPython. Also enabled"
+    + " Markdown formatting for posts.  https://bit.ly/abc"
+)
+OTHER_TWEET = (
+    "78/#100DaysOfCode Worked on the tests for the link shortener and added a"
+    + " memory mapped store for the codes.  https://s.lpld.io/x"
+)
+DAILY_TEXT = (
+    "Worked on the tests for the link shortener and added a memory mapped"
+    + " store for the codes."
+)
+
+
+class TestSimhash(object):
+    """Tests for the `simhash` function."""
+
+    def test_link_and_white_space_ignored(self) -> None:
+        """Only the text of the message matters."""
+        from logtweet._history import nearduplicate as histnear
+        changed_tweet = TWEET.replace("https://bit.ly/abc", "https://s.lpld.io/y")
+
+        assert histnear.simhash(changed_tweet) == histnear.simhash(TWEET)
+        assert histnear.simhash(TWEET.upper().replace(" ", "   ")) == (
+            histnear.simhash(TWEET)
+        )
+
+    def test_similar_messages_similar_fingerprints(self) -> None:
+        """A typo keeps the fingerprint similar, another text does not."""
+        from logtweet._history import nearduplicate as histnear
+        fingerprint = histnear.simhash(TWEET)
+
+        typo_similarity = histnear.get_similarity(
+            fingerprint,
+            histnear.simhash(TWEET.replace("first", "frist")),
+        )
+        other_similarity = histnear.get_similarity(
+            fingerprint,
+            histnear.simhash(OTHER_TWEET),
+        )
+
+        assert typo_similarity >= 0.9
+        assert other_similarity < 0.75
+
+
+class TestNearDuplicateIndex(object):
+    """Tests for the `NearDuplicateIndex` class."""
+
+    def test_finds_near_duplicates(self, tmp_path: "pathlib.Path") -> None:
+        """Edited messages are found, others are not."""
+        from logtweet._history import nearduplicate as histnear
+        index = histnear.NearDuplicateIndex(str(tmp_path / "h.simhash"))
+        index.add(TWEET)
+
+        matches = index.find(TWEET.replace("first", "frist"))
+
+        assert len(matches) == 1
+        assert matches[0].fingerprint == histnear.simhash(TWEET)
+        assert index.find(OTHER_TWEET) == []
+
+    def test_only_same_day_compared(self, tmp_path: "pathlib.Path") -> None:
+        """A typo fix of the day is found, the same text of another day not."""
+        from logtweet._history import nearduplicate as histnear
+        index = histnear.NearDuplicateIndex(str(tmp_path / "h.simhash"))
+        index.add("21/#100DaysOfCode " + DAILY_TEXT)
+
+        typo_matches = index.find(
+            "21/#100DaysOfCode " + DAILY_TEXT.replace("codes", "cods"),
+        )
+        other_day_matches = index.find("22/#100DaysOfCode " + DAILY_TEXT)
+
+        assert len(typo_matches) == 1
+        assert typo_matches[0].similarity > histnear.DEFAULT_THRESHOLD
+        assert other_day_matches == []
+        assert histnear.get_similarity(
+            histnear.simhash("21/#100DaysOfCode " + DAILY_TEXT),
+            histnear.simhash("22/#100DaysOfCode " + DAILY_TEXT),
+        ) < 0.75
+
+    def test_lookup_time_of_large_index(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """Lookups in 300000 fingerprints take well under a few milliseconds."""
+        import random
+        import time
+        from logtweet._history import nearduplicate as histnear
+        index = histnear.NearDuplicateIndex(str(tmp_path / "h.simhash"))
+        generator = random.Random(0)
+        index._write(  # noqa: WPS437
+            [generator.getrandbits(64) for _ in range(300000)],
+        )
+        durations = []
+
+        for day_number in range(20):
+            message = "{0}/#100DaysOfCode {1}".format(day_number, DAILY_TEXT)
+            started = time.perf_counter()
+            index.find(message)
+            durations.append(time.perf_counter() - started)
+
+        # About 0.5 ms at the default threshold, 8 ms at a threshold of 0.8.
+        assert sorted(durations)[len(durations) // 2] < 0.002
+
+    def test_tail_merged_into_sorted_tables(
+        self,
+        tmp_path: "pathlib.Path",
+        monkeypatch: typing.Any,
+    ) -> None:
+        """Fingerprints are found before and after the tail is merged."""
+        from logtweet._history import nearduplicate as histnear
+        monkeypatch.setattr(histnear, "MAX_TAIL_LENGTH", 2)
+        index_path = tmp_path / "h.simhash"
+        index = histnear.NearDuplicateIndex(str(index_path), threshold=0.95)
+        messages = ["{0} {1}".format(number, OTHER_TWEET) for number in range(5)]
+        messages.append(TWEET)
+
+        for message in messages:
+            index.add(message)
+
+        assert index.is_usable()
+        assert all(index.find(message) for message in messages)
+        assert len(index.find(TWEET)) == 1
+        # Header, 4 sorted tables of 4 fingerprints and a tail of 2.
+        assert index_path.stat().st_size == 32 + 4 * 8 * 4 + 2 * 8
+
+    def test_index_of_other_threshold_rebuilt(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """The store rebuilds an index created for another threshold."""
+        from logtweet._history import nearduplicate as histnear
+        from logtweet._history import text as histtext
+        history_path = str(tmp_path / "tweet.log")
+        index_path = history_path + histnear.INDEX_SUFFIX
+        with histnear.NearDuplicateHistoryStore(
+            histtext.TextHistoryStore(history_path),
+            index_path,
+            threshold=0.9,
+        ) as store:
+            store.add(TWEET)
+
+        with histnear.NearDuplicateHistoryStore(
+            histtext.TextHistoryStore(history_path),
+            index_path,
+            threshold=0.8,
+        ) as other_store:
+            matches = other_store.find_similar(TWEET.replace("Gone", "Went"))
+
+        assert matches
+        assert other_store.index.is_usable()
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the segmented history."""
+
+import datetime
+import typing
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+    from logtweet._history import segmented as histsegmented
+
+
+def create_store(
+    directory: "pathlib.Path",
+    **kwargs: typing.Any,
+) -> "histsegmented.SegmentedHistoryStore":
+    """Create a segmented store with one entry per segment by default."""
+    from logtweet._history import segmented as histsegmented
+    kwargs.setdefault("max_segment_bytes", 1)
+    return histsegmented.SegmentedHistoryStore(str(directory), **kwargs)
+
+
+class TestSegmentedHistoryStore(object):
+    """Tests for the `SegmentedHistoryStore` class."""
+
+    def test_rotated_by_size(self, tmp_path: "pathlib.Path") -> None:
+        """Full segments are sealed with an index."""
+        store = create_store(tmp_path)
+
+        for number in range(3):
+            store.add("Tweet {0}".format(number))
+
+        assert store.list_segments() == [1, 2, 3]
+        assert sorted(path.name for path in tmp_path.glob("*.idx")) == [
+            "segment-00000001.idx",
+            "segment-00000002.idx",
+        ]
+        assert all(store.contains("Tweet {0}".format(num)) for num in range(3))
+        assert store.contains("Tweet") is False
+
+    def test_rotated_by_age(self, tmp_path: "pathlib.Path") -> None:
+        """Segments older than the maximum age are sealed."""
+        store = create_store(
+            tmp_path,
+            max_segment_bytes=1024 * 1024,
+            max_segment_age=datetime.timedelta(days=1),
+        )
+        store.add("Old tweet.", sent_at=datetime.datetime(2020, 1, 1))
+        store.add("Recent tweet.")
+        store.add("New tweet.")
+
+        assert store.list_segments() == [1, 2]
+
+    def test_sealed_segments_checked_once(
+        self,
+        tmp_path: "pathlib.Path",
+        monkeypatch: typing.Any,
+    ) -> None:
+        """Appends only check the indexes of sealed segments not seen yet."""
+        import os
+        store = create_store(tmp_path)
+        for number in range(3):
+            store.add("Tweet {0}".format(number))
+        checked_paths: typing.List[str] = []
+        original_exists = os.path.exists
+
+        def recording_exists(path: str) -> bool:
+            checked_paths.append(path)
+            return original_exists(path)
+
+        monkeypatch.setattr(os.path, "exists", recording_exists)
+        store.add("Tweet 3")
+
+        assert store.list_segments() == [1, 2, 3, 4]
+        assert checked_paths == []
+
+    def test_sealed_lookup_uses_index(self, tmp_path: "pathlib.Path") -> None:
+        """Sealed segments are not scanned if their index is current."""
+        store = create_store(tmp_path)
+        store.add("A tweet.")
+        store.add("Another tweet.")
+        sealed_path = tmp_path / "segment-00000001.log"
+        sealed_content = sealed_path.read_bytes()
+        # Hide the message from a scan, but keep the size and the offsets.
+        sealed_path.write_bytes(sealed_content.replace(b"A tw", b"X tw"))
+
+        assert store.contains("A tweet.") is False
+        assert store.contains("X tweet.") is False
+        sealed_path.write_bytes(sealed_content)
+        assert store.contains("A tweet.") is True
+
+    def test_changed_segment_scanned(self, tmp_path: "pathlib.Path") -> None:
+        """Segments that changed after indexing are searched directly."""
+        from logtweet._history import store as histstore
+        store = create_store(tmp_path)
+        store.add("A tweet.")
+        store.add("Another tweet.")
+        sealed_path = tmp_path / "segment-00000001.log"
+        entry = histstore.HistoryEntry(datetime.datetime.now(), "Late tweet.")
+        with open(sealed_path, "a") as sealed_file:
+            sealed_file.write(histstore.format_entry_line(entry))
+
+        assert store.contains("Late tweet.") is True
+
+    def test_compaction(self, tmp_path: "pathlib.Path") -> None:
+        """Sealed segments are merged and old entries dropped."""
+        store = create_store(tmp_path)
+        now = datetime.datetime(2020, 3, 1)
+        for day in range(1, 5):
+            store.add(
+                "Tweet of day {0}".format(day),
+                sent_at=datetime.datetime(2020, 2, day),
+            )
+
+        compaction = store.compact(datetime.timedelta(days=28), now=now)
+
+        assert tuple(compaction) == (3, 2, 1)
+        assert store.list_segments() == [3, 4]
+        assert store.contains("Tweet of day 1") is False
+        assert all(
+            store.contains("Tweet of day {0}".format(day))
+            for day in range(2, 5)
+        )
+        assert [entry.message for entry in store.iter_entries()] == [
+            "Tweet of day 2",
+            "Tweet of day 3",
+            "Tweet of day 4",
+        ]
+
+    def test_compaction_without_sealed_segments(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """The active segment is never compacted."""
+        store = create_store(tmp_path)
+        store.add("A tweet.")
+
+        assert tuple(store.compact(datetime.timedelta(0))) == (0, 0, 0)
+        assert store.contains("A tweet.")
@@ -3,6 +3,7 @@
 """Fixtures shared among the tests."""
 
 from datetime import date
+import socket
 
 from bs4 import BeautifulSoup  # type: ignore
 import pytest  # type: ignore
@@ -80,6 +81,25 @@ def test_file(tmp_path):
     return tmp_path / "test.txt"
 
 
+@pytest.fixture  # type: ignore
+def free_port() -> int:
+    """
+    Return free port on the localhost.
+
+    Returns
+    -------
+    int
+        Free port number on the localhost.
+
+    """
+    sock = socket.socket(socket.AF_INET, type=socket.SOCK_STREAM)
+    sock.bind(("localhost", 0))
+    port: int
+    _, port = sock.getsockname()
+    sock.close()
+    return port
+
+
 # Page content for reference
 # <html>
 #     <body>
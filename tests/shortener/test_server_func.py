@@ -0,0 +1,131 @@
+# -*- coding: utf-8 -*-
+
+"""Functional tests for the shortener service."""
+
+import threading
+import typing
+
+import pytest  # type: ignore
+import requests
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+@pytest.fixture  # type: ignore
+def shortener_url(
+    tmp_path: "pathlib.Path",
+    free_port: int,
+) -> typing.Iterator[str]:
+    """
+    Run the shortener service in a thread.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Temporary directory used for the short link store.
+    free_port : int
+        Free port on the localhost to run the service on.
+
+    Yields
+    ------
+    str
+        Base URL of the running service.
+
+    """
+    from logtweet.shortener import server as shortserver
+    from logtweet.shortener import store as shortstore
+    store = shortstore.ShortLinkStore(str(tmp_path))
+    server = shortserver.ShortenerServer(("localhost", free_port), store)
+    server_thread = threading.Thread(target=server.serve_forever)
+    server_thread.daemon = True
+    server_thread.start()
+
+    yield "http://localhost:{0}".format(free_port)
+
+    server.shutdown()
+    server.server_close()
+    store.close()
+
+
+class TestShortenerService(object):
+    """Tests for the shortener service."""
+
+    def test_create_and_redirect(self, shortener_url: str) -> None:
+        """Created short link redirects to the long URL."""
+        long_url = "https://example.com/some/long/path"
+
+        create_response = requests.post(
+            "{0}/create".format(shortener_url),
+            json={"long_url": long_url},
+        )
+        short_link = create_response.json()["short"]
+        redirect_response = requests.get(short_link, allow_redirects=False)
+
+        assert create_response.status_code == 200
+        assert short_link.startswith(shortener_url)
+        assert redirect_response.status_code == 301
+        assert redirect_response.headers["Location"] == long_url
+
+    def test_get_short_link_uses_service(self, shortener_url: str) -> None:
+        """The service can be used with `get_short_link`."""
+        from logtweet._content import shortlink
+
+        short_link = shortlink.get_short_link(
+            "https://example.com",
+            shortener_url="{0}/create".format(shortener_url),
+        )
+
+        assert short_link.startswith(shortener_url)
+
+    def test_unknown_code_not_found(self, shortener_url: str) -> None:
+        """Unknown codes respond with 404."""
+        response = requests.get(
+            "{0}/unknown".format(shortener_url),
+            allow_redirects=False,
+        )
+
+        assert response.status_code == 404
+
+    def test_invalid_long_url_bad_request(self, shortener_url: str) -> None:
+        """Creating a short link for a non-URL responds with 400."""
+        response = requests.post(
+            "{0}/create".format(shortener_url),
+            json={"long_url": "not a url"},
+        )
+
+        assert response.status_code == 400
+
+    def test_connection_usable_after_rejected_body(
+        self,
+        shortener_url: str,
+    ) -> None:
+        """Bodies of rejected requests are not parsed as the next request."""
+        from http import client as httpclient
+        from urllib import parse
+        connection = httpclient.HTTPConnection(parse.urlsplit(shortener_url).netloc)
+
+        connection.request("POST", "/other", body=b'{"long_url": "x"}')
+        rejected_response = connection.getresponse()
+        rejected_response.read()
+        connection.request("GET", "/unknown")
+        next_response = connection.getresponse()
+        next_response.read()
+        connection.close()
+
+        assert rejected_response.status == 404
+        assert next_response.status == 404
+
+    def test_connection_closed_after_oversized_body(
+        self,
+        shortener_url: str,
+    ) -> None:
+        """Connections are closed if the request body is not read."""
+        from logtweet.shortener import server as shortserver
+        response = requests.post(
+            "{0}/create".format(shortener_url),
+            data=b"x" * (shortserver.MAX_REQUEST_BODY + 1),
+        )
+
+        assert response.status_code == 400
+        assert response.headers["Connection"] == "close"
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the short link store."""
+
+import typing
+
+import pytest  # type: ignore
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+class TestMakeCode(object):
+    """Tests for the `make_code` function."""
+
+    def test_same_url_same_code(self) -> None:
+        """Code is derived deterministically from the URL."""
+        from logtweet.shortener import store as shortstore
+
+        first_code = shortstore.make_code("https://example.com")
+        second_code = shortstore.make_code("https://example.com")
+
+        assert first_code == second_code
+
+    def test_salt_changes_code(self) -> None:
+        """A salt leads to a different code for the same URL."""
+        from logtweet.shortener import store as shortstore
+
+        unsalted_code = shortstore.make_code("https://example.com")
+        salted_code = shortstore.make_code("https://example.com", salt=1)
+
+        assert unsalted_code != salted_code
+
+    def test_code_length_and_alphabet(self) -> None:
+        """Code has defined length and only uses characters of alphabet."""
+        from logtweet.shortener import store as shortstore
+
+        code = shortstore.make_code("https://example.com")
+
+        assert len(code) == shortstore.CODE_LENGTH
+        assert set(code) <= set(shortstore.CODE_ALPHABET)
+
+
+class TestShortLinkStore(object):
+    """Tests for the `ShortLinkStore` class."""
+
+    def test_get_created_code(self, tmp_path: "pathlib.Path") -> None:
+        """Long URL can be retrieved with the created code."""
+        from logtweet.shortener import store as shortstore
+
+        with shortstore.ShortLinkStore(str(tmp_path)) as store:
+            code = store.create("https://example.com/1")
+
+            assert store.get(code) == "https://example.com/1"
+
+    def test_unknown_code_is_none(self, tmp_path: "pathlib.Path") -> None:
+        """Getting an unknown code returns `None`."""
+        from logtweet.shortener import store as shortstore
+
+        with shortstore.ShortLinkStore(str(tmp_path)) as store:
+            assert store.get("unknown") is None
+
+    def test_create_is_idempotent(self, tmp_path: "pathlib.Path") -> None:
+        """Creating a code for a known URL returns the existing code."""
+        from logtweet.shortener import store as shortstore
+
+        with shortstore.ShortLinkStore(str(tmp_path)) as store:
+            first_code = store.create("https://example.com/1")
+            second_code = store.create("https://example.com/1")
+
+            assert first_code == second_code
+            assert len(store) == 1
+
+    @pytest.mark.parametrize(
+        "long_url",
+        ["", "https://example.com/with space", "https://example.com/\n"],
+    )
+    def test_invalid_url_rejected(
+        self,
+        tmp_path: "pathlib.Path",
+        long_url: str,
+    ) -> None:
+        """Empty URLs and URLs with white space are rejected."""
+        from logtweet.shortener import store as shortstore
+
+        with shortstore.ShortLinkStore(str(tmp_path)) as store:
+            with pytest.raises(shortstore.InvalidLongUrlError):
+                store.create(long_url)
+
+    def test_survives_restart(self, tmp_path: "pathlib.Path") -> None:
+        """Codes can be retrieved after the store is reopened."""
+        from logtweet.shortener import store as shortstore
+        with shortstore.ShortLinkStore(str(tmp_path)) as store:
+            code = store.create("https://example.com/1")
+
+        with shortstore.ShortLinkStore(str(tmp_path)) as reopened_store:
+            assert reopened_store.get(code) == "https://example.com/1"
+            assert len(reopened_store) == 1
+
+    def test_index_grows(self, tmp_path: "pathlib.Path") -> None:
+        """All codes can be retrieved after the index had to grow."""
+        from logtweet.shortener import store as shortstore
+        urls = ["https://example.com/{0}".format(num) for num in range(3000)]
+
+        with shortstore.ShortLinkStore(str(tmp_path)) as store:
+            codes = [store.create(url) for url in urls]
+
+            assert [store.get(code) for code in codes] == urls
+
+    def test_rebuilds_missing_index(self, tmp_path: "pathlib.Path") -> None:
+        """Index is rebuilt from the data file if it is missing."""
+        from logtweet.shortener import store as shortstore
+        with shortstore.ShortLinkStore(str(tmp_path)) as store:
+            code = store.create("https://example.com/1")
+        (tmp_path / shortstore.INDEX_FILENAME).unlink()
+
+        with shortstore.ShortLinkStore(str(tmp_path)) as reopened_store:
+            assert reopened_store.get(code) == "https://example.com/1"
+
+    def test_indexes_lines_missing_in_index(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """Lines appended to the data file behind the index are indexed."""
+        from logtweet.shortener import store as shortstore
+        with shortstore.ShortLinkStore(str(tmp_path)) as store:
+            store.create("https://example.com/1")
+        with open(str(tmp_path / shortstore.DATA_FILENAME), "a") as data_file:
+            data_file.write("abcdefg\thttps://example.com/2\n")
+
+        with shortstore.ShortLinkStore(str(tmp_path)) as reopened_store:
+            assert reopened_store.get("abcdefg") == "https://example.com/2"
+            assert len(reopened_store) == 2
+
+    def test_drops_partial_last_line(self, tmp_path: "pathlib.Path") -> None:
+        """Incomplete last line of an interrupted write is dropped."""
+        from logtweet.shortener import store as shortstore
+        with shortstore.ShortLinkStore(str(tmp_path)) as store:
+            code = store.create("https://example.com/1")
+        with open(str(tmp_path / shortstore.DATA_FILENAME), "a") as data_file:
+            data_file.write("abcdefg\thttps://exa")
+
+        with shortstore.ShortLinkStore(str(tmp_path)) as reopened_store:
+            assert reopened_store.get("abcdefg") is None
+            assert reopened_store.get(code) == "https://example.com/1"
@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the compressed local file source retriever."""
+
+import bz2
+import datetime
+import gzip
+import typing
+
+import pytest  # type: ignore
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+LOG = (
+    "<h2>Day 1: October 16, 2019, Wednesday</h2><p>Grüße</p>"
+    + "<h2>Day 2: October 17, 2019, Thursday</h2><p>Two</p>"
+)
+
+
+def create_retriever(
+    path: "pathlib.Path",
+    day_date: typing.Optional[datetime.date] = None,
+) -> typing.Any:
+    """Create retriever for the compressed file at the path."""
+    from logtweet.source.adapters import compressedfile as adaptcompressed
+    from logtweet.source.adapters import validfile as adaptvalidfile
+    return adaptcompressed.CompressedLocalFileSourceContentRetriever(
+        adaptvalidfile.ValidSourceFile(str(path)),
+        day_date,
+        chunk_size=8,
+    )
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "file_name, compress",
+    [("log.html.gz", gzip.compress), ("log.html.bz2", bz2.compress)],
+)
+class TestCompressedLocalFileSourceContentRetriever(object):
+    """Tests for the `CompressedLocalFileSourceContentRetriever` class."""
+
+    def test_returns_decompressed_content(
+        self,
+        tmp_path: "pathlib.Path",
+        file_name: str,
+        compress: typing.Callable[[bytes], bytes],
+    ) -> None:
+        """Whole decompressed content is returned without a day."""
+        log_file = tmp_path / file_name
+        log_file.write_bytes(compress(LOG.encode("utf-8")))
+        retriever = create_retriever(log_file)
+
+        content = retriever.get_content()
+
+        assert content == LOG
+
+    def test_returns_section_of_day(
+        self,
+        tmp_path: "pathlib.Path",
+        file_name: str,
+        compress: typing.Callable[[bytes], bytes],
+    ) -> None:
+        """Only the section of the day is returned with a day."""
+        log_file = tmp_path / file_name
+        log_file.write_bytes(compress(LOG.encode("utf-8")))
+        retriever = create_retriever(log_file, datetime.date(2019, 10, 16))
+
+        content = retriever.get_content()
+
+        assert content == "<h2>Day 1: October 16, 2019, Wednesday</h2><p>Grüße</p>"
+
+    def test_error_if_corrupt(
+        self,
+        tmp_path: "pathlib.Path",
+        file_name: str,
+        compress: typing.Callable[[bytes], bytes],
+    ) -> None:
+        """Raise retrieval error if the file can not be decompressed."""
+        log_file = tmp_path / file_name
+        log_file.write_bytes(b"not compressed")
+        retriever = create_retriever(log_file)
+        from logtweet.source.usecases import retrieve as ucretrieve
+
+        with pytest.raises(ucretrieve.SourceContentRetrievalError):
+            retriever.get_content()
+
+
+def test_error_if_decompressed_too_large(tmp_path: "pathlib.Path") -> None:
+    """Decompression stops with an error above the maximum size."""
+    log_file = tmp_path / "log.html.gz"
+    log_file.write_bytes(gzip.compress(b"x" * 100000))
+    from logtweet.source.usecases import retrieve as ucretrieve
+    from logtweet.source.adapters import compressedfile as adaptcompressed
+    from logtweet.source.adapters import limits as adaptlimits
+    from logtweet.source.adapters import validfile as adaptvalidfile
+    retriever = adaptcompressed.CompressedLocalFileSourceContentRetriever(
+        adaptvalidfile.ValidSourceFile(str(log_file)),
+        limits=adaptlimits.RetrievalLimits(max_body_bytes=1000),
+    )
+
+    with pytest.raises(ucretrieve.BodyTooLargeError):
+        retriever.get_content()
+
+
+def test_zstandard(tmp_path: "pathlib.Path") -> None:
+    """Zstandard compressed file is decompressed."""
+    zstandard = pytest.importorskip("zstandard")
+    log_file = tmp_path / "log.html.zst"
+    log_file.write_bytes(zstandard.ZstdCompressor().compress(LOG.encode()))
+    retriever = create_retriever(log_file)
+
+    content = retriever.get_content()
+
+    assert content == LOG
+
+
+def test_error_without_zstandard(
+    tmp_path: "pathlib.Path",
+    monkeypatch: typing.Any,
+) -> None:
+    """Raise error naming the package if zstandard is not installed."""
+    from logtweet.source.adapters import compressedfile as adaptcompressed
+    monkeypatch.setattr(adaptcompressed, "zstandard", None)
+    log_file = tmp_path / "log.html.zst"
+    log_file.write_bytes(b"data")
+    retriever = create_retriever(log_file)
+
+    with pytest.raises(
+        adaptcompressed.MissingDecompressorError,
+        match=r".*zstandard.*",
+    ):
+        retriever.get_content()
+
+
+def test_controller_selects_compressed_retriever(
+    tmp_path: "pathlib.Path",
+) -> None:
+    """Controller decompresses files with a compression suffix."""
+    log_file = tmp_path / "log.html.gz"
+    log_file.write_bytes(gzip.compress(LOG.encode("utf-8")))
+    from logtweet.source.controllers import retrieve as ctrlretrieve
+
+    content = ctrlretrieve.get_log_content_from_source(str(log_file))
+
+    assert content == LOG
@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the local file source classes."""
+
+import typing
+
+import pytest  # type: ignore
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+class TestValidSourceFile(object):
+    """Tests for the `ValidSourceFile` class."""
+
+    def test_existing_file_is_valid(self, tmp_path: "pathlib.Path") -> None:
+        """Path of an existing file is valid."""
+        log_file = tmp_path / "log.html"
+        log_file.write_text("content")
+        from logtweet.source.adapters import validfile as adaptvalidfile
+
+        is_valid = adaptvalidfile.ValidSourceFile.is_valid(str(log_file))
+
+        assert is_valid is True
+
+    def test_directory_is_not_valid(self, tmp_path: "pathlib.Path") -> None:
+        """Path of a directory is not valid."""
+        from logtweet.source.adapters import validfile as adaptvalidfile
+
+        is_valid = adaptvalidfile.ValidSourceFile.is_valid(str(tmp_path))
+
+        assert is_valid is False
+
+    def test_path_without_file_prefix(self, tmp_path: "pathlib.Path") -> None:
+        """The `path` property does not contain the `file://` prefix."""
+        log_file = tmp_path / "log.html"
+        log_file.write_text("content")
+        from logtweet.source.adapters import validfile as adaptvalidfile
+
+        valid_file = adaptvalidfile.ValidSourceFile(
+            "file://{0}".format(log_file),
+        )
+
+        assert valid_file.path == str(log_file)
+
+    def test_missing_file_raises_exception(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """Init fails with exception for a missing file."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        from logtweet.source.adapters import validfile as adaptvalidfile
+
+        with pytest.raises(
+            ucretrieve.SourceValidationError,
+            match=r".*is not a file.*",
+        ):
+            adaptvalidfile.ValidSourceFile(str(tmp_path / "missing.html"))
+
+
+class TestLocalFileSourceContentRetriever(object):
+    """Tests for the `LocalFileSourceContentRetriever` class."""
+
+    @staticmethod
+    def create_retriever(
+        path: "pathlib.Path",
+    ) -> typing.Any:
+        """Create retriever for the file at the path."""
+        from logtweet.source.adapters import fileretriever as adaptfile
+        from logtweet.source.adapters import validfile as adaptvalidfile
+        return adaptfile.LocalFileSourceContentRetriever(
+            adaptvalidfile.ValidSourceFile(str(path)),
+        )
+
+    def test_subclass(self) -> None:
+        """Is subclass of `ucretrieve.AbstractSourceContentRetriever`."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        from logtweet.source.adapters import fileretriever as adaptfile
+
+        assert issubclass(
+            adaptfile.LocalFileSourceContentRetriever,
+            ucretrieve.AbstractSourceContentRetriever,
+        )
+
+    def test_returns_file_content(self, tmp_path: "pathlib.Path") -> None:
+        """Content of the file is returned."""
+        log_file = tmp_path / "log.html"
+        log_file.write_text("<h2>Grüße</h2>", encoding="utf-8")
+        retriever = self.create_retriever(log_file)
+
+        content = retriever.get_content()
+
+        assert content == "<h2>Grüße</h2>"
+
+    def test_empty_file(self, tmp_path: "pathlib.Path") -> None:
+        """Empty file returns empty content."""
+        log_file = tmp_path / "log.html"
+        log_file.write_text("")
+        retriever = self.create_retriever(log_file)
+
+        content = retriever.get_content()
+
+        assert content == ""
+
+    def test_buffer_of_file(self, tmp_path: "pathlib.Path") -> None:
+        """Buffer gives access to the raw bytes of the file."""
+        log_file = tmp_path / "log.html"
+        log_file.write_bytes(b"<h2>Day 1</h2>")
+        retriever = self.create_retriever(log_file)
+
+        with retriever.open_buffer() as buffer:
+            is_memoryview = isinstance(buffer, memoryview)
+            first_bytes = bytes(buffer[:4])
+
+        assert is_memoryview
+        assert first_bytes == b"<h2>"
+
+    def test_error_if_file_too_large(self, tmp_path: "pathlib.Path") -> None:
+        """Raise error if the file exceeds the maximum size of the limits."""
+        log_file = tmp_path / "log.html"
+        log_file.write_text("x" * 100)
+        from logtweet.source.usecases import retrieve as ucretrieve
+        from logtweet.source.adapters import fileretriever as adaptfile
+        from logtweet.source.adapters import limits as adaptlimits
+        from logtweet.source.adapters import validfile as adaptvalidfile
+        retriever = adaptfile.LocalFileSourceContentRetriever(
+            adaptvalidfile.ValidSourceFile(str(log_file)),
+            limits=adaptlimits.RetrievalLimits(max_body_bytes=99),
+        )
+
+        with pytest.raises(ucretrieve.BodyTooLargeError):
+            retriever.get_content()
+
+    def test_error_if_file_removed(self, tmp_path: "pathlib.Path") -> None:
+        """Raise retrieval error if the file was removed after validation."""
+        log_file = tmp_path / "log.html"
+        log_file.write_text("content")
+        retriever = self.create_retriever(log_file)
+        log_file.unlink()
+        from logtweet.source.usecases import retrieve as ucretrieve
+
+        with pytest.raises(ucretrieve.SourceContentRetrievalError):
+            retriever.get_content()
+
+
+def make_log(day_numbers: typing.Iterable[int], markdown: bool = False) -> str:
+    """Create log with a section per day in October 2019."""
+    import datetime
+    sections = []
+    for day_number in day_numbers:
+        day_date = datetime.date(2019, 10, 15 + day_number)
+        heading_text = "Day {0}: {1}".format(
+            day_number,
+            day_date.strftime("%B %d, %Y, %A"),
+        )
+        if markdown:
+            heading = "## {0}\n".format(heading_text)
+        else:
+            heading = "<h2>{0}</h2>\n".format(heading_text)
+        sections.append(heading + "<p>Progress {0}</p>\n".format(day_number))
+    return "".join(sections)
+
+
+class TestTailSeekingLocalFileSourceContentRetriever(object):
+    """Tests for the `TailSeekingLocalFileSourceContentRetriever` class."""
+
+    @staticmethod
+    def create_retriever(
+        path: "pathlib.Path",
+        day_number: int,
+        block_size: int = 7,
+    ) -> typing.Any:
+        """Create retriever for the day of the file at the path."""
+        import datetime
+        from logtweet.source.adapters import fileretriever as adaptfile
+        from logtweet.source.adapters import validfile as adaptvalidfile
+        return adaptfile.TailSeekingLocalFileSourceContentRetriever(
+            adaptvalidfile.ValidSourceFile(str(path)),
+            datetime.date(2019, 10, 15 + day_number),
+            block_size=block_size,
+        )
+
+    @pytest.mark.parametrize("block_size", [1, 7, 64, 4096])  # type: ignore
+    def test_returns_section_of_day(
+        self,
+        tmp_path: "pathlib.Path",
+        block_size: int,
+    ) -> None:
+        """Only the section of the day is returned for any block size."""
+        log_file = tmp_path / "log.html"
+        log_file.write_text(make_log(range(1, 6)))
+        retriever = self.create_retriever(log_file, 3, block_size)
+
+        content = retriever.get_content()
+
+        assert content == make_log([3])
+
+    def test_last_section(self, tmp_path: "pathlib.Path") -> None:
+        """Last section reaches to the end of the file."""
+        log_file = tmp_path / "log.html"
+        log_file.write_text(make_log(range(1, 6)))
+        retriever = self.create_retriever(log_file, 5)
+
+        content = retriever.get_content()
+
+        assert content == make_log([5])
+
+    def test_descending_log(self, tmp_path: "pathlib.Path") -> None:
+        """Section is found in a log with the newest day first."""
+        log_file = tmp_path / "log.html"
+        log_file.write_text(make_log(range(5, 0, -1)))
+        retriever = self.create_retriever(log_file, 2)
+
+        content = retriever.get_content()
+
+        assert content == make_log([2])
+
+    def test_markdown_headings_ignored(self, tmp_path: "pathlib.Path") -> None:
+        """Only ``<h2>`` headings start sections, like in the extraction."""
+        log_file = tmp_path / "log.md"
+        log_file.write_text(make_log(range(1, 6), markdown=True))
+        retriever = self.create_retriever(log_file, 4)
+
+        content = retriever.get_content()
+
+        assert content == ""
+
+    @pytest.mark.parametrize("day_number", [0, 6])  # type: ignore
+    def test_day_not_in_log(
+        self,
+        tmp_path: "pathlib.Path",
+        day_number: int,
+    ) -> None:
+        """Empty content if the day is not in the log."""
+        log_file = tmp_path / "log.html"
+        log_file.write_text(make_log(range(1, 6)))
+        retriever = self.create_retriever(log_file, day_number)
+
+        content = retriever.get_content()
+
+        assert content == ""
+
+    def test_stops_before_start_of_file(
+        self,
+        tmp_path: "pathlib.Path",
+        monkeypatch: typing.Any,
+    ) -> None:
+        """Reading stops once a day before the requested one is passed."""
+        log_file = tmp_path / "log.html"
+        # Marker bytes at the start of the file that should never be read.
+        log_file.write_bytes(
+            b"\xff" * 10 + make_log(range(1, 6)).encode("utf-8"),
+        )
+        retriever = self.create_retriever(log_file, 4)
+        from logtweet._content import daysection
+        read_windows = []
+        original_pattern = daysection.BYTES_HEADING_PATTERN
+
+        class RecordingPattern(object):
+            def finditer(self, window: bytes) -> typing.Any:
+                read_windows.append(window)
+                return original_pattern.finditer(window)
+
+        monkeypatch.setattr(
+            daysection,
+            "BYTES_HEADING_PATTERN",
+            RecordingPattern(),
+        )
+
+        content = retriever.get_content()
+
+        assert content == make_log([4])
+        assert all(b"\xff" not in window for window in read_windows)
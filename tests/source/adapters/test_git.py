@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the git repository source classes."""
+
+import subprocess  # noqa: S404
+import typing
+
+import pytest  # type: ignore
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+@pytest.fixture  # type: ignore
+def git_repo(tmp_path: "pathlib.Path") -> "pathlib.Path":
+    """
+    Return path of a git repository with a committed log.
+
+    The repository has the branch ``main`` with ``log.md`` in two versions.
+    The first version is tagged ``v1``.
+
+    Returns
+    -------
+    pathlib.Path
+        Path of the repository.
+
+    """
+    repo = tmp_path / "repo"
+    repo.mkdir()
+
+    def git(*args: str) -> None:
+        subprocess.run(  # noqa: S603, S607
+            ["git", "-C", str(repo)] + list(args),
+            check=True,
+            stdout=subprocess.DEVNULL,
+        )
+
+    git("init", "-q", "-b", "main")
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    (repo / "log.md").write_text("## Day 1\n")
+    git("add", "log.md")
+    git("commit", "-q", "-m", "Day 1")
+    git("tag", "v1")
+    (repo / "log.md").write_text("## Day 1\n## Day 2 Grüße\n")
+    git("commit", "-q", "-am", "Day 2")
+    return repo
+
+
+class TestValidGitSource(object):
+    """Tests for the `ValidGitSource` class."""
+
+    def test_repo_file_is_valid(self, git_repo: "pathlib.Path") -> None:
+        """Source string naming a file in an existing repository is valid."""
+        from logtweet.source.adapters import validgit as adaptvalidgit
+
+        valid_source = adaptvalidgit.ValidGitSource(
+            "{0}@main:docs/log.md".format(git_repo),
+        )
+
+        assert valid_source.spec.repo_path == str(git_repo)
+        assert valid_source.spec.ref == "main"
+        assert valid_source.spec.path == "docs/log.md"
+
+    @pytest.mark.parametrize(  # type: ignore
+        "source_template",
+        ["{0}", "{0}@main", "{0}/missing@main:log.md", "https://{0}@a:b"],
+    )
+    def test_invalid_git_source(
+        self,
+        git_repo: "pathlib.Path",
+        source_template: str,
+    ) -> None:
+        """Raise validation error if the source string is no git source."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        from logtweet.source.adapters import validgit as adaptvalidgit
+
+        with pytest.raises(
+            ucretrieve.SourceValidationError,
+            match=r".*is not a git source.*",
+        ):
+            adaptvalidgit.ValidGitSource(source_template.format(git_repo))
+
+
+class TestGitSourceContentRetriever(object):
+    """Tests for the `GitSourceContentRetriever` class."""
+
+    @staticmethod
+    def create_retriever(source_string: str) -> typing.Any:
+        """Create retriever for the git source string."""
+        from logtweet.source.adapters import gitretriever as adaptgit
+        from logtweet.source.adapters import validgit as adaptvalidgit
+        return adaptgit.GitSourceContentRetriever(
+            adaptvalidgit.ValidGitSource(source_string),
+        )
+
+    @pytest.mark.parametrize(  # type: ignore
+        "ref, expected",
+        [("main", "## Day 1\n## Day 2 Grüße\n"), ("v1", "## Day 1\n")],
+    )
+    def test_returns_blob_at_ref(
+        self,
+        git_repo: "pathlib.Path",
+        ref: str,
+        expected: str,
+    ) -> None:
+        """Content of the file at the ref is returned."""
+        retriever = self.create_retriever(
+            "{0}@{1}:log.md".format(git_repo, ref),
+        )
+
+        content = retriever.get_content()
+
+        assert content == expected
+
+    @pytest.mark.parametrize(  # type: ignore
+        "object_name",
+        # The path "." is the root tree, which is not a file.
+        ["main:missing.md", "nobranch:log.md", "main:.", "main:my log.md"],
+    )
+    def test_error_if_not_found(
+        self,
+        git_repo: "pathlib.Path",
+        object_name: str,
+    ) -> None:
+        """Raise error if the ref or path does not exist or is no file."""
+        from logtweet.source.adapters import gitretriever as adaptgit
+        retriever = self.create_retriever(
+            "{0}@{1}".format(git_repo, object_name),
+        )
+
+        with pytest.raises(adaptgit.GitObjectNotFoundError):
+            retriever.get_content()
+
+    def test_process_shared(self, git_repo: "pathlib.Path") -> None:
+        """All sources of one repository share one batch process."""
+        from logtweet.source.adapters import gitretriever as adaptgit
+        first = self.create_retriever("{0}@main:log.md".format(git_repo))
+        second = self.create_retriever("{0}@v1:log.md".format(git_repo))
+        first.get_content()
+        batch = adaptgit.get_batch_process(str(git_repo))
+        process = batch._process  # noqa: WPS437
+
+        second.get_content()
+
+        assert batch._process is process  # noqa: WPS437
+        assert process is not None
+
+    def test_process_restarted(self, git_repo: "pathlib.Path") -> None:
+        """A died batch process is restarted."""
+        from logtweet.source.adapters import gitretriever as adaptgit
+        retriever = self.create_retriever("{0}@main:log.md".format(git_repo))
+        retriever.get_content()
+        batch = adaptgit.get_batch_process(str(git_repo))
+        batch._process.kill()  # noqa: WPS437
+        batch._process.wait()  # noqa: WPS437
+
+        content = retriever.get_content()
+
+        assert content.startswith("## Day 1")
+
+
+def test_controller_selects_git_retriever(git_repo: "pathlib.Path") -> None:
+    """Controller reads git source strings from the repository."""
+    from logtweet.source.controllers import retrieve as ctrlretrieve
+
+    content = ctrlretrieve.get_log_content_from_source(
+        "{0}@v1:log.md".format(git_repo),
+    )
+
+    assert content == "## Day 1\n"
@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the on-disk HTTP cache."""
+
+import typing
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+class TestCachedResponse(object):
+    """Tests for the `httpcache.CachedResponse` class."""
+
+    def test_conditional_headers_from_validators(self) -> None:
+        """Conditional headers are created from the known validators."""
+        from logtweet.source.adapters import httpcache
+        cached_response = httpcache.CachedResponse(
+            url="http://example.com",
+            body=b"",
+            etag='"abc"',
+            last_modified="Mon, 18 May 2020 10:15:00 GMT",
+        )
+
+        headers = cached_response.conditional_headers()
+
+        assert headers == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 18 May 2020 10:15:00 GMT",
+        }
+
+    def test_no_conditional_headers_without_validators(self) -> None:
+        """No conditional headers if no validators are known."""
+        from logtweet.source.adapters import httpcache
+        cached_response = httpcache.CachedResponse(
+            url="http://example.com",
+            body=b"",
+        )
+
+        assert cached_response.conditional_headers() == {}
+
+    def test_text_decoded_with_encoding(self) -> None:
+        """Text is decoded with the stored encoding."""
+        from logtweet.source.adapters import httpcache
+        cached_response = httpcache.CachedResponse(
+            url="http://example.com",
+            body="Grüße".encode("latin-1"),
+            encoding="latin-1",
+        )
+
+        assert cached_response.text == "Grüße"
+
+
+class TestHTTPCache(object):
+    """Tests for the `httpcache.HTTPCache` class."""
+
+    def test_load_stored_response(self, tmp_path: "pathlib.Path") -> None:
+        """Stored response can be loaded by URL."""
+        from logtweet.source.adapters import httpcache
+        cache = httpcache.HTTPCache(str(tmp_path))
+        cached_response = httpcache.CachedResponse(
+            url="http://example.com",
+            body=b"The content\nwith multiple lines",
+            encoding="utf-8",
+            etag='"abc"',
+        )
+        cache.store(cached_response)
+
+        loaded_response = cache.load("http://example.com")
+
+        assert loaded_response == cached_response
+
+    def test_store_file_in_chunks(
+        self,
+        tmp_path: "pathlib.Path",
+        monkeypatch: typing.Any,
+    ) -> None:
+        """A body file is stored in chunks and can be loaded."""
+        import tempfile
+        from logtweet.source.adapters import httpcache
+        monkeypatch.setattr(httpcache, "COPY_CHUNK_SIZE", 4)
+        cache = httpcache.HTTPCache(str(tmp_path))
+        body = b"The content\nwith multiple lines"
+
+        with tempfile.TemporaryFile() as body_file:
+            body_file.write(body)
+            cache.store_file(
+                "http://example.com",
+                body_file,
+                encoding="utf-8",
+                last_modified="Mon, 18 May 2020 10:15:00 GMT",
+            )
+
+        loaded_response = cache.load("http://example.com")
+
+        assert loaded_response == httpcache.CachedResponse(
+            url="http://example.com",
+            body=body,
+            encoding="utf-8",
+            last_modified="Mon, 18 May 2020 10:15:00 GMT",
+        )
+
+    def test_load_unknown_url(self, tmp_path: "pathlib.Path") -> None:
+        """Loading an unknown URL returns `None`."""
+        from logtweet.source.adapters import httpcache
+        cache = httpcache.HTTPCache(str(tmp_path))
+
+        assert cache.load("http://example.com") is None
+
+    def test_response_without_validators_not_stored(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """Responses that can not be revalidated are not stored."""
+        from logtweet.source.adapters import httpcache
+        cache = httpcache.HTTPCache(str(tmp_path))
+        cache.store(httpcache.CachedResponse(
+            url="http://example.com",
+            body=b"The content",
+        ))
+
+        assert cache.load("http://example.com") is None
+
+    def test_truncated_entry_not_loaded(self, tmp_path: "pathlib.Path") -> None:
+        """Entries with a body of unexpected length are ignored."""
+        from logtweet.source.adapters import httpcache
+        cache = httpcache.HTTPCache(str(tmp_path))
+        cache.store(httpcache.CachedResponse(
+            url="http://example.com",
+            body=b"The content",
+            etag='"abc"',
+        ))
+        entry_path = cache.get_entry_path("http://example.com")
+        with open(entry_path, "rb") as entry_file:
+            entry = entry_file.read()
+        with open(entry_path, "wb") as entry_file:
+            entry_file.write(entry[:-3])
+
+        assert cache.load("http://example.com") is None
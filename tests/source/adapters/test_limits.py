@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the retrieval limits."""
+
+import pytest  # type: ignore
+
+
+class TestRetrievalLimits(object):
+    """Tests for the `RetrievalLimits` class."""
+
+    def test_defaults_without_config_section(self) -> None:
+        """Defaults are used if there is no config section."""
+        from logtweet.source.adapters import limits as adaptlimits
+
+        limits = adaptlimits.RetrievalLimits.from_config(None)
+
+        assert limits == adaptlimits.RetrievalLimits()
+
+    @pytest.mark.parametrize(  # type: ignore
+        "max_body_size, expected",
+        [("1000", 1000), ("0", None)],
+    )
+    def test_limits_from_config_section(
+        self,
+        max_body_size: str,
+        expected: int,
+    ) -> None:
+        """Options of the config section are used; zero disables the maximum."""
+        from configparser import ConfigParser
+        from logtweet.source.adapters import limits as adaptlimits
+        config = ConfigParser()
+        config.read_dict({"LogTweet": {
+            "max_body_size": max_body_size,
+            "spool_threshold": "10",
+        }})
+
+        limits = adaptlimits.RetrievalLimits.from_config(config["LogTweet"])
+
+        assert limits.max_body_bytes == expected
+        assert limits.spool_threshold == 10
+
+    def test_check(self) -> None:
+        """Sizes up to the maximum are allowed."""
+        from logtweet.source.adapters import limits as adaptlimits
+        limits = adaptlimits.RetrievalLimits(max_body_bytes=10)
+
+        assert limits.check(10)
+        assert not limits.check(11)
+        assert adaptlimits.RetrievalLimits(max_body_bytes=None).check(10 ** 12)
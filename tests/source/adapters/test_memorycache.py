@@ -0,0 +1,189 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the in-memory stale-while-revalidate cache."""
+
+import typing
+
+import pytest  # type: ignore
+
+if typing.TYPE_CHECKING:
+    from logtweet.source.adapters import memorycache
+
+
+class FakeClock(object):
+    """Clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def create_retriever(
+    contents: typing.List[typing.Any],
+    cache: "memorycache.MemoryCache",
+    calls: typing.List[str],
+    source_string: str = "source",
+) -> typing.Any:
+    """
+    Create caching retriever around a retriever returning the contents.
+
+    Each call of the wrapped retriever returns the next of the contents (or
+    raises it, if it is an exception) and is recorded in the calls.
+
+    """
+    from logtweet.source.usecases import retrieve as ucretrieve
+    from logtweet.source.adapters import memorycache
+
+    class MockValidSource(ucretrieve.AbstractValidSource):
+        @staticmethod
+        def is_valid(source_string: str) -> bool:
+            return True
+
+    class MockRetriever(ucretrieve.AbstractSourceContentRetriever):
+        def get_content(self) -> str:
+            calls.append(self.valid_source.source_string)
+            content = contents.pop(0)
+            if isinstance(content, Exception):
+                raise content
+            return typing.cast(str, content)
+
+    return memorycache.CachingSourceContentRetriever(
+        MockRetriever(MockValidSource(source_string)),
+        cache,
+    )
+
+
+def wait_for_revalidation(cache: "memorycache.MemoryCache") -> None:
+    """Wait until background revalidations are done."""
+    import time
+    deadline = time.monotonic() + 5
+    while cache._revalidating and time.monotonic() < deadline:  # noqa: WPS437
+        time.sleep(0.001)
+
+
+class TestCachingSourceContentRetriever(object):
+    """Tests for the `CachingSourceContentRetriever` class."""
+
+    def test_fresh_content_not_retrieved(self) -> None:
+        """Fresh content is returned without calling the retriever."""
+        from logtweet.source.adapters import memorycache
+        clock = FakeClock()
+        cache = memorycache.MemoryCache(fresh_for=10, clock=clock)
+        calls: typing.List[str] = []
+        retriever = create_retriever(["first", "second"], cache, calls)
+        retriever.get_content()
+        clock.now = 9
+
+        content = retriever.get_content()
+
+        assert content == "first"
+        assert len(calls) == 1
+
+    def test_stale_content_returned_and_revalidated(self) -> None:
+        """Stale content is returned and refreshed in the background."""
+        from logtweet.source.adapters import memorycache
+        clock = FakeClock()
+        cache = memorycache.MemoryCache(fresh_for=10, stale_for=10, clock=clock)
+        calls: typing.List[str] = []
+        retriever = create_retriever(["first", "second"], cache, calls)
+        retriever.get_content()
+        clock.now = 15
+
+        stale_content = retriever.get_content()
+        wait_for_revalidation(cache)
+        fresh_content = retriever.get_content()
+
+        assert stale_content == "first"
+        assert fresh_content == "second"
+        assert len(calls) == 2
+
+    def test_failed_revalidation_keeps_stale_content(self) -> None:
+        """Stale content is served if the revalidation fails."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        from logtweet.source.adapters import memorycache
+        clock = FakeClock()
+        cache = memorycache.MemoryCache(fresh_for=10, stale_for=10, clock=clock)
+        calls: typing.List[str] = []
+        error = ucretrieve.SourceContentRetrievalError("failed")
+        retriever = create_retriever(["first", error, error], cache, calls)
+        retriever.get_content()
+        clock.now = 15
+        retriever.get_content()
+        wait_for_revalidation(cache)
+
+        content = retriever.get_content()
+        wait_for_revalidation(cache)
+
+        assert content == "first"
+        assert len(calls) == 3
+
+    def test_expired_content_retrieved(self) -> None:
+        """Content older than the stale window is retrieved again."""
+        from logtweet.source.adapters import memorycache
+        clock = FakeClock()
+        cache = memorycache.MemoryCache(fresh_for=10, stale_for=10, clock=clock)
+        calls: typing.List[str] = []
+        retriever = create_retriever(["first", "second"], cache, calls)
+        retriever.get_content()
+        clock.now = 20
+
+        content = retriever.get_content()
+
+        assert content == "second"
+
+    def test_error_if_nothing_cached(self) -> None:
+        """Retrieval errors are raised if nothing is cached."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        from logtweet.source.adapters import memorycache
+        calls: typing.List[str] = []
+        retriever = create_retriever(
+            [ucretrieve.SourceContentRetrievalError("failed")],
+            memorycache.MemoryCache(),
+            calls,
+        )
+
+        with pytest.raises(ucretrieve.SourceContentRetrievalError):
+            retriever.get_content()
+
+
+class TestMemoryCache(object):
+    """Tests for the limits of the `MemoryCache` class."""
+
+    def test_entry_limit_evicts_least_recently_used(self) -> None:
+        """Least recently used entry is evicted beyond the entry limit."""
+        from logtweet.source.adapters import memorycache
+        cache = memorycache.MemoryCache(max_entries=2)
+        cache.put("a", "content a")
+        cache.put("b", "content b")
+        cache.get("a")
+
+        cache.put("c", "content c")
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert len(cache) == 2
+
+    def test_byte_limit(self) -> None:
+        """Entries are evicted to stay within the byte limit."""
+        import sys
+        from logtweet.source.adapters import memorycache
+        entry_size = sys.getsizeof("x" * 1000)
+        cache = memorycache.MemoryCache(max_bytes=entry_size * 2)
+
+        for key in range(5):
+            cache.put(key, "x" * 1000)
+
+        assert len(cache) == 2
+        assert cache.total_bytes <= entry_size * 2
+
+    def test_too_large_content_not_cached(self) -> None:
+        """Content larger than the byte limit is not cached."""
+        from logtweet.source.adapters import memorycache
+        cache = memorycache.MemoryCache(max_bytes=100)
+
+        cache.put("a", "x" * 1000)
+
+        assert cache.get("a") is None
+        assert cache.total_bytes == 0
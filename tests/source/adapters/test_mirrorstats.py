@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the mirror latency statistics."""
+
+import typing
+
+import pytest  # type: ignore
+
+if typing.TYPE_CHECKING:
+    import pathlib
+
+
+class TestJSONMirrorLatencyStats(object):
+    """Tests for the `JSONMirrorLatencyStats` class."""
+
+    def test_unknown_mirror(self, tmp_path: "pathlib.Path") -> None:
+        """Latency of an unknown mirror is `None`."""
+        from logtweet.source.adapters import mirrorstats
+        stats = mirrorstats.JSONMirrorLatencyStats(str(tmp_path / "s.json"))
+
+        assert stats.get_latency("https://example.com") is None
+
+    def test_moving_average(self, tmp_path: "pathlib.Path") -> None:
+        """Latencies are combined into a weighted moving average."""
+        from logtweet.source.adapters import mirrorstats
+        stats = mirrorstats.JSONMirrorLatencyStats(
+            str(tmp_path / "s.json"),
+            smoothing=0.5,
+        )
+
+        stats.record("https://example.com", 1.0)
+        stats.record("https://example.com", 3.0)
+
+        assert stats.get_latency("https://example.com") == pytest.approx(2.0)
+
+    def test_failure_recorded_as_penalty(
+        self,
+        tmp_path: "pathlib.Path",
+    ) -> None:
+        """Failed retrievals count as the failure penalty."""
+        from logtweet.source.adapters import mirrorstats
+        stats = mirrorstats.JSONMirrorLatencyStats(str(tmp_path / "s.json"))
+
+        stats.record("https://example.com", None)
+
+        assert stats.get_latency("https://example.com") == (
+            mirrorstats.FAILURE_PENALTY
+        )
+
+    def test_persisted(self, tmp_path: "pathlib.Path") -> None:
+        """Saved statistics are loaded by a new instance."""
+        from logtweet.source.adapters import mirrorstats
+        path = str(tmp_path / "dir" / "s.json")
+        stats = mirrorstats.JSONMirrorLatencyStats(path)
+        stats.record("https://example.com", 1.5)
+
+        stats.save()
+
+        loaded = mirrorstats.JSONMirrorLatencyStats(path)
+        assert loaded.get_latency("https://example.com") == 1.5
+
+    def test_corrupt_file_ignored(self, tmp_path: "pathlib.Path") -> None:
+        """Unreadable file starts empty statistics."""
+        from logtweet.source.adapters import mirrorstats
+        path = tmp_path / "s.json"
+        path.write_text("{not json")
+
+        stats = mirrorstats.JSONMirrorLatencyStats(str(path))
+
+        assert stats.get_latency("https://example.com") is None
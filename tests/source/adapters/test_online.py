@@ -166,8 +166,9 @@ class TestOnlineSourceRetrieverGetContentWhiteBox(object):
     Tests for the `get_content` method of the `OnlineSourceRetriever`.
 
     These are white box tests, that heavily rely on mocking out the used
-    `requests` library and specifically its `get` method. When the
-    implementation changes, then these tests have to be changed.
+    `requests` library and specifically the `get` method of the sessions used
+    by the transport. When the implementation changes, then these tests have
+    to be changed.
 
     """
 
@@ -182,7 +183,7 @@ class TestOnlineSourceRetrieverGetContentWhiteBox(object):
         page_content: str = "",
     ) -> typing.Callable[[typing.Any], "requests.Response"]:
         """
-        Return a mock function to replace `requests.get()`.
+        Return a mock function to replace `requests.Session.get()`.
 
         The mock get function will return a `requests.Response` object with
         the given `status_code` and `page_content`. The `page_content` string
@@ -200,7 +201,7 @@ class TestOnlineSourceRetrieverGetContentWhiteBox(object):
         Returns
         -------
         typing.Callable[[typing.Any], requests.Response]
-            Mock function to replace `requests.get`. Takes typing.Any arguments and
+            Mock function to replace `requests.Session.get`. Takes typing.Any arguments and
             ignores them. It returns a `requests.Response` object with the
             given `status_code` and `page_content`.
 
@@ -211,7 +212,7 @@ class TestOnlineSourceRetrieverGetContentWhiteBox(object):
             """
             Mock get function.
 
-            Use this function to mock out `requests.get`. It returns a
+            Use this function to mock out `requests.Session.get`. It returns a
             `requests.Response` object, just like the real function.
 
             All parameters passed to this function are ignored.
@@ -289,7 +290,7 @@ class TestOnlineSourceRetrieverGetContentWhiteBox(object):
         )
         from logtweet.source.adapters.onlineretriever import requests  # type: ignore
         monkeypatch.setattr(
-            requests,
+            requests.Session,
             "get",
             mock_get,
         )
@@ -305,12 +306,12 @@ class TestOnlineSourceRetrieverGetContentWhiteBox(object):
     ) -> None:
         """Raises ucretrieve.SourceContentRetrievalError when connection error. """
         from logtweet.source.adapters.onlineretriever import requests  # type: ignore
-        # Create mock function for `requests.get`
+        # Create mock function for `requests.Session.get`
         def mock_get_raises_connection_error(*args: typing.Any, **kwargs: typing.Any) -> None:
             raise requests.ConnectionError
-        # Activate the mock for `requests.get`
+        # Activate the mock for `requests.Session.get`
         monkeypatch.setattr(
-            requests,
+            requests.Session,
             "get",
             mock_get_raises_connection_error,
         )
@@ -326,12 +327,12 @@ class TestOnlineSourceRetrieverGetContentWhiteBox(object):
     ) -> None:
         """Raises ucretrieve.SourceContentRetrievalError when connection error. """
         from logtweet.source.adapters.onlineretriever import requests  # type: ignore
-        # Create mock function for `requests.get`
+        # Create mock function for `requests.Session.get`
         def mock_get_raises_connection_error(*args: typing.Any, **kwargs: typing.Any) -> None:
             raise requests.ConnectionError
-        # Activate the mock for `requests.get`
+        # Activate the mock for `requests.Session.get`
         monkeypatch.setattr(
-            requests,
+            requests.Session,
             "get",
             mock_get_raises_connection_error,
         )
@@ -356,7 +357,7 @@ class TestOnlineSourceRetrieverGetContentWhiteBox(object):
         )
         from logtweet.source.adapters.onlineretriever import requests  # type: ignore
         monkeypatch.setattr(
-            requests,
+            requests.Session,
             "get",
             mock_get,
         )
@@ -379,7 +380,7 @@ class TestOnlineSourceRetrieverGetContentWhiteBox(object):
         )
         from logtweet.source.adapters.onlineretriever import requests  # type: ignore
         monkeypatch.setattr(
-            requests,
+            requests.Session,
             "get",
             mock_get,
         )
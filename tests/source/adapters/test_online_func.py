@@ -91,3 +91,241 @@ class TestOnlineSourceContentRetrieverGetContentFunctional(object):
 
         with pytest.raises(adaptonline.RequestError):
             online_source_content_retriever.get_content()
+
+
+class TestOnlineSourceContentRetrieverCacheFunctional(object):
+    """Functional tests for the `get_content` method when using a cache."""
+
+    @staticmethod
+    def etag_handler_class_factory(
+        body: str,
+        requests_seen: typing.List[typing.Dict[str, str]],
+    ) -> typing.Type["httpserver.BaseHTTPRequestHandler"]:
+        """
+        Create handler that supports conditional requests with an ETag.
+
+        Parameters
+        ----------
+        body : str
+            Body of the full response.
+        requests_seen : List[Dict[str, str]]
+            List that the headers of every received request are appended to.
+
+        Returns
+        -------
+        Type[httpserver.BaseHTTPRequestHandler]
+            Request handler responding with ``304`` if the request contains a
+            matching ``If-None-Match`` header.
+
+        """
+        from http import server as httpserver
+        etag = '"v1"'
+
+        class ETagRequestHandler(httpserver.BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                requests_seen.append(dict(self.headers))
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-type", "text/html; charset=utf-8")
+                self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(body.encode("utf-8"))
+
+        return ETagRequestHandler
+
+    def test_not_modified_served_from_cache(
+        self,
+        tmp_path: typing.Any,
+        mock_server_factory: typing.Callable[[typing.Type["httpserver.BaseHTTPRequestHandler"]], typing.Tuple[str, int]],
+        valid_online_source_factory: typing.Callable[[str], "adaptonline.AbstractValidOnlineSource"],
+    ) -> None:
+        """Second retrieval is revalidated and served from the cache."""
+        defined_content = "The content"
+        requests_seen: typing.List[typing.Dict[str, str]] = []
+        mock_server = mock_server_factory(
+            self.etag_handler_class_factory(defined_content, requests_seen),
+        )
+        source_string = "http://{0}:{1}/".format(mock_server[0], mock_server[1])
+        valid_online_source = valid_online_source_factory(source_string)
+        from logtweet.source.adapters import httpcache
+        from logtweet.source.adapters import onlineretriever as adaptonline
+        online_source_content_retriever = adaptonline.OnlineSourceContentRetriever(
+            valid_online_source,
+            httpcache.HTTPCache(str(tmp_path)),
+        )
+
+        first_content = online_source_content_retriever.get_content()
+        second_content = online_source_content_retriever.get_content()
+
+        assert first_content == defined_content
+        assert second_content == defined_content
+        assert "If-None-Match" not in requests_seen[0]
+        assert requests_seen[1]["If-None-Match"] == '"v1"'
+
+
+class TestOnlineSourceContentRetrieverLimitsFunctional(object):
+    """Functional tests for the `get_content` method with size limits."""
+
+    @pytest.mark.parametrize("spool_threshold", [16, 1024 * 1024])  # type: ignore
+    def test_content_within_limit(
+        self,
+        request_get_handler_class_factory: typing.Callable[[int, str], typing.Type["httpserver.BaseHTTPRequestHandler"]],
+        mock_server_factory: typing.Callable[[typing.Type["httpserver.BaseHTTPRequestHandler"]], typing.Tuple[str, int]],
+        valid_online_source_factory: typing.Callable[[str], "adaptonline.AbstractValidOnlineSource"],
+        spool_threshold: int,
+    ) -> None:
+        """Content within the maximum is returned, spooled or not."""
+        defined_content = "The content " * 100
+        mock_server = mock_server_factory(
+            request_get_handler_class_factory(200, defined_content),
+        )
+        source_string = "http://{0}:{1}/".format(mock_server[0], mock_server[1])
+        from logtweet.source.adapters import limits as adaptlimits
+        from logtweet.source.adapters import onlineretriever as adaptonline
+        retriever = adaptonline.OnlineSourceContentRetriever(
+            valid_online_source_factory(source_string),
+            limits=adaptlimits.RetrievalLimits(
+                max_body_bytes=len(defined_content),
+                spool_threshold=spool_threshold,
+                chunk_size=64,
+            ),
+        )
+
+        actual_content = retriever.get_content()
+
+        assert actual_content == defined_content
+
+    def test_spooled_content_cached(
+        self,
+        tmp_path: typing.Any,
+        mock_server_factory: typing.Callable[[typing.Type["httpserver.BaseHTTPRequestHandler"]], typing.Tuple[str, int]],
+        valid_online_source_factory: typing.Callable[[str], "adaptonline.AbstractValidOnlineSource"],
+    ) -> None:
+        """Spooled content is cached and served on ``304 Not Modified``."""
+        defined_content = "The content " * 100
+        requests_seen: typing.List[typing.Dict[str, str]] = []
+        mock_server = mock_server_factory(
+            TestOnlineSourceContentRetrieverCacheFunctional.etag_handler_class_factory(
+                defined_content,
+                requests_seen,
+            ),
+        )
+        source_string = "http://{0}:{1}/".format(mock_server[0], mock_server[1])
+        from logtweet.source.adapters import httpcache
+        from logtweet.source.adapters import limits as adaptlimits
+        from logtweet.source.adapters import onlineretriever as adaptonline
+        retriever = adaptonline.OnlineSourceContentRetriever(
+            valid_online_source_factory(source_string),
+            httpcache.HTTPCache(str(tmp_path)),
+            limits=adaptlimits.RetrievalLimits(spool_threshold=16),
+        )
+
+        first_content = retriever.get_content()
+        second_content = retriever.get_content()
+
+        assert first_content == defined_content
+        assert second_content == defined_content
+        assert requests_seen[1]["If-None-Match"] == '"v1"'
+
+    def test_exception_if_content_too_large(
+        self,
+        request_get_handler_class_factory: typing.Callable[[int, str], typing.Type["httpserver.BaseHTTPRequestHandler"]],
+        mock_server_factory: typing.Callable[[typing.Type["httpserver.BaseHTTPRequestHandler"]], typing.Tuple[str, int]],
+        valid_online_source_factory: typing.Callable[[str], "adaptonline.AbstractValidOnlineSource"],
+    ) -> None:
+        """Raises exception when the body exceeds the maximum."""
+        mock_server = mock_server_factory(
+            request_get_handler_class_factory(200, "x" * 1000),
+        )
+        source_string = "http://{0}:{1}/".format(mock_server[0], mock_server[1])
+        from logtweet.source.usecases import retrieve as ucretrieve
+        from logtweet.source.adapters import limits as adaptlimits
+        from logtweet.source.adapters import onlineretriever as adaptonline
+        retriever = adaptonline.OnlineSourceContentRetriever(
+            valid_online_source_factory(source_string),
+            limits=adaptlimits.RetrievalLimits(max_body_bytes=999),
+        )
+
+        with pytest.raises(ucretrieve.BodyTooLargeError, match=r".*999 bytes.*"):
+            retriever.get_content()
+
+    def test_streaming_exception_if_content_too_large(
+        self,
+        request_get_handler_class_factory: typing.Callable[[int, str], typing.Type["httpserver.BaseHTTPRequestHandler"]],
+        mock_server_factory: typing.Callable[[typing.Type["httpserver.BaseHTTPRequestHandler"]], typing.Tuple[str, int]],
+        valid_online_source_factory: typing.Callable[[str], "adaptonline.AbstractValidOnlineSource"],
+    ) -> None:
+        """Streaming retrieval stops with an exception above the maximum."""
+        mock_server = mock_server_factory(
+            request_get_handler_class_factory(200, "x" * 1000),
+        )
+        source_string = "http://{0}:{1}/".format(mock_server[0], mock_server[1])
+        from datetime import date
+        from logtweet.source.usecases import retrieve as ucretrieve
+        from logtweet.source.adapters import limits as adaptlimits
+        from logtweet.source.adapters import onlineretriever as adaptonline
+        retriever = adaptonline.StreamingOnlineSourceContentRetriever(
+            valid_online_source_factory(source_string),
+            date(2019, 10, 17),
+            chunk_size=64,
+            limits=adaptlimits.RetrievalLimits(max_body_bytes=500),
+        )
+
+        with pytest.raises(ucretrieve.BodyTooLargeError):
+            retriever.get_content()
+
+
+class TestStreamingOnlineSourceContentRetrieverFunctional(object):
+    """Functional tests for the `StreamingOnlineSourceContentRetriever`."""
+
+    def test_returns_day_section(
+        self,
+        request_get_handler_class_factory: typing.Callable[[int, str], typing.Type["httpserver.BaseHTTPRequestHandler"]],
+        mock_server_factory: typing.Callable[[typing.Type["httpserver.BaseHTTPRequestHandler"]], typing.Tuple[str, int]],
+        valid_online_source_factory: typing.Callable[[str], "adaptonline.AbstractValidOnlineSource"],
+    ) -> None:
+        """Only the section of the requested day is returned."""
+        day_2 = "<h2>Day 2: October 17, 2019, Thursday</h2>\n<p>Second.</p>\n"
+        day_1 = "<h2>Day 1: October 16, 2019, Wednesday</h2>\n<p>First.</p>\n"
+        request_handler = request_get_handler_class_factory(
+            200,
+            "<html><body>\n" + day_2 + day_1 * 1000 + "</body></html>",
+        )
+        mock_server = mock_server_factory(request_handler)
+        source_string = "http://{0}:{1}/".format(mock_server[0], mock_server[1])
+        valid_online_source = valid_online_source_factory(source_string)
+        from datetime import date
+        from logtweet.source.adapters import onlineretriever as adaptonline
+        retriever = adaptonline.StreamingOnlineSourceContentRetriever(
+            valid_online_source,
+            date(2019, 10, 17),
+            chunk_size=64,
+        )
+
+        actual_content = retriever.get_content()
+
+        assert actual_content == day_2
+
+    def test_exception_if_404_response(
+        self,
+        request_get_handler_class_factory: typing.Callable[[int, str], typing.Type["httpserver.BaseHTTPRequestHandler"]],
+        mock_server_factory: typing.Callable[[typing.Type["httpserver.BaseHTTPRequestHandler"]], typing.Tuple[str, int]],
+        valid_online_source_factory: typing.Callable[[str], "adaptonline.AbstractValidOnlineSource"],
+    ) -> None:
+        """Raises exception when server responds with 404 status."""
+        request_handler = request_get_handler_class_factory(404)  # type: ignore
+        mock_server = mock_server_factory(request_handler)
+        source_string = "http://{0}:{1}/".format(mock_server[0], mock_server[1])
+        valid_online_source = valid_online_source_factory(source_string)
+        from datetime import date
+        from logtweet.source.adapters import onlineretriever as adaptonline
+        retriever = adaptonline.StreamingOnlineSourceContentRetriever(
+            valid_online_source,
+            date(2019, 10, 17),
+        )
+
+        with pytest.raises(adaptonline.HTTPStatusError):
+            retriever.get_content()
@@ -0,0 +1,195 @@
+# -*- coding: utf-8 -*-
+
+"""Functional tests for the IncrementalOnlineSourceContentRetriever class."""
+
+import re
+import typing
+
+import pytest  # type: ignore
+
+if typing.TYPE_CHECKING:
+    from http import server as httpserver
+    import pathlib
+    from logtweet.source.adapters import rangeretriever as adaptrange
+
+
+class RangeServerState(object):
+    """Content served by the range mock server and requests it received."""
+
+    def __init__(self, content: bytes, supports_ranges: bool = True) -> None:
+        self.content = content
+        self.supports_ranges = supports_ranges
+        self.range_headers: typing.List[typing.Optional[str]] = []
+        self.sent_bytes = 0
+
+
+def range_handler_class_factory(
+    state: RangeServerState,
+) -> typing.Type["httpserver.BaseHTTPRequestHandler"]:
+    """
+    Create request handler that supports open ended `Range` requests.
+
+    Parameters
+    ----------
+    state : RangeServerState
+        Content to serve. Received `Range` headers and the number of sent body
+        bytes are recorded on it.
+
+    Returns
+    -------
+    Type[httpserver.BaseHTTPRequestHandler]
+        Request handler serving the content of the state.
+
+    """
+    from http import server as httpserver
+
+    class RangeRequestHandler(httpserver.BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            range_header = self.headers.get("Range")
+            state.range_headers.append(range_header)
+            match = re.match(r"bytes=(\d+)-$", range_header or "")
+            body = state.content
+            if state.supports_ranges and match:
+                start = int(match.group(1))
+                if start >= len(state.content):
+                    self.send_response(416)
+                    self.end_headers()
+                    return
+                body = state.content[start:]
+                self.send_response(206)
+                self.send_header(
+                    "Content-Range",
+                    "bytes {0}-{1}/{2}".format(
+                        start,
+                        len(state.content) - 1,
+                        len(state.content),
+                    ),
+                )
+            else:
+                self.send_response(200)
+            self.send_header("Content-type", "text/html; charset=utf-8")
+            self.end_headers()
+            self.wfile.write(body)
+            state.sent_bytes += len(body)
+
+    return RangeRequestHandler
+
+
+@pytest.fixture  # type: ignore
+def retriever_factory(
+    tmp_path: "pathlib.Path",
+    mock_server_factory: typing.Callable[[typing.Type["httpserver.BaseHTTPRequestHandler"]], typing.Tuple[str, int]],
+    valid_online_source_factory: typing.Callable[[str], typing.Any],
+) -> typing.Callable[[RangeServerState], "adaptrange.IncrementalOnlineSourceContentRetriever"]:
+    """
+    Return factory for retrievers of a range mock server.
+
+    Parameters
+    ----------
+    tmp_path : pathlib.Path
+        Directory of the cache.
+    mock_server_factory : Callable
+        Fixture returning a factory function to create a running webserver.
+    valid_online_source_factory : Callable
+        Factory function fixture to create a valid online source instance.
+
+    Returns
+    -------
+    Callable[[RangeServerState], IncrementalOnlineSourceContentRetriever]
+        Factory starting a range mock server for the given state and
+        returning a retriever for it.
+
+    """
+    from logtweet.source.adapters import httpcache
+    from logtweet.source.adapters import rangeretriever as adaptrange
+
+    def actual_factory(
+        state: RangeServerState,
+    ) -> adaptrange.IncrementalOnlineSourceContentRetriever:
+        mock_server = mock_server_factory(range_handler_class_factory(state))
+        url = "http://{0}:{1}/".format(mock_server[0], mock_server[1])
+        return adaptrange.IncrementalOnlineSourceContentRetriever(
+            valid_online_source_factory(url),
+            httpcache.HTTPCache(str(tmp_path)),
+            overlap=16,
+        )
+
+    return actual_factory
+
+
+class TestIncrementalOnlineSourceContentRetriever(object):
+    """Functional tests for the `get_content` method."""
+
+    def test_only_appended_tail_downloaded(
+        self,
+        retriever_factory: typing.Callable[[RangeServerState], "adaptrange.IncrementalOnlineSourceContentRetriever"],
+    ) -> None:
+        """Second retrieval only downloads the overlap and the new tail."""
+        state = RangeServerState(b"<h2>Day 1</h2>" * 100)
+        retriever = retriever_factory(state)
+        first_content = retriever.get_content()
+        state.content += b"<h2>Day 2</h2>"
+        state.sent_bytes = 0
+
+        second_content = retriever.get_content()
+
+        assert first_content == "<h2>Day 1</h2>" * 100
+        assert second_content == state.content.decode("utf-8")
+        assert state.range_headers[-1] == "bytes=1384-"
+        assert state.sent_bytes == 16 + len(b"<h2>Day 2</h2>")
+
+    def test_unchanged_log(
+        self,
+        retriever_factory: typing.Callable[[RangeServerState], "adaptrange.IncrementalOnlineSourceContentRetriever"],
+    ) -> None:
+        """Unchanged log is returned from the copy."""
+        state = RangeServerState(b"<h2>Day 1</h2>" * 100)
+        retriever = retriever_factory(state)
+        retriever.get_content()
+
+        content = retriever.get_content()
+
+        assert content == state.content.decode("utf-8")
+
+    def test_full_fetch_if_log_changed(
+        self,
+        retriever_factory: typing.Callable[[RangeServerState], "adaptrange.IncrementalOnlineSourceContentRetriever"],
+    ) -> None:
+        """Log is fetched in full if the overlap does not match."""
+        state = RangeServerState(b"<h2>Day 1</h2>" * 100)
+        retriever = retriever_factory(state)
+        retriever.get_content()
+        state.content = b"<h2>Day 0</h2>" * 101
+
+        content = retriever.get_content()
+
+        assert content == state.content.decode("utf-8")
+        assert state.range_headers[-1] is None
+
+    def test_full_fetch_if_log_shrank(
+        self,
+        retriever_factory: typing.Callable[[RangeServerState], "adaptrange.IncrementalOnlineSourceContentRetriever"],
+    ) -> None:
+        """Log is fetched in full if it is shorter than the copy."""
+        state = RangeServerState(b"<h2>Day 1</h2>" * 100)
+        retriever = retriever_factory(state)
+        retriever.get_content()
+        state.content = b"<h2>Day 1</h2>"
+
+        content = retriever.get_content()
+
+        assert content == "<h2>Day 1</h2>"
+
+    def test_server_ignoring_ranges(
+        self,
+        retriever_factory: typing.Callable[[RangeServerState], "adaptrange.IncrementalOnlineSourceContentRetriever"],
+    ) -> None:
+        """Full response is used if the server ignores the range."""
+        state = RangeServerState(b"<h2>Day 1</h2>", supports_ranges=False)
+        retriever = retriever_factory(state)
+        retriever.get_content()
+        state.content += b"<h2>Day 2</h2>"
+
+        content = retriever.get_content()
+
+        assert content == "<h2>Day 1</h2><h2>Day 2</h2>"
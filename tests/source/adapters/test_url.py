@@ -2,6 +2,8 @@
 
 """Tests for the OnlineLogSource class."""
 
+import typing
+
 import pytest  # type: ignore
 
 
@@ -95,3 +97,65 @@ class TestValidUrlInitialization(object):
             match=r".*{0}.*".format(invalid_url_string),
         ):
             adapturl.ValidSourceURL(invalid_url_string)
+
+
+class TestValidateSourceURLs(object):
+    """Test the batch validation ``validate_source_urls``."""
+
+    def test_returns_valid_urls_in_order(self) -> None:
+        """One valid URL object per source string is returned in order."""
+        source_strings = [
+            "https://example.com/{0}".format(num) for num in range(1000)
+        ]
+        from logtweet.source.adapters import validurl as adapturl
+
+        valid_urls = adapturl.validate_source_urls(source_strings)
+
+        assert [valid_url.url for valid_url in valid_urls] == source_strings
+        assert all(
+            isinstance(valid_url, adapturl.ValidSourceURL)
+            for valid_url in valid_urls
+        )
+
+    def test_all_invalid_sources_reported(self) -> None:
+        """All invalid source strings are listed on the error."""
+        source_strings = [
+            "not a url",
+            "https://example.com",
+            "/some/path.html",
+            "https://",
+        ]
+        from logtweet.source.adapters import validurl as adapturl
+
+        with pytest.raises(adapturl.InvalidSourcesError) as excinfo:
+            adapturl.validate_source_urls(source_strings)
+
+        assert excinfo.value.invalid_sources == [
+            "not a url",
+            "/some/path.html",
+            "https://",
+        ]
+
+    def test_non_string_raises_type_error(self) -> None:
+        """Source strings that are not of type `str` raise a type error."""
+        from logtweet.source.adapters import validurl as adapturl
+
+        with pytest.raises(TypeError):
+            adapturl.validate_source_urls(["https://example.com", 1])  # type: ignore
+
+    def test_validation_memoized(self, monkeypatch: typing.Any) -> None:
+        """Each distinct string is only validated once."""
+        from logtweet.source.adapters import validurl as adapturl
+        validated = []
+        original_url = adapturl.validators.url
+
+        def counting_url(url: str) -> typing.Any:
+            validated.append(url)
+            return original_url(url)
+
+        monkeypatch.setattr(adapturl.validators, "url", counting_url)
+        adapturl.is_url.cache_clear()
+
+        adapturl.validate_source_urls(["https://example.org/log"] * 50)
+
+        assert validated == ["https://example.org/log"]
@@ -9,7 +9,6 @@ https://realpython.com/testing-third-party-apis-with-mock-servers/#testing-the-m
 """
 
 from http import server as httpserver
-import socket
 import threading
 import typing
 
@@ -121,25 +120,6 @@ def request_get_handler_class_factory(
     return concrete_get_handler_class_factory
 
 
-@pytest.fixture  # type: ignore
-def free_port() -> int:
-    """
-    Return free port on the localhost.
-
-    Returns
-    -------
-    int
-        Free port number on the localhost.
-
-    """
-    sock = socket.socket(socket.AF_INET, type=socket.SOCK_STREAM)
-    sock.bind(("localhost", 0))
-    port: int
-    _, port = sock.getsockname()
-    sock.close()
-    return port
-
-
 @pytest.fixture  # type: ignore
 def mock_server_factory(
     free_port: int,
@@ -4,6 +4,7 @@
 
 import typing
 
+import pytest  # type: ignore
 
 if typing.TYPE_CHECKING:
     from http import server as httpserver
@@ -32,5 +33,141 @@ def test_exiting_url_to_content(
 
     assert returned_content == page_content
 
-# TEST: Returns log content from local file when given it's path
-# TEST: Raises and error when source string neither path nor URL.
+
+def test_existing_file_to_content(tmp_path: typing.Any) -> None:
+    """Return log content from local file when given its path."""
+    page_content = "This is the content"
+    log_file = tmp_path / "log.html"
+    log_file.write_text(page_content)
+    from logtweet.source.controllers import retrieve as ctrlretrieve
+
+    returned_content = ctrlretrieve.get_log_content_from_source(
+        source_string=str(log_file),
+    )
+
+    assert returned_content == page_content
+
+
+def test_file_url_to_content(tmp_path: typing.Any) -> None:
+    """Return log content from local file when given its `file://` URL."""
+    page_content = "This is the content"
+    log_file = tmp_path / "log.html"
+    log_file.write_text(page_content)
+    from logtweet.source.controllers import retrieve as ctrlretrieve
+
+    returned_content = ctrlretrieve.get_log_content_from_source(
+        source_string="file://{0}".format(log_file),
+    )
+
+    assert returned_content == page_content
+
+
+def test_file_section_of_day(tmp_path: typing.Any) -> None:
+    """Return only the section of the day from a local file."""
+    import datetime
+    day_1 = "<h2>Day 1: October 16, 2019, Wednesday</h2><p>One</p>"
+    day_2 = "<h2>Day 2: October 17, 2019, Thursday</h2><p>Two</p>"
+    log_file = tmp_path / "log.html"
+    log_file.write_text(day_1 + day_2)
+    from logtweet.source.controllers import retrieve as ctrlretrieve
+
+    returned_content = ctrlretrieve.get_log_content_from_source(
+        source_string=str(log_file),
+        day_date=datetime.date(2019, 10, 16),
+    )
+
+    assert returned_content == day_1
+
+
+def test_error_if_neither_path_nor_url(tmp_path: typing.Any) -> None:
+    """Raise an error when source string is neither a path nor a URL."""
+    source_string = str(tmp_path / "does-not-exist.html")
+    from logtweet.source.usecases import retrieve as ucretrieve
+    from logtweet.source.controllers import retrieve as ctrlretrieve
+
+    with pytest.raises(
+        ucretrieve.SourceValidationError,
+        match=r".*neither a URL nor an existing file.*",
+    ):
+        ctrlretrieve.get_log_content_from_source(source_string)
+
+
+def test_many_urls_to_contents(
+    request_get_handler_class_factory: typing.Callable[[int, str], typing.Type["httpserver.BaseHTTPRequestHandler"]],
+    mock_server_factory: typing.Callable[[typing.Type["httpserver.BaseHTTPRequestHandler"]], typing.Tuple[str, int]],
+) -> None:
+    """Return log contents and per-source errors for many sources."""
+    page_content = "This is the content"
+    request_get_handler = request_get_handler_class_factory(200, page_content)
+    mock_server = mock_server_factory(request_get_handler)
+    url = "http://{0}:{1}".format(mock_server[0], mock_server[1])
+    from logtweet.source.controllers import retrieve as ctrlretrieve
+
+    results = ctrlretrieve.get_log_contents_from_sources(
+        [url, "not a url", url + "/other"],
+        max_concurrency=2,
+    )
+
+    assert [result.source_string for result in results] == [
+        url,
+        "not a url",
+        url + "/other",
+    ]
+    assert results[0].content == page_content
+    assert results[1].content is None
+    assert results[1].error is not None
+    assert results[2].content == page_content
+
+
+def test_mirrors_to_content(tmp_path: typing.Any, free_port: int) -> None:
+    """Return content of a mirror and record the mirror latencies."""
+    log_file = tmp_path / "log.html"
+    log_file.write_text("This is the content")
+    missing_url = "http://localhost:{0}/log.html".format(free_port)
+    stats_path = tmp_path / "mirrors.json"
+    from logtweet.source.controllers import retrieve as ctrlretrieve
+
+    returned_content = ctrlretrieve.get_log_content_from_mirrors(
+        [missing_url, str(log_file)],
+        stats_path=str(stats_path),
+    )
+
+    assert returned_content == "This is the content"
+    assert str(log_file) in stats_path.read_text()
+
+
+@pytest.mark.parametrize(  # type: ignore
+    "source_option",
+    [
+        "https://a.example.com, https://b.example.com",
+        "\nhttps://a.example.com\nhttps://b.example.com\n",
+    ],
+)
+def test_parse_source_strings(source_option: str) -> None:
+    """Mirrors are separated by commas or line breaks."""
+    from logtweet.source.controllers import retrieve as ctrlretrieve
+
+    source_strings = ctrlretrieve.parse_source_strings(source_option)
+
+    assert source_strings == ["https://a.example.com", "https://b.example.com"]
+
+
+def test_memory_cache_serves_fresh_content(tmp_path: typing.Any) -> None:
+    """Fresh content is served from the memory cache without retrieval."""
+    log_file = tmp_path / "log.html"
+    log_file.write_text("first")
+    from logtweet.source.adapters import memorycache
+    from logtweet.source.controllers import retrieve as ctrlretrieve
+    memory_cache = memorycache.MemoryCache(fresh_for=60)
+    ctrlretrieve.get_log_content_from_source(
+        str(log_file),
+        memory_cache=memory_cache,
+    )
+    log_file.write_text("second")
+
+    returned_content = ctrlretrieve.get_log_content_from_source(
+        str(log_file),
+        memory_cache=memory_cache,
+    )
+
+    assert returned_content == "first"
@@ -352,3 +352,279 @@ class TestGetLogContentFromSource(object):
             get_log_content_from_source(
                 mock_source_content_retriever,
             )
+
+
+class TestGetLogContentsFromSources(object):
+    """Tests for the asynchronous use case `get_log_contents_from_sources`."""
+
+    if typing.TYPE_CHECKING:
+        from logtweet.source.usecases import retrieve as ucretrieve
+
+    @staticmethod
+    def run(coroutine: typing.Awaitable[typing.Any]) -> typing.Any:
+        """Run coroutine in a new event loop."""
+        import asyncio
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coroutine)
+        finally:
+            loop.close()
+
+    @staticmethod
+    def mock_valid_source(
+        source_string: str,
+    ) -> "ucretrieve.AbstractValidSource":
+        """Return a mock instance of an ucretrieve.AbstractValidSource subclass."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        class MockValidSource(ucretrieve.AbstractValidSource):
+            @staticmethod
+            def is_valid(source_string: str) -> bool:
+                return True
+        return MockValidSource(source_string)
+
+    def test_returns_contents_in_order(self) -> None:
+        """Results are returned in the order of the retrievers."""
+        import asyncio
+        from logtweet.source.usecases import retrieve as ucretrieve
+        class MockAsyncRetriever(ucretrieve.AbstractAsyncSourceContentRetriever):
+            async def get_content(self) -> str:
+                # Later sources finish first.
+                delay = 0.01 / int(self.valid_source.source_string)
+                await asyncio.sleep(delay)
+                return "content {0}".format(self.valid_source.source_string)
+        retrievers = [
+            MockAsyncRetriever(self.mock_valid_source(str(num)))
+            for num in range(1, 6)
+        ]
+
+        results = self.run(ucretrieve.get_log_contents_from_sources(retrievers))
+
+        assert [result.content for result in results] == [
+            "content {0}".format(num) for num in range(1, 6)
+        ]
+
+    def test_retrieval_errors_per_source(self) -> None:
+        """Retrieval errors are reported on the result of the failed source."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        class MockAsyncRetriever(ucretrieve.AbstractAsyncSourceContentRetriever):
+            async def get_content(self) -> str:
+                if self.valid_source.source_string == "bad":
+                    raise ucretrieve.SourceContentRetrievalError("failed")
+                return "content"
+        retrievers = [
+            MockAsyncRetriever(self.mock_valid_source(source_string))
+            for source_string in ("good", "bad", "good")
+        ]
+
+        results = self.run(ucretrieve.get_log_contents_from_sources(retrievers))
+
+        assert [result.content for result in results] == [
+            "content",
+            None,
+            "content",
+        ]
+        assert isinstance(
+            results[1].error,
+            ucretrieve.SourceContentRetrievalError,
+        )
+
+    def test_concurrency_is_bounded(self) -> None:
+        """No more than the maximum number of retrievals run at once."""
+        import asyncio
+        running = []
+        max_running = []
+        from logtweet.source.usecases import retrieve as ucretrieve
+        class MockAsyncRetriever(ucretrieve.AbstractAsyncSourceContentRetriever):
+            async def get_content(self) -> str:
+                running.append(self)
+                max_running.append(len(running))
+                await asyncio.sleep(0.001)
+                running.remove(self)
+                return "content"
+        retrievers = [
+            MockAsyncRetriever(self.mock_valid_source(str(num)))
+            for num in range(20)
+        ]
+
+        self.run(ucretrieve.get_log_contents_from_sources(
+            retrievers,
+            max_concurrency=3,
+        ))
+
+        assert max(max_running) == 3
+
+    def test_not_inherited_retrievers_raise_type_error(self) -> None:
+        """Retrievers not inherited from the abstract class raise type error."""
+        class MockAsyncRetriever(object):
+            async def get_content(self) -> str:
+                return "some string"
+        from logtweet.source.usecases import retrieve as ucretrieve
+
+        with pytest.raises(TypeError):
+            self.run(ucretrieve.get_log_contents_from_sources(
+                [MockAsyncRetriever()],  # type: ignore
+            ))
+
+
+class TestGetLogContentFromMirrors(object):
+    """Tests for the use case `get_log_content_from_mirrors`."""
+
+    if typing.TYPE_CHECKING:
+        from logtweet.source.usecases import retrieve as ucretrieve
+
+    @staticmethod
+    def mock_retrievers(
+        delays: typing.Dict[str, float],
+        failing: typing.Iterable[str] = (),
+        started: typing.Optional[typing.List[str]] = None,
+    ) -> typing.List["ucretrieve.AbstractSourceContentRetriever"]:
+        """Return retrievers that return their source string after a delay."""
+        import time
+        from logtweet.source.usecases import retrieve as ucretrieve
+        class MockValidSource(ucretrieve.AbstractValidSource):
+            @staticmethod
+            def is_valid(source_string: str) -> bool:
+                return True
+        class MockRetriever(ucretrieve.AbstractSourceContentRetriever):
+            def get_content(self) -> str:
+                source_string = self.valid_source.source_string
+                if started is not None:
+                    started.append(source_string)
+                time.sleep(delays[source_string])
+                if source_string in failing:
+                    raise ucretrieve.SourceContentRetrievalError("failed")
+                return source_string
+        return [
+            MockRetriever(MockValidSource(source_string))
+            for source_string in delays
+        ]
+
+    @staticmethod
+    def mock_stats(
+        latencies: typing.Dict[str, float],
+    ) -> "ucretrieve.AbstractMirrorLatencyStats":
+        """Return in-memory latency stats that keep the last latency."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        class MockStats(ucretrieve.AbstractMirrorLatencyStats):
+            def get_latency(self, source_string: str) -> typing.Optional[float]:
+                return latencies.get(source_string)
+
+            def record(
+                self,
+                source_string: str,
+                latency: typing.Optional[float],
+            ) -> None:
+                latencies[source_string] = latency  # type: ignore
+        return MockStats()
+
+    def test_fastest_mirror_wins(self) -> None:
+        """Content of the first mirror to respond is returned."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        retrievers = self.mock_retrievers({"slow": 0.5, "fast": 0.01})
+
+        content = ucretrieve.get_log_content_from_mirrors(retrievers)
+
+        assert content == "fast"
+
+    def test_failing_mirror_skipped(self) -> None:
+        """A failing mirror does not stop the others."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        retrievers = self.mock_retrievers(
+            {"broken": 0, "working": 0.05},
+            failing=["broken"],
+        )
+
+        content = ucretrieve.get_log_content_from_mirrors(retrievers)
+
+        assert content == "working"
+
+    def test_unexpected_error_is_mirror_failure(self) -> None:
+        """Any exception of a mirror is recorded as its failure."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        latencies: typing.Dict[str, float] = {}
+        retrievers = self.mock_retrievers({"broken": 0, "working": 0.05})
+
+        def raise_unexpected() -> str:
+            raise UnicodeDecodeError("utf-8", b"\xff", 0, 1, "invalid")
+
+        retrievers[0].get_content = raise_unexpected  # type: ignore
+
+        content = ucretrieve.get_log_content_from_mirrors(
+            retrievers,
+            self.mock_stats(latencies),
+        )
+
+        assert content == "working"
+        assert latencies["broken"] is None
+
+    def test_error_if_all_mirrors_fail(self) -> None:
+        """Raise error listing the error of each mirror if all fail."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        retrievers = self.mock_retrievers(
+            {"first": 0, "second": 0},
+            failing=["first", "second"],
+        )
+
+        with pytest.raises(ucretrieve.AllMirrorsFailedError) as excinfo:
+            ucretrieve.get_log_content_from_mirrors(retrievers)
+
+        assert set(excinfo.value.errors) == {"first", "second"}
+
+    def test_fastest_known_mirror_started_first(self) -> None:
+        """Mirrors are started in the order of their known latency."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        started: typing.List[str] = []
+        retrievers = self.mock_retrievers(
+            {"a": 0, "b": 0, "c": 0},
+            started=started,
+        )
+        stats = self.mock_stats({"a": 3.0, "b": 1.0, "c": 2.0})
+
+        ucretrieve.get_log_content_from_mirrors(
+            retrievers,
+            stats,
+            max_concurrency=1,
+        )
+
+        assert started[0] == "b"
+
+    def test_latencies_recorded(self) -> None:
+        """Latency of the winning mirror and failures are recorded."""
+        from logtweet.source.usecases import retrieve as ucretrieve
+        latencies: typing.Dict[str, float] = {}
+        retrievers = self.mock_retrievers(
+            {"broken": 0, "working": 0.05},
+            failing=["broken"],
+        )
+
+        ucretrieve.get_log_content_from_mirrors(
+            retrievers,
+            self.mock_stats(latencies),
+        )
+
+        assert latencies["broken"] is None
+        assert latencies["working"] >= 0.05
+
+    def test_late_mirror_outcome_saved(self) -> None:
+        """Outcomes of mirrors ending after the winner are saved too."""
+        import time
+        from logtweet.source.usecases import retrieve as ucretrieve
+        latencies: typing.Dict[str, float] = {}
+        saved: typing.List[typing.Dict[str, float]] = []
+        stats = self.mock_stats(latencies)
+        stats.save = lambda: saved.append(dict(latencies))  # type: ignore
+        retrievers = self.mock_retrievers({"fast": 0, "slow": 0.2})
+
+        content = ucretrieve.get_log_content_from_mirrors(retrievers, stats)
+        time.sleep(0.4)
+
+        assert content == "fast"
+        assert len(saved) == 2
+        assert set(saved[-1]) == {"fast", "slow"}
+
+    def test_unknown_mirror_sorted_at_mean_latency(self) -> None:
+        """Unmeasured mirrors are not always tried first."""
+        stats = self.mock_stats({"a": 1.0, "b": 3.0})
+
+        assert stats.sort(["c", "b", "a"]) == ["a", "c", "b"]
+        assert self.mock_stats({}).sort(["c", "b"]) == ["c", "b"]
@@ -11,6 +11,16 @@ def test_sending_creates_history_entry():
     """"Test sending in normal mode creates a history entry."""
     pass
 
+
+def test_day_source_independent_of_mirror_order():
+    """Mirrors listed in another order share the key of their days."""
+    from logtweet import app
+
+    day_source = app.get_day_source(["https://b.example/log", "/tmp/log"])
+
+    assert day_source == app.get_day_source(["/tmp/log", "https://b.example/log"])
+    assert day_source == "/tmp/log,https://b.example/log"
+
 # TEST: Sending duplicate in normal mode leads to error to user.
 # TEST: Sending in normal mode shows a console message.
 # TEST: Sending in normal mode prints success msg to console
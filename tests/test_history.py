@@ -185,3 +185,156 @@ This is some more."""
         )
 
         assert found is False
+
+
+class TestCreateHistoryStore(object):
+    """Tests for ``create_history_store`` function."""
+
+    def test_text_backend_by_default(self):
+        from logtweet import history
+        from logtweet._history import text as histtext
+
+        store = history.create_history_store()
+
+        assert isinstance(store, histtext.TextHistoryStore)
+        assert store.path == history.LOG_FILE
+
+    def test_sqlite_backend_from_config(self, tmp_path):
+        import configparser
+        from logtweet import history
+        from logtweet._history import sqlite as histsqlite
+        config = configparser.ConfigParser()
+        config.read_dict({
+            "History": {
+                "backend": "sqlite",
+                "path": str(tmp_path / "history.db"),
+            },
+        })
+        settings = history.HistorySettings.from_config(config["History"])
+
+        with history.create_history_store(settings) as store:
+            assert isinstance(store, histsqlite.SQLiteHistoryStore)
+            history.add_tweet_to_history("A\nmultiline tweet.", store=store)
+
+            assert history.is_tweet_in_history("A\nmultiline tweet.", store=store)
+            assert store.contains("A multiline tweet.")
+
+    def test_unknown_backend_rejected(self):
+        import pytest
+        from logtweet import history
+
+        with pytest.raises(ValueError):
+            history.create_history_store(history.HistorySettings(backend="csv"))
+
+    def test_bloom_filter_from_config(self, tmp_path):
+        import os
+        from logtweet import history
+        from logtweet._history import bloom as histbloom
+        settings = history.HistorySettings(
+            path=str(tmp_path / "tweet.log"),
+            bloom_filter=True,
+        )
+
+        with history.create_history_store(settings) as store:
+            history.add_tweet_to_history("A tweet.", store=store)
+
+            assert isinstance(store, histbloom.BloomFilteredHistoryStore)
+        assert os.path.exists(str(tmp_path / "tweet.log.bloom"))
+        assert history.rebuild_bloom_filter(settings) == 1
+
+    def test_compact_only_segmented(self, tmp_path):
+        import pytest
+        from logtweet import history
+        settings = history.HistorySettings(
+            backend="segmented",
+            path=str(tmp_path / "history"),
+            segment_max_bytes=1,
+        )
+        with history.create_history_store(settings) as store:
+            history.add_tweet_to_history("A tweet.", store=store)
+            history.add_tweet_to_history("Another tweet.", store=store)
+
+        compaction = history.compact_history(settings, retention_days=0)
+
+        assert compaction.dropped_entries == 1
+        with pytest.raises(ValueError):
+            history.compact_history(history.HistorySettings())
+
+    def test_near_duplicates_from_config(self, tmp_path):
+        from logtweet import history
+        settings = history.HistorySettings(
+            path=str(tmp_path / "tweet.log"),
+            bloom_filter=True,
+            near_duplicates=True,
+        )
+        tweet = (
+            "1/#100DaysOfCode Set up the project structure and the first"
+            + " tests.\n\nhttps://bit.ly/a"
+        )
+
+        with history.create_history_store(settings) as store:
+            history.add_tweet_to_history(tweet, store=store)
+            matches = history.find_similar_tweets(
+                tweet.replace("project", "projekt").replace("/a", "/b"),
+                store=store,
+            )
+            exact = history.is_tweet_in_history(tweet, store=store)
+
+        assert len(matches) == 1
+        assert exact is True
+
+
+class TestHistoryQueries(object):
+    """Tests for the time range queries of the history."""
+
+    def test_count_and_export_time_range(self, tmp_path):
+        import datetime
+        import io
+        import json
+        from logtweet import history
+        settings = history.HistorySettings(
+            backend="sqlite",
+            path=str(tmp_path / "history.db"),
+        )
+        start = datetime.datetime(2020, 1, 1, 12)
+        with history.create_history_store(settings) as store:
+            for day in range(7):
+                store.add(
+                    "Tweet {0}.".format(day),
+                    sent_at=start + datetime.timedelta(days=day),
+                )
+        since = start + datetime.timedelta(days=5)
+        export_file = io.StringIO()
+
+        count = history.count_history_entries(settings, since=since)
+        exported = history.export_history(
+            settings,
+            export_file,
+            since=since,
+            export_format="json",
+        )
+
+        assert count == exported == 2
+        assert json.loads(export_file.getvalue().splitlines()[0]) == {
+            "sent_at": "2020-01-06T12:00:00",
+            "message": "Tweet 5.",
+        }
+
+
+class TestDayKeys(object):
+    """Tests for the day keys recorded next to the history."""
+
+    def test_day_recorded_unless_disabled(self, tmp_path):
+        import datetime
+        from logtweet import history
+        settings = history.HistorySettings(path=str(tmp_path / "tweet.log"))
+        disabled = settings._replace(day_keys=False)
+        day_date = datetime.date(2020, 1, 31)
+
+        history.add_day_to_history("https://a.com", day_date, 3, settings)
+        history.add_day_to_history("https://b.com", day_date, 3, disabled)
+
+        assert history.is_day_in_history("https://a.com", day_date, settings)
+        assert not history.is_day_in_history("https://b.com", day_date, settings)
+        assert not history.is_day_in_history("https://a.com", day_date, disabled)
+        assert history.get_day_keys_path(settings).endswith("tweet.log.days")
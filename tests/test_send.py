@@ -7,3 +7,132 @@
 # How can I test the successful case? I do not want to store my actual
 # twitter credentials in the repo. Do I need a testing account? Even for that
 # I would not want it's credentials to be public.
+
+
+class TestTwitterClientCache(object):
+    """Tests for the `TwitterClientCache` class."""
+
+    def test_api_reused_and_verified_within_ttl(self, monkeypatch) -> None:
+        """Credentials are only verified again after the TTL."""
+        import tweepy
+        from logtweet import send
+        from logtweet import transport as httptransport
+        verifications = []
+        monkeypatch.setattr(
+            tweepy.API,
+            "verify_credentials",
+            lambda api: verifications.append(api),
+        )
+        now = [0.0]
+        cache = send.TwitterClientCache(clock=lambda: now[0])
+        credentials = send.TwitterCredentials("key", "secret", "token", "s")
+        transport = httptransport.Transport()
+
+        first_api = cache.get_api(credentials, transport, verify_ttl=60)
+        now[0] = 59
+        second_api = cache.get_api(credentials, transport, verify_ttl=60)
+        now[0] = 60
+        third_api = cache.get_api(credentials, transport, verify_ttl=60)
+
+        assert first_api is second_api is third_api
+        assert first_api.session is transport.get_session(send.TWITTER_API_URL)
+        assert len(verifications) == 2
+
+    def test_api_kept_for_new_transport(self, monkeypatch) -> None:
+        """One API is kept per credentials and moved to a new transport."""
+        import tweepy
+        from logtweet import send
+        from logtweet import transport as httptransport
+        verifications = []
+        monkeypatch.setattr(
+            tweepy.API,
+            "verify_credentials",
+            lambda api: verifications.append(api),
+        )
+        cache = send.TwitterClientCache()
+        credentials = send.TwitterCredentials("key", "secret", "token", "s")
+        new_transport = httptransport.Transport()
+
+        first_api = cache.get_api(credentials, httptransport.Transport())
+        second_api = cache.get_api(credentials, new_transport)
+
+        assert first_api is second_api
+        assert second_api.session is new_transport.get_session(
+            send.TWITTER_API_URL,
+        )
+        assert len(verifications) == 1
+        assert len(cache._apis) == 1  # noqa: WPS437
+
+    def test_verifications_of_other_credentials_not_blocked(
+        self,
+        monkeypatch,
+    ) -> None:
+        """A slow verification only blocks requests for its credentials."""
+        import threading
+        import tweepy
+        from logtweet import send
+        from logtweet import transport as httptransport
+        slow_started = threading.Event()
+        release_slow = threading.Event()
+
+        def verify(api):
+            if api.auth.consumer_key == "slow":
+                slow_started.set()
+                release_slow.wait(5)
+
+        monkeypatch.setattr(tweepy.API, "verify_credentials", verify)
+        cache = send.TwitterClientCache()
+        transport = httptransport.Transport()
+        slow_thread = threading.Thread(
+            target=cache.get_api,
+            args=(send.TwitterCredentials("slow", "s", "t", "s"), transport),
+        )
+        slow_thread.start()
+        slow_started.wait(5)
+
+        fast_api = cache.get_api(
+            send.TwitterCredentials("fast", "s", "t", "s"),
+            transport,
+        )
+        is_slow_waiting = slow_thread.is_alive()
+        release_slow.set()
+        slow_thread.join(5)
+
+        assert fast_api is not None
+        assert is_slow_waiting
+
+    def test_verified_again_after_auth_error(self, monkeypatch) -> None:
+        """An authentication error drops the cached API."""
+        import pytest
+        import requests
+        import tweepy
+        from logtweet import send
+        from logtweet import transport as httptransport
+        verifications = []
+        monkeypatch.setattr(
+            tweepy.API,
+            "verify_credentials",
+            lambda api: verifications.append(api),
+        )
+        response = requests.Response()
+        response.status_code = 401
+
+        def reject(api, status):
+            raise tweepy.Unauthorized(response)
+
+        monkeypatch.setattr(tweepy.API, "update_status", reject)
+        monkeypatch.setattr(send, "_client_cache", send.TwitterClientCache())
+        twitter_config = {
+            "api_key": "key",
+            "api_secret": "secret",
+            "access_token": "token",
+            "access_secret": "s",
+        }
+        transport = httptransport.Transport()
+
+        with pytest.raises(tweepy.Unauthorized):
+            send.send_tweet("A tweet.", twitter_config, transport)
+        api = send.get_tweepy_api("key", "secret", "token", "s", transport)
+
+        assert len(verifications) == 2
+        assert api is not verifications[0]
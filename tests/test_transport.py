@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the shared HTTP transport."""
+
+from configparser import ConfigParser
+import typing
+
+import pytest  # type: ignore
+
+
+class TestTransportSettings(object):
+    """Tests for the `TransportSettings` class."""
+
+    def test_defaults_without_config_section(self) -> None:
+        """Default settings are used without a config section."""
+        from logtweet import transport as httptransport
+
+        settings = httptransport.TransportSettings.from_config(None)
+
+        assert settings == httptransport.TransportSettings()
+
+    def test_settings_from_config_section(self) -> None:
+        """Options defined in the config section are used."""
+        config = ConfigParser()
+        config.read_string(
+            "[Transport]\n"
+            + "pool_maxsize = 20\n"
+            + "connect_timeout = 1.5\n"
+            + "https_proxy = http://proxy.example.com:3128\n",
+        )
+        from logtweet import transport as httptransport
+
+        settings = httptransport.TransportSettings.from_config(
+            config["Transport"],
+        )
+
+        assert settings.pool_maxsize == 20
+        assert settings.timeout == (1.5, settings.read_timeout)
+        assert settings.proxies == {"https": "http://proxy.example.com:3128"}
+
+
+class TestTransport(object):
+    """Tests for the `Transport` class."""
+
+    def test_same_session_for_same_host(self) -> None:
+        """Requests to the same host share one session."""
+        from logtweet import transport as httptransport
+        transport = httptransport.Transport()
+
+        first_session = transport.get_session("https://example.com/a")
+        second_session = transport.get_session("https://example.com/b?c=d")
+
+        assert first_session is second_session
+
+    def test_different_session_for_different_host(self) -> None:
+        """Requests to different hosts use different sessions."""
+        from logtweet import transport as httptransport
+        transport = httptransport.Transport()
+
+        first_session = transport.get_session("https://example.com/a")
+        second_session = transport.get_session("https://example.org/a")
+
+        assert first_session is not second_session
+
+    def test_compressed_transfer_requested(self) -> None:
+        """Sessions ask for every content coding that can be decoded."""
+        from urllib3.util import request as urlrequest
+        from logtweet import transport as httptransport
+        transport = httptransport.Transport()
+
+        session = transport.get_session("https://example.com/a")
+
+        accept_encoding = session.headers["Accept-Encoding"]
+        assert "gzip" in accept_encoding
+        for coding in urlrequest.ACCEPT_ENCODING.split(","):
+            assert coding in accept_encoding
+
+    @pytest.mark.parametrize("method_name", ["get", "post"])
+    def test_configured_timeout_applied(
+        self,
+        monkeypatch: typing.Any,
+        method_name: str,
+    ) -> None:
+        """Configured timeouts are applied if none are given."""
+        import requests
+        passed_kwargs: typing.Dict[str, typing.Any] = {}
+
+        def mock_method(*_args: typing.Any, **kwargs: typing.Any) -> None:
+            passed_kwargs.update(kwargs)
+        monkeypatch.setattr(requests.Session, method_name, mock_method)
+        from logtweet import transport as httptransport
+        transport = httptransport.Transport(
+            httptransport.TransportSettings(connect_timeout=1, read_timeout=2),
+        )
+
+        getattr(transport, method_name)("https://example.com")
+
+        assert passed_kwargs["timeout"] == (1, 2)
+
+    def test_default_transport_is_shared(self) -> None:
+        """The default transport is the same object for every caller."""
+        from logtweet import transport as httptransport
+
+        first_transport = httptransport.get_default_transport()
+        second_transport = httptransport.get_default_transport()
+
+        assert first_transport is second_transport
+
+
+class TestTransportPrewarm(object):
+    """Tests for the `prewarm` method of the `Transport` class."""
+
+    @staticmethod
+    def start_keep_alive_server(
+        connections: typing.List[typing.Any],
+    ) -> typing.Any:
+        """Start HTTP/1.1 server recording every accepted connection."""
+        import threading
+        from http import server as httpserver
+
+        class KeepAliveHandler(httpserver.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                connections.append(self.client_address)
+                super().setup()
+
+            def do_HEAD(self) -> None:
+                self.send_response(200)
+                self.send_header("Content-Length", "2")
+                self.end_headers()
+
+            def do_GET(self) -> None:
+                self.do_HEAD()
+                self.wfile.write(b"ok")
+
+            def log_message(self, *args: typing.Any) -> None:
+                pass
+
+        server = httpserver.ThreadingHTTPServer(("localhost", 0), KeepAliveHandler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def test_prewarmed_connection_reused(self) -> None:
+        """The request after the pre-warm reuses the open connection."""
+        connections: typing.List[typing.Any] = []
+        server = self.start_keep_alive_server(connections)
+        url = "http://localhost:{0}/log".format(server.server_address[1])
+        from logtweet import transport as httptransport
+        transport = httptransport.Transport()
+
+        prewarm_futures = transport.prewarm([url, url + "?again"])
+        opened = [future.result(timeout=5) for future in prewarm_futures]
+        response = transport.get(url)
+        server.shutdown()
+
+        assert opened == [True]
+        assert response.text == "ok"
+        assert len(connections) == 1
+
+    def test_prewarm_does_not_block_exit(self) -> None:
+        """Pre-warms of hosts that do not respond run in daemon threads."""
+        import socket
+        import threading
+        from logtweet import transport as httptransport
+        silent_server = socket.socket()
+        silent_server.bind(("localhost", 0))
+        silent_server.listen(1)
+        url = "http://localhost:{0}/".format(silent_server.getsockname()[1])
+        transport = httptransport.Transport(
+            httptransport.TransportSettings(read_timeout=5, retries=0),
+        )
+
+        prewarm_futures = transport.prewarm([url])
+        is_waiting = not prewarm_futures[0].done()
+        other_threads = [
+            thread for thread in threading.enumerate()
+            if thread is not threading.main_thread()
+        ]
+        silent_server.close()
+
+        assert is_waiting
+        assert other_threads
+        assert all(thread.daemon for thread in other_threads)
+
+    def test_unreachable_host_ignored(self, free_port: int) -> None:
+        """Failing pre-warms resolve to `False` instead of raising."""
+        from logtweet import transport as httptransport
+        transport = httptransport.Transport()
+
+        prewarm_futures = transport.prewarm(
+            ["http://localhost:{0}/".format(free_port)],
+        )
+
+        assert [future.result(timeout=5) for future in prewarm_futures] == [
+            False,
+        ]
+
+    def test_non_http_and_disabled_skipped(self, tmp_path: typing.Any) -> None:
+        """Local sources are skipped and nothing is done when disabled."""
+        from logtweet import transport as httptransport
+        transport = httptransport.Transport()
+        disabled = httptransport.Transport(
+            httptransport.TransportSettings(prewarm=False),
+        )
+
+        assert transport.prewarm([str(tmp_path), "repo@main:log.md"]) == []
+        assert disabled.prewarm(["https://example.com"]) == []